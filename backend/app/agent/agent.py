@@ -41,6 +41,8 @@ from app.agent.context import AgentContext
 from app.agent.prompts import get_system_prompt
 from app.agent.tools.registry import dispatch_tool, get_bedrock_tools
 from app.core.config import settings
+from app.services import llm_usage_service
+from app.services.llm_usage_service import BudgetExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -90,135 +92,145 @@ async def stream_agent_response(
         full_text       = ""
         iteration       = 0
 
-        while iteration < MAX_TOOL_ITERATIONS:
-            iteration += 1
-
-            # ── Call Bedrock ──────────────────────────────────────────────
-            response = await _call_bedrock(
-                messages=messages,
-                system_prompt=system_prompt,
-                tools=bedrock_tools,
-                stream=True,
-            )
-
-            current_tool_use  = None
-            current_tool_input_json = ""
-            stop_reason       = None
-
-            # ── Process streaming response ────────────────────────────────
-            for chunk in response:
-                event_type = list(chunk.keys())[0] if chunk else None
-
-                # Text delta
-                if event_type == "contentBlockDelta":
-                    delta = chunk["contentBlockDelta"].get("delta", {})
-
-                    if "text" in delta:
-                        text = delta["text"]
-                        full_text += text
-                        yield {"type": "text_delta", "text": text}
-
-                    elif "toolUse" in delta:
-                        # Accumulate tool input JSON (streamed in chunks)
-                        current_tool_input_json += delta["toolUse"].get("input", "")
-
-                # Tool use block start
-                elif event_type == "contentBlockStart":
-                    block = chunk["contentBlockStart"].get("start", {})
-                    if "toolUse" in block:
-                        current_tool_use = {
-                            "id":   block["toolUse"]["toolUseId"],
-                            "name": block["toolUse"]["name"],
-                        }
-                        current_tool_input_json = ""
-                        yield {
-                            "type": "tool_start",
-                            "tool": current_tool_use["name"],
-                            "input": {},
-                        }
-
-                # Tool use block end → dispatch tool
-                elif event_type == "contentBlockStop":
-                    if current_tool_use:
-                        tool_name = current_tool_use["name"]
-                        tool_id   = current_tool_use["id"]
-
-                        # Parse accumulated input JSON
-                        try:
-                            tool_inputs = json.loads(current_tool_input_json) if current_tool_input_json else {}
-                        except json.JSONDecodeError:
-                            tool_inputs = {}
-
-                        yield {
-                            "type":  "tool_start",
-                            "tool":  tool_name,
-                            "input": tool_inputs,
-                        }
-
-                        # ── Dispatch tool ─────────────────────────────────
-                        tool_result = await dispatch_tool(
-                            tool_name=tool_name,
-                            tool_inputs=tool_inputs,
-                            context=context,
-                        )
+        # One admission and usage record per request: every tool turn runs on
+        # the admitted model, and tool calls count towards its wall time
+        async with llm_usage_service.track_async("agent.chat", BEDROCK_MODEL_ID, user_id=context.lawyer_id) as call:
+            while iteration < MAX_TOOL_ITERATIONS:
+                iteration += 1
+
+                # ── Call Bedrock ──────────────────────────────────────────
+                response = await _call_bedrock(
+                    messages=messages,
+                    system_prompt=system_prompt,
+                    tools=bedrock_tools,
+                    stream=True,
+                    model_id=call.model_id,
+                )
+
+                current_tool_use  = None
+                current_tool_input_json = ""
+                stop_reason       = None
+
+                # ── Process streaming response ────────────────────────────
+                for chunk in response:
+                    event_type = list(chunk.keys())[0] if chunk else None
+
+                    # Text delta
+                    if event_type == "contentBlockDelta":
+                        delta = chunk["contentBlockDelta"].get("delta", {})
+
+                        if "text" in delta:
+                            text = delta["text"]
+                            full_text += text
+                            yield {"type": "text_delta", "text": text}
+
+                        elif "toolUse" in delta:
+                            # Accumulate tool input JSON (streamed in chunks)
+                            current_tool_input_json += delta["toolUse"].get("input", "")
+
+                    # Tool use block start
+                    elif event_type == "contentBlockStart":
+                        block = chunk["contentBlockStart"].get("start", {})
+                        if "toolUse" in block:
+                            current_tool_use = {
+                                "id":   block["toolUse"]["toolUseId"],
+                                "name": block["toolUse"]["name"],
+                            }
+                            current_tool_input_json = ""
+                            yield {
+                                "type": "tool_start",
+                                "tool": current_tool_use["name"],
+                                "input": {},
+                            }
 
-                        yield {
-                            "type":    "tool_end",
-                            "tool":    tool_name,
-                            "success": tool_result.get("success", False),
-                            "summary": _summarise_tool_result(tool_name, tool_result),
-                        }
+                    # Tool use block end → dispatch tool
+                    elif event_type == "contentBlockStop":
+                        if current_tool_use:
+                            tool_name = current_tool_use["name"]
+                            tool_id   = current_tool_use["id"]
+
+                            # Parse accumulated input JSON
+                            try:
+                                tool_inputs = json.loads(current_tool_input_json) if current_tool_input_json else {}
+                            except json.JSONDecodeError:
+                                tool_inputs = {}
+
+                            yield {
+                                "type":  "tool_start",
+                                "tool":  tool_name,
+                                "input": tool_inputs,
+                            }
 
-                        # Append assistant tool_use + tool result to messages
-                        messages.append({
-                            "role": "assistant",
-                            "content": [{
-                                "toolUse": {
-                                    "toolUseId": tool_id,
-                                    "name":      tool_name,
-                                    "input":     tool_inputs,
-                                }
-                            }],
-                        })
+                            # ── Dispatch tool ─────────────────────────────
+                            tool_result = await dispatch_tool(
+                                tool_name=tool_name,
+                                tool_inputs=tool_inputs,
+                                context=context,
+                            )
+
+                            yield {
+                                "type":    "tool_end",
+                                "tool":    tool_name,
+                                "success": tool_result.get("success", False),
+                                "summary": _summarise_tool_result(tool_name, tool_result),
+                            }
+
+                            # Append assistant tool_use + tool result to messages
+                            messages.append({
+                                "role": "assistant",
+                                "content": [{
+                                    "toolUse": {
+                                        "toolUseId": tool_id,
+                                        "name":      tool_name,
+                                        "input":     tool_inputs,
+                                    }
+                                }],
+                            })
+                            messages.append({
+                                "role": "user",
+                                "content": [{
+                                    "toolResult": {
+                                        "toolUseId": tool_id,
+                                        "content":   [{"text": json.dumps(tool_result)}],
+                                        "status":    "success" if tool_result.get("success") else "error",
+                                    }
+                                }],
+                            })
+
+                            current_tool_use        = None
+                            current_tool_input_json = ""
+
+                    # Stop reason
+                    elif event_type == "messageStop":
+                        stop_reason = chunk["messageStop"].get("stopReason")
+
+                    # Token usage (last event of the stream)
+                    elif event_type == "metadata":
+                        call.add_usage(chunk["metadata"].get("usage"))
+
+                # ── Check stop reason ─────────────────────────────────────
+                if stop_reason == "end_turn":
+                    # Claude is done — append final assistant message to history
+                    if full_text:
                         messages.append({
-                            "role": "user",
-                            "content": [{
-                                "toolResult": {
-                                    "toolUseId": tool_id,
-                                    "content":   [{"text": json.dumps(tool_result)}],
-                                    "status":    "success" if tool_result.get("success") else "error",
-                                }
-                            }],
+                            "role":    "assistant",
+                            "content": [{"text": full_text}],
                         })
+                    break
 
-                        current_tool_use        = None
-                        current_tool_input_json = ""
-
-                # Stop reason
-                elif event_type == "messageStop":
-                    stop_reason = chunk["messageStop"].get("stopReason")
-
-            # ── Check stop reason ─────────────────────────────────────────
-            if stop_reason == "end_turn":
-                # Claude is done — append final assistant message to history
-                if full_text:
-                    messages.append({
-                        "role":    "assistant",
-                        "content": [{"text": full_text}],
-                    })
-                break
+                elif stop_reason == "tool_use":
+                    # Tool was called — loop continues with updated messages
+                    continue
 
-            elif stop_reason == "tool_use":
-                # Tool was called — loop continues with updated messages
-                continue
-
-            else:
-                # Unexpected stop — break safely
-                logger.warning("Unexpected stop reason: %s", stop_reason)
-                break
+                else:
+                    # Unexpected stop — break safely
+                    logger.warning("Unexpected stop reason: %s", stop_reason)
+                    break
 
         yield {"type": "done", "full_text": full_text}
 
+    except BudgetExceeded as e:
+        yield {"type": "error", "message": str(e)}
     except Exception as e:
         logger.exception("Agent stream error: %s", e)
         yield {"type": "error", "message": f"Agent error: {str(e)}"}
@@ -252,69 +264,74 @@ async def run_agent(
         tools_used    = []
         iteration     = 0
 
-        while iteration < MAX_TOOL_ITERATIONS:
-            iteration += 1
-
-            response    = await _call_bedrock(
-                messages=messages,
-                system_prompt=system_prompt,
-                tools=bedrock_tools,
-                stream=False,
-            )
+        # One admission and usage record per request: every tool turn runs on
+        # the admitted model, and tool calls count towards its wall time
+        async with llm_usage_service.track_async("agent.chat", BEDROCK_MODEL_ID, user_id=context.lawyer_id) as call:
+            while iteration < MAX_TOOL_ITERATIONS:
+                iteration += 1
 
-            stop_reason = response.get("stopReason")
-            content     = response.get("output", {}).get("message", {}).get("content", [])
+                response = await _call_bedrock(
+                    messages=messages,
+                    system_prompt=system_prompt,
+                    tools=bedrock_tools,
+                    stream=False,
+                    model_id=call.model_id,
+                )
+                call.add_usage(response.get("usage"))
 
-            # Process content blocks
-            tool_results_for_next_turn = []
+                stop_reason = response.get("stopReason")
+                content     = response.get("output", {}).get("message", {}).get("content", [])
 
-            for block in content:
-                if "text" in block:
-                    full_text += block["text"]
+                # Process content blocks
+                tool_results_for_next_turn = []
 
-                elif "toolUse" in block:
-                    tool_use   = block["toolUse"]
-                    tool_name  = tool_use["name"]
-                    tool_id    = tool_use["toolUseId"]
-                    tool_inputs = tool_use.get("input", {})
+                for block in content:
+                    if "text" in block:
+                        full_text += block["text"]
 
-                    tools_used.append(tool_name)
+                    elif "toolUse" in block:
+                        tool_use   = block["toolUse"]
+                        tool_name  = tool_use["name"]
+                        tool_id    = tool_use["toolUseId"]
+                        tool_inputs = tool_use.get("input", {})
 
-                    tool_result = await dispatch_tool(
-                        tool_name=tool_name,
-                        tool_inputs=tool_inputs,
-                        context=context,
-                    )
+                        tools_used.append(tool_name)
 
-                    tool_results_for_next_turn.append({
-                        "toolUseId": tool_id,
-                        "result":    tool_result,
-                    })
+                        tool_result = await dispatch_tool(
+                            tool_name=tool_name,
+                            tool_inputs=tool_inputs,
+                            context=context,
+                        )
 
-            # Append assistant message
-            messages.append({
-                "role":    "assistant",
-                "content": content,
-            })
+                        tool_results_for_next_turn.append({
+                            "toolUseId": tool_id,
+                            "result":    tool_result,
+                        })
 
-            # If tools were called, feed results back
-            if tool_results_for_next_turn:
+                # Append assistant message
                 messages.append({
-                    "role": "user",
-                    "content": [
-                        {
-                            "toolResult": {
-                                "toolUseId": tr["toolUseId"],
-                                "content":   [{"text": json.dumps(tr["result"])}],
-                                "status":    "success" if tr["result"].get("success") else "error",
-                            }
-                        }
-                        for tr in tool_results_for_next_turn
-                    ],
+                    "role":    "assistant",
+                    "content": content,
                 })
 
-            if stop_reason == "end_turn":
-                break
+                # If tools were called, feed results back
+                if tool_results_for_next_turn:
+                    messages.append({
+                        "role": "user",
+                        "content": [
+                            {
+                                "toolResult": {
+                                    "toolUseId": tr["toolUseId"],
+                                    "content":   [{"text": json.dumps(tr["result"])}],
+                                    "status":    "success" if tr["result"].get("success") else "error",
+                                }
+                            }
+                            for tr in tool_results_for_next_turn
+                        ],
+                    })
+
+                if stop_reason == "end_turn":
+                    break
 
         return {
             "response":   full_text,
@@ -380,6 +397,7 @@ async def _call_bedrock(
     system_prompt: str,
     tools:         list[dict],
     stream:        bool = True,
+    model_id:      str = BEDROCK_MODEL_ID,
 ):
     """
     Makes a Bedrock converse or converse_stream call.
@@ -389,7 +407,7 @@ async def _call_bedrock(
     client = boto3.client("bedrock-runtime", region_name=AWS_REGION)
 
     params = {
-        "modelId":  BEDROCK_MODEL_ID,
+        "modelId":  model_id,
         "system":   [{"text": system_prompt}],
         "messages": messages,
         "toolConfig": {
@@ -6,14 +6,26 @@ Bedrock LLM. Each generated query is scoped to Kerala High Court and Supreme
 Court of India.
 
 Falls back to [user_query] on any failure — never blocks the main pipeline.
+Successful expansions are cached per (model, normalised query) so repeated or
+re-phrased-identically Precedent Finder turns skip the LLM round-trip.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 
+from app.agent.prep_tools import bedrock_client
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache, normalize_key
+
 logger = logging.getLogger(__name__)
 
+_expansion_cache: TTLCache[list[str]] = TTLCache(
+    max_entries=settings.CASE_PREP_SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CASE_PREP_SEARCH_CACHE_TTL_SECONDS,
+)
+
 _EXPAND_SYSTEM = (
     "You are a legal search query expert for Indian courts. "
     "Given a legal question, generate 3 to 4 specific search queries. "
@@ -38,28 +50,14 @@ async def expand_query(user_query: str, model_id: str, region: str) -> list[str]
     Returns:
         List of 1-4 query strings. Always contains at least [user_query].
     """
-    import boto3
-    from app.core.config import settings
+    cache_key = (model_id, normalize_key(user_query))
+    cached = _expansion_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Multi-query expansion cache hit for %r", user_query[:60])
+        return list(cached)
 
     try:
-        client = boto3.client(
-            "bedrock-runtime",
-            region_name=region,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-
-        response = client.converse(
-            modelId=model_id,
-            system=[{"text": _EXPAND_SYSTEM}],
-            messages=[
-                {
-                    "role": "user",
-                    "content": [{"text": f"Legal question: {user_query}"}],
-                }
-            ],
-            inferenceConfig={"maxTokens": 512, "temperature": 0.2},
-        )
+        response = await asyncio.to_thread(_converse, user_query, model_id, region)
 
         raw = (
             response.get("output", {})
@@ -83,9 +81,25 @@ async def expand_query(user_query: str, model_id: str, region: str) -> list[str]
             logger.info(
                 "Multi-query expansion: %d queries for %r", len(valid), user_query[:60]
             )
-            return valid
+            _expansion_cache.set(cache_key, valid)
+            return list(valid)
 
     except Exception as exc:
         logger.warning("Multi-query expansion failed, using original query: %s", exc)
 
     return [user_query]
+
+
+def _converse(user_query: str, model_id: str, region: str) -> dict:
+    """Blocking Bedrock converse call — run via asyncio.to_thread."""
+    return bedrock_client("bedrock-runtime", region).converse(
+        modelId=model_id,
+        system=[{"text": _EXPAND_SYSTEM}],
+        messages=[
+            {
+                "role": "user",
+                "content": [{"text": f"Legal question: {user_query}"}],
+            }
+        ],
+        inferenceConfig={"maxTokens": 512, "temperature": 0.2},
+    )
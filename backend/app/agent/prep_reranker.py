@@ -5,16 +5,35 @@ Reranks candidate judgment chunks using Cohere Rerank via AWS Bedrock
 (bedrock-agent-runtime rerank API).
 
 Falls back to original order (sliced to top_k) if the rerank call is
-unavailable or fails — never blocks the main pipeline.
+unavailable or fails — never blocks the main pipeline.  Relevance scores
+are cached per (normalised query, chunk hash).
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+from typing import Optional
+
+from app.agent.prep_tools import bedrock_client
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache, normalize_key
 
 logger = logging.getLogger(__name__)
 
 _SCORE_THRESHOLD = 0.4
 
+# Rerank relevance scores are absolute per (query, document), so they can be
+# cached independently and merged across calls with different candidate sets.
+_score_cache: TTLCache[float] = TTLCache(
+    max_entries=settings.CASE_PREP_SEARCH_CACHE_MAX_ENTRIES * 16,
+    ttl_seconds=settings.CASE_PREP_SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+def _chunk_text(chunk: dict) -> str:
+    return (chunk.get("excerpt") or chunk.get("title") or "")[:2000]
+
 
 async def rerank(
     query: str,
@@ -34,70 +53,51 @@ async def rerank(
     Returns:
         Up to top_k chunks sorted by descending rerank score, filtered to
         relevanceScore >= 0.4. Falls back to chunks[:top_k] on any failure.
+        Scores already cached for (query, chunk) are reused; only the
+        remaining chunks are sent to the rerank API.
     """
     if not chunks:
         return []
     if len(chunks) <= top_k:
         return chunks
 
-    import boto3
-    from app.core.config import settings
+    query_key = normalize_key(query)
+    texts     = [_chunk_text(c) for c in chunks]
+    keys      = [
+        (query_key, hashlib.sha1(t.encode("utf-8")).hexdigest()) for t in texts
+    ]
+    scores: list[Optional[float]] = [_score_cache.get(k) for k in keys]
+    missing = [i for i, score in enumerate(scores) if score is None]
 
     try:
-        client = boto3.client(
-            "bedrock-agent-runtime",
-            region_name=region,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-
-        model_arn = (
-            f"arn:aws:bedrock:{region}::foundation-model/cohere.rerank-v3-5:0"
-        )
-
-        sources = [
-            {
-                "type": "INLINE",
-                "inlineDocumentSource": {
-                    "type": "TEXT",
-                    "textDocument": {
-                        "text": (c.get("excerpt") or c.get("title") or "")[:2000]
-                    },
-                },
-            }
-            for c in chunks
-        ]
-
-        response = client.rerank(
-            rerankingConfiguration={
-                "type": "BEDROCK_RERANKING_MODEL",
-                "bedrockRerankingConfiguration": {
-                    "modelConfiguration": {"modelArn": model_arn},
-                    "numberOfResults": min(top_k, len(chunks)),
-                },
-            },
-            sources=sources,
-            query=query,
+        if missing:
+            fresh = await asyncio.to_thread(
+                _rerank_scores, query, [texts[i] for i in missing], region
+            )
+            for local_idx, score in fresh.items():
+                if 0 <= local_idx < len(missing):
+                    idx = missing[local_idx]
+                    scores[idx] = score
+                    _score_cache.set(keys[idx], score)
+
+        ranked = sorted(
+            (i for i, score in enumerate(scores)
+             if score is not None and score >= _SCORE_THRESHOLD),
+            key=lambda i: scores[i],
+            reverse=True,
         )
-
-        reranked = response.get("rerankingResults") or []
         result: list[dict] = []
-        for item in reranked:
-            score = item.get("relevanceScore", 0.0)
-            if score < _SCORE_THRESHOLD:
-                continue
-            idx = item.get("index", 0)
-            if 0 <= idx < len(chunks):
-                enriched = dict(chunks[idx])
-                enriched["rerank_score"] = round(score, 4)
-                result.append(enriched)
+        for idx in ranked[:top_k]:
+            enriched = dict(chunks[idx])
+            enriched["rerank_score"] = round(scores[idx], 4)
+            result.append(enriched)
 
         if result:
             logger.info(
-                "Reranked %d candidates → %d selected (threshold=%.2f)",
-                len(chunks), len(result), _SCORE_THRESHOLD,
+                "Reranked %d candidates → %d selected (threshold=%.2f, cached=%d)",
+                len(chunks), len(result), _SCORE_THRESHOLD, len(chunks) - len(missing),
             )
-            return result[:top_k]
+            return result
 
         logger.warning(
             "Reranking returned 0 results above threshold %.2f — falling back",
@@ -108,3 +108,39 @@ async def rerank(
         logger.warning("Reranking unavailable, using original order: %s", exc)
 
     return chunks[:top_k]
+
+
+def _rerank_scores(query: str, texts: list[str], region: str) -> dict[int, float]:
+    """Blocking rerank call; returns {index into texts: relevanceScore}."""
+    model_arn = (
+        f"arn:aws:bedrock:{region}::foundation-model/cohere.rerank-v3-5:0"
+    )
+
+    sources = [
+        {
+            "type": "INLINE",
+            "inlineDocumentSource": {
+                "type": "TEXT",
+                "textDocument": {"text": text},
+            },
+        }
+        for text in texts
+    ]
+
+    # Ask for every score (not just top_k) so all of them can be cached.
+    response = bedrock_client("bedrock-agent-runtime", region).rerank(
+        rerankingConfiguration={
+            "type": "BEDROCK_RERANKING_MODEL",
+            "bedrockRerankingConfiguration": {
+                "modelConfiguration": {"modelArn": model_arn},
+                "numberOfResults": len(texts),
+            },
+        },
+        sources=sources,
+        query=query,
+    )
+
+    return {
+        int(item.get("index", 0)): float(item.get("relevanceScore", 0.0))
+        for item in (response.get("rerankingResults") or [])
+    }
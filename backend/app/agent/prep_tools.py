@@ -26,16 +26,27 @@ Claude's decision logic (baked into system prompt):
 from __future__ import annotations
 
 import asyncio
+import copy
 import json
 import logging
 import os
 import re
+import threading
 from typing import Any
 
 import httpx
 
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache, normalize_key
+
 logger = logging.getLogger(__name__)
 
+# Per-query KB hits for Precedent Finder (see _run_search_judgment_kb).
+_kb_hits_cache: TTLCache[dict] = TTLCache(
+    max_entries=settings.CASE_PREP_SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CASE_PREP_SEARCH_CACHE_TTL_SECONDS,
+)
+
 
 # ============================================================================
 # Tool Specs (Bedrock converse API format)
@@ -230,13 +241,49 @@ def summarise_prep_tool_result(tool_name: str, result: dict) -> str:
 # Tool implementations
 # ============================================================================
 
+_clients: dict[tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def bedrock_client(service: str, region: str):
+    """
+    Shared boto3 client per (service, region) for the Precedent Finder
+    pipeline — KB retrieve, query expansion and rerank.  boto3 clients are
+    thread-safe; building one per call costs more than the call itself.
+    """
+    client = _clients.get((service, region))
+    if client is None:
+        with _clients_lock:
+            client = _clients.get((service, region))
+            if client is None:
+                import boto3
+                client = _clients[(service, region)] = boto3.client(
+                    service,
+                    region_name=region,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                )
+    return client
+
+
+def _kb_retrieve(kb_id: str, region: str, query: str, max_results: int) -> dict:
+    """Blocking KB retrieve — always called via asyncio.to_thread."""
+    return bedrock_client("bedrock-agent-runtime", region).retrieve(
+        knowledgeBaseId=kb_id,
+        retrievalQuery={"text": query},
+        retrievalConfiguration={
+            "vectorSearchConfiguration": {"numberOfResults": max_results}
+        },
+    )
+
+
 async def _run_search_judgment_kb(inputs: dict) -> dict:
     """
     Search the Bedrock judgments Knowledge Base (cached, fast).
-    Uses bedrock-agent-runtime retrieve API.
+    Uses bedrock-agent-runtime retrieve API on a worker thread so several
+    queries can be in flight at once; successful results are memoised per
+    (normalised query, max_results).
     """
-    import boto3
-
     query       = _scope_query((inputs.get("query") or "").strip())
     max_results = min(int(inputs.get("max_results", 5)), 10)
 
@@ -253,15 +300,14 @@ async def _run_search_judgment_kb(inputs: dict) -> dict:
             "error": "BEDROCK_KNOWLEDGE_BASE_ID not configured — KB search skipped.",
         }
 
+    cache_key = (kb_id, normalize_key(query), max_results)
+    cached = _kb_hits_cache.get(cache_key)
+    if cached is not None:
+        # Callers annotate results in place; never hand out the cached dict
+        return copy.deepcopy(cached)
+
     try:
-        client = boto3.client("bedrock-agent-runtime", region_name=region)
-        response = client.retrieve(
-            knowledgeBaseId=kb_id,
-            retrievalQuery={"text": query},
-            retrievalConfiguration={
-                "vectorSearchConfiguration": {"numberOfResults": max_results}
-            },
-        )
+        response = await asyncio.to_thread(_kb_retrieve, kb_id, region, query, max_results)
 
         results = []
         for item in response.get("retrievalResults", []):
@@ -282,7 +328,7 @@ async def _run_search_judgment_kb(inputs: dict) -> dict:
                 "score":      round(score, 3),
             })
 
-        return {
+        payload = {
             "success": True,
             "data": {
                 "query":   query,
@@ -292,6 +338,8 @@ async def _run_search_judgment_kb(inputs: dict) -> dict:
             },
             "error": None if results else "No judgments found in KB for this query.",
         }
+        _kb_hits_cache.set(cache_key, copy.deepcopy(payload))
+        return payload
 
     except Exception as exc:
         logger.warning("Judgment KB search failed: %s", exc)
@@ -354,7 +402,16 @@ async def _run_search_indiankanoon(inputs: dict) -> dict:
             })
 
         # Fire-and-forget KB ingestion (non-blocking)
-        asyncio.create_task(_ingest_to_kb(results, query))
+        if settings.JOB_QUEUE_ENABLED:
+            try:
+                from app.services import job_queue
+                await asyncio.to_thread(
+                    job_queue.submit, "judgment.ingest", {"results": results, "query": query}
+                )
+            except Exception as exc:
+                logger.debug("KB ingestion enqueue skipped: %s", exc)
+        else:
+            asyncio.create_task(_ingest_to_kb(results, query))
 
         return {
             "success": True,
@@ -540,10 +597,8 @@ async def _run_search_judgment_kb_multi(inputs: dict) -> dict:
     Falls back gracefully at each step — if expansion or reranking fail,
     the raw single-query KB results are returned.
     """
-    import asyncio
     from app.agent.prep_multi_query import expand_query
     from app.agent.prep_reranker import rerank
-    from app.core.config import settings
 
     query = (inputs.get("query") or "").strip()
     if not query:
@@ -556,8 +611,8 @@ async def _run_search_judgment_kb_multi(inputs: dict) -> dict:
     queries = await expand_query(query, model_id=model_id, region=region)
 
     # ── Step 2: Parallel KB retrieval ────────────────────────────────────────
-    # Note: _run_search_judgment_kb uses boto3 (blocking) so gather runs
-    # them sequentially in practice — still yields multi-query coverage.
+    # Each retrieve runs on a worker thread, so the queries are in flight
+    # concurrently; repeated queries are served from the per-query cache.
     tasks = [
         _run_search_judgment_kb({"query": q, "max_results": 8})
         for q in queries
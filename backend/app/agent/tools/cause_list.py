@@ -13,10 +13,11 @@ from __future__ import annotations
 from datetime import date, datetime
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from app.agent.context import AgentContext
 from app.agent.tools.registry import BaseTool
+from app.db.compression import HEAVY
 from app.db.database import SessionLocal
 from app.db.models import DailyCauseList
 
@@ -55,6 +56,7 @@ class CauseListTool(BaseTool):
             try:
                 row = (
                     db.query(DailyCauseList)
+                    .options(undefer_group(HEAVY))
                     .filter(
                         DailyCauseList.advocate_id == UUID(context.lawyer_id),
                         DailyCauseList.date == target_date,
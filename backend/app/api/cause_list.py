@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import hashlib
+import json
 from datetime import date, datetime
+from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.core.logger import logger
 from app.db.database import SessionLocal, get_db
-from app.db.models import CauseListIngestionRun, CauseListSource, User
-from app.services.cause_list_renderer import cause_list_renderer
+from app.db.models import CauseListIngestionRun, CauseListSource, DailyCauseList, User
+from app.services import job_queue
+from app.services.cause_list_renderer import RENDER_VERSION, cause_list_renderer
 from app.services.daily_pdf_fetch_service import daily_pdf_fetch_service
 from app.services.cause_list_store import cause_list_store
 from app.services.mediation_enrichment_service import mediation_enrichment_service
@@ -29,6 +34,24 @@ def _parse_date(value: str | None) -> date:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {value}") from exc
 
 
+def _etag(listing_date: date, row: DailyCauseList | None, mediation_listings: list[dict[str, Any]]) -> str:
+    """Strong ETag over everything the GET /cause-list response is built from."""
+    h = hashlib.sha256(
+        f"{listing_date.isoformat()}|{RENDER_VERSION}|"
+        f"{row.result_hash if row else '-'}|{row.total_listings if row else 0}|".encode()
+    )
+    if mediation_listings:
+        h.update(json.dumps(mediation_listings, sort_keys=True, default=str).encode())
+    return f'"{h.hexdigest()[:32]}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match") or ""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
 # ---------------------------------------------------------------------------
 # Background pipeline — owns its own DB session so it safely runs after
 # the HTTP response has been returned and the request-scoped session closed.
@@ -91,10 +114,17 @@ async def _run_process_job(listing_date: date) -> None:
 
 @router.get("/cause-list")
 def get_cause_list(
+    request: Request,
+    response: Response,
     date_value: str | None = Query(None, alias="date"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    """
+    Served from the HTML pre-rendered at upsert time, with a strong ETag:
+    a poll whose If-None-Match still matches gets 304 without the stored
+    result or HTML being read.
+    """
     listing_date = _parse_date(date_value)
     advocate_name = (current_user.khc_advocate_name or "").strip()
 
@@ -104,9 +134,21 @@ def get_cause_list(
         advocate_name=advocate_name,
     )
 
-    row = cause_list_store.fetch_result(
+    row = cause_list_store.fetch_summary(
         db, advocate_id=str(current_user.id), listing_date=listing_date
     )
+    if row:
+        cause_list_store.ensure_rendered(db, row)
+
+    headers = {
+        "ETag": _etag(listing_date, row, mediation_listings),
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+    }
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
     if not row:
         if mediation_listings:
             result_json: dict = {"listings": mediation_listings}
@@ -124,14 +166,14 @@ def get_cause_list(
             "mediation_listings": 0,
         }
 
-    result_json = row.result_json if isinstance(row.result_json, dict) else {}
-
     if mediation_listings:
-        result_json = mediation_enrichment_service.inject_into_result(
-            result_json, mediation_listings
+        # Mediation rows change independently of the stored result
+        result_json = row.result_json if isinstance(row.result_json, dict) else {}
+        html = cause_list_renderer.render(
+            mediation_enrichment_service.inject_into_result(result_json, mediation_listings)
         )
-
-    html = cause_list_renderer.render(result_json)
+    else:
+        html = cause_list_store.rendered_html(row)
     return {
         "html": html,
         "total_listings": int(row.total_listings or 0) + len(mediation_listings),
@@ -157,7 +199,15 @@ async def process_cause_list_for_date(
     _ = current_user
     listing_date = _parse_date(date_value)
 
-    background_tasks.add_task(_run_process_job, listing_date)
+    if settings.JOB_QUEUE_ENABLED:
+        await asyncio.to_thread(
+            job_queue.submit,
+            "cause_list.process",
+            {"listing_date": listing_date.isoformat()},
+            dedupe_key=f"cause_list:{listing_date.isoformat()}",
+        )
+    else:
+        background_tasks.add_task(_run_process_job, listing_date)
 
     return {
         "success": True,
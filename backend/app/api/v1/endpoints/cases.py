@@ -2,13 +2,14 @@
 Case management endpoints
 """
 from fastapi import APIRouter, HTTPException, Depends, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import func, or_, extract
 from typing import List, Optional
 from datetime import datetime, timedelta
 from uuid import UUID
 import re
 
+from app.db.compression import HEAVY
 from app.db.database import get_db
 from app.db.models import Case, TrackedCase, User, Document, AIAnalysis, CaseHistory, CaseStatus
 from app.db.schemas import (
@@ -256,6 +257,8 @@ def get_pending_status_rows(
 ):
     rows = (
         db.query(Case)
+        # The latest hearing row comes from raw_court_data
+        .options(undefer_group(HEAVY))
         .filter(
             Case.advocate_id == current_user.id,
             Case.is_visible == True,
@@ -6,6 +6,7 @@ GET  /api/v1/doc-compare/memo/{id}      → download comparison memo as PDF
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -60,13 +61,17 @@ async def compare(
     ct_b = file_b.content_type or ""
 
     try:
-        text_a = extract_text_from_bytes(bytes_a, ct_a, file_a.filename or "", language)
+        text_a = await asyncio.to_thread(
+            extract_text_from_bytes, bytes_a, ct_a, file_a.filename or "", language
+        )
     except Exception as exc:
         logger.exception("Text extraction failed for document A")
         raise HTTPException(422, f"Could not extract text from Document A: {exc}")
 
     try:
-        text_b = extract_text_from_bytes(bytes_b, ct_b, file_b.filename or "", language)
+        text_b = await asyncio.to_thread(
+            extract_text_from_bytes, bytes_b, ct_b, file_b.filename or "", language
+        )
     except Exception as exc:
         logger.exception("Text extraction failed for document B")
         raise HTTPException(422, f"Could not extract text from Document B: {exc}")
@@ -77,7 +82,8 @@ async def compare(
         raise HTTPException(422, "Document B appears to have no readable text. Try enabling OCR or uploading a text-based PDF.")
 
     try:
-        result = compare_documents(text_a, text_b, name_a, name_b)
+        # CPU-bound on long pleadings — keep it off the event loop.
+        result = await asyncio.to_thread(compare_documents, text_a, text_b, name_a, name_b)
     except Exception as exc:
         logger.exception("Comparison failed")
         raise HTTPException(500, f"Comparison failed: {exc}")
@@ -122,7 +128,7 @@ async def download_memo(
         )
 
     try:
-        pdf_bytes = generate_comparison_memo_pdf(result)
+        pdf_bytes = await asyncio.to_thread(generate_comparison_memo_pdf, result)
     except RuntimeError as exc:
         raise HTTPException(500, str(exc))
     except Exception as exc:
@@ -1,67 +1,17 @@
 """
-Health and readiness checks – verify S3 and Bedrock connectivity.
+Health and readiness checks – S3, Bedrock and database connectivity.
+
+Readiness is served from the background health monitor's cache
+(app/services/health_monitor.py); requests never call AWS directly.
 """
-import json
 import shutil
 import subprocess
 from fastapi import APIRouter
-from app.core.config import settings
-from app.core.logger import logger
+from app.services.health_monitor import health_monitor
 
 router = APIRouter()
 
 
-def _check_s3() -> tuple[str, str]:
-    """Returns (status, detail). Status is 'ok' or 'error'."""
-    try:
-        import boto3
-        from botocore.exceptions import ClientError
-
-        client = boto3.client(
-            "s3",
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-        bucket = settings.S3_BUCKET_NAME
-        client.head_bucket(Bucket=bucket)
-        return "ok", f"Bucket '{bucket}' accessible"
-    except ClientError as e:
-        code = e.response.get("Error", {}).get("Code", "")
-        return "error", f"S3: {code} - {str(e)}"
-    except Exception as e:
-        return "error", f"S3: {str(e)}"
-
-
-def _check_bedrock() -> tuple[str, str]:
-    """Returns (status, detail). Status is 'ok' or 'error'."""
-    try:
-        import boto3
-
-        client = boto3.client(
-            "bedrock-runtime",
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-        model_id = settings.BEDROCK_MODEL_ID
-        body = json.dumps({
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 32,
-            "temperature": 0,
-            "messages": [
-                {"role": "user", "content": "Reply with exactly: OK"}
-            ],
-        })
-        response = client.invoke_model(modelId=model_id, body=body)
-        response_body = json.loads(response["body"].read())
-        text = response_body.get("content", [{}])[0].get("text", "").strip()
-        return "ok", f"Bedrock responded: {text[:50]}"
-    except Exception as e:
-        logger.exception("Bedrock check failed")
-        return "error", f"Bedrock: {str(e)}"
-
-
 def _check_ocr_capabilities() -> dict:
     """
     Runtime capability check for OCR pipeline:
@@ -162,19 +112,12 @@ def _check_ocr_capabilities() -> dict:
 @router.get("/ready")
 def readiness():
     """
-    Check if AWS services are reachable. Use this to verify S3 and Bedrock setup.
-    - s3: head_bucket on configured bucket
-    - bedrock: minimal invoke_model (single message "Reply with exactly: OK")
+    Cached readiness of S3, Bedrock and the database.
+    - status: healthy | degraded | starting (no probe yet) | stale (probe loop stopped)
+    - per dependency: status, detail, checked_at, last_ok_at, latency_ms p50/p95/p99
+    Probes run every HEALTH_PROBE_INTERVAL_SEC using control-plane calls only.
     """
-    s3_status, s3_detail = _check_s3()
-    bedrock_status, bedrock_detail = _check_bedrock()
-
-    healthy = s3_status == "ok" and bedrock_status == "ok"
-    return {
-        "status": "healthy" if healthy else "degraded",
-        "s3": {"status": s3_status, "detail": s3_detail},
-        "bedrock": {"status": bedrock_status, "detail": bedrock_detail},
-    }
+    return health_monitor.snapshot()
 
 
 @router.get("/ocr")
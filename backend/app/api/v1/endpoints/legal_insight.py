@@ -4,7 +4,8 @@ Legal Insight (Judgment Summarizer) API endpoints.
 POST   /legal-insight/jobs                    → create job from existing document (queued)
 POST   /legal-insight/jobs/upload             → create job from uploaded PDF file (queued)
 GET    /legal-insight/jobs/{job_id}           → status + progress
-GET    /legal-insight/jobs/{job_id}/result    → summary + citation_map
+GET    /legal-insight/jobs/{job_id}/result    → summary + citation_map (cited chunks only)
+GET    /legal-insight/jobs/{job_id}/chunks    → extracted chunks, paged
 POST   /legal-insight/jobs/{job_id}/chat      → streaming chat about the judgment (SSE)
 """
 
@@ -15,7 +16,7 @@ import uuid as uuid_lib
 from typing import AsyncGenerator, Literal
 
 import boto3
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
@@ -25,6 +26,7 @@ from app.core.config import settings
 from app.core.logger import logger
 from app.db.database import get_db
 from app.db.models import LegalInsightChunk, LegalInsightJob, LegalInsightJobStatus, LegalInsightResult, User
+from app.services import job_queue
 from app.services.legal_insight_job_service import legal_insight_job_service
 from app.services.legal_insight_llm_service import legal_insight_llm_service
 
@@ -52,6 +54,14 @@ class JobStatusResponse(BaseModel):
     error: str | None
 
 
+def _start_job(background_tasks: BackgroundTasks, db: Session, job_id: str) -> None:
+    """Hand the pipeline to the durable queue, or run it as a BackgroundTask."""
+    if settings.JOB_QUEUE_ENABLED:
+        job_queue.enqueue(db, "legal_insight.run", {"job_id": job_id}, dedupe_key=f"legal_insight:{job_id}")
+    else:
+        background_tasks.add_task(legal_insight_job_service.run_job, db, job_id)
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -76,9 +86,7 @@ def create_job(
     """Create a new Legal Insight job and start the pipeline in the background."""
     job = legal_insight_job_service.create_job(db, current_user, request.document_id)
 
-    background_tasks.add_task(
-        legal_insight_job_service.run_job, db, str(job.id)
-    )
+    _start_job(background_tasks, db, str(job.id))
 
     return CreateJobResponse(job_id=str(job.id), status=job.status.value)
 
@@ -154,7 +162,7 @@ async def create_upload_job(
         upload_s3_key=s3_key,
     )
 
-    background_tasks.add_task(legal_insight_job_service.run_job, db, str(job.id))
+    _start_job(background_tasks, db, str(job.id))
 
     return CreateJobResponse(job_id=str(job.id), status=job.status.value)
 
@@ -241,7 +249,57 @@ def get_job_result(
             detail="Result record not found for completed job",
         )
 
-    return result.result_json
+    result_json = dict(result.result_json or {})
+    if "citation_map" not in result_json:
+        # Resolve only the cited chunks; the full list is paged via /chunks.
+        result_json["citation_map"] = legal_insight_job_service.citation_refs(
+            db,
+            legal_insight_job_service.chunks_job_id(job, result_json),
+            legal_insight_job_service.cited_chunk_ids(result_json.get("summary") or {}),
+        )
+    return result_json
+
+
+@router.get(
+    "/jobs/{job_id}/chunks",
+    summary="Page through a Legal Insight job's extracted chunks",
+    description=(
+        "Returns extracted chunks (text, page, bbox) in document order. "
+        "Use offset/limit to page, or page_number to fetch one PDF page."
+    ),
+)
+def get_job_chunks(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    page_number: int | None = Query(None, ge=1),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Return one page of chunks for a completed Legal Insight job."""
+    job: LegalInsightJob | None = (
+        db.query(LegalInsightJob).filter(LegalInsightJob.id == job_id).first()
+    )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if str(job.user_id) != str(current_user.id):
+        raise HTTPException(status_code=403, detail="You do not have permission to view this job")
+    if job.status != LegalInsightJobStatus.completed:
+        raise HTTPException(status_code=409, detail="Job not yet completed")
+
+    result: LegalInsightResult | None = (
+        db.query(LegalInsightResult).filter(LegalInsightResult.job_id == str(job.id)).first()
+    )
+    result_json = (result.result_json if result is not None else None) or {}
+
+    total, chunks = legal_insight_job_service.page_chunks(
+        db,
+        legal_insight_job_service.chunks_job_id(job, result_json),
+        offset=offset,
+        limit=limit,
+        page_number=page_number,
+    )
+    return {"total": total, "offset": offset, "limit": limit, "chunks": chunks}
 
 
 # ============================================================================
@@ -291,10 +349,15 @@ async def chat_with_judgment(
     if result is None:
         raise HTTPException(status_code=404, detail="Result record not found for this job")
 
+    result_json = result.result_json or {}
+
     # ── Fetch and sample chunks ───────────────────────────────────────────────
     db_chunks = (
-        db.query(LegalInsightChunk)
-        .filter(LegalInsightChunk.job_id == str(job.id))
+        db.query(LegalInsightChunk.chunk_id, LegalInsightChunk.page_number, LegalInsightChunk.text)
+        .filter(
+            LegalInsightChunk.job_id
+            == legal_insight_job_service.chunks_job_id(job, result_json)
+        )
         .order_by(LegalInsightChunk.page_number)
         .all()
     )
@@ -306,12 +369,12 @@ async def chat_with_judgment(
     # Convert messages for the service
     messages = [{"role": m.role, "content": m.content} for m in body.messages]
 
-    result_json = result.result_json or {}
-
     # ── SSE generator ─────────────────────────────────────────────────────────
     async def generate() -> AsyncGenerator[str, None]:
         try:
-            for text_delta in legal_insight_llm_service.stream_chat(result_json, chunk_dicts, messages):
+            for text_delta in legal_insight_llm_service.stream_chat(
+                result_json, chunk_dicts, messages, user_id=str(current_user.id),
+            ):
                 yield f"data: {json.dumps({'text': text_delta})}\n\n"
         except Exception as exc:
             logger.exception("chat_with_judgment stream error: %s", exc)
@@ -17,6 +17,7 @@ POST /api/v1/translate/export
 """
 from __future__ import annotations
 
+import asyncio
 import io
 import json
 import logging
@@ -27,7 +28,9 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.api.v1.deps import get_current_user
+from app.core.config import settings
 from app.db.models import User
+from app.services import llm_usage_service
 from app.services.translation.llm_translate_service import llm_translate_service
 from app.services.translation.document_translate_service import document_translate_service
 
@@ -101,6 +104,9 @@ class TranslateDocumentResponse(BaseModel):
     glossary_hits: int
     warnings: List[str]
     char_count: int
+    tm_segments: int = 0
+    tm_hits: int = 0
+    tm_hit_rate: float = 0.0
 
 
 # ── Endpoints ──────────────────────────────────────────────────────────────
@@ -129,7 +135,9 @@ def translate_text(
     )
 
     try:
-        result = llm_translate_service.translate_text(payload.text, direction)
+        result = llm_translate_service.translate_text(
+            payload.text, direction, user_id=str(current_user.id)
+        )
     except RuntimeError as exc:
         logger.error("translate/text failed: %s", exc)
         raise HTTPException(
@@ -172,10 +180,15 @@ def translate_text_stream(
         else payload.direction  # type: ignore[assignment]
     )
 
+    # Budget check before the stream starts, so it can still be a 429
+    model_id = llm_usage_service.admit(
+        "translate", settings.LEGAL_TRANSLATE_MODEL_ID, str(current_user.id)
+    )
+
     def generate():
         try:
             for item in llm_translate_service.stream_translate_text(
-                payload.text, direction
+                payload.text, direction, model_id=model_id, user_id=str(current_user.id)
             ):
                 if isinstance(item, dict):
                     # Final done event — add char_count and direction
@@ -204,7 +217,7 @@ def translate_text_stream(
     summary="Translate uploaded document — chunk-by-chunk SSE stream",
     description=(
         "Upload a PDF, DOCX, or TXT file. The backend extracts text (OCR for scanned PDFs), "
-        "then translates each chunk and streams it via SSE as soon as it is ready. "
+        "then translates chunks in parallel and streams them via SSE in document order. "
         "Event types: 'extracted' (OCR done, total chunk count known), "
         "'chunk' (one translated chunk), 'done' (final quality metadata), 'error'."
     ),
@@ -215,9 +228,11 @@ async def translate_document_stream(
     current_user: User = Depends(get_current_user),
 ) -> StreamingResponse:
     """Translate an uploaded document with per-chunk SSE streaming."""
-    from app.services.translation.document_translate_service import extract_text, chunk_text
-    from app.services.translation.protect_service import protect_service
-    from app.services.translation.glossary_service import glossary_service
+    from app.services.translation.document_translate_service import (
+        chunk_text,
+        extract_text,
+        translate_chunks_ordered,
+    )
 
     content_type = (file.content_type or "").split(";")[0].strip()
     if content_type not in _ALLOWED_MIME_TYPES:
@@ -234,6 +249,9 @@ async def translate_document_stream(
         )
 
     filename = file.filename or "document"
+    model_id = await asyncio.to_thread(
+        llm_usage_service.admit, "translate", settings.LEGAL_TRANSLATE_MODEL_ID, str(current_user.id)
+    )
 
     def generate():
         # ── Phase 1: OCR / text extraction ──────────────────────────────────
@@ -246,36 +264,32 @@ async def translate_document_stream(
         chunks = chunk_text(text)
         yield f"data: {json.dumps({'type': 'extracted', 'total_chunks': len(chunks), 'char_count': len(text), 'source_text': text})}\n\n"
 
-        # ── Phase 2: translate chunk by chunk ────────────────────────────────
+        # ── Phase 2: translate chunks concurrently, stream in order ─────────
         total_glossary_hits = 0
         all_warnings: list = []
-        translated_parts: list = []
-
-        for idx, chunk in enumerate(chunks):
-            protected, pmap = protect_service.protect_text(chunk)
-            try:
-                translated_protected = llm_translate_service.translate_chunk(
-                    protected, direction
+        tm_segments = tm_hits = 0
+
+        for result in translate_chunks_ordered(
+            chunks, direction, model_id=model_id, user_id=str(current_user.id)
+        ):
+            idx = result["index"]
+            if result["failed"]:
+                logger.error(
+                    "Document stream chunk %d/%d failed: %s", idx + 1, len(chunks), result["error"]
                 )
-            except RuntimeError as exc:
-                logger.error("Document stream chunk %d/%d failed: %s", idx + 1, len(chunks), exc)
-                translated_parts.append(chunk)
-                all_warnings.append(f"Chunk {idx + 1} failed: {exc}")
-                yield f"data: {json.dumps({'type': 'chunk', 'index': idx, 'total': len(chunks), 'text': chunk, 'failed': True})}\n\n"
+                all_warnings.append(f"Chunk {idx + 1} failed: {result['error']}")
+                yield f"data: {json.dumps({'type': 'chunk', 'index': idx, 'total': len(chunks), 'text': result['text'], 'failed': True})}\n\n"
                 continue
 
-            restored = protect_service.restore_text(translated_protected, pmap)
-            warnings = protect_service.validate_protection(chunk, restored)
-            all_warnings.extend(warnings)
+            all_warnings.extend(result["warnings"])
+            total_glossary_hits += result["glossary_hits"]
+            tm_segments += result["tm_segments"]
+            tm_hits += result["tm_hits"]
 
-            hits = len(glossary_service.find_matches(chunk, direction))
-            total_glossary_hits += hits
-            translated_parts.append(restored)
-
-            yield f"data: {json.dumps({'type': 'chunk', 'index': idx, 'total': len(chunks), 'text': restored})}\n\n"
+            yield f"data: {json.dumps({'type': 'chunk', 'index': idx, 'total': len(chunks), 'text': result['text']})}\n\n"
 
         # ── Phase 3: done ─────────────────────────────────────────────────────
-        yield f"data: {json.dumps({'type': 'done', 'total_chunks': len(chunks), 'glossary_hits': total_glossary_hits, 'warnings': all_warnings, 'char_count': len(text), 'filename': filename, 'direction': direction})}\n\n"
+        yield f"data: {json.dumps({'type': 'done', 'total_chunks': len(chunks), 'glossary_hits': total_glossary_hits, 'warnings': all_warnings, 'char_count': len(text), 'filename': filename, 'direction': direction, 'tm_hits': tm_hits, 'tm_segments': tm_segments})}\n\n"
 
     return StreamingResponse(
         generate(),
@@ -320,7 +334,9 @@ async def translate_document(
         )
 
     try:
-        result = document_translate_service.translate_bytes(data, content_type, direction)
+        result = document_translate_service.translate_bytes(
+            data, content_type, direction, user_id=str(current_user.id)
+        )
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
@@ -341,6 +357,9 @@ async def translate_document(
         glossary_hits=result["glossary_hits"],
         warnings=result["warnings"],
         char_count=result.get("char_count", 0),
+        tm_segments=result.get("tm_segments", 0),
+        tm_hits=result.get("tm_hits", 0),
+        tm_hit_rate=result.get("tm_hit_rate", 0.0),
     )
 
 
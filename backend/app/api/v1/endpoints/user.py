@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
 from app.db.models import User
+from app.services import llm_usage_service
 
 router = APIRouter()
 
@@ -94,3 +95,13 @@ def update_profile(
     db.commit()
     db.refresh(current_user)
     return {"data": _profile_payload(current_user)}
+
+
+@router.get("/llm-usage")
+def get_llm_usage(
+    days: int = Query(7, ge=1, le=90),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """The caller's daily AI token usage per feature/model and today's budget."""
+    return {"data": llm_usage_service.daily_usage_for_user(db, current_user.id, days)}
@@ -20,9 +20,27 @@ class Settings(BaseSettings):
     # Application
     APP_NAME: str = "Lawmate"
     DEBUG: bool = False
+
+    # Logging (app/core/logger.py) — written by a background thread
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"                # "json" or "text"
+    LOG_FILE_ENABLED: bool = True           # logs/app.log in addition to stdout
+    LOG_FILE_MAX_BYTES: int = 50 * 1024 * 1024
+    LOG_FILE_BACKUP_COUNT: int = 5
+    LOG_QUEUE_SIZE: int = 10000             # records buffered; overflow is dropped and counted
+    # Access log (app/middleware/correlation.py): one line per request.
+    # Prefixes below are sampled; errors and slow requests are always logged.
+    ACCESS_LOG_SAMPLED_PATHS: str = "/health,/api/v1/health,/api/v1/sse,/metrics"
+    ACCESS_LOG_SAMPLE_RATE: float = 0.01
+    ACCESS_LOG_SLOW_MS: int = 2000                # measured to first byte, so open streams are not "slow"
+    # Prometheus text endpoint (GET /metrics, app/core/metrics.py)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""                 # if set, scrapes need "Authorization: Bearer <token>"
     
     # Database
     DATABASE_URL: str
+    # zstd level for the compressed heavy columns (app/db/compression.py)
+    HEAVY_COLUMN_ZSTD_LEVEL: int = 6
     
     # JWT Authentication
     JWT_SECRET_KEY: str
@@ -76,6 +94,22 @@ class Settings(BaseSettings):
     CAUSELIST_DAILY_SYNC_MINUTE_IST: int = 50
     CAUSELIST_RETENTION_ENABLED: bool = True
     CAUSELIST_RETENTION_DAYS: int = 60
+    # Monthly partitions (app/services/partition_maintenance.py); retention drops
+    # whole months, so rows live up to a month past the configured days.
+    # 0 keeps everything.
+    ADVOCATE_CAUSELIST_RETENTION_DAYS: int = 0
+    LIVE_STATUS_SNAPSHOT_RETENTION_DAYS: int = 0
+    CAUSELIST_PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_HOUR_IST: int = 3
+    PARTITION_MAINTENANCE_MINUTE_IST: int = 30
+    PARTITION_LOCK_TIMEOUT_MS: int = 5000
+    # Nightly advocate cause-list fetch (advocate_causelist_service.sync_advocate_causelists)
+    ADVOCATE_CAUSELIST_CONCURRENCY: int = 4       # warm hckinfo sessions / parallel advocates
+    ADVOCATE_CAUSELIST_RATE_PER_SEC: float = 2.0  # hckinfo requests per second, all sessions together
+    ADVOCATE_CAUSELIST_MAX_ATTEMPTS: int = 3
+    ADVOCATE_CAUSELIST_RETRY_BASE_SEC: float = 2.0
+    ADVOCATE_CAUSELIST_SESSION_MAX_USES: int = 50  # re-GET the search page after this many POSTs
+    ADVOCATE_CAUSELIST_WRITE_BATCH: int = 25       # advocates written per transaction
     CASES_RECYCLE_BIN_PURGE_ENABLED: bool = True
     CASES_RECYCLE_BIN_RETENTION_DAYS: int = 90
 
@@ -144,6 +178,15 @@ class Settings(BaseSettings):
     
     # DynamoDB (optional)
     DYNAMODB_TABLE_NAME: str = "lawmate-activity-trail"
+    # Audit events (app/services/audit_service.py) are queued in-process and
+    # written with BatchWriteItem by a background thread.  Events DynamoDB
+    # does not accept go to a local spill file, replayed once it recovers.
+    AUDIT_QUEUE_SIZE: int = 10000              # overflow goes to the spill file
+    AUDIT_BATCH_LINGER_MS: int = 50            # wait for a batch of 25 to fill
+    AUDIT_MAX_ATTEMPTS: int = 5                # per batch, incl. unprocessed-item retries
+    AUDIT_SPILL_PATH: str = "logs/audit_spill.jsonl"   # relative to backend/
+    AUDIT_SPILL_REPLAY_INTERVAL_SEC: int = 60
+    AUDIT_SHUTDOWN_TIMEOUT_SEC: float = 10.0
     
     # CORS
     CORS_ORIGINS: str = '["https://lawmate-prod.vercel.app","https://www.lawmatekerala.com","https://lawmatekerala.com","http://localhost:3000"]'
@@ -182,6 +225,13 @@ class Settings(BaseSettings):
     LEGAL_TRANSLATE_MAX_TOKENS: int = 8192   # Haiku 4.5 supports larger output windows
     LEGAL_TRANSLATE_TEMPERATURE: float = 0.1
     LEGAL_TRANSLATE_MAX_SUBSET_TERMS: int = 30
+    LEGAL_TRANSLATE_OCR_WORKERS: int = 4     # parallel Tesseract processes for scanned PDF pages
+    LEGAL_TRANSLATE_CONCURRENCY: int = 6     # max in-flight Bedrock calls per model (process-wide)
+    LEGAL_TRANSLATE_CHUNK_RETRIES: int = 2   # extra attempts for a failed document chunk
+    LEGAL_TRANSLATE_TM_ENABLED: bool = True       # reuse translated paragraphs (translation_memory table)
+    LEGAL_TRANSLATE_TM_NEAR_MATCH: bool = False   # also reuse case/punctuation-only variants
+    LEGAL_TRANSLATE_TM_CACHE_SIZE: int = 5000     # in-process LRU entries in front of Postgres
+    LEGAL_TRANSLATE_TM_MIN_CHARS: int = 20        # shorter paragraphs are not looked up or stored
     LEGAL_GLOSSARY_PATH: str = ""  # leave blank to auto-resolve from backend root
 
     # Legal Insight — Judgment Summarizer
@@ -191,6 +241,11 @@ class Settings(BaseSettings):
     LEGAL_INSIGHT_JOB_TIMEOUT_SEC: int = 600
     LEGAL_INSIGHT_PROMPT_VERSION: str = "v1"
     LEGAL_INSIGHT_ENABLE_OCR_FALLBACK: bool = True
+    LEGAL_INSIGHT_MAP_CONCURRENCY: int = 4          # parallel map-phase Bedrock calls per job
+    LEGAL_INSIGHT_OCR_WORKERS: int = 2              # OCR processes for scanned pages (process-wide)
+    LEGAL_INSIGHT_RESUME_STALE_SEC: int = 900       # job with no heartbeat for this long is resumed
+    LEGAL_INSIGHT_RESUME_MAX_AGE_HOURS: int = 24    # older unfinished jobs are left alone
+    LEGAL_INSIGHT_RESUME_INTERVAL_SEC: int = 300    # how often each worker looks for stale jobs
 
     # Case Prep AI
     # Model used for the sustained hearing-prep chat and brief generation.
@@ -199,6 +254,10 @@ class Settings(BaseSettings):
     CASE_PREP_MODEL_ID: str = "anthropic.claude-3-haiku-20240307-v1:0"
     CASE_PREP_MAX_TOKENS: int = 8192
     CASE_PREP_TEMPERATURE: float = 0.3
+    # Precedent Finder caches: query expansions, per-query KB hits and
+    # rerank scores are memoised in-process for this long.
+    CASE_PREP_SEARCH_CACHE_TTL_SECONDS: int = 1800
+    CASE_PREP_SEARCH_CACHE_MAX_ENTRIES: int = 1024
 
     # BDA document extraction — set profile ARN to enable; falls back to PyMuPDF
     BDA_PROFILE_ARN:      str = ""
@@ -220,6 +279,71 @@ class Settings(BaseSettings):
     # Total token budget below which all doc text is sent as full context.
     # Above this threshold the service switches to hybrid RAG via Bedrock KB.
     DRAFTING_FULL_CONTEXT_TOKEN_LIMIT: int = 800_000
+    # Serve RAG turns from the local per-workspace index (BM25 + optional
+    # embeddings in workspace_chunks) instead of a Bedrock KB round-trip.
+    DRAFTING_LOCAL_INDEX_ENABLED: bool = True
+    # Also store Titan embeddings per chunk and fuse dense + BM25 rankings.
+    DRAFTING_LOCAL_INDEX_EMBEDDINGS: bool = False
+    # Number of hot workspace indexes kept in memory per process (LRU)
+    DRAFTING_LOCAL_INDEX_CACHE_SIZE: int = 32
+
+    # ── Embeddings (app/utils/embedder.py) ────────────────────────────────────
+    # "bedrock" = Titan Embed Text v2; "local" = deterministic hashing embedder
+    # for tests and offline runs (no network, same dimension).
+    EMBEDDING_BACKEND: str = "bedrock"
+    # Concurrent embed requests are coalesced into micro-batches of this size…
+    EMBEDDING_BATCH_SIZE: int = 16
+    # …or flushed after this many milliseconds, whichever comes first.
+    EMBEDDING_BATCH_WAIT_MS: int = 5
+    # Parallel Titan invocations per batch (Titan accepts one input per call)
+    EMBEDDING_CONCURRENCY: int = 8
+    # Vectors kept in the in-process cache, keyed by hash(model, text)
+    EMBEDDING_CACHE_SIZE: int = 20000
+
+    # ── Durable job queue (app/services/job_queue.py) ─────────────────────────
+    # When enabled, heavy background work is enqueued in the job_queue table
+    # and executed by `python -m jobs.worker` instead of in-process tasks.
+    # Leave off until a worker is deployed alongside the API.
+    JOB_QUEUE_ENABLED: bool = False
+    JOB_QUEUE_MAX_ATTEMPTS: int = 5
+    JOB_QUEUE_VISIBILITY_SEC: int = 900      # lease per dequeue; extended by heartbeats
+    JOB_QUEUE_POLL_INTERVAL_SEC: float = 2.0  # idle poll; backs off to 15x when empty
+    JOB_QUEUE_RETENTION_DAYS: int = 7        # succeeded/dead rows are purged after this
+    # Per job type concurrency for one worker process ("type=n,type=n")
+    JOB_WORKER_CONCURRENCY: str = (
+        "legal_insight.run=2,drafting.kb_ingest=4,drafting.context_extraction=2,"
+        "judgment.ingest=2,judgment.kb_sync=1,cause_list.process=1"
+    )
+
+    # ── Health monitor (app/services/health_monitor.py) ───────────────────────
+    # Dependencies are probed in the background; /health/ready serves the cache.
+    HEALTH_PROBE_INTERVAL_SEC: int = 30
+    HEALTH_PROBE_TIMEOUT_SEC: int = 5        # connect/read timeout per probe call
+    HEALTH_FAILURE_THRESHOLD: int = 2        # consecutive failures before "error"
+
+    # ── Scheduler (app/core/scheduler.py) ─────────────────────────────────────
+    # Periodic jobs run only on the process holding the group's advisory lock.
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_TICK_SEC: float = 5.0          # leader check / follower failover poll
+    SCHEDULER_CATCHUP_WINDOW_HOURS: int = 24  # missed daily slots older than this are dropped
+    SCHEDULER_DISABLED_JOBS: str = ""        # "advocate_causelist,hearing_sync"
+
+    # ── Bedrock usage accounting (app/services/llm_usage_service.py) ──────────
+    # Every Bedrock call is recorded in llm_usage_events and rolled up per
+    # (IST day, user, feature, model) in llm_usage_daily.
+    LLM_USAGE_ENABLED: bool = True
+    LLM_USAGE_RETENTION_DAYS: int = 90       # per-call rows; daily roll-ups are kept
+    # Daily token budgets (input + output + cache writes); 0 / absent = unlimited
+    LLM_USER_DAILY_TOKEN_BUDGET: int = 0     # per user, across features
+    LLM_FEATURE_DAILY_TOKEN_BUDGETS: str = ""  # "drafting.chat=5000000,agent.chat=2000000"
+    # Over budget: "downgrade" to LLM_BUDGET_FALLBACK_MODEL_ID, or "reject".
+    # Downgraded callers are still rejected past budget × LLM_BUDGET_HARD_FACTOR.
+    LLM_BUDGET_ACTION: str = "downgrade"
+    LLM_BUDGET_FALLBACK_MODEL_ID: str = ""   # blank → BEDROCK_MODEL_ID (lawmate-fast)
+    LLM_BUDGET_HARD_FACTOR: float = 2.0
+    # Cost estimate, USD per million tokens: "<model id or substring>=<input>:<output>,…"
+    # Cache reads are priced at 10% and cache writes at 125% of input.
+    LLM_PRICING_USD_PER_MTOK: str = ""
 
     # Feature flags
     HEARING_DAY_ENABLED: bool = True
@@ -1,22 +1,172 @@
 """
 Logging configuration
+
+Log calls never touch the disk or stdout on the calling thread.  The root
+logger has a single handler that pushes records onto a bounded in-memory
+queue; a ``QueueListener`` thread formats them (JSON or plain text) and
+writes them to ``logs/app.log`` (size-rotated) and stdout.
+
+When the queue is full the record is dropped and counted instead of
+blocking the event loop; the count is reported by the next record that
+gets through and by ``dropped_records()``.
+
+Every record carries the ``correlation_id`` / ``tab_id`` of the request
+that produced it (set by ``CorrelationMiddleware`` through the context
+variables below), captured on the calling thread before hand-off.
 """
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
-# Create logs directory if it doesn't exist
-log_dir = Path(__file__).parent.parent.parent / "logs"
-log_dir.mkdir(exist_ok=True)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_dir / "app.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
-logger = logging.getLogger("lawmate")
\ No newline at end of file
+from app.core.config import settings
+
+# Request-scoped IDs; "-" outside a request (startup, scheduled loops)
+correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default="-")
+tab_id_var: ContextVar[str] = ContextVar("tab_id", default="")
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "correlation_id", "tab_id",
+}
+
+# Overflow notices are emitted at most this often
+_DROP_NOTICE_INTERVAL_SEC = 5.0
+
+_TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra={...}`` fields are kept as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", "-"),
+        }
+        if getattr(record, "tab_id", ""):
+            entry["tab_id"] = record.tab_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    Non-blocking hand-off to the listener thread.
+
+    ``prepare`` only does what must happen on the caller's thread: merge
+    ``msg % args`` (args may be mutated later) and stamp the request IDs
+    (context variables are invisible to the listener thread).  Exception
+    tracebacks are formatted by the listener.
+    """
+
+    def __init__(self, q: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(q)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self._reported = 0
+        self._reported_at = 0.0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if not hasattr(record, "correlation_id"):
+            record.correlation_id = correlation_id_var.get()
+        if not hasattr(record, "tab_id"):
+            record.tab_id = tab_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+
+        if self.dropped == self._reported:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._reported_at < _DROP_NOTICE_INTERVAL_SEC:
+                return
+            unreported, total = self.dropped - self._reported, self.dropped
+            self._reported, self._reported_at = total, now
+        if unreported > 0:
+            notice = logging.makeLogRecord({
+                "name": "lawmate.logging",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"log queue full — dropped {unreported} records ({total} total)",
+                "correlation_id": "-",
+                "tab_id": "",
+            })
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                pass
+
+
+def _build_handlers() -> list[logging.Handler]:
+    formatter: logging.Formatter = (
+        JsonFormatter() if settings.LOG_FORMAT.lower() == "json" else logging.Formatter(_TEXT_FORMAT)
+    )
+    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    if settings.LOG_FILE_ENABLED:
+        # Create logs directory if it doesn't exist
+        log_dir = Path(__file__).parent.parent.parent / "logs"
+        log_dir.mkdir(exist_ok=True)
+        handlers.append(RotatingFileHandler(
+            log_dir / "app.log",
+            maxBytes=settings.LOG_FILE_MAX_BYTES,
+            backupCount=settings.LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _configure() -> tuple[_DroppingQueueHandler, QueueListener]:
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = _DroppingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    listener.start()
+    atexit.register(listener.stop)  # drains the queue before exit
+    return queue_handler, listener
+
+
+_queue_handler, _listener = _configure()
+
+
+def dropped_records() -> int:
+    """Records discarded because the log queue was full (process lifetime)."""
+    return _queue_handler.dropped
+
+
+logger = logging.getLogger("lawmate")
@@ -0,0 +1,337 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+No collector or client library is required: metrics live in this process
+and ``render()`` produces the text format served at ``GET /metrics``.
+Updates take one uncontended per-series lock (a few hundred ns), so the
+instrumentation stays on in production.
+
+Instrumented here or wired from elsewhere:
+- HTTP routes:      ``CorrelationMiddleware`` → ``http_request_duration_seconds``
+- AWS calls:        botocore event hooks (installed on import) → ``dependency_*``
+                    with ``dependency`` = service name (s3, bedrock-runtime, …)
+- Postgres:         cursor events in ``app/db/database.py`` → ``dependency_*``;
+                    pool checkout wait and pool gauges
+- hckinfo portal:   ``track_dependency("hckinfo", …)`` around the fetches
+- Bedrock tokens:   ``llm_tokens_total`` / ``llm_calls_total`` (``app/services/llm_usage_service.py``)
+- Background loops: ``background_loop_busy`` / ``background_task_up`` (main.py)
+- Scheduled jobs:   ``scheduler_leader`` / ``scheduled_job_*`` (``app/core/scheduler.py``)
+
+Import this module before any boto3 client is created (``app/main.py`` does
+so right after config) — clients copy the session's event hooks when they
+are created.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+
+from app.core.logger import logger
+
+# Seconds; Bedrock generations run to minutes, so the tail is wide
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self._samples())
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_label_str(self.labelnames, key)} {_fmt(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> list[str]:
+        lines: list[str] = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {cumulative}")
+            labels = _label_str(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_fmt(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        """*fn* runs before every render, e.g. to refresh gauges from live state."""
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            try:
+                fn()
+            except Exception as exc:
+                logger.warning("metrics: collector %s failed: %s", getattr(fn, "__name__", fn), exc)
+        return "".join(m.render() for m in list(self._metrics.values()))
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ── Shared metrics ────────────────────────────────────────────────────────────
+
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template (streams: until the body ends).",
+    ("method", "route", "status"),
+)
+DEPENDENCY_CALL_DURATION = histogram(
+    "dependency_call_duration_seconds",
+    "Latency of calls to external dependencies (streaming AWS calls: until headers).",
+    ("dependency", "operation"),
+)
+DEPENDENCY_ERRORS = counter(
+    "dependency_errors_total",
+    "Failed calls to external dependencies.",
+    ("dependency", "operation"),
+)
+DB_POOL_CHECKOUT_WAIT = histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTIONS = gauge(
+    "db_pool_connections",
+    "SQLAlchemy pool connections by state.",
+    ("state",),
+)
+BACKGROUND_LOOP_BUSY = gauge(
+    "background_loop_busy",
+    "1 while a background loop or scheduled job is doing work, 0 otherwise.",
+    ("loop",),
+)
+BACKGROUND_TASK_UP = gauge(
+    "background_task_up",
+    "1 if the startup background task is still running.",
+    ("task",),
+)
+LOG_RECORDS_DROPPED = gauge(
+    "log_records_dropped",
+    "Log records dropped because the logging queue was full.",
+)
+
+
+@contextmanager
+def track_dependency(dependency: str, operation: str) -> Iterator[None]:
+    """Time a block as one dependency call; an exception counts as an error."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        DEPENDENCY_ERRORS.labels(dependency, operation).inc()
+        raise
+    finally:
+        DEPENDENCY_CALL_DURATION.labels(dependency, operation).observe(time.perf_counter() - start)
+
+
+def route_label(scope: dict) -> Optional[str]:
+    """Route template for *scope* (set by the router once matched), else None."""
+    route = scope.get("route")
+    return getattr(route, "path", None)
+
+
+# ── botocore hooks ────────────────────────────────────────────────────────────
+
+_CTX_KEY = "metrics_start"
+
+
+def _before_call(context=None, **_) -> None:
+    if context is not None:
+        context[_CTX_KEY] = time.perf_counter()
+
+
+def _observe_call(event_name: str, context, failed: bool) -> None:
+    start = (context or {}).pop(_CTX_KEY, None)
+    if start is None:
+        return
+    # "after-call.<service-id>.<Operation>", e.g. after-call.bedrock-runtime.InvokeModel
+    _, service, operation = event_name.split(".", 2)
+    DEPENDENCY_CALL_DURATION.labels(service, operation).observe(time.perf_counter() - start)
+    if failed:
+        DEPENDENCY_ERRORS.labels(service, operation).inc()
+
+
+def _after_call(event_name="", http_response=None, context=None, **_) -> None:
+    status = getattr(http_response, "status_code", 0) or 0
+    _observe_call(event_name, context, failed=status >= 400)
+
+
+def _after_call_error(event_name="", context=None, **_) -> None:
+    _observe_call(event_name, context, failed=True)
+
+
+def _install_boto_hooks() -> None:
+    try:
+        import boto3
+    except ImportError:  # pragma: no cover — boto3 is a hard dependency today
+        return
+    events = boto3._get_default_session().events
+    events.register("before-call.*.*", _before_call, unique_id="lawmate-metrics-before")
+    events.register("after-call.*.*", _after_call, unique_id="lawmate-metrics-after")
+    events.register("after-call-error.*.*", _after_call_error, unique_id="lawmate-metrics-error")
+
+
+def _collect_log_drops() -> None:
+    from app.core.logger import dropped_records
+
+    LOG_RECORDS_DROPPED.set(dropped_records())
+
+
+_install_boto_hooks()
+REGISTRY.add_collector(_collect_log_drops)
@@ -0,0 +1,363 @@
+"""
+Leader-elected scheduler for the periodic background jobs.
+
+Every API worker (and the scraper service) runs a ``Scheduler``, but only
+the process holding the Postgres advisory lock for its group starts jobs.
+The lock lives on a dedicated autocommit connection: when the leader dies
+its connection closes, Postgres releases the lock and a follower takes over
+on its next poll (``SCHEDULER_TICK_SEC``).  Server-side TCP keepalives on
+that connection cover a host that vanishes without closing the socket.  A
+leader whose connection fails steps down and cancels its running jobs.
+
+``scheduler_jobs`` keeps one row per job: the last slot run, start/finish
+time, duration, outcome and counters.
+
+- A run claims its slot with a conditional UPDATE, so a slot runs at most
+  once even if two leaders briefly overlap.
+- While a job runs, the leader holds a per-job advisory lock.  A run that
+  comes due while the previous one is still going (here or on another
+  host) is skipped and counted.
+- After downtime the most recent missed slot within
+  ``SCHEDULER_CATCHUP_WINDOW_HOURS`` runs once (older misses coalesce into
+  it); interval jobs run as soon as their interval has passed.  Runs that
+  were cancelled, or abandoned by a dead leader, count as missed.
+- A daily job that has never run is seeded with its latest slot instead,
+  so the first deploy waits for the next slot; catch-up applies only once
+  a run has been recorded.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.logger import logger
+
+IST = ZoneInfo("Asia/Kolkata")
+
+# Detect a silently dead leader host within ~25 s
+_KEEPALIVE_SQL = (
+    "SET tcp_keepalives_idle = 10",
+    "SET tcp_keepalives_interval = 5",
+    "SET tcp_keepalives_count = 3",
+)
+
+SCHEDULER_LEADER = metrics.gauge(
+    "scheduler_leader",
+    "1 while this process is the scheduler leader for the group.",
+    ("group",),
+)
+SCHEDULED_JOB_RUNS = metrics.counter(
+    "scheduled_job_runs_total",
+    "Scheduled job runs by outcome (ok, error, cancelled, skipped, abandoned).",
+    ("job", "outcome"),
+)
+SCHEDULED_JOB_DURATION = metrics.histogram(
+    "scheduled_job_duration_seconds",
+    "Duration of scheduled job runs.",
+    ("job",),
+    buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0),
+)
+
+
+@dataclass(frozen=True)
+class Job:
+    """A periodic job: every ``interval_sec`` seconds, or daily at ``at_ist`` (hour, minute) times."""
+
+    name: str
+    func: Callable[[], Any]              # coroutine function, or a sync function run in a thread
+    interval_sec: Optional[float] = None
+    at_ist: tuple[tuple[int, int], ...] = ()
+
+    def __post_init__(self) -> None:
+        if bool(self.interval_sec) == bool(self.at_ist):
+            raise ValueError(f"job {self.name}: set exactly one of interval_sec / at_ist")
+
+    def latest_slot(self, now: datetime) -> datetime:
+        """Most recent daily slot at or before *now*; both naive UTC."""
+        local = now.replace(tzinfo=timezone.utc).astimezone(IST)
+        slots = []
+        for hour, minute in self.at_ist:
+            slot = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if slot > local:
+                slot -= timedelta(days=1)
+            slots.append(slot)
+        return max(slots).astimezone(timezone.utc).replace(tzinfo=None)
+
+    def due(self, now: datetime, last: Optional[datetime]) -> Optional[tuple[datetime, datetime]]:
+        """
+        ``(slot, claim_before)`` if a run is due, else None.  The slot can be
+        claimed only while ``last_scheduled_for < claim_before``.
+        """
+        if self.interval_sec:
+            threshold = now - timedelta(seconds=max(1.0, self.interval_sec - 1))
+            if last is None or last < threshold:
+                return now, threshold
+            return None
+        slot = self.latest_slot(now)
+        if last is not None and last >= slot:
+            return None
+        if now - slot > timedelta(hours=settings.SCHEDULER_CATCHUP_WINDOW_HOURS):
+            return None
+        return slot, slot
+
+
+class Scheduler:
+    def __init__(self, group: str) -> None:
+        self.group = group
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self._jobs: dict[str, Job] = {}
+        self._running: dict[str, asyncio.Task] = {}
+        self._conn: Optional[Connection] = None
+        self._conn_lock = threading.Lock()
+
+    def add(self, job: Job) -> None:
+        disabled = {n.strip() for n in settings.SCHEDULER_DISABLED_JOBS.split(",") if n.strip()}
+        if job.name in disabled:
+            logger.info("scheduler[%s]: job %s disabled", self.group, job.name)
+            return
+        self._jobs[job.name] = job
+
+    # ── Leader connection (blocking; called through asyncio.to_thread) ────────
+
+    def _exec(self, sql: str, **params: Any) -> Any:
+        with self._conn_lock:
+            if self._conn is None:
+                from app.db.database import engine
+
+                conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+                for stmt in _KEEPALIVE_SQL:
+                    conn.execute(text(stmt))
+                self._conn = conn
+            result = self._conn.execute(text(sql), params)
+            return result.all() if result.returns_rows else result.rowcount
+
+    def _close(self) -> None:
+        """Drop the connection, releasing every advisory lock it holds."""
+        with self._conn_lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.invalidate()
+                conn.close()
+            except Exception:
+                pass
+
+    def _try_lead(self) -> bool:
+        try:
+            if self.is_leader:
+                # The lock is tied to this connection; a new one would not hold it
+                return self._conn is not None and bool(self._exec("SELECT 1"))
+            rows = self._exec(
+                "SELECT pg_try_advisory_lock(hashtext(:key))", key=f"lawmate-scheduler:{self.group}"
+            )
+            return bool(rows[0][0])
+        except DBAPIError as exc:
+            logger.warning("scheduler[%s]: leader connection failed: %s", self.group, exc.orig)
+            self._close()
+            return False
+
+    def _register(self) -> None:
+        for name in self._jobs:
+            self._exec(
+                "INSERT INTO scheduler_jobs (name, scheduler_group) VALUES (:name, :grp) "
+                "ON CONFLICT (name) DO UPDATE SET scheduler_group = EXCLUDED.scheduler_group",
+                name=name, grp=self.group,
+            )
+
+    def _job_lock(self, name: str) -> bool:
+        rows = self._exec("SELECT pg_try_advisory_lock(hashtext(:key))", key=f"lawmate-job:{name}")
+        return bool(rows[0][0])
+
+    def _job_unlock(self, name: str) -> None:
+        self._exec("SELECT pg_advisory_unlock(hashtext(:key))", key=f"lawmate-job:{name}")
+
+    def _states(self) -> dict[str, Any]:
+        rows = self._exec(
+            "SELECT name, last_scheduled_for, last_started_at, running_since, running_owner "
+            "FROM scheduler_jobs WHERE name = ANY(:names)",
+            names=list(self._jobs),
+        )
+        return {row.name: row for row in rows}
+
+    def _claim(self, name: str, slot: datetime, before: datetime) -> bool:
+        if not self._job_lock(name):
+            return False
+        claimed = self._exec(
+            "UPDATE scheduler_jobs SET last_scheduled_for = :slot, last_started_at = :now, "
+            "running_since = :now, running_owner = :owner, updated_at = :now "
+            "WHERE name = :name AND (last_scheduled_for IS NULL OR last_scheduled_for < :before)",
+            name=name, slot=slot, before=before, now=datetime.utcnow(), owner=self.owner,
+        )
+        if not claimed:
+            self._job_unlock(name)
+        return bool(claimed)
+
+    def _seed(self, name: str, slot: datetime) -> None:
+        self._exec(
+            "UPDATE scheduler_jobs SET last_scheduled_for = :slot, updated_at = :now "
+            "WHERE name = :name AND last_scheduled_for IS NULL AND last_started_at IS NULL",
+            name=name, slot=slot, now=datetime.utcnow(),
+        )
+
+    def _skip(self, name: str, slot: datetime, before: datetime) -> bool:
+        return bool(self._exec(
+            "UPDATE scheduler_jobs SET last_scheduled_for = :slot, "
+            "skipped_count = skipped_count + 1, updated_at = :now "
+            "WHERE name = :name AND (last_scheduled_for IS NULL OR last_scheduled_for < :before)",
+            name=name, slot=slot, before=before, now=datetime.utcnow(),
+        ))
+
+    def _reap(self, name: str, running_since: datetime) -> bool:
+        """
+        Clear a run whose owner no longer holds the job lock; it counts as
+        missed.  Advisory locks are re-entrant, so the lock alone does not
+        exclude our own runs: the update only applies while the row still
+        shows the run seen in *running_since*, not one _finish has closed
+        since the states were read.
+        """
+        if not self._job_lock(name):
+            return False
+        try:
+            return bool(self._exec(
+                "UPDATE scheduler_jobs SET last_status = 'abandoned', last_scheduled_for = NULL, "
+                "running_since = NULL, running_owner = NULL, updated_at = :now "
+                "WHERE name = :name AND running_since = :since",
+                name=name, now=datetime.utcnow(), since=running_since,
+            ))
+        finally:
+            self._job_unlock(name)
+
+    def _finish(self, name: str, outcome: str, duration: float, error: Optional[str]) -> None:
+        self._exec(
+            "UPDATE scheduler_jobs SET last_finished_at = :now, last_duration_ms = :ms, "
+            "last_status = :outcome, last_error = :error, run_count = run_count + 1, "
+            "error_count = error_count + CASE WHEN :outcome = 'error' THEN 1 ELSE 0 END, "
+            "last_scheduled_for = CASE WHEN :outcome = 'cancelled' THEN NULL ELSE last_scheduled_for END, "
+            "running_since = NULL, running_owner = NULL, updated_at = :now "
+            "WHERE name = :name AND running_owner = :owner",
+            name=name, now=datetime.utcnow(), ms=int(duration * 1000), outcome=outcome,
+            error=error, owner=self.owner,
+        )
+        self._job_unlock(name)
+
+    # ── Event loop side ───────────────────────────────────────────────────────
+
+    async def _run_job(self, job: Job, slot: datetime) -> None:
+        outcome, error = "ok", None
+        start = time.perf_counter()
+        metrics.BACKGROUND_LOOP_BUSY.labels(job.name).set(1)
+        logger.info("scheduler[%s]: %s started (slot %s UTC)", self.group, job.name, slot.isoformat())
+        try:
+            if asyncio.iscoroutinefunction(job.func):
+                await job.func()
+            else:
+                await asyncio.to_thread(job.func)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as exc:
+            outcome, error = "error", f"{type(exc).__name__}: {exc}"[:2000]
+            logger.exception("scheduler[%s]: %s failed", self.group, job.name)
+        finally:
+            duration = time.perf_counter() - start
+            metrics.BACKGROUND_LOOP_BUSY.labels(job.name).set(0)
+            SCHEDULED_JOB_RUNS.labels(job.name, outcome).inc()
+            SCHEDULED_JOB_DURATION.labels(job.name).observe(duration)
+            logger.info("scheduler[%s]: %s %s in %.1fs", self.group, job.name, outcome, duration)
+            try:
+                await asyncio.to_thread(self._finish, job.name, outcome, duration, error)
+            except DBAPIError as exc:
+                logger.warning("scheduler[%s]: could not record %s run: %s", self.group, job.name, exc.orig)
+            finally:
+                # Only now: until _finish clears the row, a _tick would see
+                # running_since set and, with no task here, reap the run.
+                self._running.pop(job.name, None)
+
+    async def _tick(self) -> None:
+        now = datetime.utcnow()
+        states = await asyncio.to_thread(self._states)
+        for job in self._jobs.values():
+            state = states.get(job.name)
+            if (
+                job.at_ist and state is not None
+                and state.last_scheduled_for is None and state.last_started_at is None
+            ):
+                # Never run: wait for the next slot rather than catch up this one
+                await asyncio.to_thread(self._seed, job.name, job.latest_slot(now))
+                continue
+            due = job.due(now, state.last_scheduled_for if state else None)
+            busy = job.name in self._running
+            if not busy and state is not None and state.running_since is not None:
+                # Someone else's run: still going elsewhere, or its owner died
+                if await asyncio.to_thread(self._reap, job.name, state.running_since):
+                    SCHEDULED_JOB_RUNS.labels(job.name, "abandoned").inc()
+                    logger.warning(
+                        "scheduler[%s]: %s run by %s was abandoned; it will be caught up",
+                        self.group, job.name, state.running_owner,
+                    )
+                    continue
+                busy = True
+            if due is None:
+                continue
+            if busy:
+                if await asyncio.to_thread(self._skip, job.name, *due):
+                    SCHEDULED_JOB_RUNS.labels(job.name, "skipped").inc()
+                    logger.warning("scheduler[%s]: %s skipped, previous run still going", self.group, job.name)
+                continue
+            if await asyncio.to_thread(self._claim, job.name, *due):
+                self._running[job.name] = asyncio.create_task(
+                    self._run_job(job, due[0]), name=f"scheduler:{job.name}"
+                )
+
+    async def _step_down(self) -> None:
+        self.is_leader = False
+        SCHEDULER_LEADER.labels(self.group).set(0)
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self) -> None:
+        """Run until cancelled: follow, or lead and start due jobs."""
+        if not self._jobs:
+            logger.info("scheduler[%s]: no jobs registered", self.group)
+            return
+        logger.info("scheduler[%s]: jobs %s (owner %s)", self.group, sorted(self._jobs), self.owner)
+        try:
+            while True:
+                leader = await asyncio.to_thread(self._try_lead)
+                if not leader and self.is_leader:
+                    logger.warning("scheduler[%s]: %s lost leadership", self.group, self.owner)
+                    await self._step_down()
+                if leader:
+                    try:
+                        if not self.is_leader:
+                            await asyncio.to_thread(self._register)
+                            self.is_leader = True
+                            SCHEDULER_LEADER.labels(self.group).set(1)
+                            logger.info("scheduler[%s]: %s is now the leader", self.group, self.owner)
+                        await self._tick()
+                    except DBAPIError as exc:
+                        # Leadership is re-checked (and lost, if the connection is gone) next poll
+                        logger.warning("scheduler[%s]: tick failed: %s", self.group, exc.orig)
+                        await asyncio.to_thread(self._close)
+                    except Exception:
+                        logger.exception("scheduler[%s]: tick failed", self.group)
+                await asyncio.sleep(settings.SCHEDULER_TICK_SEC)
+        finally:
+            await self._step_down()
+            await asyncio.to_thread(self._close)
@@ -0,0 +1,142 @@
+"""
+zstd-compressed, deferred storage for heavy text / JSON columns.
+
+Each heavy attribute is backed by two deferred columns in the ``heavy``
+load group:
+
+- ``<name>_zst``  BYTEA — the zstd frame, written for every new value
+- ``<name>``      the original TEXT / JSONB column, read only for rows the
+                  backfill (``python -m jobs.compress_heavy_columns``) has not
+                  converted yet, and cleared whenever the value is written
+
+The model exposes the plain value through ``compressed_text`` /
+``compressed_json`` descriptors, so ``doc.extracted_text`` reads and
+assigns a ``str`` exactly as before.  Because the columns are deferred,
+``db.query(Model)`` and counts never select them; code that needs the value
+for many rows should load it up front with ``.options(undefer_group(HEAVY))``
+or ``undefer_heavy(db, rows)`` instead of one lazy load per row.
+
+The descriptors are plain Python attributes, not mapped columns: they cannot
+be used in SQL filters.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Sequence
+
+import zstandard
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, undefer_group
+
+from app.core.config import settings
+
+HEAVY = "heavy"
+
+_local = threading.local()
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    # zstd contexts are not safe for concurrent use; keep one per thread
+    c = getattr(_local, "compressor", None)
+    if c is None:
+        c = _local.compressor = zstandard.ZstdCompressor(level=settings.HEAVY_COLUMN_ZSTD_LEVEL)
+    return c
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    d = getattr(_local, "decompressor", None)
+    if d is None:
+        d = _local.decompressor = zstandard.ZstdDecompressor()
+    return d
+
+
+def compress_text(value: str) -> bytes:
+    return _compressor().compress(value.encode("utf-8"))
+
+
+def decompress_text(blob: bytes) -> str:
+    return _decompressor().decompress(bytes(blob)).decode("utf-8")
+
+
+def compress_json(value: Any) -> bytes:
+    return _compressor().compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def decompress_json(blob: bytes) -> Any:
+    return json.loads(_decompressor().decompress(bytes(blob)))
+
+
+class _Compressed:
+    def __init__(self, blob_attr: str, plain_attr: str, compress, decompress) -> None:
+        self.blob_attr = blob_attr
+        self.plain_attr = plain_attr
+        self._compress = compress
+        self._decompress = decompress
+        self._cache_key = f"_decoded_{blob_attr}"
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        if obj is None:
+            return self
+        blob = getattr(obj, self.blob_attr)
+        if blob is None:
+            return getattr(obj, self.plain_attr)
+        # Decode once per loaded blob; a refresh loads a new bytes object
+        cached = obj.__dict__.get(self._cache_key)
+        if cached is not None and cached[0] is blob:
+            return cached[1]
+        value = self._decompress(blob)
+        obj.__dict__[self._cache_key] = (blob, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self.blob_attr, None if value is None else self._compress(value))
+        setattr(obj, self.plain_attr, None)
+
+
+def compressed_text(blob_attr: str, plain_attr: str) -> Any:
+    """``str`` attribute stored zstd-compressed in *blob_attr* (falls back to *plain_attr*)."""
+    return _Compressed(blob_attr, plain_attr, compress_text, decompress_text)
+
+
+def compressed_json(blob_attr: str, plain_attr: str) -> Any:
+    """JSON attribute stored zstd-compressed in *blob_attr* (falls back to *plain_attr*)."""
+    return _Compressed(blob_attr, plain_attr, compress_json, decompress_json)
+
+
+def compressed_values(**values: Any) -> dict[str, Any]:
+    """
+    Column values for Core INSERT/UPDATE statements, which bypass the
+    descriptors: ``compressed_values(result_json=payload)`` →
+    ``{"result_json_zst": <zstd>, "result_json": None}``.
+    """
+    out: dict[str, Any] = {}
+    for name, value in values.items():
+        out[f"{name}_zst"] = None if value is None else (
+            compress_text(value) if isinstance(value, str) else compress_json(value)
+        )
+        out[name] = None
+    return out
+
+
+def undefer_heavy(db: Session, instances: Sequence[Any]) -> None:
+    """Load the heavy columns of already-fetched *instances* with one query."""
+    if not instances:
+        return
+    model = type(instances[0])
+    pk = inspect(model).primary_key[0]
+    ids = [getattr(obj, pk.key) for obj in instances]
+    db.query(model).options(undefer_group(HEAVY)).filter(pk.in_(ids)).all()
+
+
+__all__ = [
+    "HEAVY",
+    "compress_json",
+    "compress_text",
+    "compressed_json",
+    "compressed_text",
+    "compressed_values",
+    "decompress_json",
+    "decompress_text",
+    "undefer_heavy",
+]
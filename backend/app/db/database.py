@@ -88,20 +88,71 @@
 #     Base.metadata.drop_all(bind=engine)
 #     logger.warning("All tables dropped")
 from datetime import datetime
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from app.core import metrics
 from app.core.config import settings
 import uuid
 from uuid import UUID
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=_TimedQueuePool,
     pool_pre_ping=True,   # test connection health before each checkout
     pool_size=5,
     max_overflow=10,
     pool_recycle=1800,    # recycle connections after 30 min (avoids Railway proxy killing idle conns)
 )
 
+
+@event.listens_for(engine, "before_cursor_execute")
+def _query_start(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _query_end(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if starts:
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        metrics.DEPENDENCY_CALL_DURATION.labels("postgres", verb).observe(time.perf_counter() - starts.pop())
+
+
+@event.listens_for(engine, "handle_error")
+def _query_error(exception_context):
+    starts = exception_context.connection.info.get("metrics_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+    statement = (exception_context.statement or "").strip()
+    verb = statement.split(None, 1)[0].upper() if statement else "CONNECT"
+    metrics.DEPENDENCY_ERRORS.labels("postgres", verb).inc()
+
+
+def _collect_pool_stats() -> None:
+    pool = engine.pool
+    metrics.DB_POOL_CONNECTIONS.labels("checked_out").set(pool.checkedout())
+    metrics.DB_POOL_CONNECTIONS.labels("idle").set(pool.checkedin())
+    metrics.DB_POOL_CONNECTIONS.labels("overflow").set(max(0, pool.overflow()))
+    metrics.DB_POOL_CONNECTIONS.labels("size").set(pool.size())
+
+
+metrics.REGISTRY.add_collector(_collect_pool_stats)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
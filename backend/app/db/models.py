@@ -17,15 +17,17 @@ from sqlalchemy import (
     ForeignKey,
     Float,
     Integer,
+    LargeBinary,
     String,
     Text,
     TIMESTAMP,
     UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy import Index
 
+from app.db.compression import HEAVY, compressed_json, compressed_text
 from app.db.database import Base
 
 # ============================================================================
@@ -292,7 +294,10 @@ class Case(Base):
     khc_source_url = Column(Text, nullable=True)
     last_synced_at = Column(TIMESTAMP, nullable=True)
     sync_status = Column(String(50), nullable=False, default="pending")
-    raw_court_data = Column(JSONB, nullable=True)
+    # Heavy: deferred, zstd-compressed (see app/db/compression.py)
+    raw_court_data_zst = deferred(Column(LargeBinary, nullable=True), group=HEAVY)
+    _raw_court_data_plain = deferred(Column("raw_court_data", JSONB, nullable=True), group=HEAVY)
+    raw_court_data = compressed_json("raw_court_data_zst", "_raw_court_data_plain")
     
     # Search
     search_vector = Column(Text, nullable=True)  # TSVECTOR in PostgreSQL
@@ -370,7 +375,10 @@ class CaseLiveStatusTracker(Base):
 
 
 class CaseLiveStatusSnapshot(Base):
-    """Immutable snapshots of live-status pulls."""
+    """
+    Immutable snapshots of live-status pulls.
+    Range-partitioned by month on fetched_at, which is therefore part of the key.
+    """
     __tablename__ = "case_live_status_snapshots"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -385,10 +393,14 @@ class CaseLiveStatusSnapshot(Base):
     check_source = Column(String(50), nullable=False, default="mcp")
     changed_fields = Column(ARRAY(String), nullable=False, default=list)
     raw_payload = Column(JSONB, nullable=True)
-    fetched_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, index=True)
+    fetched_at = Column(TIMESTAMP, primary_key=True, nullable=False, default=datetime.utcnow, index=True)
 
     case = relationship("Case", back_populates="live_status_snapshots")
 
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (fetched_at)"},
+    )
+
 
 class CourtSessionStatus(Base):
     """Per-user Kerala court session tracking."""
@@ -485,8 +497,10 @@ class Document(Base):
     ocr_status = Column(SQLEnum(OCRStatus), nullable=True, default=OCRStatus.not_required)
     ocr_job_id = Column(String(255), nullable=True)
     
-    # AI Classification Fields
-    extracted_text = Column(Text, nullable=True)
+    # AI Classification Fields (extracted_text is deferred and zstd-compressed)
+    extracted_text_zst = deferred(Column(LargeBinary, nullable=True), group=HEAVY)
+    _extracted_text_plain = deferred(Column("extracted_text", Text, nullable=True), group=HEAVY)
+    extracted_text = compressed_text("extracted_text_zst", "_extracted_text_plain")
     classification_confidence = Column(Float, nullable=True)
     ai_metadata = Column(JSONB, nullable=True)
 
@@ -1071,19 +1085,27 @@ class CauseListEnrichmentQueue(Base):
 class DailyCauseList(Base):
     """
     Precomputed daily cause-list result per advocate.
+    Range-partitioned by month on date, which is therefore part of the key.
     """
     __tablename__ = "daily_cause_lists"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     advocate_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, primary_key=True, nullable=False, index=True)
     total_listings = Column(Integer, nullable=False, default=0)
-    result_json = Column(JSONB, nullable=False, default=dict)
+    result_json_zst = deferred(Column(LargeBinary, nullable=True), group=HEAVY)
+    _result_json_plain = deferred(Column("result_json", JSONB, nullable=True), group=HEAVY)
+    result_json = compressed_json("result_json_zst", "_result_json_plain")
     parse_error = Column(Text, nullable=True)
+    # Pre-rendered HTML (cause_list_store), regenerated on every upsert
+    result_hash = Column(String(64), nullable=True)      # sha256 of result_json
+    render_version = Column(Integer, nullable=True)      # cause_list_renderer.RENDER_VERSION
+    rendered_html_zst = deferred(Column(LargeBinary, nullable=True))
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
 
     __table_args__ = (
         UniqueConstraint("advocate_id", "date", name="uq_daily_cause_lists_adv_date"),
+        {"postgresql_partition_by": "RANGE (date)"},
     )
 
 
@@ -1117,6 +1139,12 @@ class LegalInsightJob(Base):
     # For direct-upload jobs (no linked document): store the S3 location here.
     upload_s3_key = Column(String(500), nullable=True)
     upload_s3_bucket = Column(String(100), nullable=True)
+    # Completed map-reduce batches, so an interrupted job resumes without
+    # re-sending them: {"signature": str, "map": {"<batch_idx>": partial}}
+    checkpoint = Column(JSONB, nullable=True)
+    # Extraction settings the persisted chunks were produced with (see
+    # LegalInsightExtractor.extraction_key); with pdf_sha256 enables reuse.
+    extraction_key = Column(String(64), nullable=True)
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
     updated_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = Column(TIMESTAMP, nullable=True)
@@ -1127,6 +1155,8 @@ class LegalInsightJob(Base):
     __table_args__ = (
         Index("ix_legal_insight_jobs_user_doc", "user_id", "document_id"),
         Index("ix_legal_insight_jobs_sha_model_pv", "pdf_sha256", "model_id", "prompt_version"),
+        Index("ix_legal_insight_jobs_status_updated", "status", "updated_at"),
+        Index("ix_legal_insight_jobs_sha_extraction", "pdf_sha256", "extraction_key"),
     )
 
 
@@ -1165,7 +1195,9 @@ class LegalInsightResult(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_id = Column(UUID(as_uuid=True), ForeignKey("legal_insight_jobs.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
-    result_json = Column(JSONB, nullable=False)
+    result_json_zst = deferred(Column(LargeBinary, nullable=True), group=HEAVY)
+    _result_json_plain = deferred(Column("result_json", JSONB, nullable=True), group=HEAVY)
+    result_json = compressed_json("result_json_zst", "_result_json_plain")
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
 
     job = relationship("LegalInsightJob", back_populates="result")
@@ -1264,7 +1296,8 @@ class AdvocateCauseList(Base):
 
     Each row = one case listed for the advocate on a given date.
     Unique constraint on (lawyer_id, advocate_name, date, case_no) makes
-    upserts fully idempotent.
+    upserts fully idempotent.  Range-partitioned by month on date, which is
+    therefore part of the key.
     """
     __tablename__ = "advocate_cause_lists"
 
@@ -1272,7 +1305,7 @@ class AdvocateCauseList(Base):
     lawyer_id         = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     advocate_name     = Column(String(255), nullable=False)          # full name+enrollment string used in query
     advocate_code     = Column(String(20),  nullable=True)           # adv_cd used in query
-    date              = Column(Date, nullable=False, index=True)
+    date              = Column(Date, primary_key=True, nullable=False, index=True)
 
     # Cause-list entry fields
     item_no           = Column(Integer,      nullable=True)
@@ -1304,6 +1337,7 @@ class AdvocateCauseList(Base):
             "lawyer_id", "advocate_name", "date", "case_no",
             name="uq_advocate_cause_lists_lawyer_adv_date_case",
         ),
+        {"postgresql_partition_by": "RANGE (date)"},
     )
 
 
@@ -1845,7 +1879,9 @@ class WorkspaceDocument(Base):
     s3_key        = Column(String(1024), nullable=False)
     size_bytes    = Column(Integer, nullable=False)
     page_count    = Column(Integer, nullable=True)
-    extracted_text = Column(Text, nullable=True)
+    extracted_text_zst = deferred(Column(LargeBinary, nullable=True), group=HEAVY)
+    _extracted_text_plain = deferred(Column("extracted_text", Text, nullable=True), group=HEAVY)
+    extracted_text = compressed_text("extracted_text_zst", "_extracted_text_plain")
     summary       = Column(Text, nullable=True)
     token_estimate = Column(Integer, nullable=False, default=0)
     # "full_context" | "summarized"
@@ -1859,6 +1895,97 @@ class WorkspaceDocument(Base):
     )
 
 
+class WorkspaceChunk(Base):
+    """
+    One retrieval chunk of a workspace document for the local RAG index.
+    ``embedding`` holds an L2-normalised float32 vector (raw bytes) when
+    embeddings are enabled; BM25 statistics are rebuilt from ``text`` on load.
+    """
+    __tablename__ = "workspace_chunks"
+
+    id           = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workspace_id = Column(UUID(as_uuid=True),
+                          ForeignKey("workspaces.id", ondelete="CASCADE"),
+                          nullable=False, index=True)
+    document_id  = Column(UUID(as_uuid=True),
+                          ForeignKey("workspace_documents.id", ondelete="CASCADE"),
+                          nullable=False, index=True)
+    chunk_index  = Column(Integer, nullable=False)
+    text         = Column(Text, nullable=False)
+    embedding    = Column(LargeBinary, nullable=True)
+    created_at   = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("document_id", "chunk_index", name="uq_workspace_chunks_doc_idx"),
+        Index("ix_workspace_chunks_workspace_id", "workspace_id"),
+    )
+
+
+class TranslationMemoryEntry(Base):
+    """
+    One reusable translated segment (paragraph) for the legal translation
+    pipeline.  ``key_hash`` = sha256(direction, model, glossary version,
+    normalised protected+tokenized source); ``loose_hash`` drops case and
+    punctuation/whitespace differences for optional near-duplicate reuse.
+    """
+    __tablename__ = "translation_memory"
+
+    key_hash         = Column(String(64), primary_key=True)
+    loose_hash       = Column(String(64), nullable=False, index=True)
+    direction        = Column(String(10), nullable=False)
+    model_id         = Column(String(255), nullable=False)
+    glossary_version = Column(String(20), nullable=False)
+    source_text      = Column(Text, nullable=False)
+    translated_text  = Column(Text, nullable=False)
+    hit_count        = Column(Integer, nullable=False, default=0)
+    created_at       = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    last_used_at     = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+
+
+class JobQueueStatus(str, enum.Enum):
+    """Lifecycle of a durable background job (see app/services/job_queue.py)."""
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    dead = "dead"          # exhausted max_attempts
+
+
+class JobQueueEntry(Base):
+    """
+    One unit of background work, dequeued by the worker process
+    (``python -m jobs.worker``) with ``FOR UPDATE SKIP LOCKED``.
+
+    A running job whose ``locked_until`` (visibility timeout) passes without a
+    heartbeat is considered abandoned and becomes visible to other workers.
+    """
+    __tablename__ = "job_queue"
+
+    id           = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type     = Column(String(64), nullable=False)
+    payload      = Column(JSONB, nullable=False, default=dict)
+    priority     = Column(Integer, nullable=False, default=100)   # lower runs first
+    status       = Column(SQLEnum(JobQueueStatus, name="job_queue_status"), nullable=False,
+                          default=JobQueueStatus.queued)
+    attempts     = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after    = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    locked_by    = Column(String(100), nullable=True)
+    locked_until = Column(TIMESTAMP, nullable=True)
+    dedupe_key   = Column(String(200), nullable=True)
+    last_error   = Column(Text, nullable=True)
+    created_at   = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    updated_at   = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at  = Column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_queue_dequeue", "job_type", "status", "priority", "run_after"),
+        Index(
+            "uq_job_queue_dedupe_queued", "dedupe_key", unique=True,
+            postgresql_where=(status == JobQueueStatus.queued),
+        ),
+    )
+
+
 class WorkspaceDraft(Base):
     """A generated or manually edited draft document in a workspace."""
     __tablename__ = "workspace_drafts"
@@ -1880,3 +2007,81 @@ class WorkspaceDraft(Base):
     __table_args__ = (
         Index("ix_workspace_drafts_workspace_id", "workspace_id"),
     )
+
+
+class LlmUsageEvent(Base):
+    """
+    One Bedrock call as recorded by ``app.services.llm_usage_service.track``.
+    ``requested_model_id`` is set when the budget check downgraded the call;
+    ``status`` is ok / error / aborted (client went away) / rejected.
+    """
+    __tablename__ = "llm_usage_events"
+
+    id                 = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at         = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    day                = Column(Date, nullable=False)            # IST date
+    user_id            = Column(UUID(as_uuid=True), nullable=True)
+    feature            = Column(String(64), nullable=False)
+    model_id           = Column(String(255), nullable=False)
+    requested_model_id = Column(String(255), nullable=True)
+    status             = Column(String(16), nullable=False)
+    input_tokens       = Column(Integer, nullable=False, default=0)
+    output_tokens      = Column(Integer, nullable=False, default=0)
+    cache_read_tokens  = Column(Integer, nullable=False, default=0)
+    cache_write_tokens = Column(Integer, nullable=False, default=0)
+    latency_ms         = Column(Integer, nullable=False, default=0)
+    cost_usd           = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index("ix_llm_usage_events_created_at", "created_at"),
+        Index("ix_llm_usage_events_user_day", "user_id", "day"),
+    )
+
+
+class LlmUsageDaily(Base):
+    """
+    Per-day roll-up of ``llm_usage_events``, upserted on every call; budget
+    checks read this table.  System calls (no user) use the nil UUID.
+    """
+    __tablename__ = "llm_usage_daily"
+
+    day                = Column(Date, primary_key=True)
+    user_id            = Column(UUID(as_uuid=True), primary_key=True)
+    feature            = Column(String(64), primary_key=True)
+    model_id           = Column(String(255), primary_key=True)
+    calls              = Column(Integer, nullable=False, default=0)
+    errors             = Column(Integer, nullable=False, default=0)
+    rejected           = Column(Integer, nullable=False, default=0)
+    input_tokens       = Column(BigInteger, nullable=False, default=0)
+    output_tokens      = Column(BigInteger, nullable=False, default=0)
+    cache_read_tokens  = Column(BigInteger, nullable=False, default=0)
+    cache_write_tokens = Column(BigInteger, nullable=False, default=0)
+    latency_ms         = Column(BigInteger, nullable=False, default=0)
+    cost_usd           = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index("ix_llm_usage_daily_day_feature", "day", "feature"),
+    )
+
+
+class SchedulerJobState(Base):
+    """
+    One row per scheduled job (``app/core/scheduler.py``): the last slot run,
+    how it went, and who is running it right now.
+    """
+    __tablename__ = "scheduler_jobs"
+
+    name               = Column(String(100), primary_key=True)
+    scheduler_group    = Column(String(50), nullable=False)        # "api", "scraper"
+    last_scheduled_for = Column(TIMESTAMP, nullable=True)          # slot of the last run/skip (UTC)
+    last_started_at    = Column(TIMESTAMP, nullable=True)
+    last_finished_at   = Column(TIMESTAMP, nullable=True)
+    last_duration_ms   = Column(Integer, nullable=True)
+    last_status        = Column(String(16), nullable=True)         # ok / error / cancelled / abandoned
+    last_error         = Column(Text, nullable=True)
+    running_since      = Column(TIMESTAMP, nullable=True)
+    running_owner      = Column(String(255), nullable=True)        # host:pid
+    run_count          = Column(Integer, nullable=False, default=0)
+    error_count        = Column(Integer, nullable=False, default=0)
+    skipped_count      = Column(Integer, nullable=False, default=0)
+    updated_at         = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
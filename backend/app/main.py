@@ -7,17 +7,20 @@ import asyncio
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 
 from app.core.config import settings
+from app.core import metrics  # before any boto3 client exists (installs call hooks)
+from app.core.scheduler import Job, Scheduler
 from app.api.v1.api import api_router
 from app.api import cause_list as cause_list_route
 from app.core.logger import logger
 from app.db.database import SessionLocal
 from app.db.models import Case, CauseListIngestionRun, CauseListSource
-from app.services.cause_list_store import cause_list_store
 from app.services.daily_pdf_fetch_service import daily_pdf_fetch_service
+from app.services.llm_usage_service import BudgetExceeded
 from jobs.daily_cause_list_job import run_daily_cause_list_job
 
 # ── New ───────────────────────────────────────────────────────────────────────
@@ -78,6 +81,16 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(BudgetExceeded)
+async def budget_exceeded_handler(request: Request, exc: BudgetExceeded):
+    """Daily Bedrock token budget exhausted — retry after midnight IST."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "budget_scope": exc.scope},
+        headers={"Retry-After": str(int(_seconds_until_next_ist_run(0, 0)))},
+    )
+
+
 @app.get("/")
 def read_root():
     logger.info("Root endpoint accessed")
@@ -89,9 +102,30 @@ def health_check():
     return {"status": "healthy"}
 
 
-# ── Existing scheduled loops (unchanged) ─────────────────────────────────────
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Prometheus text exposition of the in-process metrics registry."""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    if settings.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return Response(status_code=401)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+async def _loop_sleep(loop: str, seconds: float) -> None:
+    """asyncio.sleep for background loops: the loop counts as idle while it waits."""
+    metrics.BACKGROUND_LOOP_BUSY.labels(loop).set(0)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        metrics.BACKGROUND_LOOP_BUSY.labels(loop).set(1)
+
+
+# ── Scheduled jobs ────────────────────────────────────────────────────────────
+# Run by the leader-elected scheduler (app/core/scheduler.py): exactly once
+# across all workers and hosts, with the last run recorded in scheduler_jobs.
 
-SCHEDULED_CAUSELIST_RUNS_IST = [(5, 0), (18, 45), (19, 15)]
+SCHEDULED_CAUSELIST_RUNS_IST = ((5, 0), (18, 45), (19, 15))
 
 
 def _seconds_until_next_ist_run(hour: int, minute: int) -> float:
@@ -103,312 +137,310 @@ def _seconds_until_next_ist_run(hour: int, minute: int) -> float:
     return max((target - now).total_seconds(), 1.0)
 
 
-def _next_scheduled_ist_run() -> tuple[float, datetime]:
-    ist = ZoneInfo("Asia/Kolkata")
-    now = datetime.now(ist)
-    candidates: list[datetime] = []
-    for hour, minute in SCHEDULED_CAUSELIST_RUNS_IST:
-        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if target <= now:
-            target = target + timedelta(days=1)
-        candidates.append(target)
-    next_target = min(candidates)
-    return max((next_target - now).total_seconds(), 1.0), next_target
-
-
-async def _scheduled_daily_pdf_fetch_loop() -> None:
-    if not settings.CAUSELIST_ENABLE_SCHEDULED_SYNC:
-        logger.info("Daily cause-list PDF fetch scheduler disabled")
-        return
-
-    while True:
+async def _daily_pdf_fetch_job() -> None:
+    def _fetch() -> set:
+        db = SessionLocal()
         try:
-            delay, target = _next_scheduled_ist_run()
-            logger.info("Next cause-list sync in %.0f seconds at %s", delay, target.isoformat())
-            await asyncio.sleep(delay)
-            db = SessionLocal()
-            try:
-                stats = daily_pdf_fetch_service.fetch_daily_pdfs_to_s3(db=db, max_tabs=3)
-                listing_dates: set = set()
-                for value in (stats.listing_dates or set()):
-                    try:
-                        listing_dates.add(datetime.strptime(value, "%Y-%m-%d").date())
-                    except Exception:
-                        continue
-
-                if not listing_dates:
-                    recent_runs = (
-                        db.query(CauseListIngestionRun)
-                        .filter(CauseListIngestionRun.source == CauseListSource.daily)
-                        .order_by(CauseListIngestionRun.fetched_at.desc())
-                        .limit(3)
-                        .all()
-                    )
-                    listing_dates = {run.listing_date for run in recent_runs if run.listing_date}
-
-                logger.info(
-                    "Scheduled cause-list PDF fetch completed: source=%s fetched=%s runs=%s dates=%s",
-                    stats.source, stats.fetched, stats.runs,
-                    sorted([d.isoformat() for d in listing_dates]),
-                )
-            finally:
-                db.close()
-
-            for listing_date in sorted(listing_dates):
-                try:
-                    summary = await run_daily_cause_list_job(listing_date)
-                    logger.info("Scheduled cause-list processing completed: %s", summary)
-                except Exception:
-                    logger.exception("Scheduled cause-list processing failed for date=%s", listing_date.isoformat())
-
-            if settings.CAUSELIST_RETENTION_ENABLED:
-                db = SessionLocal()
+            stats = daily_pdf_fetch_service.fetch_daily_pdfs_to_s3(db=db, max_tabs=3)
+            listing_dates: set = set()
+            for value in (stats.listing_dates or set()):
                 try:
-                    deleted = cause_list_store.purge_older_than(db, settings.CAUSELIST_RETENTION_DAYS)
-                    db.commit()
-                    if deleted > 0:
-                        logger.info(
-                            "Cause-list retention cleanup deleted %s rows older than %s days",
-                            deleted, settings.CAUSELIST_RETENTION_DAYS,
-                        )
+                    listing_dates.add(datetime.strptime(value, "%Y-%m-%d").date())
                 except Exception:
-                    db.rollback()
-                    logger.exception("Cause-list retention cleanup failed")
-                finally:
-                    db.close()
-        except Exception:
-            logger.exception("Scheduled daily cause-list PDF fetch failed")
-            await asyncio.sleep(60)
-
-
-async def _scheduled_recycle_bin_cleanup_loop() -> None:
-    if not settings.CASES_RECYCLE_BIN_PURGE_ENABLED:
-        logger.info("Recycle-bin cleanup scheduler disabled")
-        return
-
-    while True:
-        try:
-            delay = _seconds_until_next_ist_run(5, 30)
-            logger.info("Next recycle-bin cleanup in %.0f seconds", delay)
-            await asyncio.sleep(delay)
-
-            cutoff = datetime.utcnow() - timedelta(days=max(1, int(settings.CASES_RECYCLE_BIN_RETENTION_DAYS)))
-            db = SessionLocal()
-            try:
-                deleted = (
-                    db.query(Case)
-                    .filter(Case.is_visible == False, Case.updated_at < cutoff)
-                    .delete(synchronize_session=False)
+                    continue
+
+            if not listing_dates:
+                recent_runs = (
+                    db.query(CauseListIngestionRun)
+                    .filter(CauseListIngestionRun.source == CauseListSource.daily)
+                    .order_by(CauseListIngestionRun.fetched_at.desc())
+                    .limit(3)
+                    .all()
                 )
-                db.commit()
-                if deleted:
-                    logger.info(
-                        "Recycle-bin cleanup deleted %s cases older than %s days",
-                        deleted, settings.CASES_RECYCLE_BIN_RETENTION_DAYS,
-                    )
-            except Exception:
-                db.rollback()
-                logger.exception("Recycle-bin cleanup failed")
-            finally:
-                db.close()
-        except Exception:
-            logger.exception("Recycle-bin cleanup scheduler crashed")
-            await asyncio.sleep(60)
+                listing_dates = {run.listing_date for run in recent_runs if run.listing_date}
 
+            logger.info(
+                "Scheduled cause-list PDF fetch completed: source=%s fetched=%s runs=%s dates=%s",
+                stats.source, stats.fetched, stats.runs,
+                sorted([d.isoformat() for d in listing_dates]),
+            )
+            return listing_dates
+        finally:
+            db.close()
 
-# ── New background job loops (thin wrappers — logic lives in background_jobs.py)
-
-async def _sync_hearing_dates_loop() -> None:
-    """Calls sync_hearing_dates_to_calendar() every 60 min. Active hours guard is inside the job."""
-    if sync_hearing_dates_to_calendar is None:
-        logger.info("Hearing-date sync loop disabled")
-        return
-    while True:
-        try:
-            await asyncio.sleep(3600)
-            await sync_hearing_dates_to_calendar()
-        except Exception:
-            logger.exception("_sync_hearing_dates_loop crashed")
-            await asyncio.sleep(60)
-
+    listing_dates = await asyncio.to_thread(_fetch)
 
-async def _sync_google_calendar_loop() -> None:
-    """Calls sync_google_calendar_for_all_lawyers() every 30 min. Active hours guard is inside the job."""
-    if sync_google_calendar_for_all_lawyers is None:
-        logger.info("Google calendar sync loop disabled")
-        return
-    while True:
+    for listing_date in sorted(listing_dates):
         try:
-            await asyncio.sleep(1800)
-            await sync_google_calendar_for_all_lawyers()
+            summary = await run_daily_cause_list_job(listing_date)
+            logger.info("Scheduled cause-list processing completed: %s", summary)
         except Exception:
-            logger.exception("_sync_google_calendar_loop crashed")
-            await asyncio.sleep(60)
+            logger.exception("Scheduled cause-list processing failed for date=%s", listing_date.isoformat())
+
+
+def _recycle_bin_cleanup_job() -> None:
+    cutoff = datetime.utcnow() - timedelta(days=max(1, int(settings.CASES_RECYCLE_BIN_RETENTION_DAYS)))
+    db = SessionLocal()
+    try:
+        deleted = (
+            db.query(Case)
+            .filter(Case.is_visible == False, Case.updated_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if deleted:
+            logger.info(
+                "Recycle-bin cleanup deleted %s cases older than %s days",
+                deleted, settings.CASES_RECYCLE_BIN_RETENTION_DAYS,
+            )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
 
-async def _scheduled_advocate_causelist_loop() -> None:
+async def _advocate_causelist_job() -> None:
     """
-    Runs once daily at 7:15 PM IST.
-
     Fetches TOMORROW's cause list for every active user who has
     khc_advocate_name, khc_enrollment_number, and khc_advocate_code set.
     Upserts results into advocate_cause_lists so they are ready for the
     next morning when advocates check the dashboard.
     """
-    from datetime import timedelta
     from app.db.models import User
-    from app.services.advocate_causelist_service import fetch_and_store_advocate_causelist
-
-    while True:
-        try:
-            delay = _seconds_until_next_ist_run(19, 15)   # 7:15 PM IST
-            logger.info(
-                "Advocate cause-list scheduler: next run in %.0f s (19:15 IST)",
-                delay,
+    from app.services.advocate_causelist_service import AdvocateTarget, sync_advocate_causelists
+
+    ist       = ZoneInfo("Asia/Kolkata")
+    tomorrow  = (datetime.now(ist) + timedelta(days=1)).date()
+
+    db = SessionLocal()
+    try:
+        users = (
+            db.query(User)
+            .filter(
+                User.is_active           == True,
+                User.khc_advocate_name   != None,
+                User.khc_enrollment_number != None,
+                User.khc_advocate_code   != None,
             )
-            await asyncio.sleep(delay)
+            .all()
+        )
+
+        targets = [
+            AdvocateTarget(
+                lawyer_id=str(user.id),
+                advocate_name=user.khc_advocate_name,
+                enrollment_number=user.khc_enrollment_number or "",
+                advocate_code=user.khc_advocate_code or "",
+            )
+            for user in users
+        ]
+    finally:
+        db.close()
+
+    logger.info(
+        "Advocate cause-list: fetching for %d users, date=%s",
+        len(targets), tomorrow,
+    )
+    summary = await sync_advocate_causelists(targets, tomorrow)
+    logger.info("Advocate cause-list batch done: %s", summary)
 
-            ist       = ZoneInfo("Asia/Kolkata")
-            tomorrow  = (datetime.now(ist) + timedelta(days=1)).date()
 
-            db = SessionLocal()
-            try:
-                users = (
-                    db.query(User)
-                    .filter(
-                        User.is_active           == True,
-                        User.khc_advocate_name   != None,
-                        User.khc_enrollment_number != None,
-                        User.khc_advocate_code   != None,
-                    )
-                    .all()
-                )
+# Case-status sync is handled by the Lambda worker (live_status_sync).
+# The Lambda calls POST /api/v1/live-status-worker/run-due every 15 minutes,
+# which processes a rolling batch of pending cases oldest-first.
 
-                logger.info(
-                    "Advocate cause-list: fetching for %d users, date=%s",
-                    len(users), tomorrow,
-                )
+def _idempotency_cleanup_job() -> None:
+    """Delete expired idempotency_records rows."""
+    from app.services.idempotency_service import delete_expired_idempotency_records
 
-                ok = failed = 0
-                for user in users:
-                    try:
-                        await fetch_and_store_advocate_causelist(
-                            advocate_name=user.khc_advocate_name,
-                            target_date=tomorrow,
-                            lawyer_id=str(user.id),
-                            db=db,
-                            enrollment_number=user.khc_enrollment_number or "",
-                            advocate_code=user.khc_advocate_code or "",
-                        )
-                        ok += 1
-                    except Exception:
-                        failed += 1
-                        logger.exception(
-                            "Advocate cause-list fetch failed for user %s", user.id
-                        )
-
-                logger.info(
-                    "Advocate cause-list batch done: %d ok, %d failed, date=%s",
-                    ok, failed, tomorrow,
-                )
-            finally:
-                db.close()
+    db = SessionLocal()
+    try:
+        deleted = delete_expired_idempotency_records(db)
+        if deleted:
+            logger.info("idempotency_cleanup: deleted %d expired rows", deleted)
+    finally:
+        db.close()
 
-        except Exception:
-            logger.exception("_scheduled_advocate_causelist_loop crashed")
-            await asyncio.sleep(60)
 
+async def _legal_insight_resume_job() -> None:
+    """
+    Resume Legal Insight jobs whose worker died mid-pipeline (crash or
+    redeploy kills the BackgroundTask).  Claimed jobs restart from their
+    persisted chunks and checkpointed map batches.
+    """
+    from app.services.legal_insight_job_service import legal_insight_job_service
 
-# ── Startup / Shutdown ────────────────────────────────────────────────────────
-# Case-status sync is now handled by the Lambda worker (live_status_sync).
-# The Lambda calls POST /api/v1/live-status-worker/run-due every 15 minutes,
-# which processes a rolling batch of pending cases oldest-first.
+    def _resume(job_id: str) -> None:
+        db = SessionLocal()
+        try:
+            legal_insight_job_service.run_job(db, job_id)
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    try:
+        job_ids = legal_insight_job_service.claim_stale_jobs(db)
+    finally:
+        db.close()
+    if job_ids and settings.JOB_QUEUE_ENABLED:
+        from app.services import job_queue
+        for job_id in job_ids:
+            await asyncio.to_thread(
+                job_queue.submit, "legal_insight.run", {"job_id": job_id},
+                dedupe_key=f"legal_insight:{job_id}",
+            )
+    elif job_ids:
+        await asyncio.gather(*(asyncio.to_thread(_resume, j) for j in job_ids))
 
-async def _idempotency_cleanup_loop() -> None:
-    """Delete expired idempotency_records rows every hour."""
-    from app.services.idempotency_service import delete_expired_idempotency_records
+
+async def _health_monitor_loop() -> None:
+    """
+    Probe S3/Bedrock/database so /health/ready can answer from cache.
+    Runs in every worker (each serves its own /health/ready), not as a scheduled job.
+    """
+    from app.services.health_monitor import health_monitor
 
     while True:
         try:
-            await asyncio.sleep(3600)
-            db = SessionLocal()
-            try:
-                deleted = delete_expired_idempotency_records(db)
-                if deleted:
-                    logger.info("idempotency_cleanup: deleted %d expired rows", deleted)
-            finally:
-                db.close()
+            await asyncio.to_thread(health_monitor.run_once)
+            await _loop_sleep("health_monitor", settings.HEALTH_PROBE_INTERVAL_SEC)
         except asyncio.CancelledError:
             break
         except Exception:
-            logger.exception("_idempotency_cleanup_loop crashed")
-            await asyncio.sleep(60)
+            logger.exception("_health_monitor_loop crashed")
+            await _loop_sleep("health_monitor", 60)
+
+
+async def _llm_usage_cleanup_job() -> None:
+    """Purge per-call llm_usage_events past LLM_USAGE_RETENTION_DAYS."""
+    from app.services.llm_usage_service import purge_old_events
+
+    db = SessionLocal()
+    try:
+        deleted = await asyncio.to_thread(purge_old_events, db, settings.LLM_USAGE_RETENTION_DAYS)
+        if deleted:
+            logger.info("llm_usage_cleanup: deleted %d rows", deleted)
+    finally:
+        db.close()
 
 
-async def _doc_comparison_cleanup_loop() -> None:
-    """Delete expired doc_comparisons rows every hour."""
+async def _partition_maintenance_job() -> None:
+    """
+    Keep monthly partitions of the cause-list tables ahead of the writes and
+    drop the expired ones, at the quiet hour away from the 18:45/19:15 IST
+    cause-list runs.
+    """
+    from app.services.partition_maintenance import drop_expired_partitions, ensure_partitions
+
+    db = SessionLocal()
+    try:
+        created = await asyncio.to_thread(ensure_partitions, db)
+        dropped = await asyncio.to_thread(drop_expired_partitions, db)
+    finally:
+        db.close()
+    if created or dropped:
+        logger.info("partition_maintenance: created=%s dropped=%s", created, dropped)
+
+
+def _doc_comparison_cleanup_job() -> None:
+    """Delete expired doc_comparisons rows."""
     from app.services.document_comparison_service import delete_expired_comparisons
-    from app.db.database import SessionLocal
 
-    while True:
-        try:
-            await asyncio.sleep(3600)  # wait 1 hour between sweeps
-            db = SessionLocal()
-            try:
-                deleted = delete_expired_comparisons(db)
-                if deleted:
-                    logger.info("doc_comparison_cleanup: deleted %d expired rows", deleted)
-            finally:
-                db.close()
-        except asyncio.CancelledError:
-            break
-        except Exception:
-            logger.exception("_doc_comparison_cleanup_loop crashed")
-            await asyncio.sleep(60)
+    db = SessionLocal()
+    try:
+        deleted = delete_expired_comparisons(db)
+        if deleted:
+            logger.info("doc_comparison_cleanup: deleted %d expired rows", deleted)
+    finally:
+        db.close()
 
 
-async def _roster_sync_loop() -> None:
+async def _roster_sync_job() -> None:
     """
-    Check once daily at midnight IST whether a new roster has been posted.
+    Check whether a new roster has been posted.
     sync_latest_roster() compares the SHA-256 checksum of the downloaded PDF
     against the stored one, so no extra work is done when the roster hasn't changed.
     HTML is generated (or backfilled) as part of the same sync call.
     """
     from app.services.roster_service import RosterService
 
-    while True:
-        try:
-            delay = _seconds_until_next_ist_run(0, 0)
-            logger.info("Roster sync: next check in %.0f s (midnight IST)", delay)
-            await asyncio.sleep(delay)
-            result = RosterService().sync_latest_roster()
-            logger.info(
-                "Roster sync done: checksum=%s lastCheckedAt=%s",
-                result.get("checksum", "?"),
-                result.get("lastCheckedAt", "?"),
-            )
-        except Exception:
-            logger.exception("_roster_sync_loop crashed")
-            await asyncio.sleep(60)
+    result = await asyncio.to_thread(RosterService().sync_latest_roster)
+    logger.info(
+        "Roster sync done: checksum=%s lastCheckedAt=%s",
+        result.get("checksum", "?"),
+        result.get("lastCheckedAt", "?"),
+    )
+
+
+scheduler = Scheduler("api")
+
+
+def _register_scheduled_jobs() -> None:
+    if settings.CAUSELIST_ENABLE_SCHEDULED_SYNC:
+        scheduler.add(Job("daily_pdf_fetch", _daily_pdf_fetch_job, at_ist=SCHEDULED_CAUSELIST_RUNS_IST))
+    else:
+        logger.info("Daily cause-list PDF fetch scheduler disabled")
+    if settings.CASES_RECYCLE_BIN_PURGE_ENABLED:
+        scheduler.add(Job("recycle_bin_cleanup", _recycle_bin_cleanup_job, at_ist=((5, 30),)))
+    else:
+        logger.info("Recycle-bin cleanup scheduler disabled")
+    # Calendar jobs — active-hours guard is inside each job
+    if sync_hearing_dates_to_calendar is not None:
+        scheduler.add(Job("hearing_sync", sync_hearing_dates_to_calendar, interval_sec=3600))
+    if sync_google_calendar_for_all_lawyers is not None:
+        scheduler.add(Job("google_calendar_sync", sync_google_calendar_for_all_lawyers, interval_sec=1800))
+    # Advocate cause list — 7:15 PM IST daily, fetches tomorrow for all users
+    scheduler.add(Job("advocate_causelist", _advocate_causelist_job, at_ist=((19, 15),)))
+    scheduler.add(Job("idempotency_cleanup", _idempotency_cleanup_job, interval_sec=3600))
+    scheduler.add(Job("doc_comparison_cleanup", _doc_comparison_cleanup_job, interval_sec=3600))
+    # Roster — midnight IST; syncs only when the PDF has changed
+    scheduler.add(Job("roster_sync", _roster_sync_job, at_ist=((0, 0),)))
+    # Legal Insight — resume jobs interrupted by a crash or redeploy
+    scheduler.add(Job(
+        "legal_insight_resume", _legal_insight_resume_job,
+        interval_sec=settings.LEGAL_INSIGHT_RESUME_INTERVAL_SEC,
+    ))
+    # Bedrock usage — purge per-call rows past retention (daily roll-ups are kept)
+    scheduler.add(Job("llm_usage_cleanup", _llm_usage_cleanup_job, interval_sec=6 * 3600))
+    # Cause-list tables — create monthly partitions ahead, drop expired ones
+    scheduler.add(Job(
+        "partition_maintenance", _partition_maintenance_job,
+        at_ist=((settings.PARTITION_MAINTENANCE_HOUR_IST, settings.PARTITION_MAINTENANCE_MINUTE_IST),),
+    ))
+
+
+# app.state attributes of the startup tasks: cancelled on shutdown,
+# exported as background_task_up on /metrics
+_BACKGROUND_TASKS = (
+    "scheduler_task",
+    "health_monitor_task",
+)
+
+
+def _collect_background_tasks() -> None:
+    for task_name in _BACKGROUND_TASKS:
+        task = getattr(app.state, task_name, None)
+        metrics.BACKGROUND_TASK_UP.labels(task_name).set(int(task is not None and not task.done()))
+
+
+metrics.REGISTRY.add_collector(_collect_background_tasks)
 
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Lawmate API started")
-    # Existing tasks
-    app.state.daily_pdf_fetch_task      = asyncio.create_task(_scheduled_daily_pdf_fetch_loop())
-    app.state.recycle_bin_cleanup_task  = asyncio.create_task(_scheduled_recycle_bin_cleanup_loop())
-    # Calendar tasks
-    app.state.hearing_sync_task         = asyncio.create_task(_sync_hearing_dates_loop())
-    app.state.google_calendar_sync_task = asyncio.create_task(_sync_google_calendar_loop())
-    # Advocate cause list — 7:15 PM IST daily, fetches tomorrow for all users
-    app.state.advocate_causelist_task   = asyncio.create_task(_scheduled_advocate_causelist_loop())
-    # Idempotency records — purge expired rows every hour
-    app.state.idempotency_cleanup_task    = asyncio.create_task(_idempotency_cleanup_loop())
-    # Doc comparison — purge expired rows every hour
-    app.state.doc_comparison_cleanup_task = asyncio.create_task(_doc_comparison_cleanup_loop())
-    # Roster — check once daily at midnight IST; syncs only when the PDF has changed
-    app.state.roster_sync_task            = asyncio.create_task(_roster_sync_loop())
+    # Periodic jobs — only the elected leader (one process across workers and hosts) runs them
+    if settings.SCHEDULER_ENABLED:
+        _register_scheduled_jobs()
+        app.state.scheduler_task = asyncio.create_task(scheduler.run())
+    else:
+        logger.info("Scheduler disabled")
+    # Health — probe dependencies in the background; /health/ready reads the cache
+    app.state.health_monitor_task = asyncio.create_task(_health_monitor_loop())
+    # Audit trail — batch writer thread; replays events spilled by a previous run
+    from app.services.audit_service import audit_service
+    audit_service.start()
     # Note: case-status sync is handled by the live_status_sync Lambda worker,
     #       not by an in-process loop. See /api/v1/live-status-worker/run-due.
 
@@ -416,16 +448,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Lawmate API shutdown")
-    for task_name in [
-        "daily_pdf_fetch_task",
-        "recycle_bin_cleanup_task",
-        "hearing_sync_task",
-        "google_calendar_sync_task",
-        "advocate_causelist_task",
-        "idempotency_cleanup_task",
-        "doc_comparison_cleanup_task",
-        "roster_sync_task",
-    ]:
+    for task_name in _BACKGROUND_TASKS:
         task = getattr(app.state, task_name, None)
         if task:
             task.cancel()
@@ -433,4 +456,10 @@ async def shutdown_event():
                 await task
             except asyncio.CancelledError:
                 pass
+    # Start a judgments KB sync still waiting out its in-process debounce
+    from app.services.judgement_ingestion_service import flush_kb_sync
+    await flush_kb_sync()
+    # Flush queued audit events to DynamoDB (spilled to disk if it cannot)
+    from app.services.audit_service import audit_service
+    await asyncio.to_thread(audit_service.close)
 
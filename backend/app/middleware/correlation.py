@@ -7,44 +7,125 @@ service, or retry produced it.
 
 Also echoes X-Tab-ID back in the response if the client sent one, enabling
 per-tab log tracing.
+
+Written as plain ASGI rather than ``BaseHTTPMiddleware``: messages are
+passed straight through to the server, so SSE and other streamed bodies
+are never buffered or re-wrapped, and no extra task is spawned per request.
+One access-log line is written when the response finishes (or the client
+goes away).  Paths in ``ACCESS_LOG_SAMPLED_PATHS`` are logged at
+``ACCESS_LOG_SAMPLE_RATE`` unless they fail or are slow to start
+responding: the slow rule uses time to first byte, so a long-lived SSE
+stream is not "slow" just for staying open.  Every request
+is also recorded in the ``http_request_duration_seconds`` histogram,
+labelled by route template rather than raw path.
 """
 from __future__ import annotations
 
-import uuid
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+import random
+import re
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.logger import correlation_id_var, tab_id_var
 
 logger = logging.getLogger(__name__)
 
+# Client-supplied IDs end up in every log line — keep them short and inert
+_ID_RE = re.compile(r"[A-Za-z0-9._:\-]{1,128}")
 
-class CorrelationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Accept from client or generate fresh
-        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
-        tab_id = request.headers.get("X-Tab-ID", "")
-
-        # Make available to endpoint handlers via request.state
-        request.state.correlation_id = correlation_id
-        request.state.tab_id = tab_id
-
-        # Structured log on every request
-        logger.info(
-            "request",
-            extra={
-                "correlation_id": correlation_id,
-                "tab_id": tab_id or None,
-                "method": request.method,
-                "path": request.url.path,
-            },
+
+def _header(scope: Scope, name: bytes) -> str:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+class CorrelationMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.sampled_prefixes = tuple(
+            p.strip() for p in settings.ACCESS_LOG_SAMPLED_PATHS.split(",") if p.strip()
         )
 
-        response = await call_next(request)
+    def _should_log(self, path: str, status: int, ttfb_ms: float) -> bool:
+        if status >= 400 or ttfb_ms >= settings.ACCESS_LOG_SLOW_MS:
+            return True
+        if path.startswith(self.sampled_prefixes):
+            return random.random() < settings.ACCESS_LOG_SAMPLE_RATE
+        return True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Accept from client or generate fresh
+        correlation_id = _header(scope, b"x-correlation-id")
+        if not _ID_RE.fullmatch(correlation_id):
+            correlation_id = str(uuid.uuid4())
+        tab_id = _header(scope, b"x-tab-id")
+        if tab_id and not _ID_RE.fullmatch(tab_id):
+            tab_id = ""
+
+        # Make available to endpoint handlers via request.state …
+        state = scope.setdefault("state", {})
+        state["correlation_id"] = correlation_id
+        state["tab_id"] = tab_id
+        # … and to every log record emitted while handling it
+        cid_token = correlation_id_var.set(correlation_id)
+        tab_token = tab_id_var.set(tab_id)
 
         # Echo IDs in response headers for client-side log correlation
-        response.headers["X-Correlation-ID"] = correlation_id
+        extra_headers = [(b"x-correlation-id", correlation_id.encode("latin-1"))]
         if tab_id:
-            response.headers["X-Tab-ID"] = tab_id
+            extra_headers.append((b"x-tab-id", tab_id.encode("latin-1")))
+
+        start = time.perf_counter()
+        first_byte: float | None = None
+        status = 500
+        sent_bytes = 0
+        completed = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, sent_bytes, completed, first_byte
+            if message["type"] == "http.response.start":
+                first_byte = time.perf_counter()
+                status = message["status"]
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            elif message["type"] == "http.response.body":
+                sent_bytes += len(message.get("body", b""))
+                completed = not message.get("more_body", False)
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end = time.perf_counter()
+            duration_ms = (end - start) * 1000
+            ttfb_ms = ((first_byte or end) - start) * 1000
+            path = scope.get("path", "")
+            metrics.HTTP_REQUEST_DURATION.labels(
+                scope.get("method", ""), metrics.route_label(scope) or "<unmatched>", status,
+            ).observe(duration_ms / 1000)
+            if self._should_log(path, status, ttfb_ms):
+                logger.info(
+                    "%s %s %d %.1fms",
+                    scope.get("method", ""), path, status, duration_ms,
+                    extra={
+                        "method": scope.get("method", ""),
+                        "path": path,
+                        "status": status,
+                        "duration_ms": round(duration_ms, 1),
+                        "ttfb_ms": round(ttfb_ms, 1),
+                        "bytes": sent_bytes,
+                        "completed": completed,
+                    },
+                )
+            correlation_id_var.reset(cid_token)
+            tab_id_var.reset(tab_token)
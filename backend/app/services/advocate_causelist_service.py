@@ -14,7 +14,9 @@ Payload (form-encoded):
   adv_cd         — numeric advocate code from hckinfo
 
 Freshness strategy:
-  - Scheduler calls this at 7:15 PM IST for ALL users, using tomorrow's date.
+  - Scheduler calls sync_advocate_causelists at 7:15 PM IST for ALL users,
+    using tomorrow's date: a few advocates at a time over warm portal
+    sessions, rate-limited, retried with jitter, written in batches.
   - Manual refresh available via API.
   - Past dates served from DB cache by the tool.
 
@@ -24,11 +26,16 @@ DB: upserts into advocate_cause_lists with unique constraint
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
+import random
 import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 from urllib.parse import quote
 from uuid import UUID
 
@@ -37,6 +44,8 @@ from bs4 import BeautifulSoup
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.metrics import track_dependency
 from app.db.models import AdvocateCauseList, AdvocateCauseListFetchStatus
 
 logger = logging.getLogger(__name__)
@@ -247,6 +256,29 @@ def _parse_adv_cd_from_html(
     return None
 
 
+@dataclass(frozen=True)
+class AdvocateTarget:
+    """One advocate to fetch: the user's KHC profile fields."""
+    lawyer_id:         str
+    advocate_name:     str
+    enrollment_number: str = ""
+    advocate_code:     str = ""
+
+    @property
+    def enc_name(self) -> str:
+        if self.enrollment_number:
+            return build_advocate_name_param(self.advocate_name, self.enrollment_number)
+        # Fall back: base64 of the plain name if no enrollment stored
+        return base64.b64encode(self.advocate_name.upper().encode()).decode()
+
+    @property
+    def db_advocate_name(self) -> str:
+        """Full identifier string stored in DB rows for cache lookups."""
+        if self.enrollment_number:
+            return f"{self.advocate_name.strip().upper()}({self.enrollment_number.strip()})"
+        return self.advocate_name.strip().upper()
+
+
 async def fetch_and_store_advocate_causelist(
     advocate_name:     str,
     target_date:       date,
@@ -272,85 +304,269 @@ async def fetch_and_store_advocate_causelist(
     Raises:
         Exception on HTTP/parse failure — caller should catch and log
     """
-    # Build the encoded advocate_name parameter
-    if enrollment_number:
-        enc_name = build_advocate_name_param(advocate_name, enrollment_number)
-    else:
-        # Fall back: base64 of the plain name if no enrollment stored
-        enc_name = base64.b64encode(advocate_name.upper().encode()).decode()
-
-    # Full identifier string stored in DB rows for cache lookups
-    db_advocate_name = (
-        f"{advocate_name.strip().upper()}({enrollment_number.strip()})"
-        if enrollment_number
-        else advocate_name.strip().upper()
-    )
+    target = AdvocateTarget(lawyer_id, advocate_name, enrollment_number, advocate_code)
 
     logger.info(
         "Fetching advocate cause list: %s  date=%s  adv_cd=%s",
-        db_advocate_name, target_date, advocate_code,
+        target.db_advocate_name, target_date, advocate_code,
     )
 
-    rows = await _fetch(enc_name, target_date, advocate_code)
+    async with PortalSessionPool(size=1) as pool:
+        rows = await _fetch(pool, target, target_date)
 
     if not rows:
-        logger.info("No listings found for %s on %s", db_advocate_name, target_date)
+        logger.info("No listings found for %s on %s", target.db_advocate_name, target_date)
         return []
 
-    upserted = _upsert_rows(
-        db=db,
-        rows=rows,
-        lawyer_id=lawyer_id,
-        db_advocate_name=db_advocate_name,
-        advocate_code=advocate_code,
-        target_date=target_date,
-    )
+    _write_batch(db, [(target, rows)], target_date)
+    db.commit()
 
+    upserted = (
+        db.query(AdvocateCauseList)
+        .filter(
+            AdvocateCauseList.lawyer_id     == UUID(lawyer_id),
+            AdvocateCauseList.advocate_name == target.db_advocate_name,
+            AdvocateCauseList.date          == target_date,
+        )
+        .order_by(AdvocateCauseList.item_no)
+        .all()
+    )
     logger.info(
         "Upserted %d cause list rows for %s on %s",
-        len(upserted), db_advocate_name, target_date,
+        len(upserted), target.db_advocate_name, target_date,
     )
     return upserted
 
 
+async def sync_advocate_causelists(targets: list[AdvocateTarget], target_date: date) -> dict:
+    """
+    Fetch *target_date*'s cause list for every target and store it.
+
+    Up to ADVOCATE_CAUSELIST_CONCURRENCY advocates are fetched at once over
+    a pool of warm portal sessions, all sharing the process-wide politeness
+    limit.  Results are written ADVOCATE_CAUSELIST_WRITE_BATCH advocates per
+    transaction as they arrive.  One advocate failing (after retries) never
+    touches that advocate's stored rows or holds up the others.
+    """
+    from app.db.database import SessionLocal
+
+    summary = {"advocates": len(targets), "ok": 0, "empty": 0, "failed": 0, "rows": 0}
+    if not targets:
+        return summary
+
+    batch_size = max(1, int(settings.ADVOCATE_CAUSELIST_WRITE_BATCH))
+    pending: list[tuple[AdvocateTarget, list[dict]]] = []
+    db = SessionLocal()
+
+    def flush() -> None:
+        if not pending:
+            return
+        try:
+            _write_batch(db, pending, target_date)
+            db.commit()
+            summary["ok"] += len(pending)
+            summary["rows"] += sum(len(rows) for _, rows in pending)
+        except Exception:
+            db.rollback()
+            summary["failed"] += len(pending)
+            logger.exception(
+                "Advocate cause-list write failed for %d advocates on %s", len(pending), target_date,
+            )
+        pending.clear()
+
+    async def flush_off_loop() -> None:
+        # DB writes block: run them on a thread.  If we are cancelled, the
+        # write still finishes before the session is closed under it.
+        write = asyncio.ensure_future(asyncio.to_thread(flush))
+        try:
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            await write
+            raise
+
+    async def fetch_one(target: AdvocateTarget) -> tuple[AdvocateTarget, Optional[list[dict]]]:
+        try:
+            return target, await _fetch(pool, target, target_date)
+        except Exception as exc:
+            logger.warning(
+                "Advocate cause-list fetch failed for user %s (%s): %s",
+                target.lawyer_id, target.db_advocate_name, exc,
+            )
+            return target, None
+
+    try:
+        async with PortalSessionPool(size=settings.ADVOCATE_CAUSELIST_CONCURRENCY) as pool:
+            tasks = [asyncio.ensure_future(fetch_one(t)) for t in targets]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    target, rows = await next_done
+                    if rows is None:
+                        summary["failed"] += 1
+                    elif not rows:
+                        summary["empty"] += 1
+                    else:
+                        pending.append((target, rows))
+                        if len(pending) >= batch_size:
+                            await flush_off_loop()
+            finally:
+                # Cancelled or failed part-way: stop the remaining fetches
+                # before their sessions are closed under them
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        await flush_off_loop()
+    finally:
+        db.close()
+
+    logger.info("Advocate cause-list sync for %s: %s", target_date, summary)
+    return summary
+
+
 # ============================================================================
 # HTTP fetch
 # ============================================================================
 
-async def _fetch(enc_name: str, target_date: date, adv_cd: str) -> list[dict]:
+# 400 is what the portal returns once a ci_session has gone stale
+_RETRY_STATUSES = {400, 403, 408, 429, 500, 502, 503, 504}
+
+
+class _RateLimiter:
+    """Spaces requests at least 1/rate seconds apart across every caller."""
+
+    def __init__(self, per_sec: float) -> None:
+        self._interval = 1.0 / per_sec if per_sec > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        # Reserve the next slot before sleeping (no await in between, so no lock)
+        now = time.monotonic()
+        delay = self._next - now
+        self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Process-wide, so concurrent syncs and manual refreshes share one budget
+_rate_limiter = _RateLimiter(settings.ADVOCATE_CAUSELIST_RATE_PER_SEC)
+
+
+@dataclass(eq=False)
+class _PortalSession:
+    client: httpx.AsyncClient
+    uses:   int = 0
+
+
+class PortalSessionPool:
+    """
+    Up to *size* httpx clients that already hold a ci_session cookie.
+
+    The portal only needs the search-page GET once per session, so a warm
+    client is reused for many advocates' POSTs.  A session is re-warmed
+    after ADVOCATE_CAUSELIST_SESSION_MAX_USES posts, and discarded whenever
+    a request through it fails.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._idle: asyncio.Queue[Optional[_PortalSession]] = asyncio.Queue()
+        for _ in range(max(1, int(size))):
+            self._idle.put_nowait(None)   # opened on first use
+        self._open: set[_PortalSession] = set()
+
+    async def __aenter__(self) -> "PortalSessionPool":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def _connect(self) -> _PortalSession:
+        client = httpx.AsyncClient(headers=HEADERS, timeout=TIMEOUT, follow_redirects=True)
+        session = _PortalSession(client)
+        self._open.add(session)
+        try:
+            await _rate_limiter.wait()
+            with track_dependency("hckinfo", "advocate_causelist_session"):
+                # Sets ci_session in client.cookies; without it the POST returns 400
+                await client.get(SEARCH_PAGE)
+        except BaseException:
+            await self._discard(session)
+            raise
+        return session
+
+    async def _discard(self, session: _PortalSession) -> None:
+        self._open.discard(session)
+        await session.client.aclose()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[_PortalSession]:
+        session = await self._idle.get()
+        try:
+            if session is not None and session.uses >= settings.ADVOCATE_CAUSELIST_SESSION_MAX_USES:
+                await self._discard(session)
+                session = None
+            if session is None:
+                session = await self._connect()
+            yield session
+        except BaseException:
+            if session is not None:
+                await self._discard(session)
+                session = None
+            raise
+        finally:
+            self._idle.put_nowait(session)
+
+    async def aclose(self) -> None:
+        for session in list(self._open):
+            await self._discard(session)
+
+
+async def _fetch(pool: PortalSessionPool, target: AdvocateTarget, target_date: date) -> list[dict]:
     """
     POSTs to the Casebyadv1 endpoint and parses the HTML table response.
 
     The portal (CodeIgniter) requires a ci_session cookie established by a
     prior GET to the search page before it will accept the POST — same pattern
-    as the case-number lookup.  Without the GET first, it returns 400.
+    as the case-number lookup.  *pool* hands out clients that already have
+    one.  Transport errors and retryable statuses are retried with full
+    jitter on a fresh session.
     """
     form_data = {
-        "advocate_name": enc_name,
+        "advocate_name": target.enc_name,
         "from_date":     target_date.strftime("%Y-%m-%d"),
-        "adv_cd":        adv_cd,
+        "adv_cd":        target.advocate_code,
     }
+    attempts = max(1, int(settings.ADVOCATE_CAUSELIST_MAX_ATTEMPTS))
 
-    async with httpx.AsyncClient(
-        headers=HEADERS,
-        timeout=TIMEOUT,
-        follow_redirects=True,
-    ) as client:
-        # Step 1: GET search page — sets ci_session in client.cookies
-        await client.get(SEARCH_PAGE)
-        # Step 2: POST with session cookie carried automatically
-        resp = await client.post(
-            API_URL,
-            data=form_data,
-            headers={
-                **HEADERS,
-                "X-Requested-With": "XMLHttpRequest",
-                "Referer": SEARCH_PAGE,
-            },
-        )
-        resp.raise_for_status()
-
-    return _parse_table(resp.text, target_date)
+    for attempt in range(1, attempts + 1):
+        try:
+            async with pool.session() as session:
+                await _rate_limiter.wait()
+                with track_dependency("hckinfo", "advocate_causelist"):
+                    resp = await session.client.post(
+                        API_URL,
+                        data=form_data,
+                        headers={
+                            **HEADERS,
+                            "X-Requested-With": "XMLHttpRequest",
+                            "Referer": SEARCH_PAGE,
+                        },
+                    )
+                    session.uses += 1
+                    resp.raise_for_status()
+            return _parse_table(resp.text, target_date)
+        except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+            if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code not in _RETRY_STATUSES:
+                raise
+            if attempt == attempts:
+                raise
+            delay = random.uniform(0, settings.ADVOCATE_CAUSELIST_RETRY_BASE_SEC * 2 ** (attempt - 1))
+            logger.info(
+                "hckinfo cause-list attempt %d/%d for %s failed (%s); retrying in %.1fs",
+                attempt, attempts, target.db_advocate_name, exc, delay,
+            )
+            await asyncio.sleep(delay)
+    return []
 
 
 # ============================================================================
@@ -480,17 +696,16 @@ def _parse_table(html: str, target_date: date) -> list[dict]:
 # DB upsert
 # ============================================================================
 
-def _upsert_rows(
-    db:               Session,
-    rows:             list[dict],
-    lawyer_id:        str,
-    db_advocate_name: str,
-    advocate_code:    str,
-    target_date:      date,
-) -> list[AdvocateCauseList]:
+def _write_batch(
+    db:          Session,
+    batch:       list[tuple[AdvocateTarget, list[dict]]],
+    target_date: date,
+) -> None:
     """
-    Replace-style write: delete all existing rows for (lawyer_id, date),
-    then insert the freshly-parsed rows.
+    Replace-style write of several advocates' rows: one DELETE of every
+    existing row for those (lawyer_id, date) pairs, then one multi-row
+    INSERT … ON CONFLICT.  The caller commits, so the whole batch lands or
+    rolls back together and the previous data survives a failure.
 
     Why not a plain upsert?  The unique constraint is on
     (lawyer_id, advocate_name, date, case_no).  Old data from the pre-fix
@@ -501,79 +716,70 @@ def _upsert_rows(
     Why not filter on advocate_name in the DELETE?  The advocate_name stored
     in old rows may differ from the current db_advocate_name format (e.g. old
     rows may lack the "(ENROLLMENT)" suffix).  Filtering on it would miss
-    those stale rows and still leave duplicates.
+    those stale rows and still leave duplicates.  Since lawyer_id is per-user
+    and date is specific, this is still safe.
 
-    Deleting first solves this cleanly.  The DELETE and all INSERTs live in a
-    single transaction, so a mid-way failure rolls everything back and the
-    previous data is preserved.
+    The ON CONFLICT only fires if a manual refresh for the same advocate
+    commits in between.
     """
     now = datetime.utcnow()
 
-    # Purge stale rows for this (lawyer, date) before writing fresh data.
-    # NOTE: we deliberately do NOT filter on advocate_name here.  Old rows may
-    # have been stored with a different advocate_name format (e.g. without the
-    # enrollment suffix) compared to what db_advocate_name is now.  Filtering
-    # on advocate_name would miss those rows and leave duplicate stale data.
-    # Since lawyer_id is per-user and date is specific, this is still safe.
     db.query(AdvocateCauseList).filter(
-        AdvocateCauseList.lawyer_id == UUID(lawyer_id),
+        AdvocateCauseList.lawyer_id.in_([UUID(t.lawyer_id) for t, _ in batch]),
         AdvocateCauseList.date      == target_date,
     ).delete(synchronize_session=False)
-    db.flush()
-
-    for row in rows:
-        stmt = pg_insert(AdvocateCauseList).values(
-            lawyer_id=UUID(lawyer_id),
-            advocate_name=db_advocate_name,
-            advocate_code=advocate_code or None,
-            date=row["date"],
-            item_no=row["item_no"],
-            item_no_range=row.get("item_no_range"),
-            court_hall=row["court_hall"],
-            court_hall_number=row["court_hall_number"],
-            bench=row["bench"],
-            list_type=row["list_type"],
-            judge_name=row["judge_name"],
-            case_no=row["case_no"],
-            petitioner=row["petitioner"],
-            respondent=row["respondent"],
-            fetch_status=AdvocateCauseListFetchStatus.fetched,
-            fetch_error=None,
-            source_url=API_URL,
-            fetched_at=now,
-        ).on_conflict_do_update(
-            constraint="uq_advocate_cause_lists_lawyer_adv_date_case",
-            set_={
-                "item_no":           pg_insert(AdvocateCauseList).excluded.item_no,
-                "court_hall":        pg_insert(AdvocateCauseList).excluded.court_hall,
-                "item_no_range":     pg_insert(AdvocateCauseList).excluded.item_no_range,
-                "court_hall_number": pg_insert(AdvocateCauseList).excluded.court_hall_number,
-                "bench":             pg_insert(AdvocateCauseList).excluded.bench,
-                "list_type":         pg_insert(AdvocateCauseList).excluded.list_type,
-                "judge_name":        pg_insert(AdvocateCauseList).excluded.judge_name,
-                "petitioner":        pg_insert(AdvocateCauseList).excluded.petitioner,
-                "respondent":        pg_insert(AdvocateCauseList).excluded.respondent,
-                "fetch_status":      pg_insert(AdvocateCauseList).excluded.fetch_status,
-                "fetch_error":       None,
-                "source_url":        pg_insert(AdvocateCauseList).excluded.source_url,
-                "fetched_at":        pg_insert(AdvocateCauseList).excluded.fetched_at,
-                "updated_at":        now,
-            },
-        )
-        db.execute(stmt)
-
-    db.commit()
 
-    return (
-        db.query(AdvocateCauseList)
-        .filter(
-            AdvocateCauseList.lawyer_id     == UUID(lawyer_id),
-            AdvocateCauseList.advocate_name == db_advocate_name,
-            AdvocateCauseList.date          == target_date,
-        )
-        .order_by(AdvocateCauseList.item_no)
-        .all()
+    # A multi-row upsert may not hit the same key twice: last row wins
+    values: dict[tuple, dict] = {}
+    for target, rows in batch:
+        for row in rows:
+            key = (target.lawyer_id, target.db_advocate_name, row["date"], row["case_no"])
+            if row["case_no"] is None:
+                key += (len(values),)   # NULL case_no never conflicts
+            values[key] = dict(
+                lawyer_id=UUID(target.lawyer_id),
+                advocate_name=target.db_advocate_name,
+                advocate_code=target.advocate_code or None,
+                date=row["date"],
+                item_no=row["item_no"],
+                item_no_range=row.get("item_no_range"),
+                court_hall=row["court_hall"],
+                court_hall_number=row["court_hall_number"],
+                bench=row["bench"],
+                list_type=row["list_type"],
+                judge_name=row["judge_name"],
+                case_no=row["case_no"],
+                petitioner=row["petitioner"],
+                respondent=row["respondent"],
+                fetch_status=AdvocateCauseListFetchStatus.fetched,
+                fetch_error=None,
+                source_url=API_URL,
+                fetched_at=now,
+            )
+    if not values:
+        return
+
+    stmt = pg_insert(AdvocateCauseList).values(list(values.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_advocate_cause_lists_lawyer_adv_date_case",
+        set_={
+            "item_no":           stmt.excluded.item_no,
+            "court_hall":        stmt.excluded.court_hall,
+            "item_no_range":     stmt.excluded.item_no_range,
+            "court_hall_number": stmt.excluded.court_hall_number,
+            "bench":             stmt.excluded.bench,
+            "list_type":         stmt.excluded.list_type,
+            "judge_name":        stmt.excluded.judge_name,
+            "petitioner":        stmt.excluded.petitioner,
+            "respondent":        stmt.excluded.respondent,
+            "fetch_status":      stmt.excluded.fetch_status,
+            "fetch_error":       None,
+            "source_url":        stmt.excluded.source_url,
+            "fetched_at":        stmt.excluded.fetched_at,
+            "updated_at":        now,
+        },
     )
+    db.execute(stmt)
 
 
 # ============================================================================
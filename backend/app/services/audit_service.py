@@ -1,28 +1,303 @@
 # app/services/audit_service.py
 
-import boto3
+import atexit
+import json
+import queue
+import random
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 from sqlalchemy.orm import Session
 
+from app.core import metrics
 from app.core.config import settings
 from app.core.logger import logger
 
+# BatchWriteItem accepts at most 25 put requests per call
+_BATCH_SIZE = 25
+
+AUDIT_EVENTS = metrics.counter(
+    "audit_events_total",
+    "Audit events by outcome (written / spilled / replayed / lost).",
+    ("outcome",),
+)
+AUDIT_QUEUE_DEPTH = metrics.gauge(
+    "audit_queue_depth",
+    "Audit events waiting in the in-process queue.",
+)
+
+
+def _json_default(value: Any) -> Any:
+    # UnprocessedItems come back deserialized with Decimal numbers
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+class _AuditBatchWriter:
+    """
+    Background writer for audit items.
+
+    ``enqueue`` is the only work done on the caller's thread.  A daemon
+    thread takes up to 25 queued items at a time and writes them with
+    ``BatchWriteItem``, retrying ``UnprocessedItems`` with jittered backoff.
+    Items that still cannot be written — or that overflow the queue — are
+    appended to a JSON-lines spill file and replayed every
+    ``AUDIT_SPILL_REPLAY_INTERVAL_SEC`` (and on the next start).  After a
+    failed batch the writer spills directly until the next replay, so an
+    outage does not stall the queue behind retries.
+    """
+
+    def __init__(self, table_name: str) -> None:
+        self.table_name = table_name
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+        self._spill_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._resource = None
+        self._degraded_until = 0.0
+
+        spill = Path(settings.AUDIT_SPILL_PATH)
+        if not spill.is_absolute():
+            spill = Path(__file__).parent.parent.parent / spill
+        self.spill_path = spill
+        self.replay_path = spill.with_name(spill.name + ".replaying")
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Drain the queue (bounded by *timeout*); whatever is left is spilled."""
+        thread = self._thread
+        self._stopping.set()
+        if thread is not None and thread.is_alive():
+            thread.join(settings.AUDIT_SHUTDOWN_TIMEOUT_SEC if timeout is None else timeout)
+        leftover = self._drain_nowait()
+        if leftover:
+            logger.warning("audit: %d events not flushed before shutdown — spilled", len(leftover))
+            self._spill(leftover)
+
+    def enqueue(self, item: Dict[str, Any]) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            if self._stopping.is_set():
+                self._spill([item])
+                return
+            self.start()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._spill([item])
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # ── Worker thread ──────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        self._replay_spill()
+        next_replay = time.monotonic() + settings.AUDIT_SPILL_REPLAY_INTERVAL_SEC
+        while True:
+            batch = self._next_batch()
+            if batch:
+                if time.monotonic() < self._degraded_until:
+                    self._spill(batch)
+                elif not self._write_or_spill(batch):
+                    self._degraded_until = time.monotonic() + settings.AUDIT_SPILL_REPLAY_INTERVAL_SEC
+            elif self._stopping.is_set():
+                return
+            if time.monotonic() >= next_replay and not self._stopping.is_set():
+                self._replay_spill()
+                next_replay = time.monotonic() + settings.AUDIT_SPILL_REPLAY_INTERVAL_SEC
+
+    def _next_batch(self) -> List[dict]:
+        try:
+            first = self._queue.get(timeout=0.2 if self._stopping.is_set() else 1.0)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + settings.AUDIT_BATCH_LINGER_MS / 1000
+        while len(batch) < _BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain_nowait(self) -> List[dict]:
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _client(self):
+        if self._resource is None:
+            self._resource = boto3.resource(
+                'dynamodb',
+                region_name=settings.AWS_REGION,
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+            )
+        return self._resource
+
+    def _write_or_spill(self, items: List[dict]) -> bool:
+        """``_write`` that never raises, so nothing can kill the writer thread."""
+        try:
+            return self._write(items)
+        except Exception:
+            # Puts are idempotent: re-spilling items already written is harmless
+            logger.exception("audit: batch of %d events failed — spilled", len(items))
+            self._spill(items)
+            return False
+
+    def _write(self, items: List[dict]) -> bool:
+        """Write up to 25 items; returns False if any had to be spilled."""
+        # One request may not contain two items with the same key (user_id,
+        # timestamp in seconds) — later duplicates go in a follow-up request.
+        groups: List[List[dict]] = []
+        seen: List[set] = []
+        for item in items:
+            key = (item['user_id'], item['timestamp'])
+            for group, keys in zip(groups, seen):
+                if key not in keys:
+                    group.append(item)
+                    keys.add(key)
+                    break
+            else:
+                groups.append([item])
+                seen.append({key})
+        for i, group in enumerate(groups):
+            if not self._write_group(group):
+                # Do not retry the rest against a failing table
+                self._spill([item for rest in groups[i + 1:] for item in rest])
+                return False
+        return True
+
+    def _write_group(self, items: List[dict]) -> bool:
+        requests = [{'PutRequest': {'Item': item}} for item in items]
+        error: Optional[Exception] = None
+        for attempt in range(max(1, settings.AUDIT_MAX_ATTEMPTS)):
+            if attempt:
+                time.sleep(min(5.0, 0.1 * 2 ** attempt) * random.uniform(0.5, 1.0))
+            try:
+                response = self._client().batch_write_item(RequestItems={self.table_name: requests})
+            except (BotoCoreError, ClientError) as e:
+                error = e
+                continue
+            written = len(requests)
+            requests = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            AUDIT_EVENTS.labels("written").inc(written - len(requests))
+            if not requests:
+                return True
+        logger.error(
+            "audit: %d events not written after %d attempts (%s) — spilled",
+            len(requests), settings.AUDIT_MAX_ATTEMPTS, error or "unprocessed items",
+        )
+        self._spill([r['PutRequest']['Item'] for r in requests])
+        return False
+
+    # ── Spill file ─────────────────────────────────────────────────────────
+
+    def _spill(self, items: List[dict]) -> None:
+        try:
+            lines = "".join(json.dumps(item, default=_json_default) + "\n" for item in items)
+            with self._spill_lock:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_path, "a", encoding="utf-8") as fh:
+                    fh.write(lines)
+            AUDIT_EVENTS.labels("spilled").inc(len(items))
+        except Exception as e:
+            AUDIT_EVENTS.labels("lost").inc(len(items))
+            logger.error(f"Failed to spill {len(items)} audit events: {str(e)}")
+
+    def _replay_spill(self) -> None:
+        """Re-send spilled events.  A replay interrupted by a crash is resumed next start."""
+        with self._spill_lock:
+            if not self.replay_path.exists():
+                if not self.spill_path.exists():
+                    return
+                self.spill_path.replace(self.replay_path)
+        try:
+            with open(self.replay_path, encoding="utf-8") as fh:
+                items = [json.loads(line, parse_float=Decimal) for line in fh if line.strip()]
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable audit spill file {self.replay_path}: {str(e)}")
+            return
+
+        logger.info("audit: replaying %d spilled events", len(items))
+        for i in range(0, len(items), _BATCH_SIZE):
+            batch = items[i:i + _BATCH_SIZE]
+            if not self._write_or_spill(batch):
+                # Still down: the failed batch was re-spilled; keep the rest too
+                self._spill(items[i + _BATCH_SIZE:])
+                self._degraded_until = time.monotonic() + settings.AUDIT_SPILL_REPLAY_INTERVAL_SEC
+                break
+            AUDIT_EVENTS.labels("replayed").inc(len(batch))
+        else:
+            self._degraded_until = 0.0
+        self.replay_path.unlink(missing_ok=True)
+
+
 class AuditService:
     """
     Service for audit trail logging (DPDPA compliance).
     Uses DynamoDB for high-velocity audit logs.
+
+    The ``log_*`` methods only build the item and enqueue it; writes happen
+    in batches on a background thread (see ``_AuditBatchWriter``).
+    ``start()`` / ``close()`` are called from the app's startup / shutdown
+    events.
     """
-    
+
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-        )
-        self.table = self.dynamodb.Table('lawmate-activity-trail')
-    
+        self.writer = _AuditBatchWriter(settings.DYNAMODB_TABLE_NAME)
+        metrics.REGISTRY.add_collector(lambda: AUDIT_QUEUE_DEPTH.set(self.writer.pending()))
+        # Scripts and job workers have no shutdown event
+        atexit.register(self.writer.close)
+
+    def start(self) -> None:
+        """Start the writer (also replays events spilled by a previous run)."""
+        self.writer.start()
+
+    def close(self) -> None:
+        """Flush queued events; called from ``shutdown_event``."""
+        self.writer.close()
+
+    def _emit(
+        self,
+        user_id: str,
+        action_type: str,
+        metadata: Dict[str, Any],
+        ttl_days: int,
+        **fields: Any
+    ) -> None:
+        now = datetime.utcnow()
+        timestamp = int(now.timestamp())
+        self.writer.enqueue({
+            'user_id': user_id,
+            'timestamp': timestamp,
+            'action_type': action_type,
+            **fields,
+            'metadata': {**metadata, 'timestamp_iso': now.isoformat()},
+            'ttl': timestamp + ttl_days * 24 * 3600
+        })
+
     async def log_identity_mismatch(
         self,
         user_id: str,
@@ -34,24 +309,18 @@ class AuditService:
         Log identity mismatch event (CRITICAL security event).
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'IDENTITY_MISMATCH',
-                'severity': 'CRITICAL',
-                'metadata': {
-                    'scraped_khc_id': scraped_khc_id,
-                    'registered_khc_id': registered_khc_id,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (3 * 365 * 24 * 3600)  # 3 years
-            })
-            
+            self._emit(
+                user_id, 'IDENTITY_MISMATCH',
+                {'scraped_khc_id': scraped_khc_id, 'registered_khc_id': registered_khc_id},
+                ttl_days=3 * 365,  # 3 years
+                severity='CRITICAL',
+            )
+
             logger.warning(f"Identity mismatch logged for user {user_id}")
-            
+
         except Exception as e:
             logger.error(f"Failed to log identity mismatch: {str(e)}")
-    
+
     async def log_identity_verified(
         self,
         user_id: str,
@@ -62,21 +331,15 @@ class AuditService:
         Log successful identity verification.
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'IDENTITY_VERIFIED',
-                'severity': 'INFO',
-                'metadata': {
-                    'khc_id': khc_id,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (90 * 24 * 3600)  # 90 days
-            })
-            
+            self._emit(
+                user_id, 'IDENTITY_VERIFIED', {'khc_id': khc_id},
+                ttl_days=90,
+                severity='INFO',
+            )
+
         except Exception as e:
             logger.error(f"Failed to log identity verification: {str(e)}")
-    
+
     async def log_case_sync(
         self,
         user_id: str,
@@ -88,22 +351,15 @@ class AuditService:
         Log case sync activity.
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'CASE_SYNC',
-                'resource_type': 'Case',
-                'resource_id': case_id,
-                'metadata': {
-                    'action': action,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)  # 1 year
-            })
-            
+            self._emit(
+                user_id, 'CASE_SYNC', {'action': action},
+                ttl_days=365,  # 1 year
+                resource_type='Case', resource_id=case_id,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log case sync: {str(e)}")
-    
+
     async def log_document_sync(
         self,
         user_id: str,
@@ -115,22 +371,15 @@ class AuditService:
         Log document sync activity.
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'DOCUMENT_SYNC',
-                'resource_type': 'Document',
-                'resource_id': document_id,
-                'metadata': {
-                    'action': action,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
+            self._emit(
+                user_id, 'DOCUMENT_SYNC', {'action': action},
+                ttl_days=365,
+                resource_type='Document', resource_id=document_id,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log document sync: {str(e)}")
-    
+
     async def log_document_access(
         self,
         user_id: str,
@@ -142,22 +391,15 @@ class AuditService:
         Log document access (viewed/downloaded).
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'DOCUMENT_ACCESS',
-                'resource_type': 'Document',
-                'resource_id': document_id,
-                'metadata': {
-                    'action': action,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
+            self._emit(
+                user_id, 'DOCUMENT_ACCESS', {'action': action},
+                ttl_days=365,
+                resource_type='Document', resource_id=document_id,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log document access: {str(e)}")
-    
+
     async def log_analysis_access(
         self,
         user_id: str,
@@ -168,21 +410,15 @@ class AuditService:
         Log AI analysis access.
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'ANALYSIS_ACCESS',
-                'resource_type': 'AIAnalysis',
-                'resource_id': analysis_id,
-                'metadata': {
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
+            self._emit(
+                user_id, 'ANALYSIS_ACCESS', {},
+                ttl_days=365,
+                resource_type='AIAnalysis', resource_id=analysis_id,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log analysis access: {str(e)}")
-    
+
     async def log_batch_sync(
         self,
         user_id: str,
@@ -195,19 +431,12 @@ class AuditService:
         Log batch sync operation.
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'BATCH_SYNC',
-                'metadata': {
-                    'sync_id': sync_id,
-                    'synced_cases': synced_cases,
-                    'failed_cases': failed_cases,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
+            self._emit(
+                user_id, 'BATCH_SYNC',
+                {'sync_id': sync_id, 'synced_cases': synced_cases, 'failed_cases': failed_cases},
+                ttl_days=365,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log batch sync: {str(e)}")
 
@@ -222,23 +451,15 @@ class AuditService:
         Log document deletion (critical for compliance).
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'DOCUMENT_DELETION',
-                'severity': 'HIGH',
-                'resource_type': 'Document',
-                'resource_id': document_id,
-                'metadata': {
-                    'permanent': permanent,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (3 * 365 * 24 * 3600)  # 3 years
-            })
-            
+            self._emit(
+                user_id, 'DOCUMENT_DELETION', {'permanent': permanent},
+                ttl_days=3 * 365,  # 3 years
+                severity='HIGH', resource_type='Document', resource_id=document_id,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log document deletion: {str(e)}")
-    
+
     async def log_case_transfer(
         self,
         user_id: str,
@@ -250,22 +471,15 @@ class AuditService:
         Log case transfer (vakalath change).
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'CASE_TRANSFER',
-                'resource_type': 'Case',
-                'resource_id': case_id,
-                'metadata': {
-                    'reason': reason,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (3 * 365 * 24 * 3600)  # 3 years
-            })
-            
+            self._emit(
+                user_id, 'CASE_TRANSFER', {'reason': reason},
+                ttl_days=3 * 365,  # 3 years
+                resource_type='Case', resource_id=case_id,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log case transfer: {str(e)}")
-    
+
     async def log_analysis_feedback(
         self,
         user_id: str,
@@ -277,21 +491,14 @@ class AuditService:
         Log AI analysis feedback (for quality improvement).
         """
         try:
-            self.table.put_item(Item={
-                'user_id': user_id,
-                'timestamp': int(datetime.utcnow().timestamp()),
-                'action_type': 'ANALYSIS_FEEDBACK',
-                'resource_type': 'AIAnalysis',
-                'resource_id': analysis_id,
-                'metadata': {
-                    'rating': rating,
-                    'timestamp_iso': datetime.utcnow().isoformat()
-                },
-                'ttl': int(datetime.utcnow().timestamp()) + (365 * 24 * 3600)
-            })
-            
+            self._emit(
+                user_id, 'ANALYSIS_FEEDBACK', {'rating': rating},
+                ttl_days=365,
+                resource_type='AIAnalysis', resource_id=analysis_id,
+            )
+
         except Exception as e:
             logger.error(f"Failed to log analysis feedback: {str(e)}")
 
 # Singleton instance
-audit_service = AuditService()
\ No newline at end of file
+audit_service = AuditService()
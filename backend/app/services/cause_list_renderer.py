@@ -4,6 +4,10 @@ import html
 from collections import defaultdict
 from typing import Any
 
+# Bump whenever the HTML output changes: stored renders of an older version
+# are re-rendered on first read and their ETags change.
+RENDER_VERSION = 1
+
 GREEN = {"ADMITTED", "ALLOWED", "DISPOSED"}
 AMBER = {"PART_HEARD", "SERVICE_NOT_COMPLETE", "ADJOURNED"}
 RED = {"NOT_ADMITTED"}
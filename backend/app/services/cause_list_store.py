@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import uuid
-from datetime import date, timedelta
+from datetime import date
 from typing import Any
 
+from sqlalchemy import or_, update
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
+from app.db.compression import HEAVY, compress_text, compressed_values, decompress_text
 from app.db.models import DailyCauseList
+from app.services.cause_list_renderer import RENDER_VERSION, cause_list_renderer
+
+
+def result_hash(result_json: dict[str, Any]) -> str:
+    payload = json.dumps(result_json or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _rendered_values(result_json: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "result_hash": result_hash(result_json),
+        "render_version": RENDER_VERSION,
+        "rendered_html_zst": compress_text(cause_list_renderer.render(result_json)),
+    }
 
 
 class CauseListStore:
@@ -20,20 +38,27 @@ class CauseListStore:
         result_json: dict[str, Any],
         parse_error: str | None,
     ) -> None:
+        result_json = result_json or {}
         stmt = insert(DailyCauseList.__table__).values(
             id=uuid.uuid4(),
             advocate_id=advocate_id,
             date=listing_date,
             total_listings=max(0, int(total_listings)),
-            result_json=result_json or {},
             parse_error=parse_error,
+            **compressed_values(result_json=result_json),
+            # Rendered here, once per write, rather than on every view
+            **_rendered_values(result_json),
         )
         stmt = stmt.on_conflict_do_update(
             index_elements=[DailyCauseList.__table__.c.advocate_id, DailyCauseList.__table__.c.date],
             set_={
                 "total_listings": stmt.excluded.total_listings,
+                "result_json_zst": stmt.excluded.result_json_zst,
                 "result_json": stmt.excluded.result_json,
                 "parse_error": stmt.excluded.parse_error,
+                "result_hash": stmt.excluded.result_hash,
+                "render_version": stmt.excluded.render_version,
+                "rendered_html_zst": stmt.excluded.rendered_html_zst,
                 "created_at": DailyCauseList.__table__.c.created_at,
             },
         )
@@ -42,19 +67,44 @@ class CauseListStore:
     def fetch_result(self, db: Session, advocate_id: str, listing_date: date) -> DailyCauseList | None:
         return (
             db.query(DailyCauseList)
+            .options(undefer_group(HEAVY))
             .filter(DailyCauseList.advocate_id == advocate_id, DailyCauseList.date == listing_date)
             .first()
         )
 
-    def purge_older_than(self, db: Session, keep_days: int) -> int:
-        keep_days = max(1, int(keep_days))
-        cutoff = date.today() - timedelta(days=keep_days)
-        deleted = (
+    def fetch_summary(self, db: Session, advocate_id: str, listing_date: date) -> DailyCauseList | None:
+        """The row without result_json or the HTML: enough for the ETag."""
+        return (
             db.query(DailyCauseList)
-            .filter(DailyCauseList.date < cutoff)
-            .delete(synchronize_session=False)
+            .filter(DailyCauseList.advocate_id == advocate_id, DailyCauseList.date == listing_date)
+            .first()
         )
-        return int(deleted or 0)
+
+    def ensure_rendered(self, db: Session, row: DailyCauseList) -> None:
+        """
+        Render rows written before the HTML was stored, or by an older
+        RENDER_VERSION.  The update is skipped if an upsert has meanwhile
+        replaced the result; either way *row* reloads the stored values.
+        """
+        if row.result_hash and row.render_version == RENDER_VERSION:
+            return
+        values = _rendered_values(row.result_json if isinstance(row.result_json, dict) else {})
+        table = DailyCauseList.__table__
+        db.execute(
+            update(table)
+            .where(
+                table.c.id == row.id,
+                table.c.date == row.date,
+                or_(table.c.result_hash.is_(None), table.c.result_hash == values["result_hash"]),
+            )
+            .values(**values)
+        )
+        db.commit()
+
+    def rendered_html(self, row: DailyCauseList) -> str:
+        if row.rendered_html_zst is None:
+            return cause_list_renderer.render(row.result_json if isinstance(row.result_json, dict) else {})
+        return decompress_text(row.rendered_html_zst)
 
 
 cause_list_store = CauseListStore()
@@ -10,6 +10,7 @@ import httpx
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.core.metrics import track_dependency
 from app.services.captcha_solver_service import captcha_solver_service
 
 try:
@@ -828,9 +829,10 @@ class CourtApiService:
         try:
             # ── Primary path: httpx.Client with persistent cookie jar ──────────
             try:
-                return self._fetch_case_status_via_httpx(
-                    case_number, case_type, case_no, case_year
-                )
+                with track_dependency("hckinfo", "case_status"):
+                    return self._fetch_case_status_via_httpx(
+                        case_number, case_type, case_no, case_year
+                    )
             except ValueError:
                 raise  # INVALID_CASE_TYPE — a browser won't help
             except Exception as exc:
@@ -847,7 +849,7 @@ class CourtApiService:
                     "Install with `pip install playwright` and install the browser "
                     "with `playwright install chromium`."
                 )
-            with sync_playwright() as p:
+            with track_dependency("hckinfo", "case_status_browser"), sync_playwright() as p:
                 return self._search_and_fetch_detail_via_browser(
                     p=p,
                     case_number=case_number,
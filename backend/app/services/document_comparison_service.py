@@ -3,8 +3,8 @@ Document Comparison Service — LawMate
 ======================================
 Handles text extraction from PDF/DOCX/image files and computes
 a rich legal diff including:
-  - Paragraph-level SequenceMatcher diff
-  - Inline word-level diff for replaced blocks
+  - Paragraph-level patience diff over hashed paragraphs
+  - Inline word-level diff for replaced blocks (changed span only)
   - Legal-entity detection (sections, dates, citations, amounts)
   - Prayer/Relief section isolation
   - Comparison Memo PDF generation via ReportLab
@@ -119,6 +119,8 @@ _AMOUNT_RE = re.compile(
     re.IGNORECASE | re.VERBOSE,
 )
 
+_DIGIT_RE = re.compile(r"\d")
+
 _PRAYER_RE = re.compile(
     r"^(?:PRAYER|PRAYERS|PRAYER\s+CLAUSE|PRAYERS\s+CLAUSE|RELIEF\s+SOUGHT|"
     r"RELIEFS\s+SOUGHT|WHEREFORE|IN\s+VIEW\s+OF\s+THE\s+ABOVE|"
@@ -312,7 +314,15 @@ def compare_documents(
     paras_a = _split_paragraphs(text_a)
     paras_b = _split_paragraphs(text_b)
 
-    matcher = difflib.SequenceMatcher(None, paras_a, paras_b, autojunk=False)
+    # Entities are extracted once per distinct paragraph text; unchanged
+    # paragraphs (the bulk of an amended pleading) are shared by both sides.
+    entity_cache: dict[str, LegalEntities] = {}
+
+    def _entities(text: str) -> LegalEntities:
+        ent = entity_cache.get(text)
+        if ent is None:
+            ent = entity_cache[text] = _extract_entities(text)
+        return ent
 
     blocks: list[DiffBlock] = []
     total_additions = 0
@@ -320,7 +330,7 @@ def compare_documents(
     total_changes = 0
     substantive_changes = 0
 
-    for opcode, a1, a2, b1, b2 in matcher.get_opcodes():
+    for opcode, a1, a2, b1, b2 in _paragraph_opcodes(paras_a, paras_b):
         if opcode == "equal":
             for i in range(a2 - a1):
                 blocks.append(
@@ -335,7 +345,7 @@ def compare_documents(
 
         elif opcode == "insert":
             for i, pb in enumerate(paras_b[b1:b2]):
-                ent_b = _extract_entities(pb)
+                ent_b = _entities(pb)
                 subst = bool(ent_b.sections or ent_b.citations or ent_b.amounts)
                 blocks.append(
                     DiffBlock(
@@ -354,7 +364,7 @@ def compare_documents(
 
         elif opcode == "delete":
             for i, pa in enumerate(paras_a[a1:a2]):
-                ent_a = _extract_entities(pa)
+                ent_a = _entities(pa)
                 subst = bool(ent_a.sections or ent_a.citations or ent_a.amounts)
                 blocks.append(
                     DiffBlock(
@@ -378,8 +388,8 @@ def compare_documents(
             for i in range(max_len):
                 pa = a_list[i] if i < len(a_list) else ""
                 pb = b_list[i] if i < len(b_list) else ""
-                ent_a = _extract_entities(pa)
-                ent_b = _extract_entities(pb)
+                ent_a = _entities(pa)
+                ent_b = _entities(pb)
                 subst = _is_substantive(ent_a, ent_b)
                 word_diff = _word_diff(pa, pb) if pa and pb else None
                 blocks.append(
@@ -405,7 +415,9 @@ def compare_documents(
     prayer_diff = _diff_prayer(prayer_a or "", prayer_b or "") if (prayer_a or prayer_b) else []
 
     # Global legal entity change summary
-    legal_entity_changes = _legal_entity_diff(text_a, text_b)
+    legal_entity_changes = _legal_entity_diff(
+        [_entities(p) for p in paras_a], [_entities(p) for p in paras_b]
+    )
 
     result = ComparisonResult(
         comparison_id=comparison_id,
@@ -440,7 +452,139 @@ def _split_paragraphs(text: str) -> list[str]:
     return result or [""]
 
 
+def _paragraph_opcodes(paras_a: list[str], paras_b: list[str]) -> list[tuple[str, int, int, int, int]]:
+    """
+    SequenceMatcher-style opcodes for two paragraph lists, via patience diff.
+
+    Paragraphs are interned to ints, so every comparison is an int compare.
+    Common head/tail runs are matched directly; in between, paragraphs that
+    occur exactly once on each side anchor the alignment (longest increasing
+    subsequence) and the gaps between anchors are diffed recursively.  Only
+    gaps with no unique anchor (e.g. runs of repeated headers) fall back to
+    SequenceMatcher, on ints and on that gap alone.
+    """
+    ids: dict[str, int] = {}
+    a = [ids.setdefault(p, len(ids)) for p in paras_a]
+    b = [ids.setdefault(p, len(ids)) for p in paras_b]
+
+    matches: list[tuple[int, int, int]] = []   # (i, j, n) like get_matching_blocks
+    _patience(a, 0, len(a), b, 0, len(b), matches)
+    matches.sort()
+
+    # Coalesce adjacent matches, then convert to opcodes exactly like
+    # difflib.SequenceMatcher.get_opcodes().
+    blocks: list[tuple[int, int, int]] = []
+    for i, j, n in matches:
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            pi, pj, pn = blocks[-1]
+            blocks[-1] = (pi, pj, pn + n)
+        else:
+            blocks.append((i, j, n))
+    blocks.append((len(a), len(b), 0))
+
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    i = j = 0
+    for ai, bj, size in blocks:
+        tag = ""
+        if i < ai and j < bj:
+            tag = "replace"
+        elif i < ai:
+            tag = "delete"
+        elif j < bj:
+            tag = "insert"
+        if tag:
+            opcodes.append((tag, i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(("equal", ai, i, bj, j))
+    return opcodes
+
+
+def _patience(
+    a: list[int], alo: int, ahi: int,
+    b: list[int], blo: int, bhi: int,
+    out: list[tuple[int, int, int]],
+) -> None:
+    """Append matching (i, j, n) runs between a[alo:ahi] and b[blo:bhi] to *out*."""
+    # Common head / tail
+    head = 0
+    while alo + head < ahi and blo + head < bhi and a[alo + head] == b[blo + head]:
+        head += 1
+    if head:
+        out.append((alo, blo, head))
+        alo += head
+        blo += head
+    tail = 0
+    while alo < ahi - tail and blo < bhi - tail and a[ahi - 1 - tail] == b[bhi - 1 - tail]:
+        tail += 1
+    if tail:
+        out.append((ahi - tail, bhi - tail, tail))
+        ahi -= tail
+        bhi -= tail
+    if alo >= ahi or blo >= bhi:
+        return
+
+    # Paragraphs unique on both sides of this gap
+    count_a: dict[int, int] = {}
+    for i in range(alo, ahi):
+        count_a[a[i]] = count_a.get(a[i], 0) + 1
+    pos_b: dict[int, int] = {}
+    count_b: dict[int, int] = {}
+    for j in range(blo, bhi):
+        v = b[j]
+        if count_a.get(v) == 1:
+            count_b[v] = count_b.get(v, 0) + 1
+            pos_b[v] = j
+    pairs = [(i, pos_b[a[i]]) for i in range(alo, ahi) if count_b.get(a[i]) == 1]
+
+    if not pairs:
+        sm = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+        out.extend((alo + i, blo + j, n) for i, j, n in sm.get_matching_blocks() if n)
+        return
+
+    # Longest increasing subsequence of b-positions (patience sorting)
+    tails: list[int] = []          # index into pairs of the smallest tail per length
+    prev: list[int] = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        pos = _bisect_tails(pairs, tails, j)
+        if pos:
+            prev[k] = tails[pos - 1]
+        if pos == len(tails):
+            tails.append(k)
+        else:
+            tails[pos] = k
+    anchors: list[tuple[int, int]] = []
+    k = tails[-1] if tails else -1
+    while k != -1:
+        anchors.append(pairs[k])
+        k = prev[k]
+    anchors.reverse()
+
+    # Recurse into the gaps between anchors
+    i0, j0 = alo, blo
+    for i, j in anchors:
+        _patience(a, i0, i, b, j0, j, out)
+        out.append((i, j, 1))
+        i0, j0 = i + 1, j + 1
+    _patience(a, i0, ahi, b, j0, bhi, out)
+
+
+def _bisect_tails(pairs: list[tuple[int, int]], tails: list[int], j: int) -> int:
+    """Leftmost slot in *tails* whose pair has b-position >= *j*."""
+    lo, hi = 0, len(tails)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if pairs[tails[mid]][1] < j:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
 def _extract_entities(text: str) -> LegalEntities:
+    # Every entity pattern needs a digit; most prose paragraphs have none.
+    if not _DIGIT_RE.search(text):
+        return LegalEntities()
     return LegalEntities(
         sections=list(dict.fromkeys(_SECTION_RE.findall(text))),
         dates=list(dict.fromkeys(_DATE_RE.findall(text))),
@@ -462,18 +606,41 @@ def _word_diff(text_a: str, text_b: str) -> list[dict]:
     """
     Compute an inline word-level diff between two strings.
     Returns a list of {type: 'equal'|'insert'|'delete'|'replace', left, right}.
+
+    The common leading/trailing words are split off first, so the matcher
+    only sees the changed span (typically a few words of a long paragraph).
     """
     words_a = text_a.split()
     words_b = text_b.split()
-    sm = difflib.SequenceMatcher(None, words_a, words_b, autojunk=False)
-    result: list[dict] = []
-    for op, a1, a2, b1, b2 in sm.get_opcodes():
-        result.append({
+
+    lo = 0
+    limit = min(len(words_a), len(words_b))
+    while lo < limit and words_a[lo] == words_b[lo]:
+        lo += 1
+    hi_a, hi_b = len(words_a), len(words_b)
+    while hi_a > lo and hi_b > lo and words_a[hi_a - 1] == words_b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+
+    ops: list[tuple[str, int, int, int, int]] = []
+    if lo:
+        ops.append(("equal", 0, lo, 0, lo))
+    if lo < hi_a or lo < hi_b:
+        sm = difflib.SequenceMatcher(None, words_a[lo:hi_a], words_b[lo:hi_b], autojunk=False)
+        ops.extend(
+            (op, a1 + lo, a2 + lo, b1 + lo, b2 + lo) for op, a1, a2, b1, b2 in sm.get_opcodes()
+        )
+    if hi_a < len(words_a):
+        ops.append(("equal", hi_a, len(words_a), hi_b, len(words_b)))
+
+    return [
+        {
             "op": op,
             "left": " ".join(words_a[a1:a2]),
             "right": " ".join(words_b[b1:b2]),
-        })
-    return result
+        }
+        for op, a1, a2, b1, b2 in ops
+    ]
 
 
 def _extract_prayer(text: str) -> Optional[str]:
@@ -517,15 +684,15 @@ def _diff_prayer(prayer_a: str, prayer_b: str) -> list[DiffBlock]:
     return blocks
 
 
-def _legal_entity_diff(text_a: str, text_b: str) -> dict:
-    sec_a = set(_SECTION_RE.findall(text_a))
-    sec_b = set(_SECTION_RE.findall(text_b))
-    cit_a = set(_CITATION_RE.findall(text_a))
-    cit_b = set(_CITATION_RE.findall(text_b))
-    amt_a = set(_AMOUNT_RE.findall(text_a))
-    amt_b = set(_AMOUNT_RE.findall(text_b))
-    date_a = set(_DATE_RE.findall(text_a))
-    date_b = set(_DATE_RE.findall(text_b))
+def _legal_entity_diff(ents_a: list[LegalEntities], ents_b: list[LegalEntities]) -> dict:
+    """Document-wide entity changes, from the per-paragraph entities."""
+    def _union(ents: list[LegalEntities], attr: str) -> set[str]:
+        return {v for e in ents for v in getattr(e, attr)}
+
+    sec_a, sec_b = _union(ents_a, "sections"), _union(ents_b, "sections")
+    cit_a, cit_b = _union(ents_a, "citations"), _union(ents_b, "citations")
+    amt_a, amt_b = _union(ents_a, "amounts"), _union(ents_b, "amounts")
+    date_a, date_b = _union(ents_a, "dates"), _union(ents_b, "dates")
     return {
         "sections_added": sorted(sec_b - sec_a),
         "sections_removed": sorted(sec_a - sec_b),
@@ -3,7 +3,7 @@ app/services/drafting_service.py
 
 Core orchestration for the Drafting AI feature:
   - Workspace CRUD (5-workspace cap per user)
-  - Document upload → S3 → text extraction → classification → KB ingestion
+  - Document upload → S3 → text extraction → classification → local index
   - Case context extraction (structured JSON via Claude)
   - SSE streaming chat with full-context or hybrid-RAG strategy
   - Draft generation with extended thinking
@@ -27,7 +27,11 @@ import boto3
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.db.compression import undefer_heavy
 from app.db.models import Workspace, WorkspaceDocument, WorkspaceDraft
+from app.services import job_queue, llm_usage_service
+from app.services.llm_usage_service import BudgetExceeded
+from app.utils import workspace_index
 from app.utils.chunker import chunk_text, estimate_tokens
 from app.utils.pdf_extractor import extract_text_from_pdf
 
@@ -253,6 +257,7 @@ def delete_workspace(db: Session, workspace_id: str, user_id: str) -> None:
 
     db.delete(ws)
     db.commit()
+    workspace_index.invalidate(workspace_id)
     logger.info("Deleted workspace %s", workspace_id)
 
 
@@ -337,13 +342,28 @@ async def upload_document(
     db.commit()
     db.refresh(doc)
 
-    # ── Fire-and-forget KB ingestion ──────────────────────────────────────────
-    asyncio.create_task(
-        _ingest_doc_to_kb(extracted_text, str(doc.id), workspace_id, filename)
-    )
+    # ── Retrieval index ───────────────────────────────────────────────────────
+    # Local index: chunks are persisted once here and queried in-process at
+    # chat time.  Failures are non-fatal — search() backfills missing docs.
+    if settings.DRAFTING_LOCAL_INDEX_ENABLED:
+        try:
+            await workspace_index.index_document(db, workspace_id, str(doc.id), extracted_text)
+        except Exception as exc:
+            db.rollback()
+            logger.warning("Local index build for doc %s deferred: %s", doc.id, exc)
+    elif settings.JOB_QUEUE_ENABLED:
+        await asyncio.to_thread(
+            job_queue.submit,
+            "drafting.kb_ingest",
+            {"doc_id": str(doc.id), "workspace_id": workspace_id},
+        )
+    else:
+        asyncio.create_task(
+            _ingest_doc_to_kb(extracted_text, str(doc.id), workspace_id, filename)
+        )
 
     # ── Trigger context re-extraction in background ───────────────────────────
-    asyncio.create_task(_run_context_extraction(db, workspace_id, user_id))
+    await _schedule_context_extraction(db, workspace_id, user_id)
 
     return _doc_to_dict(doc)
 
@@ -373,9 +393,10 @@ async def delete_document(
 
     db.delete(doc)
     db.commit()
+    workspace_index.invalidate(workspace_id)
 
     # Re-run context extraction
-    asyncio.create_task(_run_context_extraction(db, workspace_id, user_id))
+    await _schedule_context_extraction(db, workspace_id, user_id)
 
 
 # ============================================================================
@@ -427,6 +448,7 @@ async def extract_case_context(
     """
     ws = get_workspace(db, workspace_id, user_id)
     docs = list(ws.documents)
+    undefer_heavy(db, docs)
 
     if not docs:
         empty: dict = {}
@@ -586,6 +608,7 @@ async def clear_workspace_documents(
     ws.conversation_history  = []
     ws.updated_at            = datetime.utcnow()
     db.commit()
+    workspace_index.invalidate(workspace_id)
     logger.info("Workspace %s cleared (%d docs removed).", workspace_id, len(docs))
 
 
@@ -618,6 +641,7 @@ async def stream_chat(
     """
     ws   = get_workspace(db, workspace_id, user_id)
     docs = list(ws.documents)
+    undefer_heavy(db, docs)
 
     # ── Topic-shift guard ─────────────────────────────────────────────────────
     if not skip_shift_detection and docs and ws.case_context:
@@ -641,7 +665,7 @@ async def stream_chat(
     if use_full_context:
         docs_text = _build_full_context(docs)
     else:
-        chunks = await _retrieve_rag_context(message, workspace_id)
+        chunks = await _retrieve_rag_context(db, message, workspace_id, docs)
         docs_text = _build_rag_context(chunks)
 
     # ── System prompt ─────────────────────────────────────────────────────────
@@ -681,56 +705,63 @@ async def stream_chat(
     # Current user message
     convo_messages.append({"role": "user", "content": [{"text": message}]})
 
-    # ── Extended thinking ─────────────────────────────────────────────────────
-    # Only enabled when (a) message warrants it AND (b) the active model
-    # supports it.  DeepSeek and older Claude models do NOT support the
-    # `thinking` field — passing it causes a Bedrock ValidationException.
-    extra_fields: dict = {}
-    active_model = _drafting_model()
-    use_thinking = _needs_thinking(message) and _model_supports_thinking(active_model)
-    if use_thinking:
-        # Claude Sonnet 4 on Bedrock uses snake_case budget_tokens (not budgetTokens)
-        extra_fields = {"thinking": {"type": "enabled", "budget_tokens": 10000}}
-
     # ── Stream ────────────────────────────────────────────────────────────────
     try:
-        client = _bedrock_runtime()
-        stream_kwargs: dict[str, Any] = dict(
-            modelId=active_model,
-            system=[{"text": system_prompt}],
-            messages=convo_messages,
-            inferenceConfig={"maxTokens": 8192, "temperature": 1 if use_thinking else 0.3},
-        )
-        if extra_fields:
-            stream_kwargs["additionalModelRequestFields"] = extra_fields
-
-        response = client.converse_stream(**stream_kwargs)
-        stream   = response.get("stream")
-        if not stream:
-            yield _sse({"type": "error", "message": "No stream returned from Bedrock."})
-            return
-
-        full_text     = []
-        cited_doc_ids = set()
-
-        for event in stream:
-            # Text delta
-            if "contentBlockDelta" in event:
-                delta = event["contentBlockDelta"].get("delta", {})
-                if "text" in delta:
-                    chunk = delta["text"]
-                    full_text.append(chunk)
-                    yield _sse({"type": "text_delta", "text": chunk})
-
-                    # Collect cited document filenames → match to IDs
-                    for doc in docs:
-                        if doc.filename.lower() in chunk.lower():
-                            cited_doc_ids.add(str(doc.id))
-
-                elif "reasoningContent" in delta:
-                    thinking_chunk = delta["reasoningContent"].get("text", "")
-                    if thinking_chunk:
-                        yield _sse({"type": "thinking_delta", "text": thinking_chunk})
+        # The budget check may swap in the fallback model, so thinking support
+        # is decided on the model actually called.
+        async with llm_usage_service.track_async("drafting.chat", _drafting_model(), user_id=user_id) as call:
+            # ── Extended thinking ─────────────────────────────────────────────
+            # Only enabled when (a) message warrants it AND (b) the active model
+            # supports it.  DeepSeek and older Claude models do NOT support the
+            # `thinking` field — passing it causes a Bedrock ValidationException.
+            extra_fields: dict = {}
+            active_model = call.model_id
+            use_thinking = _needs_thinking(message) and _model_supports_thinking(active_model)
+            if use_thinking:
+                # Claude Sonnet 4 on Bedrock uses snake_case budget_tokens (not budgetTokens)
+                extra_fields = {"thinking": {"type": "enabled", "budget_tokens": 10000}}
+
+            client = _bedrock_runtime()
+            stream_kwargs: dict[str, Any] = dict(
+                modelId=active_model,
+                system=[{"text": system_prompt}],
+                messages=convo_messages,
+                inferenceConfig={"maxTokens": 8192, "temperature": 1 if use_thinking else 0.3},
+            )
+            if extra_fields:
+                stream_kwargs["additionalModelRequestFields"] = extra_fields
+
+            response = client.converse_stream(**stream_kwargs)
+            stream   = response.get("stream")
+            if not stream:
+                yield _sse({"type": "error", "message": "No stream returned from Bedrock."})
+                return
+
+            full_text     = []
+            cited_doc_ids = set()
+
+            for event in stream:
+                # Text delta
+                if "contentBlockDelta" in event:
+                    delta = event["contentBlockDelta"].get("delta", {})
+                    if "text" in delta:
+                        chunk = delta["text"]
+                        full_text.append(chunk)
+                        yield _sse({"type": "text_delta", "text": chunk})
+
+                        # Collect cited document filenames → match to IDs
+                        for doc in docs:
+                            if doc.filename.lower() in chunk.lower():
+                                cited_doc_ids.add(str(doc.id))
+
+                    elif "reasoningContent" in delta:
+                        thinking_chunk = delta["reasoningContent"].get("text", "")
+                        if thinking_chunk:
+                            yield _sse({"type": "thinking_delta", "text": thinking_chunk})
+
+                # Token usage (last event of the stream)
+                elif "metadata" in event:
+                    call.add_usage(event["metadata"].get("usage"))
 
         assembled = "".join(full_text)
 
@@ -762,12 +793,14 @@ async def generate_draft(
     """
     ws   = get_workspace(db, workspace_id, user_id)
     docs = list(ws.documents)
+    undefer_heavy(db, docs)
 
-    # Retrieve precedents from KB
-    from app.utils.embedder import retrieve_from_kb
-    prec_chunks = await retrieve_from_kb(
+    # Retrieve precedents from the workspace index
+    prec_chunks = await _retrieve_rag_context(
+        db,
         f"{doc_type} Kerala High Court",
         workspace_id,
+        docs,
         top_k=5,
     )
     precedents_text = "\n\n".join(
@@ -789,24 +822,26 @@ async def generate_draft(
     full_prompt = f"{docs_context}\n\n{prompt}" if docs_context else prompt
 
     try:
-        client        = _bedrock_runtime()
-        draft_model   = _drafting_model()
-        converse_kwargs: dict[str, Any] = dict(
-            modelId=draft_model,
-            messages=[{"role": "user", "content": [{"text": full_prompt}]}],
-            inferenceConfig={"maxTokens": 16000, "temperature": 0.2},
-        )
-        if _model_supports_thinking(draft_model):
-            # Extended thinking requires temperature=1 per Bedrock/Anthropic spec.
-            # Claude Sonnet 4 on Bedrock uses snake_case budget_tokens (not budgetTokens).
-            # budget_tokens counts against maxTokens, so raise maxTokens to
-            # budget_tokens (10 000) + visible output headroom (16 000) = 26 000.
-            converse_kwargs["inferenceConfig"]["maxTokens"] = 26000
-            converse_kwargs["inferenceConfig"]["temperature"] = 1
-            converse_kwargs["additionalModelRequestFields"] = {
-                "thinking": {"type": "enabled", "budget_tokens": 10000}
-            }
-        response = client.converse(**converse_kwargs)
+        async with llm_usage_service.track_async("drafting.generate", _drafting_model(), user_id=user_id) as call:
+            client        = _bedrock_runtime()
+            draft_model   = call.model_id
+            converse_kwargs: dict[str, Any] = dict(
+                modelId=draft_model,
+                messages=[{"role": "user", "content": [{"text": full_prompt}]}],
+                inferenceConfig={"maxTokens": 16000, "temperature": 0.2},
+            )
+            if _model_supports_thinking(draft_model):
+                # Extended thinking requires temperature=1 per Bedrock/Anthropic spec.
+                # Claude Sonnet 4 on Bedrock uses snake_case budget_tokens (not budgetTokens).
+                # budget_tokens counts against maxTokens, so raise maxTokens to
+                # budget_tokens (10 000) + visible output headroom (16 000) = 26 000.
+                converse_kwargs["inferenceConfig"]["maxTokens"] = 26000
+                converse_kwargs["inferenceConfig"]["temperature"] = 1
+                converse_kwargs["additionalModelRequestFields"] = {
+                    "thinking": {"type": "enabled", "budget_tokens": 10000}
+                }
+            response = client.converse(**converse_kwargs)
+            call.add_usage(response.get("usage"))
         content_blocks = (
             response.get("output", {})
             .get("message", {})
@@ -818,6 +853,8 @@ async def generate_draft(
             if b.get("type") == "text" or "text" in b
         ).strip()
 
+    except BudgetExceeded:
+        raise
     except Exception as exc:
         raise RuntimeError(f"Draft generation failed: {exc}") from exc
 
@@ -924,9 +961,17 @@ def _build_full_context(docs: list[WorkspaceDocument]) -> str:
     return "\n\n".join(parts)
 
 
-async def _retrieve_rag_context(query: str, workspace_id: str) -> list[dict]:
+async def _retrieve_rag_context(
+    db: Session,
+    query: str,
+    workspace_id: str,
+    docs: list[WorkspaceDocument],
+    top_k: int = 8,
+) -> list[dict]:
+    if settings.DRAFTING_LOCAL_INDEX_ENABLED:
+        return await workspace_index.search(db, workspace_id, query, docs, top_k=top_k)
     from app.utils.embedder import retrieve_from_kb
-    return await retrieve_from_kb(query, workspace_id, top_k=8)
+    return await retrieve_from_kb(query, workspace_id, top_k=top_k)
 
 
 def _build_rag_context(chunks: list[dict]) -> str:
@@ -985,7 +1030,6 @@ async def _ingest_doc_to_kb(
     workspace_id: str,
     filename: str,
 ) -> None:
-    from app.utils.chunker import chunk_text
     from app.utils.embedder import ingest_chunk_to_kb
 
     chunks = chunk_text(text, chunk_size=512, overlap=50)
@@ -1005,6 +1049,19 @@ async def _run_context_extraction(
         logger.debug("Background context extraction failed: %s", exc)
 
 
+async def _schedule_context_extraction(db: Session, workspace_id: str, user_id: str) -> None:
+    # Uploads in quick succession collapse into one queued extraction.
+    if settings.JOB_QUEUE_ENABLED:
+        await asyncio.to_thread(
+            job_queue.submit,
+            "drafting.context_extraction",
+            {"workspace_id": str(workspace_id), "user_id": str(user_id)},
+            dedupe_key=f"ctx:{workspace_id}",
+        )
+    else:
+        asyncio.create_task(_run_context_extraction(db, workspace_id, user_id))
+
+
 # ── Serialisation helpers ─────────────────────────────────────────────────────
 
 def _ws_to_dict(ws: Workspace) -> dict:
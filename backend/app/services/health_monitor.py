@@ -0,0 +1,189 @@
+"""
+app/services/health_monitor.py
+
+Background dependency probes for the readiness endpoint.
+
+Readiness used to build fresh boto3 clients and call ``invoke_model`` on
+every request — slow, billed per token, and prone to flapping under load.
+Instead a loop in ``app/main.py`` calls ``health_monitor.run_once()`` every
+``HEALTH_PROBE_INTERVAL_SEC``; ``/health/ready`` just returns ``snapshot()``.
+
+Probes are control-plane calls that cost nothing:
+- s3:       ``head_bucket`` on ``S3_BUCKET_NAME``
+- bedrock:  ``get_inference_profile`` (profile ARNs) or ``get_foundation_model``
+- database: ``SELECT 1``
+
+A dependency is reported ``error`` only after ``HEALTH_FAILURE_THRESHOLD``
+consecutive failures, so a single slow call does not flip readiness.
+"""
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+
+# Latency samples kept per dependency (≈1 h at the default 30 s interval)
+_LATENCY_WINDOW = 120
+
+
+class _DependencyState:
+    """Rolling probe state for one dependency."""
+
+    def __init__(self) -> None:
+        self.status = "unknown"
+        self.detail = "not probed yet"
+        self.checked_at: Optional[datetime] = None
+        self.last_ok_at: Optional[datetime] = None
+        self.consecutive_failures = 0
+        self.latencies_ms: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def record(self, ok: bool, detail: str, latency_ms: float) -> None:
+        now = datetime.utcnow()
+        self.checked_at = now
+        self.latencies_ms.append(latency_ms)
+        if ok:
+            self.status, self.detail = "ok", detail
+            self.last_ok_at = now
+            self.consecutive_failures = 0
+            return
+        self.consecutive_failures += 1
+        self.detail = detail
+        if self.consecutive_failures >= settings.HEALTH_FAILURE_THRESHOLD or self.last_ok_at is None:
+            self.status = "error"
+
+    def to_dict(self) -> dict[str, Any]:
+        samples = sorted(self.latencies_ms)
+        latency: dict[str, Optional[float]] = {"p50": None, "p95": None, "p99": None}
+        if len(samples) == 1:
+            latency = {k: round(samples[0], 1) for k in latency}
+        elif samples:
+            cuts = statistics.quantiles(samples, n=100, method="inclusive")
+            latency = {"p50": round(cuts[49], 1), "p95": round(cuts[94], 1), "p99": round(cuts[98], 1)}
+        return {
+            "status": self.status,
+            "detail": self.detail,
+            "checked_at": self.checked_at.isoformat() + "Z" if self.checked_at else None,
+            "last_ok_at": self.last_ok_at.isoformat() + "Z" if self.last_ok_at else None,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ms": latency,
+            "samples": len(samples),
+        }
+
+
+class HealthMonitor:
+    """Probes dependencies on demand and caches the results."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: dict[str, Any] = {}
+        self._probes: dict[str, Callable[[], str]] = {
+            "s3": self._probe_s3,
+            "bedrock": self._probe_bedrock,
+            "database": self._probe_database,
+        }
+        self._state = {name: _DependencyState() for name in self._probes}
+        self._last_run: Optional[float] = None
+
+    # ── Probes (each returns a detail string or raises) ───────────────────
+
+    def _client(self, service: str) -> Any:
+        client = self._clients.get(service)
+        if client is None:
+            import boto3
+            from botocore.config import Config
+
+            client = boto3.client(
+                service,
+                region_name=settings.AWS_REGION,
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                config=Config(
+                    connect_timeout=settings.HEALTH_PROBE_TIMEOUT_SEC,
+                    read_timeout=settings.HEALTH_PROBE_TIMEOUT_SEC,
+                    retries={"max_attempts": 1},
+                ),
+            )
+            self._clients[service] = client
+        return client
+
+    def _probe_s3(self) -> str:
+        bucket = settings.S3_BUCKET_NAME
+        self._client("s3").head_bucket(Bucket=bucket)
+        return f"Bucket '{bucket}' accessible"
+
+    def _probe_bedrock(self) -> str:
+        model_id = settings.BEDROCK_MODEL_ID
+        client = self._client("bedrock")
+        if ":inference-profile/" in model_id or ":application-inference-profile/" in model_id:
+            profile = client.get_inference_profile(inferenceProfileIdentifier=model_id)
+            return f"Inference profile {profile.get('status', 'unknown')}"
+        model = client.get_foundation_model(modelIdentifier=model_id)
+        lifecycle = model.get("modelDetails", {}).get("modelLifecycle", {}).get("status", "unknown")
+        return f"Model {lifecycle}"
+
+    def _probe_database(self) -> str:
+        from sqlalchemy import text
+
+        from app.db.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+        finally:
+            db.close()
+        return "Database reachable"
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def run_once(self) -> None:
+        """Probe every dependency concurrently and update the cache (blocking)."""
+        def _timed(name: str) -> tuple[str, bool, str, float]:
+            start = time.perf_counter()
+            try:
+                detail, ok = self._probes[name](), True
+            except Exception as exc:
+                detail, ok = f"{name}: {exc}", False
+            return name, ok, detail, (time.perf_counter() - start) * 1000
+
+        with ThreadPoolExecutor(max_workers=len(self._probes)) as pool:
+            results = list(pool.map(_timed, self._probes))
+
+        with self._lock:
+            for name, ok, detail, latency_ms in results:
+                state = self._state[name]
+                was = state.status
+                state.record(ok, detail, latency_ms)
+                if state.status != was and was != "unknown":
+                    logger.warning("health_monitor: %s %s → %s (%s)", name, was, state.status, detail)
+            self._last_run = time.monotonic()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Cached readiness view; never touches the network."""
+        with self._lock:
+            deps = {name: state.to_dict() for name, state in self._state.items()}
+            last_run = self._last_run
+
+        if last_run is None:
+            status = "starting"
+        elif time.monotonic() - last_run > 3 * settings.HEALTH_PROBE_INTERVAL_SEC:
+            status = "stale"  # probe loop stopped or is wedged
+        elif all(d["status"] == "ok" for d in deps.values()):
+            status = "healthy"
+        else:
+            status = "degraded"
+        return {
+            "status": status,
+            "probe_age_sec": round(time.monotonic() - last_run, 1) if last_run is not None else None,
+            **deps,
+        }
+
+
+# Module-level singleton
+health_monitor = HealthMonitor()
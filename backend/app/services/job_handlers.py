@@ -0,0 +1,129 @@
+"""
+app/services/job_handlers.py
+
+Handlers for the durable job queue (see ``app/services/job_queue.py``).
+
+Each handler receives the job's JSON payload and must be idempotent — a job
+is re-run after a worker crash or a failed attempt.  Handlers open their own
+DB sessions; nothing from the enqueuing request is available here.  Raising
+marks the attempt failed and schedules a retry.
+
+``current_job`` describes the running attempt.  Async handlers are cancelled
+when the worker loses the job's lease; sync handlers cannot be, so long ones
+should poll ``lease_lost`` and stop.
+
+Service imports are deferred so the worker only loads what its job types
+need (and so this module can be imported by the API without cycles).
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from app.db.database import SessionLocal
+
+Handler = Callable[[dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+@dataclass
+class JobContext:
+    """The queue attempt a handler is running as (set by the worker)."""
+    attempts:     int
+    max_attempts: int
+    lease_lost:   threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def final_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+
+current_job: ContextVar[Optional[JobContext]] = ContextVar("current_job", default=None)
+
+
+def legal_insight_run(payload: dict[str, Any]) -> None:
+    """
+    Run (or resume) a Legal Insight pipeline.  Permanent failures are
+    recorded on the job row; transient ones raise so the queue retries,
+    except on the final attempt.
+    """
+    from app.services.legal_insight_job_service import legal_insight_job_service
+
+    job = current_job.get()
+    db = SessionLocal()
+    try:
+        legal_insight_job_service.run_job(
+            db,
+            payload["job_id"],
+            raise_retryable=job is not None and not job.final_attempt,
+            should_abort=job.lease_lost.is_set if job is not None else None,
+        )
+    finally:
+        db.close()
+
+
+async def drafting_kb_ingest(payload: dict[str, Any]) -> None:
+    """Push a workspace document's chunks to the Bedrock KB."""
+    from app.db.models import WorkspaceDocument
+    from app.services.drafting_service import _ingest_doc_to_kb
+
+    db = SessionLocal()
+    try:
+        doc = db.query(WorkspaceDocument).filter(WorkspaceDocument.id == payload["doc_id"]).first()
+        if doc is None:
+            return  # deleted before the job ran
+        text, filename = doc.extracted_text or "", doc.filename
+    finally:
+        db.close()
+    await _ingest_doc_to_kb(text, payload["doc_id"], payload["workspace_id"], filename)
+
+
+async def drafting_context_extraction(payload: dict[str, Any]) -> None:
+    """Re-extract a workspace's case context after its documents changed."""
+    from app.services.drafting_service import extract_case_context
+
+    db = SessionLocal()
+    try:
+        await extract_case_context(db, payload["workspace_id"], payload["user_id"])
+    except LookupError:
+        pass  # workspace deleted meanwhile
+    finally:
+        db.close()
+
+
+async def judgment_ingest(payload: dict[str, Any]) -> None:
+    """Ingest IndianKanoon search results into the judgments KB."""
+    from app.services.judgement_ingestion_service import ingest_judgments
+
+    await ingest_judgments(payload["results"], payload.get("query", ""))
+
+
+async def judgment_kb_sync(payload: dict[str, Any]) -> None:
+    """Start the judgments KB ingestion job requested by recent ingestions."""
+    from app.services.judgement_ingestion_service import run_kb_sync
+
+    await run_kb_sync()
+
+
+async def cause_list_process(payload: dict[str, Any]) -> None:
+    """Daily cause-list pipeline (PDF fetch → parse → store) for one date."""
+    from app.api.cause_list import _run_process_job
+
+    await _run_process_job(date.fromisoformat(payload["listing_date"]))
+
+
+HANDLERS: dict[str, Handler] = {
+    "legal_insight.run":           legal_insight_run,
+    "drafting.kb_ingest":          drafting_kb_ingest,
+    "drafting.context_extraction": drafting_context_extraction,
+    "judgment.ingest":             judgment_ingest,
+    "judgment.kb_sync":            judgment_kb_sync,
+    "cause_list.process":          cause_list_process,
+}
+
+
+def is_async(job_type: str) -> bool:
+    return asyncio.iscoroutinefunction(HANDLERS[job_type])
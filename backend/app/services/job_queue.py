@@ -0,0 +1,287 @@
+"""
+app/services/job_queue.py
+
+Postgres-backed durable job queue for heavy background work.
+
+The API process only *enqueues* rows in ``job_queue``; a separate worker
+(``python -m jobs.worker``) dequeues them with ``FOR UPDATE SKIP LOCKED`` so
+any number of workers can poll the same table without blocking each other.
+
+Semantics
+---------
+- ``priority``: lower runs first; ties run oldest ``run_after`` first.
+- Visibility timeout: a dequeued job is leased until ``locked_until``.  The
+  worker extends the lease while the handler runs (``heartbeat``).  If the
+  worker dies the lease lapses and another worker picks the job up again.
+- Retries: a failed attempt is re-queued with exponential backoff plus
+  jitter until ``max_attempts`` is reached, then the job is marked ``dead``.
+- Dedupe: jobs enqueued with the same ``dedupe_key`` while one is still
+  *queued* collapse into the existing row.  A running job does not absorb
+  new ones — its input may already be stale — so one more job can wait
+  behind it.  If the running one then fails, the queued one supersedes its
+  retry.
+- Lease loss: the worker aborts a handler whose lease another worker has
+  taken over (see ``jobs/worker.py``).
+
+Job types and their handlers live in ``app/services/job_handlers.py``.
+"""
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.models import JobQueueEntry, JobQueueStatus
+
+# Backoff for attempt n (1-based): base * 2^(n-1), capped, ±50 % jitter
+_BACKOFF_BASE_SEC = 15
+_BACKOFF_CAP_SEC = 1800
+
+
+def enqueue(
+    db: Session,
+    job_type: str,
+    payload: Optional[dict[str, Any]] = None,
+    *,
+    priority: int = 100,
+    delay_seconds: float = 0,
+    max_attempts: Optional[int] = None,
+    dedupe_key: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Add a job to the queue and commit.
+
+    Returns the new job id, or None when *dedupe_key* matched a job that is
+    still queued (that job will do the work).
+    """
+    now = datetime.utcnow()
+    stmt = pg_insert(JobQueueEntry).values(
+        id=uuid.uuid4(),
+        job_type=job_type,
+        payload=payload or {},
+        priority=priority,
+        status=JobQueueStatus.queued,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_QUEUE_MAX_ATTEMPTS,
+        run_after=now + timedelta(seconds=delay_seconds),
+        dedupe_key=dedupe_key,
+        created_at=now,
+        updated_at=now,
+    )
+    if dedupe_key is not None:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=["dedupe_key"],
+            index_where=JobQueueEntry.status == JobQueueStatus.queued,
+        )
+    row = db.execute(stmt.returning(JobQueueEntry.id)).first()
+    db.commit()
+
+    if row is None:
+        logger.info("job_queue: %s deduplicated (key=%s)", job_type, dedupe_key)
+        return None
+    logger.info("job_queue: enqueued %s %s (priority=%d)", job_type, row.id, priority)
+    return str(row.id)
+
+
+def submit(job_type: str, payload: Optional[dict[str, Any]] = None, **kwargs: Any) -> Optional[str]:
+    """``enqueue`` on a private session — for callers without one at hand."""
+    from app.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return enqueue(db, job_type, payload, **kwargs)
+    finally:
+        db.close()
+
+
+def dequeue(
+    db: Session,
+    job_types: list[str],
+    worker_id: str,
+    visibility_seconds: int,
+    limit: int = 1,
+) -> list[dict[str, Any]]:
+    """
+    Lease up to *limit* runnable jobs of *job_types* for *worker_id*.
+
+    Runnable = queued and due, or running with an expired lease (abandoned by
+    a dead worker).  Returns plain dicts so callers need no open session.
+    """
+    now = datetime.utcnow()
+    candidates = (
+        select(JobQueueEntry.id)
+        .where(
+            JobQueueEntry.job_type.in_(job_types),
+            JobQueueEntry.attempts < JobQueueEntry.max_attempts,
+            or_(
+                (JobQueueEntry.status == JobQueueStatus.queued)
+                & (JobQueueEntry.run_after <= now),
+                (JobQueueEntry.status == JobQueueStatus.running)
+                & (JobQueueEntry.locked_until < now),
+            ),
+        )
+        .order_by(JobQueueEntry.priority, JobQueueEntry.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        update(JobQueueEntry)
+        .where(JobQueueEntry.id.in_(candidates))
+        .values(
+            status=JobQueueStatus.running,
+            attempts=JobQueueEntry.attempts + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=visibility_seconds),
+            updated_at=now,
+        )
+        .returning(
+            JobQueueEntry.id,
+            JobQueueEntry.job_type,
+            JobQueueEntry.payload,
+            JobQueueEntry.attempts,
+            JobQueueEntry.max_attempts,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return [
+        {
+            "id": str(r.id),
+            "job_type": r.job_type,
+            "payload": r.payload or {},
+            "attempts": r.attempts,
+            "max_attempts": r.max_attempts,
+        }
+        for r in rows
+    ]
+
+
+def heartbeat(db: Session, job_id: str, worker_id: str, visibility_seconds: int) -> bool:
+    """Extend the lease of a job this worker still owns.  False if it lost it."""
+    result = db.execute(
+        update(JobQueueEntry)
+        .where(
+            JobQueueEntry.id == job_id,
+            JobQueueEntry.locked_by == worker_id,
+            JobQueueEntry.status == JobQueueStatus.running,
+        )
+        .values(locked_until=datetime.utcnow() + timedelta(seconds=visibility_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def complete(db: Session, job_id: str, worker_id: str) -> None:
+    now = datetime.utcnow()
+    db.execute(
+        update(JobQueueEntry)
+        .where(JobQueueEntry.id == job_id, JobQueueEntry.locked_by == worker_id)
+        .values(
+            status=JobQueueStatus.succeeded,
+            locked_until=None,
+            finished_at=now,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def fail(
+    db: Session,
+    job_id: str,
+    worker_id: str,
+    error: str,
+    attempts: int,
+    max_attempts: int,
+) -> None:
+    """Record a failed attempt: re-queue with backoff, or mark the job dead."""
+    now = datetime.utcnow()
+    values: dict[str, Any] = {
+        "last_error": (error or "")[:4000],
+        "locked_until": None,
+        "updated_at": now,
+    }
+    if attempts >= max_attempts:
+        values.update(status=JobQueueStatus.dead, finished_at=now)
+        logger.error("job_queue: job %s dead after %d attempts: %s", job_id, attempts, error)
+    else:
+        delay = min(_BACKOFF_CAP_SEC, _BACKOFF_BASE_SEC * 2 ** (attempts - 1))
+        delay *= random.uniform(0.5, 1.5)
+        values.update(status=JobQueueStatus.queued, run_after=now + timedelta(seconds=delay))
+        logger.warning(
+            "job_queue: job %s attempt %d/%d failed (%s) — retry in %.0fs",
+            job_id, attempts, max_attempts, error, delay,
+        )
+    stmt = (
+        update(JobQueueEntry)
+        .where(JobQueueEntry.id == job_id, JobQueueEntry.locked_by == worker_id)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        db.execute(stmt.values(**values))
+        db.commit()
+    except IntegrityError:
+        # A job with the same dedupe key was queued while this one ran; it
+        # does the same work with newer input, so it replaces this retry.
+        db.rollback()
+        values.update(
+            status=JobQueueStatus.dead,
+            finished_at=now,
+            last_error=f"{values['last_error']} (superseded by a queued duplicate)"[:4000],
+        )
+        values.pop("run_after", None)
+        db.execute(stmt.values(**values))
+        db.commit()
+        logger.info("job_queue: job %s superseded by a queued duplicate", job_id)
+
+
+def reap_abandoned(db: Session) -> int:
+    """
+    Mark running jobs dead when their lease expired on the final attempt
+    (dequeue will not hand them out again, so they would otherwise stay
+    'running' forever).
+    """
+    now = datetime.utcnow()
+    result = db.execute(
+        update(JobQueueEntry)
+        .where(
+            JobQueueEntry.status == JobQueueStatus.running,
+            JobQueueEntry.locked_until < now,
+            JobQueueEntry.attempts >= JobQueueEntry.max_attempts,
+        )
+        .values(
+            status=JobQueueStatus.dead,
+            last_error="visibility timeout expired on final attempt",
+            finished_at=now,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def purge_finished(db: Session, older_than_days: int = 7) -> int:
+    """Delete succeeded/dead jobs finished more than *older_than_days* ago."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = (
+        db.query(JobQueueEntry)
+        .filter(
+            JobQueueEntry.status.in_([JobQueueStatus.succeeded, JobQueueStatus.dead]),
+            JobQueueEntry.finished_at < cutoff,
+        )
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -8,10 +8,21 @@ API hit — results are cached in Bedrock KB so future searches are free and fas
 
 Flow:
   1. Receive judgment list from IndianKanoon
-  2. Fetch full document text for each judgment (IndianKanoon /doc/ endpoint)
-  3. Chunk into overlapping segments
-  4. Write document + companion .metadata.json to S3
-  5. Trigger Bedrock KB ingestion job to embed new docs
+  2. Drop doc ids already in the ingested-doc manifest (no per-doc S3 HEAD)
+  3. Fetch full document text for the rest (IndianKanoon /doc/ endpoint),
+     at most JUDGMENT_INGEST_CONCURRENCY at a time
+  4. Chunk into overlapping segments
+  5. Write document + companion .metadata.json to S3 (off the event loop)
+  6. Schedule a debounced Bedrock KB ingestion job — many ingestion calls
+     within JUDGMENT_KB_SYNC_DEBOUNCE_SECONDS coalesce into one sync (a
+     delayed ``judgment.kb_sync`` queue job when JOB_QUEUE_ENABLED)
+
+Manifest:
+  The set of ingested doc ids is loaded once per process from a paginated
+  S3 listing of the judgments/ prefix and refreshed every
+  JUDGMENT_MANIFEST_REFRESH_SECONDS; ids written by this process are added
+  immediately.  Doc ids being fetched right now are tracked too, so
+  overlapping Precedent Finder turns never pay twice for the same /doc/.
 
 Bedrock KB ingestion model:
   - Documents stored as plain text in S3 (lawmate-judgments-kb bucket)
@@ -25,14 +36,21 @@ Environment variables:
   JUDGMENT_KB_S3_BUCKET        — S3 bucket for judgment documents
   INDIANKANOON_API_TOKEN       — for fetching full document text
   AWS_REGION
+  JUDGMENT_INGEST_CONCURRENCY       — parallel doc fetches (default 4)
+  JUDGMENT_KB_SYNC_DEBOUNCE_SECONDS — KB sync coalescing window (default 60)
+  JUDGMENT_MANIFEST_REFRESH_SECONDS — manifest re-list interval (default 3600)
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import re
+import threading
+import time
+import weakref
 from datetime import datetime
 from typing import Optional
 
@@ -45,6 +63,12 @@ BEDROCK_KB_ID          = os.getenv("BEDROCK_KNOWLEDGE_BASE_ID", "")
 BEDROCK_KB_DS_ID       = os.getenv("BEDROCK_KB_DATA_SOURCE_ID", "")
 AWS_REGION             = os.getenv("AWS_REGION", "ap-south-1")
 
+INGEST_CONCURRENCY       = max(1, int(os.getenv("JUDGMENT_INGEST_CONCURRENCY", "4")))
+KB_SYNC_DEBOUNCE_SECONDS = float(os.getenv("JUDGMENT_KB_SYNC_DEBOUNCE_SECONDS", "60"))
+MANIFEST_REFRESH_SECONDS = float(os.getenv("JUDGMENT_MANIFEST_REFRESH_SECONDS", "3600"))
+
+_JUDGMENT_PREFIX = "judgments/"
+
 CHUNK_SIZE    = 800   # tokens per chunk (approximate — using word count)
 CHUNK_OVERLAP = 150   # overlap between chunks for context continuity
 
@@ -91,64 +115,171 @@ async def ingest_judgments(
 
     stats = {"ingested": 0, "failed": 0, "skipped": 0}
 
+    manifest = await _get_manifest()
+    pending: list[dict] = []
     for judgment in judgments:
-        doc_id = judgment.get("doc_id")
+        doc_id = str(judgment.get("doc_id") or "")
         if not doc_id:
             stats["skipped"] += 1
             continue
-
-        # Check if already in KB (by S3 key existence)
-        s3_key = _judgment_s3_key(doc_id)
-        if await _s3_key_exists(s3_key):
+        # Already in KB, or being ingested by an overlapping call
+        if not manifest.claim(doc_id):
             logger.debug("Judgment %s already in KB — skipping", doc_id)
             stats["skipped"] += 1
             continue
+        # Manifest could not be listed at all: fall back to a HEAD per doc
+        # rather than risk paying for documents that are already stored.
+        if not manifest.loaded_at and await _s3_key_exists(_judgment_s3_key(doc_id)):
+            manifest.release(doc_id, stored=True)
+            stats["skipped"] += 1
+            continue
+        pending.append(judgment)
 
-        try:
+    if pending:
+        semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
+        import httpx
+
+        async with httpx.AsyncClient(timeout=15.0) as http:
+            outcomes = await asyncio.gather(
+                *(_ingest_one(j, query, http, semaphore, manifest) for j in pending)
+            )
+        for outcome in outcomes:
+            stats[outcome] += 1
+
+    # Coalesce KB sync with other recent ingestion calls
+    if stats["ingested"] > 0:
+        await _schedule_kb_sync()
+
+    logger.info(
+        "Judgment ingestion complete: +%d ingested, %d failed, %d skipped",
+        stats["ingested"], stats["failed"], stats["skipped"],
+    )
+    return stats
+
+
+async def _ingest_one(
+    judgment:  dict,
+    query:     str,
+    http,
+    semaphore: asyncio.Semaphore,
+    manifest:  "_Manifest",
+) -> str:
+    """Fetch, chunk and store one judgment.  Returns the stats bucket name."""
+    doc_id = str(judgment["doc_id"])
+    s3_key = _judgment_s3_key(doc_id)
+    stored = False
+    try:
+        async with semaphore:
             # Fetch full document text from IndianKanoon
-            full_text = await _fetch_judgment_text(doc_id)
+            full_text = await _fetch_judgment_text(doc_id, client=http)
             if not full_text:
-                stats["skipped"] += 1
-                continue
+                return "skipped"
 
             # Chunk the document
             chunks = _chunk_text(full_text)
 
-            # Write document to S3 (full text, chunked and joined)
+            # Document text and companion metadata are independent writes
             document_text = _build_document_text(judgment, chunks)
-            await _write_to_s3(s3_key, document_text.encode("utf-8"), "text/plain")
+            metadata      = _build_metadata(judgment, query)
+            meta_bytes    = json.dumps(metadata, ensure_ascii=False, indent=2).encode("utf-8")
+            await asyncio.gather(
+                _write_to_s3(s3_key, document_text.encode("utf-8"), "text/plain"),
+                _write_to_s3(_metadata_s3_key(s3_key), meta_bytes, "application/json"),
+            )
+            stored = True
+            return "ingested"
 
-            # Write companion metadata file to S3
-            metadata    = _build_metadata(judgment, query)
-            meta_s3_key = _metadata_s3_key(s3_key)
-            meta_bytes  = json.dumps(metadata, ensure_ascii=False, indent=2).encode("utf-8")
-            await _write_to_s3(meta_s3_key, meta_bytes, "application/json")
+    except Exception as e:
+        logger.warning("Judgment ingestion failed for doc %s: %s", doc_id, e)
+        return "failed"
 
-            stats["ingested"] += 1
+    finally:
+        manifest.release(doc_id, stored=stored)
 
-        except Exception as e:
-            logger.warning("Judgment ingestion failed for doc %s: %s", doc_id, e)
-            stats["failed"] += 1
 
-    # Trigger Bedrock KB sync job if anything was ingested
-    if stats["ingested"] > 0:
-        await _trigger_kb_sync()
+# ============================================================================
+# Ingested-doc manifest
+# ============================================================================
 
-    logger.info(
-        "Judgment ingestion complete: +%d ingested, %d failed, %d skipped",
-        stats["ingested"], stats["failed"], stats["skipped"],
-    )
-    return stats
+class _Manifest:
+    """In-process set of doc ids already stored under the judgments/ prefix."""
+
+    def __init__(self) -> None:
+        self._ids:      set[str] = set()
+        self._inflight: set[str] = set()
+        self._lock      = threading.Lock()
+        self.loaded_at: float = 0.0
+
+    def replace(self, ids: set[str]) -> None:
+        with self._lock:
+            self._ids = ids
+            self.loaded_at = time.monotonic()
+
+    def is_stale(self) -> bool:
+        return not self.loaded_at or time.monotonic() - self.loaded_at > MANIFEST_REFRESH_SECONDS
+
+    def claim(self, doc_id: str) -> bool:
+        """Reserve *doc_id* for ingestion; False if stored or already claimed."""
+        with self._lock:
+            if doc_id in self._ids or doc_id in self._inflight:
+                return False
+            self._inflight.add(doc_id)
+            return True
+
+    def release(self, doc_id: str, stored: bool) -> None:
+        with self._lock:
+            self._inflight.discard(doc_id)
+            if stored:
+                self._ids.add(doc_id)
+
+
+_manifest = _Manifest()
+# One reload lock per event loop: an asyncio.Lock is bound to the loop it is
+# first used on (scripts and tests run their own loops next to the app's).
+_manifest_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _get_manifest() -> _Manifest:
+    """Return the manifest, (re)loading it from S3 when stale."""
+    if not _manifest.is_stale():
+        return _manifest
+    lock = _manifest_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+    async with lock:
+        if _manifest.is_stale():
+            try:
+                ids = await asyncio.to_thread(_list_ingested_doc_ids)
+                _manifest.replace(ids)
+                logger.info("Judgment manifest loaded: %d docs", len(ids))
+            except Exception as e:
+                # Keep whatever we had; retry on the next call.
+                logger.warning("Judgment manifest refresh failed: %s", e)
+    return _manifest
+
+
+def _list_ingested_doc_ids() -> set[str]:
+    """Blocking: list judgments/<doc_id>.txt keys with a paginated LIST."""
+    ids: set[str] = set()
+    paginator = _s3_client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=JUDGMENT_KB_S3_BUCKET, Prefix=_JUDGMENT_PREFIX):
+        for obj in page.get("Contents", []) or []:
+            key = obj.get("Key", "")
+            if key.endswith(".txt"):
+                ids.add(key[len(_JUDGMENT_PREFIX):-len(".txt")])
+    return ids
 
 
 # ============================================================================
 # IndianKanoon full document fetch
 # ============================================================================
 
-async def _fetch_judgment_text(doc_id: str) -> Optional[str]:
+async def _fetch_judgment_text(doc_id: str, client=None) -> Optional[str]:
     """
     Fetches full judgment text from IndianKanoon /doc/ endpoint.
     Cost: ₹0.50 per document fetch.
+
+    Pass an open httpx.AsyncClient as *client* to reuse its connection pool.
     """
     if not INDIANKANOON_TOKEN:
         return None
@@ -156,13 +287,16 @@ async def _fetch_judgment_text(doc_id: str) -> Optional[str]:
     try:
         import httpx
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                f"{INDIANKANOON_API_URL}/doc/{doc_id}/",
-                headers={"Authorization": f"Token {INDIANKANOON_TOKEN}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        if client is None:
+            async with httpx.AsyncClient(timeout=15.0) as own_client:
+                return await _fetch_judgment_text(doc_id, client=own_client)
+
+        resp = await client.post(
+            f"{INDIANKANOON_API_URL}/doc/{doc_id}/",
+            headers={"Authorization": f"Token {INDIANKANOON_TOKEN}"},
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         # Response contains HTML — strip tags for clean text
         html_text = data.get("doc", "")
@@ -324,23 +458,37 @@ def _metadata_s3_key(document_s3_key: str) -> str:
     return f"{document_s3_key}.metadata.json"
 
 
+_s3 = None
+_s3_lock = threading.Lock()
+
+
+def _s3_client():
+    """Shared S3 client (boto3 clients are thread-safe)."""
+    global _s3
+    if _s3 is None:
+        with _s3_lock:
+            if _s3 is None:
+                import boto3
+                _s3 = boto3.client("s3", region_name=AWS_REGION)
+    return _s3
+
+
 async def _s3_key_exists(s3_key: str) -> bool:
-    """Checks if a judgment is already stored in S3."""
-    try:
-        import boto3
-        s3 = boto3.client("s3", region_name=AWS_REGION)
-        s3.head_object(Bucket=JUDGMENT_KB_S3_BUCKET, Key=s3_key)
-        return True
-    except Exception:
-        return False
+    """Checks if a judgment is already stored in S3 (single HEAD)."""
+    def _head() -> bool:
+        try:
+            _s3_client().head_object(Bucket=JUDGMENT_KB_S3_BUCKET, Key=s3_key)
+            return True
+        except Exception:
+            return False
 
+    return await asyncio.to_thread(_head)
 
-async def _write_to_s3(s3_key: str, body: bytes, content_type: str) -> None:
-    """Writes bytes to S3."""
-    import boto3
 
-    s3 = boto3.client("s3", region_name=AWS_REGION)
-    s3.put_object(
+async def _write_to_s3(s3_key: str, body: bytes, content_type: str) -> None:
+    """Writes bytes to S3 on a worker thread."""
+    await asyncio.to_thread(
+        _s3_client().put_object,
         Bucket=JUDGMENT_KB_S3_BUCKET,
         Key=s3_key,
         Body=body,
@@ -353,25 +501,118 @@ async def _write_to_s3(s3_key: str, body: bytes, content_type: str) -> None:
 # Bedrock KB sync trigger
 # ============================================================================
 
-async def _trigger_kb_sync() -> None:
+KB_SYNC_JOB = "judgment.kb_sync"
+
+_kb_sync_task: Optional[asyncio.Task] = None
+_kb_sync_dirty = False
+
+
+async def _schedule_kb_sync() -> None:
+    """
+    Request a KB sync.  The first request opens a debounce window; every
+    request inside it is served by the single sync that runs when it closes.
+
+    With the job queue on, the window is a delayed ``judgment.kb_sync`` job
+    deduplicated while queued, so it survives this process exiting, and a
+    request made while that job runs queues the next one.  Otherwise it is
+    an in-process timer (flushed on shutdown by ``flush_kb_sync``); a request
+    arriving once its sync is already being started marks the task dirty,
+    and it runs one more window afterwards.
+    """
+    from app.core.config import settings
+
+    if settings.JOB_QUEUE_ENABLED:
+        from app.services import job_queue
+
+        try:
+            await asyncio.to_thread(
+                job_queue.submit, KB_SYNC_JOB,
+                delay_seconds=KB_SYNC_DEBOUNCE_SECONDS, dedupe_key=KB_SYNC_JOB,
+            )
+            return
+        except Exception as e:
+            logger.warning("KB sync enqueue failed, syncing in-process: %s", e)
+
+    global _kb_sync_task, _kb_sync_dirty
+    loop = asyncio.get_running_loop()
+    if _kb_sync_task is not None and not _kb_sync_task.done() and _kb_sync_task.get_loop() is loop:
+        _kb_sync_dirty = True
+        return
+    _kb_sync_task = loop.create_task(_debounced_kb_sync())
+
+
+async def _debounced_kb_sync() -> None:
+    global _kb_sync_dirty
+    while True:
+        await asyncio.sleep(KB_SYNC_DEBOUNCE_SECONDS)
+        # Everything stored up to here is picked up by the job started below
+        _kb_sync_dirty = False
+        if not await _trigger_kb_sync():
+            # A job is already running for the data source (or the call failed):
+            # try once more after another window so these docs are not stranded.
+            await asyncio.sleep(KB_SYNC_DEBOUNCE_SECONDS)
+            await _trigger_kb_sync()
+        if not _kb_sync_dirty:
+            return
+
+
+async def flush_kb_sync() -> None:
+    """Start a sync still waiting on the in-process timer now (app shutdown)."""
+    global _kb_sync_task
+    task, _kb_sync_task = _kb_sync_task, None
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    await _trigger_kb_sync()
+
+
+async def run_kb_sync() -> None:
+    """Queue handler for ``judgment.kb_sync``: raises so the queue retries a sync that did not start."""
+    if not await _trigger_kb_sync():
+        raise RuntimeError("Bedrock KB ingestion job not started")
+
+
+_bedrock_agent = None
+_bedrock_agent_lock = threading.Lock()
+
+
+def _bedrock_agent_client():
+    """Shared bedrock-agent client (boto3 clients are thread-safe)."""
+    global _bedrock_agent
+    if _bedrock_agent is None:
+        with _bedrock_agent_lock:
+            if _bedrock_agent is None:
+                import boto3
+                _bedrock_agent = boto3.client("bedrock-agent", region_name=AWS_REGION)
+    return _bedrock_agent
+
+
+async def _trigger_kb_sync() -> bool:
     """
     Triggers a Bedrock KB ingestion job to embed newly added S3 documents.
     Fire-and-forget — ingestion runs asynchronously in Bedrock.
+    Returns True if a job was started.
     """
     if not BEDROCK_KB_ID or not BEDROCK_KB_DS_ID:
         logger.warning("KB sync skipped — KB ID or data source ID not configured")
-        return
-
-    try:
-        import boto3
+        return True
 
-        client = boto3.client("bedrock-agent", region_name=AWS_REGION)
-        resp   = client.start_ingestion_job(
+    def _start() -> dict:
+        return _bedrock_agent_client().start_ingestion_job(
             knowledgeBaseId=BEDROCK_KB_ID,
             dataSourceId=BEDROCK_KB_DS_ID,
         )
+
+    try:
+        resp   = await asyncio.to_thread(_start)
         job_id = resp.get("ingestionJob", {}).get("ingestionJobId", "unknown")
         logger.info("Bedrock KB ingestion job started: %s", job_id)
+        return True
 
     except Exception as e:
         logger.warning("KB sync trigger failed (non-blocking): %s", e)
+        return False
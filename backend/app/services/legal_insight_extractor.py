@@ -8,7 +8,12 @@ BBox is stored as percentage of page dimensions so the frontend PdfViewer
 from __future__ import annotations
 
 import hashlib
-from typing import Optional
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, Optional
 
 import boto3
 import fitz  # PyMuPDF
@@ -22,10 +27,18 @@ from app.core.logger import logger
 # stays representative.
 _DEFAULT_MAX_CHUNKS = 300
 
-# OCR fallback threshold: if the average extractable characters per page falls
-# below this value, the PDF is likely a scanned image rather than a text PDF.
+# OCR fallback threshold: a page with an image and fewer extractable
+# characters than this is treated as scanned and OCR'd.
 _OCR_AVG_CHARS_THRESHOLD = 200
 
+# Bump when chunking output changes so extraction reuse by PDF hash
+# (see extraction_key) never serves chunks in an old layout.
+_EXTRACTOR_VERSION = "2"
+
+# get_text("dict") flags without TEXT_PRESERVE_IMAGES: image blocks (and
+# their pixel data) are skipped, scanned pages are detected via get_images().
+_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
 
 class LegalInsightExtractor:
     """Handles PDF download from S3, text extraction, and optional OCR fallback."""
@@ -59,9 +72,18 @@ class LegalInsightExtractor:
         return hashlib.sha256(data).hexdigest()
 
     # ------------------------------------------------------------------
-    # Chunk extraction
+    # Chunk extraction (single pass)
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def extraction_key(max_chars: int, max_chunks: int, enable_ocr: bool) -> str:
+        """
+        Identifies the chunk layout produced for given settings; together with
+        the PDF hash it lets a job reuse another job's extracted chunks.
+        """
+        raw = f"{_EXTRACTOR_VERSION}|{max_chars}|{max_chunks}|{int(enable_ocr)}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
     def extract_chunks(
         self, pdf_bytes: bytes, max_chars: int = 3000
     ) -> list[dict]:
@@ -72,73 +94,143 @@ class LegalInsightExtractor:
         Returns a list of chunk dicts with keys:
             chunk_id, page_number, bbox, text, char_start, char_end
         """
+        return list(self.iter_chunks(pdf_bytes, enable_ocr=False, max_chars=max_chars))
+
+    def iter_chunks(
+        self,
+        pdf_bytes: bytes,
+        enable_ocr: bool,
+        max_chars: int,
+        on_ocr: Optional[Callable[[], None]] = None,
+    ) -> Iterator[dict]:
+        """
+        Single pass over the PDF yielding chunks in document order.
+
+        Each page's layout blocks and character count come from one
+        ``get_text("dict")`` call.  A page is OCR'd only when OCR is enabled
+        and it looks scanned (an image page with fewer than
+        _OCR_AVG_CHARS_THRESHOLD extractable characters); those pages are
+        OCR'd in a process pool while later pages are analysed.  *on_ocr* is
+        called once, when the first such page is found.
+
+        Native pages: blocks merged up to *max_chars*, bbox as 0-100 %.
+        OCR pages: text split into *max_chars* pieces, no bbox.
+        """
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        state = {"chunk_idx": 0, "char_offset": 0, "raw": 0, "out": 0, "pages": 0, "ocr_pages": 0}
+        window = max(1, settings.LEGAL_INSIGHT_OCR_WORKERS) * 2
+        pending: deque[_PageResult] = deque()
+
+        try:
+            for page_num, page in enumerate(doc, start=1):
+                state["pages"] += 1
+                result = self._analyze_page(doc, page, page_num, enable_ocr)
+                if result.ocr is not None:
+                    state["ocr_pages"] += 1
+                    if state["ocr_pages"] == 1 and on_ocr is not None:
+                        on_ocr()
+                pending.append(result)
+                # Emit finished pages in order; bound the OCR look-ahead.
+                while pending and (pending[0].ready() or len(pending) > window):
+                    yield from self._emit_page(pending.popleft(), max_chars, state)
+            while pending:
+                yield from self._emit_page(pending.popleft(), max_chars, state)
+        finally:
+            for result in pending:
+                if result.ocr is not None:
+                    result.ocr.cancel()
+            doc.close()
 
-        raw_chunks: list[dict] = []
-        chunk_idx: int = 0
-        char_offset: int = 0
-
-        for page_num, page in enumerate(doc, start=1):
-            page_width: float = page.rect.width
-            page_height: float = page.rect.height
-
-            block_dict = page.get_text("dict")
-            for block in block_dict.get("blocks", []):
-                if block.get("type") != 0:
-                    # Skip non-text blocks (images, etc.)
-                    continue
-
-                # Assemble all span text for this block
-                lines = block.get("lines", [])
-                text_parts: list[str] = []
-                for line in lines:
-                    for span in line.get("spans", []):
-                        text_parts.append(span.get("text", ""))
-                text: str = "".join(text_parts).strip()
-
-                if not text:
-                    continue
-
-                # Compute bbox as percentage of page dimensions
-                b = block["bbox"]  # (x0, y0, x1, y1)
-                x: float = (b[0] / page_width) * 100.0
-                y: float = (b[1] / page_height) * 100.0
-                width: float = ((b[2] - b[0]) / page_width) * 100.0
-                height: float = ((b[3] - b[1]) / page_height) * 100.0
-
-                chunk: dict = {
-                    "chunk_id": f"chunk_{chunk_idx:06d}",
-                    "page_number": page_num,
-                    "bbox": {
-                        "x": x,
-                        "y": y,
-                        "width": width,
-                        "height": height,
-                    },
-                    "text": text,
-                    "char_start": char_offset,
-                    "char_end": char_offset + len(text),
-                }
-
-                char_offset += len(text)
-                chunk_idx += 1
-                raw_chunks.append(chunk)
+        logger.info(
+            "Extracted %d raw blocks from %d pages (%d OCR'd), emitted %d chunks",
+            state["raw"], state["pages"], state["ocr_pages"], state["out"],
+        )
 
-        doc.close()
+    def _analyze_page(
+        self, doc: "fitz.Document", page: "fitz.Page", page_num: int, enable_ocr: bool
+    ) -> "_PageResult":
+        page_width: float = page.rect.width
+        page_height: float = page.rect.height
+
+        # Text blocks only — image payloads are never needed here.
+        block_dict = page.get_text("dict", flags=_DICT_FLAGS)
+        blocks: list[tuple[str, dict]] = []
+        n_chars = 0
+        for block in block_dict.get("blocks", []):
+            if block.get("type") != 0:
+                continue
+
+            # Assemble all span text for this block
+            text_parts: list[str] = []
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    text_parts.append(span.get("text", ""))
+            text: str = "".join(text_parts).strip()
+            if not text:
+                continue
+            n_chars += len(text)
+
+            # Compute bbox as percentage of page dimensions
+            b = block["bbox"]  # (x0, y0, x1, y1)
+            blocks.append((text, {
+                "x": (b[0] / page_width) * 100.0,
+                "y": (b[1] / page_height) * 100.0,
+                "width": ((b[2] - b[0]) / page_width) * 100.0,
+                "height": ((b[3] - b[1]) / page_height) * 100.0,
+            }))
+
+        if enable_ocr and n_chars < _OCR_AVG_CHARS_THRESHOLD and page.get_images(full=False):
+            page_pdf = _page_pdf(doc, page_num - 1)
+            return _PageResult(page_num, blocks, ocr=_submit_ocr(page_pdf, page_num), page_pdf=page_pdf)
+        return _PageResult(page_num, blocks)
+
+    def _emit_page(self, result: "_PageResult", max_chars: int, state: dict) -> Iterator[dict]:
+        if result.ocr is not None:
+            try:
+                text = _ocr_result(result.ocr, result.page_pdf, result.page_num)
+            except Exception as exc:
+                logger.warning("OCR failed on page %d (%s) — using native text", result.page_num, exc)
+                text = " ".join(t for t, _ in result.blocks)
+            pieces = [
+                (text[i : i + max_chars].strip(), None) for i in range(0, len(text), max_chars)
+            ]
+            page_chunks = self._number([p for p in pieces if p[0]], result.page_num, state)
+        else:
+            page_chunks = self._merge_page_chunks(
+                self._number(result.blocks, result.page_num, state), max_chars
+            )
+        state["raw"] += len(result.blocks)
+        state["out"] += len(page_chunks)
+        yield from page_chunks
+
+    @staticmethod
+    def _number(items: list[tuple[str, Optional[dict]]], page_num: int, state: dict) -> list[dict]:
+        """Assign document-order chunk ids and char offsets."""
+        out: list[dict] = []
+        for text, bbox in items:
+            out.append({
+                "chunk_id": f"chunk_{state['chunk_idx']:06d}",
+                "page_number": page_num,
+                "bbox": bbox,
+                "text": text,
+                "char_start": state["char_offset"],
+                "char_end": state["char_offset"] + len(text),
+            })
+            state["char_offset"] += len(text)
+            state["chunk_idx"] += 1
+        return out
 
-        # ------------------------------------------------------------------
-        # Merge small adjacent chunks on the same page up to max_chars
-        # ------------------------------------------------------------------
+    @staticmethod
+    def _merge_page_chunks(raw_chunks: list[dict], max_chars: int) -> list[dict]:
+        """Merge small adjacent chunks of one page up to *max_chars*."""
         merged: list[dict] = []
         i = 0
         while i < len(raw_chunks):
             current = dict(raw_chunks[i])  # shallow copy
-            # Try to absorb subsequent chunks from the same page
+            # Try to absorb subsequent chunks
             j = i + 1
             while j < len(raw_chunks):
                 nxt = raw_chunks[j]
-                if nxt["page_number"] != current["page_number"]:
-                    break
                 combined_len = len(current["text"]) + 1 + len(nxt["text"])
                 if combined_len > max_chars:
                     break
@@ -149,12 +241,6 @@ class LegalInsightExtractor:
 
             merged.append(current)
             i = j
-
-        logger.info(
-            "Extracted %d raw chunks, merged to %d chunks",
-            len(raw_chunks),
-            len(merged),
-        )
         return merged
 
     # ------------------------------------------------------------------
@@ -166,9 +252,8 @@ class LegalInsightExtractor:
         Return the average number of extractable characters per page.
 
         A value below _OCR_AVG_CHARS_THRESHOLD (200) indicates a scanned PDF
-        (poor or absent text layer) and should trigger OCR fallback.
-        Using per-page average is far more reliable than the old chunk-ratio
-        heuristic, which almost never triggered OCR even on scanned documents.
+        (poor or absent text layer).  The extraction pipeline itself makes
+        this decision per page; this is kept for diagnostics.
         """
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         n_pages = len(doc)
@@ -177,43 +262,36 @@ class LegalInsightExtractor:
             return 0.0
         total_chars = sum(len(page.get_text("text")) for page in doc)
         doc.close()
-        avg = total_chars / n_pages
-        logger.info(
-            "PDF quality: %.1f avg chars/page over %d pages (threshold %d)",
-            avg,
-            n_pages,
-            _OCR_AVG_CHARS_THRESHOLD,
-        )
-        return avg
+        return total_chars / n_pages
 
     # ------------------------------------------------------------------
     # Chunk sampling
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _sample_chunks(chunks: list[dict], max_chunks: int) -> list[dict]:
+    def sample_indices(n: int, max_chunks: int) -> list[int]:
         """
-        Evenly sample *max_chunks* from *chunks*, preserving document order.
+        Indices (ascending) of an even sample of *max_chunks* out of *n*.
         The first and last chunks are always kept so the opening paragraph
         (case title, bench) and final order are never dropped.
         """
-        if len(chunks) <= max_chunks:
-            return chunks
-
-        step = len(chunks) / max_chunks
-        sampled = []
-        seen: set[int] = set()
-        for i in range(max_chunks):
-            idx = min(int(i * step), len(chunks) - 1)
-            if idx not in seen:
-                sampled.append(chunks[idx])
-                seen.add(idx)
+        if n <= max_chunks:
+            return list(range(n))
 
+        step = n / max_chunks
+        picked = sorted({min(int(i * step), n - 1) for i in range(max_chunks)})
         # Always keep last chunk (final order section)
-        last_idx = len(chunks) - 1
-        if last_idx not in seen:
-            sampled.append(chunks[last_idx])
+        if picked[-1] != n - 1:
+            picked.append(n - 1)
+        return picked
 
+    @classmethod
+    def _sample_chunks(cls, chunks: list[dict], max_chunks: int) -> list[dict]:
+        """Evenly sample *max_chunks* from *chunks*, preserving document order."""
+        if len(chunks) <= max_chunks:
+            return chunks
+
+        sampled = [chunks[i] for i in cls.sample_indices(len(chunks), max_chunks)]
         logger.info(
             "_sample_chunks: reduced %d → %d chunks", len(chunks), len(sampled)
         )
@@ -231,10 +309,7 @@ class LegalInsightExtractor:
         max_chunks: int = _DEFAULT_MAX_CHUNKS,
     ) -> tuple[list[dict], bool]:
         """
-        Extract text from *pdf_bytes*.
-
-        OCR fallback is triggered when avg chars/page < _OCR_AVG_CHARS_THRESHOLD
-        (200), which reliably detects scanned-image PDFs.
+        Extract text from *pdf_bytes*, OCR-ing scanned pages when *enable_ocr*.
 
         After extraction and merging, chunks are evenly sampled down to
         *max_chunks* (default 300) to prevent extremely large documents from
@@ -242,64 +317,114 @@ class LegalInsightExtractor:
 
         Returns (chunks, ocr_used).
         """
-        # Quality check on raw bytes — cheaper than extracting all chunks first.
-        avg_chars = self.assess_quality_avg_chars(pdf_bytes)
-        needs_ocr = enable_ocr and (avg_chars < _OCR_AVG_CHARS_THRESHOLD)
-
-        if not needs_ocr:
-            chunks = self.extract_chunks(pdf_bytes, max_chars)
-            chunks = self._sample_chunks(chunks, max_chunks)
-            return chunks, False
-
-        # ---- OCR fallback ------------------------------------------------
-        logger.info(
-            "Avg chars/page %.1f < threshold %d — running OCR fallback via fitz",
-            avg_chars,
-            _OCR_AVG_CHARS_THRESHOLD,
+        ocr_used: list[bool] = []
+        chunks = list(
+            self.iter_chunks(pdf_bytes, enable_ocr, max_chars, on_ocr=lambda: ocr_used.append(True))
         )
-        ocr_chunks: list[dict] = []
-        chunk_idx = 0
-        char_offset = 0
+        return self._sample_chunks(chunks, max_chunks), bool(ocr_used)
 
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        for page_num, page in enumerate(doc, start=1):
-            try:
-                # Use fitz's built-in OCR (requires Tesseract installed)
-                tp = page.get_textpage_ocr(flags=0, full=True)
-                text = tp.extractText().strip()
-            except Exception:
-                # Fallback: plain text extraction without OCR
-                text = page.get_text("text").strip()
 
-            if not text:
-                continue
+# ----------------------------------------------------------------------
+# Page results + OCR process pool
+# ----------------------------------------------------------------------
 
-            # Split long OCR text into chunks of max_chars
-            start = 0
-            while start < len(text):
-                chunk_text = text[start : start + max_chars].strip()
-                if not chunk_text:
-                    start += max_chars
-                    continue
-
-                ocr_chunks.append(
-                    {
-                        "chunk_id": f"chunk_{chunk_idx:06d}",
-                        "page_number": page_num,
-                        "bbox": None,  # No reliable bbox from OCR plain text
-                        "text": chunk_text,
-                        "char_start": char_offset,
-                        "char_end": char_offset + len(chunk_text),
-                    }
-                )
-                char_offset += len(chunk_text)
-                chunk_idx += 1
-                start += max_chars
+class _PageResult:
+    __slots__ = ("page_num", "blocks", "ocr", "page_pdf")
 
+    def __init__(
+        self,
+        page_num: int,
+        blocks: list[tuple[str, dict]],
+        ocr: Optional[Future] = None,
+        page_pdf: Optional[bytes] = None,
+    ) -> None:
+        self.page_num = page_num
+        self.blocks = blocks
+        self.ocr = ocr
+        self.page_pdf = page_pdf  # kept to redo the OCR if the pool dies
+
+    def ready(self) -> bool:
+        return self.ocr is None or self.ocr.done()
+
+
+def _ocr_page_pdf(page_pdf: bytes) -> str:
+    """Pool worker: OCR the single page of *page_pdf* (requires Tesseract)."""
+    doc = fitz.open(stream=page_pdf, filetype="pdf")
+    try:
+        page = doc[0]
+        try:
+            return page.get_textpage_ocr(flags=0, full=True).extractText().strip()
+        except Exception:
+            # Fallback: plain text extraction without OCR
+            return page.get_text("text").strip()
+    finally:
         doc.close()
-        logger.info("OCR fallback produced %d chunks", len(ocr_chunks))
-        ocr_chunks = self._sample_chunks(ocr_chunks, max_chunks)
-        return ocr_chunks, True
+
+
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    # Tesseract via MuPDF holds the GIL, so pages are OCR'd in processes.
+    # "spawn" keeps workers independent of the parent's threads and sessions.
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.LEGAL_INSIGHT_OCR_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _ocr_pool
+
+
+def _page_pdf(doc: "fitz.Document", page_index: int) -> bytes:
+    """One page of *doc* as a standalone PDF — all that is shipped to a worker."""
+    single = fitz.open()
+    try:
+        single.insert_pdf(doc, from_page=page_index, to_page=page_index)
+        return single.tobytes()
+    finally:
+        single.close()
+
+
+def _discard_ocr_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next submit starts a fresh one."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is pool:
+            _ocr_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit_ocr(page_pdf: bytes, page_num: int) -> Future:
+    """Queue OCR of one page."""
+    pool = _get_ocr_pool()
+    try:
+        return pool.submit(_ocr_page_pdf, page_pdf)
+    except BrokenProcessPool:
+        _discard_ocr_pool(pool)
+        logger.warning("OCR process pool broke — OCR-ing page %d in-process", page_num)
+        future: Future = Future()
+        future.set_result(_ocr_page_pdf(page_pdf))
+        return future
+
+
+def _ocr_result(future: Future, page_pdf: bytes, page_num: int) -> str:
+    """
+    Wait for a queued OCR.  A worker dying mid-page (OOM, Tesseract crash)
+    breaks the pool and fails every queued future with BrokenProcessPool:
+    the page is then OCR'd in-process, and the pool is rebuilt on next submit.
+    """
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        with _ocr_pool_lock:
+            pool = _ocr_pool
+        if pool is not None and getattr(pool, "_broken", False):
+            _discard_ocr_pool(pool)
+        logger.warning("OCR process pool broke — OCR-ing page %d in-process", page_num)
+        return _ocr_page_pdf(page_pdf)
 
 
 # Singleton
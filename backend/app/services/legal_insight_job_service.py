@@ -8,16 +8,22 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import threading
 import uuid
-from datetime import datetime
-from typing import Any, Optional
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Optional
 
 import boto3
+from botocore.exceptions import ClientError, HTTPClientError
 from fastapi import HTTPException
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.db.database import SessionLocal
 from app.db.models import (
     Case,
     Document,
@@ -30,6 +36,45 @@ from app.db.models import (
 from app.services.legal_insight_extractor import legal_insight_extractor
 from app.services.legal_insight_llm_service import legal_insight_llm_service
 
+# Rows per executemany round-trip while streaming extracted chunks
+_CHUNK_INSERT_BATCH = 100
+
+# AWS error codes worth another attempt (throttling / service hiccups)
+_RETRYABLE_AWS_CODES = {
+    "ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException",
+    "InternalServerException", "ModelNotReadyException", "RequestTimeout",
+    "SlowDown", "InternalError", "ServiceUnavailable",
+}
+
+# Polled at each progress write of the running pipeline (see run_job)
+_should_abort: ContextVar[Optional[Callable[[], bool]]] = ContextVar("_should_abort", default=None)
+
+
+class JobAborted(BaseException):
+    """
+    Another worker has taken the job over; stop without touching it.
+
+    A BaseException so the summarizer's catch-all around its progress
+    callbacks lets it through.
+    """
+
+
+def _check_abort() -> None:
+    should_abort = _should_abort.get()
+    if should_abort is not None and should_abort():
+        raise JobAborted()
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Transient failures a later attempt can get past."""
+    if isinstance(exc, (HTTPClientError, OperationalError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(exc, ClientError):
+        code = exc.response.get("Error", {}).get("Code", "")
+        status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in _RETRYABLE_AWS_CODES or status == 429 or status >= 500
+    return False
+
 
 class LegalInsightJobService:
     """
@@ -53,6 +98,7 @@ class LegalInsightJobService:
         error: Optional[str] = None,
     ) -> None:
         """Update job status (and optionally progress/error), then commit."""
+        _check_abort()
         job.status = status
         if progress is not None:
             job.progress = progress
@@ -102,6 +148,230 @@ class LegalInsightJobService:
                 exc,
             )
 
+    @staticmethod
+    def _checkpoint_signature(job: LegalInsightJob, chunks: list[dict]) -> str:
+        """Identifies the map-batch layout a checkpoint belongs to."""
+        h = hashlib.sha1()
+        h.update(
+            f"{job.model_id}\0{job.prompt_version}\0"
+            f"{legal_insight_llm_service.MODEL_WINDOW}\0".encode()
+        )
+        for c in chunks:
+            h.update(c["chunk_id"].encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _load_checkpoint(self, job: LegalInsightJob, signature: str) -> dict[int, dict]:
+        """Completed map batches from an earlier run of this job ({} if none/stale)."""
+        checkpoint = job.checkpoint or {}
+        if checkpoint.get("signature") != signature:
+            return {}
+        return {int(idx): partial for idx, partial in (checkpoint.get("map") or {}).items()}
+
+    def _save_checkpoint(
+        self,
+        db: Session,
+        job: LegalInsightJob,
+        signature: str,
+        completed: dict[int, dict],
+    ) -> None:
+        # Assign a fresh dict so SQLAlchemy sees the JSONB change
+        _check_abort()
+        job.checkpoint = {
+            "signature": signature,
+            "map": {str(idx): partial for idx, partial in sorted(completed.items())},
+        }
+        db.commit()
+
+    def _load_persisted_chunks(self, db: Session, job: LegalInsightJob) -> list[dict]:
+        """Chunks stored by an earlier run of this job, in chunk_id order."""
+        rows = (
+            db.query(
+                LegalInsightChunk.chunk_id,
+                LegalInsightChunk.page_number,
+                LegalInsightChunk.text,
+            )
+            .filter(LegalInsightChunk.job_id == str(job.id))
+            .order_by(LegalInsightChunk.chunk_id)
+            .all()
+        )
+        # Only what the LLM needs; page/bbox are served from the table.
+        return [
+            {"chunk_id": r.chunk_id, "page_number": r.page_number, "text": r.text}
+            for r in rows
+        ]
+
+    def _reuse_extraction(
+        self, db: Session, job: LegalInsightJob, sha256: str, extraction_key: str
+    ) -> int:
+        """
+        Copy the chunks of an earlier job that extracted the same PDF with the
+        same settings (e.g. before a prompt-version bump), server-side.
+        Returns the number of chunks copied (0 if there is no such job).
+        """
+        source = (
+            db.query(LegalInsightJob.id)
+            .filter(
+                LegalInsightJob.pdf_sha256 == sha256,
+                LegalInsightJob.extraction_key == extraction_key,
+                LegalInsightJob.id != job.id,
+                LegalInsightJob.status.in_((
+                    LegalInsightJobStatus.summarizing,
+                    LegalInsightJobStatus.validating,
+                    LegalInsightJobStatus.completed,
+                )),
+            )
+            .order_by(LegalInsightJob.created_at.desc())
+            .first()
+        )
+        if source is None:
+            return 0
+
+        db.query(LegalInsightChunk).filter(LegalInsightChunk.job_id == str(job.id)).delete(
+            synchronize_session=False
+        )
+        columns = ("chunk_id", "page_number", "bbox", "text", "char_start", "char_end")
+        src = LegalInsightChunk.__table__.c
+        copied = db.execute(
+            insert(LegalInsightChunk).from_select(
+                ("id", "job_id", "created_at") + columns,
+                select(
+                    func.gen_random_uuid(),
+                    literal(job.id, LegalInsightChunk.job_id.type),
+                    func.now(),
+                    *(src[c] for c in columns),
+                ).where(src.job_id == source.id),
+            )
+        ).rowcount
+        db.commit()
+        return max(copied or 0, 0)
+
+    def _stream_chunks_to_db(
+        self, db: Session, job: LegalInsightJob, chunks: Iterable[dict], max_chunks: int
+    ) -> int:
+        """
+        Insert *chunks* as they are produced (batched executemany), then drop
+        all but an even sample of *max_chunks*.  Returns the number kept.
+        """
+        job_id = str(job.id)
+        # Clear any partial rows from an interrupted extraction.
+        db.query(LegalInsightChunk).filter(LegalInsightChunk.job_id == job_id).delete(
+            synchronize_session=False
+        )
+
+        chunk_ids: list[str] = []
+        batch: list[dict] = []
+        for chunk in chunks:
+            chunk_ids.append(chunk["chunk_id"])
+            batch.append({
+                "id": uuid.uuid4(),
+                "job_id": job_id,
+                "chunk_id": chunk["chunk_id"],
+                "page_number": chunk["page_number"],
+                "bbox": chunk.get("bbox"),
+                "text": chunk["text"],
+                "char_start": chunk.get("char_start"),
+                "char_end": chunk.get("char_end"),
+                "created_at": datetime.utcnow(),
+            })
+            if len(batch) >= _CHUNK_INSERT_BATCH:
+                _check_abort()
+                db.execute(insert(LegalInsightChunk), batch)
+                batch = []
+        if batch:
+            db.execute(insert(LegalInsightChunk), batch)
+
+        kept = len(chunk_ids)
+        if kept > max_chunks:
+            keep = set(legal_insight_extractor.sample_indices(kept, max_chunks))
+            dropped = [cid for i, cid in enumerate(chunk_ids) if i not in keep]
+            for i in range(0, len(dropped), 1000):
+                db.query(LegalInsightChunk).filter(
+                    LegalInsightChunk.job_id == job_id,
+                    LegalInsightChunk.chunk_id.in_(dropped[i : i + 1000]),
+                ).delete(synchronize_session=False)
+            logger.info("Job %s: sampled %d → %d chunks", job.id, kept, len(keep))
+            kept = len(keep)
+        db.commit()
+        return kept
+
+    # ------------------------------------------------------------------
+    # Result access
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def chunks_job_id(job: LegalInsightJob, result_json: dict) -> str:
+        """Job whose rows in legal_insight_chunks back this result (differs on cache hits)."""
+        return str(result_json.get("chunks_job_id") or job.id)
+
+    @staticmethod
+    def cited_chunk_ids(summary: dict) -> list[str]:
+        """Distinct citation_ids referenced anywhere in *summary*, in first-seen order."""
+        seen: dict[str, None] = {}
+        for items in (summary or {}).values():
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if isinstance(item, dict):
+                    for cid in item.get("citation_ids") or []:
+                        seen.setdefault(str(cid), None)
+        return list(seen)
+
+    def citation_refs(
+        self, db: Session, chunks_job_id: str, chunk_ids: list[str]
+    ) -> dict[str, Any]:
+        """``{chunk_id: {page_number, bbox}}`` for *chunk_ids* only."""
+        if not chunk_ids:
+            return {}
+        rows = (
+            db.query(
+                LegalInsightChunk.chunk_id,
+                LegalInsightChunk.page_number,
+                LegalInsightChunk.bbox,
+            )
+            .filter(
+                LegalInsightChunk.job_id == chunks_job_id,
+                LegalInsightChunk.chunk_id.in_(chunk_ids),
+            )
+            .all()
+        )
+        return {r.chunk_id: {"page_number": r.page_number, "bbox": r.bbox} for r in rows}
+
+    def page_chunks(
+        self,
+        db: Session,
+        chunks_job_id: str,
+        offset: int,
+        limit: int,
+        page_number: Optional[int] = None,
+    ) -> tuple[int, list[dict]]:
+        """One page of a job's chunks in document order, plus the total count."""
+        query = db.query(LegalInsightChunk).filter(LegalInsightChunk.job_id == chunks_job_id)
+        if page_number is not None:
+            query = query.filter(LegalInsightChunk.page_number == page_number)
+        total = query.count()
+        rows = (
+            query.with_entities(
+                LegalInsightChunk.chunk_id,
+                LegalInsightChunk.page_number,
+                LegalInsightChunk.bbox,
+                LegalInsightChunk.text,
+            )
+            .order_by(LegalInsightChunk.chunk_id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return total, [
+            {
+                "chunk_id": r.chunk_id,
+                "page_number": r.page_number,
+                "bbox": r.bbox,
+                "text": r.text,
+            }
+            for r in rows
+        ]
+
     # ------------------------------------------------------------------
     # Job creation
     # ------------------------------------------------------------------
@@ -223,17 +493,106 @@ class LegalInsightJobService:
         )
         return cached
 
+    # ------------------------------------------------------------------
+    # Resume after crash / redeploy
+    # ------------------------------------------------------------------
+
+    _RESUMABLE_STATUSES = (
+        LegalInsightJobStatus.queued,
+        LegalInsightJobStatus.extracting,
+        LegalInsightJobStatus.ocr,
+        LegalInsightJobStatus.summarizing,
+        LegalInsightJobStatus.validating,
+    )
+
+    def claim_stale_jobs(self, db: Session) -> list[str]:
+        """
+        Atomically claim non-terminal jobs whose worker appears to have died
+        (no heartbeat for LEGAL_INSIGHT_RESUME_STALE_SEC, see _start_heartbeat)
+        and return their ids.  Claiming bumps ``updated_at``, so concurrent
+        workers never pick up the same job.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.LEGAL_INSIGHT_RESUME_STALE_SEC)
+        created_after = now - timedelta(hours=settings.LEGAL_INSIGHT_RESUME_MAX_AGE_HOURS)
+        rows = db.execute(
+            update(LegalInsightJob)
+            .where(
+                LegalInsightJob.status.in_(self._RESUMABLE_STATUSES),
+                LegalInsightJob.updated_at < stale_before,
+                LegalInsightJob.created_at > created_after,
+            )
+            .values(updated_at=now)
+            .returning(LegalInsightJob.id)
+        ).all()
+        db.commit()
+        job_ids = [str(r.id) for r in rows]
+        if job_ids:
+            logger.info("Claimed %d stale legal insight job(s) for resume: %s", len(job_ids), job_ids)
+        return job_ids
+
+    def _start_heartbeat(
+        self, job_id: str, should_abort: Optional[Callable[[], bool]]
+    ) -> threading.Event:
+        """
+        Bump the job's ``updated_at`` every quarter of the stale window from
+        a background thread, so a run stuck in one long step (extracting or
+        OCR-ing a big PDF, a slow LLM call) is not taken for dead and resumed
+        a second time.  Set the returned event to stop.
+        """
+        stop = threading.Event()
+        interval = max(5, settings.LEGAL_INSIGHT_RESUME_STALE_SEC // 4)
+
+        def _beat() -> None:
+            while not stop.wait(interval):
+                if should_abort is not None and should_abort():
+                    return
+                db = SessionLocal()
+                try:
+                    db.execute(
+                        update(LegalInsightJob)
+                        .where(
+                            LegalInsightJob.id == job_id,
+                            LegalInsightJob.status.in_(self._RESUMABLE_STATUSES),
+                        )
+                        .values(updated_at=datetime.utcnow())
+                    )
+                    db.commit()
+                except Exception as exc:
+                    db.rollback()
+                    logger.warning("Heartbeat for legal insight job %s failed: %s", job_id, exc)
+                finally:
+                    db.close()
+
+        threading.Thread(target=_beat, name=f"insight-heartbeat-{job_id}", daemon=True).start()
+        return stop
+
     # ------------------------------------------------------------------
     # Main pipeline
     # ------------------------------------------------------------------
 
-    def run_job(self, db: Session, job_id: str) -> None:
+    def run_job(
+        self,
+        db: Session,
+        job_id: str,
+        *,
+        raise_retryable: bool = False,
+        should_abort: Optional[Callable[[], bool]] = None,
+    ) -> None:
         """
         Execute the full extraction → summarization → validation pipeline for
         the job identified by *job_id*.
 
         This method is designed to be called as a FastAPI BackgroundTask.
-        All exceptions are caught and recorded on the job record.
+        All exceptions are caught and recorded on the job record.  It is also
+        safe to call again for an interrupted job: persisted chunks and
+        checkpointed map batches are reused.
+
+        Queue workers pass *raise_retryable* while attempts remain: transient
+        errors (throttling, connection drops) then propagate so the queue's
+        backoff applies, leaving the job resumable and its upload in place.
+        *should_abort* is polled at every progress write; once it returns
+        True the run stops without recording anything.
         """
         # Load job
         job = db.query(LegalInsightJob).filter(LegalInsightJob.id == job_id).first()
@@ -241,9 +600,21 @@ class LegalInsightJobService:
             logger.error("run_job: job %s not found in DB", job_id)
             return
 
+        token = _should_abort.set(should_abort)
+        heartbeat = self._start_heartbeat(job_id, should_abort)
+        keep_upload = False
         try:
             self._pipeline(db, job)
+        except JobAborted:
+            keep_upload = True
+            db.rollback()
+            logger.warning("run_job: job %s taken over by another worker; stopping", job_id)
         except Exception as exc:
+            if raise_retryable and _is_retryable(exc):
+                keep_upload = True
+                db.rollback()
+                logger.warning("run_job: job %s hit a transient error, will retry: %s", job_id, exc)
+                raise
             logger.exception("run_job: pipeline failed for job %s: %s", job_id, exc)
             try:
                 self._set_status(
@@ -255,13 +626,43 @@ class LegalInsightJobService:
             except Exception:
                 pass  # DB write failed — nothing more we can do
         finally:
-            # Always delete the temporary uploaded PDF once the job is terminal.
-            # This runs whether the pipeline succeeded, failed, or raised unexpectedly.
-            self._delete_upload_from_s3(job)
+            heartbeat.set()
+            _should_abort.reset(token)
+            # Delete the temporary uploaded PDF once the job is terminal
+            # (succeeded or failed) — not when another attempt will need it.
+            if not keep_upload:
+                self._delete_upload_from_s3(job)
 
     def _pipeline(self, db: Session, job: LegalInsightJob) -> None:
         """Internal pipeline implementation (raises on error)."""
 
+        # Resume: an earlier run already extracted and persisted the chunks.
+        # Chunks are streamed in during extraction, so they only count once
+        # the job has moved past it.
+        chunks: Optional[list[dict]] = None
+        if job.status in (LegalInsightJobStatus.summarizing, LegalInsightJobStatus.validating):
+            chunks = self._load_persisted_chunks(db, job)
+        if chunks:
+            logger.info(
+                "Job %s: resuming with %d persisted chunks", job.id, len(chunks)
+            )
+            self._set_status(
+                db, job, LegalInsightJobStatus.summarizing, progress=max(job.progress or 0, 40)
+            )
+        else:
+            chunks = self._extract_and_persist(db, job)
+            if chunks is None:
+                return  # served from the result cache
+
+        self._summarize_and_store(db, job, chunks)
+
+    def _extract_and_persist(
+        self, db: Session, job: LegalInsightJob
+    ) -> Optional[list[dict]]:
+        """
+        Download, hash, extract and persist the job's chunks.  Returns None
+        when the job was completed from the result cache instead.
+        """
         # ----------------------------------------------------------------
         # Phase 1 — extracting (download + hash)
         # ----------------------------------------------------------------
@@ -301,16 +702,19 @@ class LegalInsightJobService:
                 .first()
             )
             if cached_result is not None:
+                # The chunks stay with the job that extracted them.
+                result_json = dict(cached_result.result_json or {})
+                result_json.setdefault("chunks_job_id", str(cached.id))
                 db.add(
                     LegalInsightResult(
                         job_id=str(job.id),
-                        result_json=cached_result.result_json,
+                        result_json=result_json,
                     )
                 )
             self._set_status(
                 db, job, LegalInsightJobStatus.completed, progress=100
             )
-            return
+            return None
 
         # ----------------------------------------------------------------
         # Phase 1b — chunk extraction
@@ -327,41 +731,41 @@ class LegalInsightJobService:
             getattr(settings, "LEGAL_INSIGHT_MAX_CHUNKS", 300)
         )
 
-        chunks, ocr_used = legal_insight_extractor.extract_text_with_ocr_fallback(
-            pdf_bytes, enable_ocr, max_chars, max_chunks=max_chunks
-        )
-
-        if not chunks:
-            raise ValueError("No text could be extracted from the PDF")
+        extraction_key = legal_insight_extractor.extraction_key(max_chars, max_chunks, enable_ocr)
+        kept = self._reuse_extraction(db, job, sha256, extraction_key)
+        if kept:
+            del pdf_bytes
+            logger.info("Job %s: reused %d extracted chunks for identical PDF", job.id, kept)
+        else:
+            # ------------------------------------------------------------
+            # Phase 2 — single-pass extraction; scanned pages OCR'd in a
+            # process pool (status moves to ocr when the first is found)
+            # ------------------------------------------------------------
+            chunk_iter = legal_insight_extractor.iter_chunks(
+                pdf_bytes,
+                enable_ocr,
+                max_chars,
+                on_ocr=lambda: self._set_status(db, job, LegalInsightJobStatus.ocr, progress=30),
+            )
 
-        # ----------------------------------------------------------------
-        # Phase 2 — OCR (status update only)
-        # ----------------------------------------------------------------
-        if ocr_used:
-            self._set_status(db, job, LegalInsightJobStatus.ocr, progress=30)
+            # ------------------------------------------------------------
+            # Phase 3 — stream chunks into the table + begin summarizing
+            # ------------------------------------------------------------
+            kept = self._stream_chunks_to_db(db, job, chunk_iter, max_chunks)
+            del pdf_bytes, chunk_iter
+            if not kept:
+                raise ValueError("No text could be extracted from the PDF")
+            logger.info("Persisted %d chunks for job %s", kept, job.id)
 
-        # ----------------------------------------------------------------
-        # Phase 3 — persist chunks + begin summarizing
-        # ----------------------------------------------------------------
+        job.extraction_key = extraction_key
         self._set_status(db, job, LegalInsightJobStatus.summarizing, progress=40)
+        return self._load_persisted_chunks(db, job)
 
-        for chunk in chunks:
-            db.add(
-                LegalInsightChunk(
-                    job_id=str(job.id),
-                    chunk_id=chunk["chunk_id"],
-                    page_number=chunk["page_number"],
-                    bbox=chunk.get("bbox"),
-                    text=chunk["text"],
-                    char_start=chunk.get("char_start"),
-                    char_end=chunk.get("char_end"),
-                )
-            )
-        db.commit()
-        logger.info("Persisted %d chunks for job %s", len(chunks), job.id)
-
+    def _summarize_and_store(
+        self, db: Session, job: LegalInsightJob, chunks: list[dict]
+    ) -> None:
         # ----------------------------------------------------------------
-        # Phase 4 — LLM summarization
+        # Phase 4 — LLM summarization (map batches checkpointed on the job)
         # ----------------------------------------------------------------
         def _progress_cb(pct: int) -> None:
             mapped = 40 + int(pct * 0.4)  # 40-80 % range
@@ -369,24 +773,32 @@ class LegalInsightJobService:
                 db, job, LegalInsightJobStatus.summarizing, progress=mapped
             )
 
-        summary = legal_insight_llm_service.summarize(chunks, on_progress=_progress_cb)
+        signature = self._checkpoint_signature(job, chunks)
+        completed = self._load_checkpoint(job, signature)
+
+        def _batch_done(batch_idx: int, partial: dict) -> None:
+            completed[batch_idx] = partial
+            self._save_checkpoint(db, job, signature, completed)
+
+        summary = legal_insight_llm_service.summarize(
+            chunks,
+            on_progress=_progress_cb,
+            completed_batches=completed,
+            on_batch_done=_batch_done,
+            user_id=str(job.user_id),
+        )
 
         # ----------------------------------------------------------------
         # Phase 5 — validation + result persistence
         # ----------------------------------------------------------------
         self._set_status(db, job, LegalInsightJobStatus.validating, progress=85)
 
-        citation_map: dict[str, Any] = {
-            c["chunk_id"]: {
-                "page_number": c["page_number"],
-                "bbox": c.get("bbox"),
-            }
-            for c in chunks
-        }
-
+        # Citations reference chunk_ids only; page/bbox are resolved from
+        # legal_insight_chunks when the result is served.
         final_result: dict[str, Any] = {
             "summary": summary,
-            "citation_map": citation_map,
+            "chunks_job_id": str(job.id),
+            "chunk_count": len(chunks),
         }
 
         db.add(
@@ -395,6 +807,7 @@ class LegalInsightJobService:
                 result_json=final_result,
             )
         )
+        job.checkpoint = None  # map partials are no longer needed
 
         self._set_status(db, job, LegalInsightJobStatus.completed, progress=100)
         logger.info("Job %s completed successfully", job.id)
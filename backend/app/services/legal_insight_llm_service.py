@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Callable, Generator, Optional
 
 import boto3
@@ -15,6 +16,7 @@ from botocore.config import Config
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.services import llm_usage_service
 
 
 SYSTEM_PROMPT_V1 = """You are an expert legal summarizer for Indian courts (Kerala High Court, Supreme Court of India).
@@ -32,6 +34,10 @@ STRICT RULES:
 class LegalInsightLlmService:
     """Summarizes Indian court judgments via AWS Bedrock (Claude)."""
 
+    # Max chunks per single Bedrock call; also the map-reduce batch size, so
+    # it is part of the checkpoint signature.
+    MODEL_WINDOW = 100
+
     def __init__(self) -> None:
         raw_model = (
             getattr(settings, "LEGAL_INSIGHT_MODEL_ID", "") or settings.BEDROCK_MODEL_ID
@@ -60,9 +66,18 @@ class LegalInsightLlmService:
     # Low-level Bedrock call
     # ------------------------------------------------------------------
 
-    def _invoke(self, prompt: str, max_tokens: int = 8192) -> str:
+    def _invoke(
+        self,
+        prompt: str,
+        max_tokens: int = 8192,
+        model: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> str:
         """
         Call Bedrock with *prompt* and return the assistant's text response.
+
+        *model* defaults to ``self.model``; the budget was already checked by
+        ``summarize``, so the call is only accounted here.
         """
         body = json.dumps(
             {
@@ -72,13 +87,17 @@ class LegalInsightLlmService:
                 "messages": [{"role": "user", "content": prompt}],
             }
         )
-        response = self.client.invoke_model(
-            modelId=self.model,
-            contentType="application/json",
-            accept="application/json",
-            body=body,
-        )
-        result = json.loads(response["body"].read())
+        with llm_usage_service.track(
+            "legal_insight.summarize", model or self.model, user_id=user_id, check_budget=False,
+        ) as call:
+            response = self.client.invoke_model(
+                modelId=call.model_id,
+                contentType="application/json",
+                accept="application/json",
+                body=body,
+            )
+            result = json.loads(response["body"].read())
+            call.add_usage(result.get("usage"))
         # Claude response: {"content": [{"type": "text", "text": "..."}], ...}
         content = result.get("content", [])
         text_parts: list[str] = []
@@ -175,7 +194,12 @@ class LegalInsightLlmService:
     # Single-batch summarization
     # ------------------------------------------------------------------
 
-    def _summarize_batch(self, chunks: list[dict]) -> dict:
+    def _summarize_batch(
+        self,
+        chunks: list[dict],
+        model: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> dict:
         """
         Send *chunks* to Bedrock and parse the structured JSON response.
         Raises ValueError if the response cannot be parsed as JSON.
@@ -187,9 +211,9 @@ class LegalInsightLlmService:
         logger.info(
             "_summarize_batch: sending %d chunks to Bedrock (model=%s)",
             len(chunks),
-            self.model,
+            model or self.model,
         )
-        raw_text = self._invoke(prompt, max_tokens=8192)
+        raw_text = self._invoke(prompt, max_tokens=8192, model=model, user_id=user_id)
 
         # Extract JSON object from the response (guards against stray whitespace /
         # accidental preamble lines)
@@ -249,18 +273,30 @@ class LegalInsightLlmService:
         self,
         chunks: list[dict],
         on_progress: Optional[Callable[[int], None]] = None,
+        completed_batches: Optional[dict[int, dict]] = None,
+        on_batch_done: Optional[Callable[[int, dict], None]] = None,
+        user_id: Optional[str] = None,
     ) -> dict:
         """
         Summarize *chunks* and return a validated dict with sections:
             facts, issues, arguments, ratio, final_order
 
         Uses single-pass if len(chunks) <= MODEL_WINDOW, otherwise map-reduce.
+        Map batches run concurrently (LEGAL_INSIGHT_MAP_CONCURRENCY).
 
         *on_progress* is called with an integer (0-100) at key milestones.
+        *completed_batches* maps batch index → partial summary from an earlier
+        run; those batches are not re-sent.  *on_batch_done* is called with
+        (batch index, partial summary) as each new map batch succeeds, so the
+        caller can checkpoint it.  Both callbacks run on the calling thread.
+
+        The daily token budget for *user_id* is checked once, up front, so all
+        calls of one job use the same model; raises ``BudgetExceeded``.
         """
+        model = llm_usage_service.admit("legal_insight.summarize", self.model, user_id)
         # 300 chunks (post-sampling cap) ÷ 100 per batch = ≤ 3 Bedrock map calls.
         # Previously 60 chunks/batch → up to 50 calls on a 1500-page document.
-        MODEL_WINDOW = 100  # max chunks per single Bedrock call
+        MODEL_WINDOW = self.MODEL_WINDOW
         valid_chunk_ids: set[str] = {c["chunk_id"] for c in chunks}
         all_chunk_ids: list[str] = [c["chunk_id"] for c in chunks]
 
@@ -279,14 +315,14 @@ class LegalInsightLlmService:
                 "summarize: single-pass mode (%d chunks)", len(chunks)
             )
             _progress(10)
-            result = self._summarize_batch(chunks)
+            result = self._summarize_batch(chunks, model, user_id)
             _progress(70)
             ok, err = self._validate_output(result, valid_chunk_ids)
             if not ok:
                 logger.warning(
                     "First pass validation failed (%s), retrying once", err
                 )
-                result = self._summarize_batch(chunks)
+                result = self._summarize_batch(chunks, model, user_id)
                 ok, err = self._validate_output(result, valid_chunk_ids)
                 if not ok:
                     raise ValueError(
@@ -309,23 +345,51 @@ class LegalInsightLlmService:
         ]
         n_batches = len(batches)
 
-        partial_summaries: list[dict] = []
-        for batch_idx, batch in enumerate(batches):
+        partials_by_batch: dict[int, dict] = {
+            idx: partial
+            for idx, partial in (completed_batches or {}).items()
+            if 0 <= idx < n_batches
+        }
+        pending = [idx for idx in range(n_batches) if idx not in partials_by_batch]
+        if partials_by_batch:
             logger.info(
-                "Map phase: batch %d/%d (%d chunks)",
-                batch_idx + 1,
+                "Map phase: resuming — %d/%d batches already checkpointed",
+                len(partials_by_batch),
                 n_batches,
-                len(batch),
             )
-            try:
-                partial = self._summarize_batch(batch)
-                partial_summaries.append(partial)
-            except Exception as exc:
-                logger.warning(
-                    "Map batch %d failed: %s — skipping", batch_idx + 1, exc
+
+        done = len(partials_by_batch)
+        workers = max(1, min(len(pending), int(getattr(settings, "LEGAL_INSIGHT_MAP_CONCURRENCY", 4))))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="insight-map") as pool:
+            futures = {}
+            for batch_idx in pending:
+                logger.info(
+                    "Map phase: batch %d/%d (%d chunks)",
+                    batch_idx + 1,
+                    n_batches,
+                    len(batches[batch_idx]),
                 )
-            progress_pct = int(10 + (batch_idx + 1) / n_batches * 60)
-            _progress(progress_pct)
+                futures[pool.submit(self._summarize_batch, batches[batch_idx], model, user_id)] = batch_idx
+
+            for future in as_completed(futures):
+                batch_idx = futures[future]
+                try:
+                    partial = future.result()
+                    partials_by_batch[batch_idx] = partial
+                    if on_batch_done is not None:
+                        on_batch_done(batch_idx, partial)
+                except Exception as exc:
+                    logger.warning(
+                        "Map batch %d failed: %s — skipping", batch_idx + 1, exc
+                    )
+                done += 1
+                progress_pct = int(10 + done / n_batches * 60)
+                _progress(progress_pct)
+
+        # Keep document order for the reduce prompt
+        partial_summaries: list[dict] = [
+            partials_by_batch[idx] for idx in sorted(partials_by_batch)
+        ]
 
         if not partial_summaries:
             raise ValueError("All map batches failed — cannot produce a summary")
@@ -350,7 +414,7 @@ class LegalInsightLlmService:
         logger.info("Reduce phase: synthesising %d partial summaries", len(partial_summaries))
         _progress(75)
         synthesis_prompt = self._build_synthesis_prompt(partial_summaries, all_chunk_ids)
-        raw_synthesis = self._invoke(synthesis_prompt, max_tokens=8192)
+        raw_synthesis = self._invoke(synthesis_prompt, max_tokens=8192, model=model, user_id=user_id)
 
         match = re.search(r"\{.*\}", raw_synthesis, re.DOTALL)
         if not match:
@@ -435,6 +499,7 @@ Rules:
         result_json: dict,
         chunks: list[dict],
         messages: list[dict],
+        user_id: Optional[str] = None,
     ) -> Generator[str, None, None]:
         """
         Stream a chat response about the judgment.
@@ -479,18 +544,21 @@ Rules:
             len(sampled),
             self.model,
         )
-        response = self.client.converse_stream(
-            modelId=self.model,
-            system=[{"text": system_prompt}],
-            messages=bedrock_messages,
-            inferenceConfig={"maxTokens": 2048, "temperature": 0.3},
-        )
-        for event in response["stream"]:
-            if "contentBlockDelta" in event:
-                delta = event["contentBlockDelta"].get("delta", {})
-                text = delta.get("text", "")
-                if text:
-                    yield text
+        with llm_usage_service.track("legal_insight.chat", self.model, user_id=user_id) as call:
+            response = self.client.converse_stream(
+                modelId=call.model_id,
+                system=[{"text": system_prompt}],
+                messages=bedrock_messages,
+                inferenceConfig={"maxTokens": 2048, "temperature": 0.3},
+            )
+            for event in response["stream"]:
+                if "contentBlockDelta" in event:
+                    delta = event["contentBlockDelta"].get("delta", {})
+                    text = delta.get("text", "")
+                    if text:
+                        yield text
+                elif "metadata" in event:
+                    call.add_usage(event["metadata"].get("usage"))
 
 
 # Singleton
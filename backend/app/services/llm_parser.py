@@ -10,6 +10,7 @@ from typing import Any
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.services import llm_usage_service
 from app.services.block_extractor import AdvocateRecord, CaseBlock
 
 
@@ -104,8 +105,10 @@ class LlmParser:
             "temperature": 0,
             "messages": [{"role": "user", "content": prompt}],
         }
-        response = self.client.invoke_model(modelId=self.model, body=json.dumps(payload))
-        data = json.loads(response["body"].read())
+        with llm_usage_service.track("cause_list.parse", self.model) as call:
+            response = self.client.invoke_model(modelId=call.model_id, body=json.dumps(payload))
+            data = json.loads(response["body"].read())
+            call.add_usage(data.get("usage"))
 
         text = ""
         for part in data.get("content", []):
@@ -0,0 +1,448 @@
+"""
+app/services/llm_usage_service.py
+
+Token accounting and daily budgets for Bedrock calls.
+
+Wrap each call in ``track()``:
+
+    with llm_usage_service.track("drafting.chat", model_id, user_id=user_id) as call:
+        response = client.converse(modelId=call.model_id, ...)
+        call.add_usage(response.get("usage"))
+
+Coroutines use ``async with track_async(...)`` instead: the same, but the
+budget lookup (a DB query when the cached figure is stale) runs on a worker
+thread rather than on the event loop.
+
+Before the call is made the user's and the feature's usage for today (IST)
+is compared with ``LLM_USER_DAILY_TOKEN_BUDGET`` /
+``LLM_FEATURE_DAILY_TOKEN_BUDGETS``.  Over budget, ``call.model_id`` is
+switched to ``LLM_BUDGET_FALLBACK_MODEL_ID`` (``LLM_BUDGET_ACTION=downgrade``)
+or ``BudgetExceeded`` is raised (``reject``, or past the hard limit).
+
+When the block exits, tokens and wall time are written to
+``llm_usage_events`` and upserted into ``llm_usage_daily`` on a single
+background thread — recording never delays or fails the caller.  Budget
+reads are cached for ``_USAGE_CACHE_TTL_SEC`` (and bumped by calls made
+from this process), so budgets are enforced to within a few seconds of
+traffic, not to the token.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.models import LlmUsageDaily, LlmUsageEvent
+
+_IST = ZoneInfo("Asia/Kolkata")
+_NIL_USER = uuid.UUID(int=0)
+_USAGE_CACHE_TTL_SEC = 10.0
+
+# Usage field names across Converse (camelCase), InvokeModel/Anthropic
+# (snake_case) and the streaming invocation metrics (…Count)
+_USAGE_KEYS = (
+    ("input_tokens", ("input_tokens", "inputTokens", "inputTokenCount")),
+    ("output_tokens", ("output_tokens", "outputTokens", "outputTokenCount")),
+    ("cache_read_tokens", ("cache_read_input_tokens", "cacheReadInputTokens", "cacheReadInputTokenCount")),
+    ("cache_write_tokens", ("cache_creation_input_tokens", "cacheWriteInputTokens", "cacheWriteInputTokenCount")),
+)
+_SUM_COLUMNS = (
+    "calls", "errors", "rejected", "input_tokens", "output_tokens",
+    "cache_read_tokens", "cache_write_tokens", "latency_ms", "cost_usd",
+)
+
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total",
+    "Bedrock tokens by feature, model and kind (input/output/cache_read/cache_write).",
+    ("feature", "model", "kind"),
+)
+LLM_CALLS = metrics.counter(
+    "llm_calls_total",
+    "Bedrock calls by feature, model and outcome (ok/error/aborted/rejected/downgraded).",
+    ("feature", "model", "status"),
+)
+
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-usage")
+_cache_lock = threading.Lock()
+_usage_cache: dict[tuple[str, str], tuple[float, int]] = {}
+
+
+class BudgetExceeded(Exception):
+    """Raised before a Bedrock call when a daily token budget is exhausted."""
+
+    def __init__(self, scope: str, used: int, budget: int) -> None:
+        self.scope, self.used, self.budget = scope, used, budget
+        super().__init__("Daily AI usage limit reached. It resets at midnight IST.")
+
+
+class LlmCall:
+    """Per-call accumulator yielded by ``track()``."""
+
+    __slots__ = (
+        "feature", "model_id", "requested_model_id", "user_id",
+        "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens",
+    )
+
+    def __init__(
+        self, feature: str, model_id: str, user_id: Optional[uuid.UUID], requested_model_id: Optional[str],
+    ) -> None:
+        self.feature = feature
+        self.model_id = model_id
+        self.requested_model_id = requested_model_id
+        self.user_id = user_id
+        self.input_tokens = self.output_tokens = 0
+        self.cache_read_tokens = self.cache_write_tokens = 0
+
+    @property
+    def downgraded(self) -> bool:
+        return self.requested_model_id is not None
+
+    def add_usage(self, usage: Optional[Mapping[str, Any]]) -> None:
+        """Add a Bedrock ``usage`` / invocation-metrics mapping (any key style)."""
+        if not usage:
+            return
+        for attr, keys in _USAGE_KEYS:
+            for key in keys:
+                value = usage.get(key)
+                if value:
+                    setattr(self, attr, getattr(self, attr) + int(value))
+                    break
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _today() -> date:
+    return datetime.now(_IST).date()
+
+
+def _as_uuid(user_id: Any) -> Optional[uuid.UUID]:
+    if user_id is None or user_id == "":
+        return None
+    if isinstance(user_id, uuid.UUID):
+        return user_id
+    try:
+        return uuid.UUID(str(user_id))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4)
+def _parse_feature_budgets(spec: str) -> dict[str, int]:
+    out: dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, tokens = part.strip().partition("=")
+        if name and tokens.strip():
+            out[name.strip()] = max(0, int(tokens))
+    return out
+
+
+@lru_cache(maxsize=4)
+def _parse_pricing(spec: str) -> tuple[tuple[str, float, float], ...]:
+    out = []
+    for part in (spec or "").split(","):
+        key, _, prices = part.strip().rpartition("=")
+        price_in, _, price_out = prices.partition(":")
+        if key and price_in:
+            out.append((key.strip(), float(price_in), float(price_out or 0)))
+    # Longest key first, so a full model ID beats a family substring
+    return tuple(sorted(out, key=lambda p: -len(p[0])))
+
+
+def estimate_cost_usd(model_id: str, input_tokens: int, output_tokens: int,
+                      cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    """USD estimate from ``LLM_PRICING_USD_PER_MTOK``; 0.0 for unpriced models."""
+    for key, price_in, price_out in _parse_pricing(settings.LLM_PRICING_USD_PER_MTOK):
+        if key == model_id or key in model_id:
+            billed_in = input_tokens + 0.1 * cache_read_tokens + 1.25 * cache_write_tokens
+            return (billed_in * price_in + output_tokens * price_out) / 1_000_000
+    return 0.0
+
+
+def _budget_tokens(input_tokens: int, output_tokens: int, cache_write_tokens: int) -> int:
+    # Cache reads are an order of magnitude cheaper and not counted
+    return input_tokens + output_tokens + cache_write_tokens
+
+
+# ── Budget checks ─────────────────────────────────────────────────────────────
+
+def _query_used(scope: str, key: str) -> int:
+    from app.db.database import SessionLocal
+
+    column = LlmUsageDaily.user_id if scope == "user" else LlmUsageDaily.feature
+    value: Any = uuid.UUID(key) if scope == "user" else key
+    db = SessionLocal()
+    try:
+        total = db.query(
+            func.coalesce(func.sum(
+                LlmUsageDaily.input_tokens + LlmUsageDaily.output_tokens + LlmUsageDaily.cache_write_tokens
+            ), 0)
+        ).filter(LlmUsageDaily.day == _today(), column == value).scalar()
+        return int(total or 0)
+    finally:
+        db.close()
+
+
+def _used_today(scope: str, key: str) -> int:
+    now = time.monotonic()
+    cached = _usage_cache.get((scope, key))
+    if cached is not None and now - cached[0] < _USAGE_CACHE_TTL_SEC:
+        return cached[1]
+    used = _query_used(scope, key)
+    with _cache_lock:
+        _usage_cache[(scope, key)] = (now, used)
+    return used
+
+
+def _bump_cached(user_id: Optional[uuid.UUID], feature: str, tokens: int) -> None:
+    if tokens <= 0:
+        return
+    with _cache_lock:
+        for cache_key in (("user", str(user_id)), ("feature", feature)):
+            cached = _usage_cache.get(cache_key)
+            if cached is not None:
+                _usage_cache[cache_key] = (cached[0], cached[1] + tokens)
+
+
+def _over_budget(feature: str, user_id: Optional[uuid.UUID]) -> Optional[tuple[str, int, int]]:
+    """The most exhausted budget as (scope, used, budget), or None if within all."""
+    checks: list[tuple[str, str, int]] = []
+    if user_id is not None and settings.LLM_USER_DAILY_TOKEN_BUDGET > 0:
+        checks.append(("user", str(user_id), settings.LLM_USER_DAILY_TOKEN_BUDGET))
+    feature_budget = _parse_feature_budgets(settings.LLM_FEATURE_DAILY_TOKEN_BUDGETS).get(feature, 0)
+    if feature_budget > 0:
+        checks.append(("feature", feature, feature_budget))
+
+    worst: Optional[tuple[str, int, int]] = None
+    for scope, key, budget in checks:
+        try:
+            used = _used_today(scope, key)
+        except Exception as exc:
+            # Accounting must never take a feature down — fail open
+            logger.warning("llm_usage: budget lookup failed for %s=%s: %s", scope, key, exc)
+            continue
+        if used >= budget and (worst is None or used / budget > worst[1] / worst[2]):
+            worst = (scope, used, budget)
+    return worst
+
+
+def admit(feature: str, model_id: str, user_id: Any = None) -> str:
+    """
+    Budget check before a call.  Returns the model to call — *model_id*, or
+    the fallback model when over budget — or raises ``BudgetExceeded``.
+    """
+    uid = _as_uuid(user_id)
+    state = _over_budget(feature, uid)
+    if state is None:
+        return model_id
+
+    scope, used, budget = state
+    fallback = settings.LLM_BUDGET_FALLBACK_MODEL_ID or settings.BEDROCK_MODEL_ID
+    if (
+        settings.LLM_BUDGET_ACTION.lower() == "downgrade"
+        and fallback
+        and used < budget * settings.LLM_BUDGET_HARD_FACTOR
+    ):
+        if fallback != model_id:
+            LLM_CALLS.labels(feature, model_id, "downgraded").inc()
+            logger.info(
+                "llm_usage: %s over %s budget (%d/%d tokens) — using fallback model",
+                feature, scope, used, budget,
+            )
+        return fallback
+
+    logger.warning(
+        "llm_usage: rejected %s call, %s budget exhausted (%d/%d tokens)", feature, scope, used, budget,
+    )
+    call = LlmCall(feature, model_id, uid, None)
+    _record(call, "rejected", 0.0)
+    raise BudgetExceeded(scope, used, budget)
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+
+def _write(row: dict[str, Any]) -> None:
+    from app.db.database import SessionLocal
+
+    status = row["status"]
+    daily_values = {
+        "day": row["day"],
+        "user_id": row["user_id"] or _NIL_USER,
+        "feature": row["feature"],
+        "model_id": row["model_id"],
+        "calls": 0 if status == "rejected" else 1,
+        "errors": 1 if status == "error" else 0,
+        "rejected": 1 if status == "rejected" else 0,
+        **{col: row[col] for col in _SUM_COLUMNS[3:]},
+    }
+    daily = pg_insert(LlmUsageDaily).values(**daily_values)
+    daily = daily.on_conflict_do_update(
+        index_elements=["day", "user_id", "feature", "model_id"],
+        set_={col: getattr(LlmUsageDaily, col) + getattr(daily.excluded, col) for col in _SUM_COLUMNS},
+    )
+    db = SessionLocal()
+    try:
+        db.execute(insert(LlmUsageEvent).values(**row))
+        db.execute(daily)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.warning("llm_usage: failed to record %s call: %s", row["feature"], exc)
+    finally:
+        db.close()
+
+
+def _record(call: LlmCall, status: str, latency_ms: float) -> None:
+    feature, model = call.feature, call.model_id
+    LLM_CALLS.labels(feature, model, status).inc()
+    for kind in ("input", "output", "cache_read", "cache_write"):
+        tokens = getattr(call, f"{kind}_tokens")
+        if tokens:
+            LLM_TOKENS.labels(feature, model, kind).inc(tokens)
+    _bump_cached(
+        call.user_id, feature,
+        _budget_tokens(call.input_tokens, call.output_tokens, call.cache_write_tokens),
+    )
+
+    if not settings.LLM_USAGE_ENABLED:
+        return
+    row = {
+        "created_at": datetime.utcnow(),
+        "day": _today(),
+        "user_id": call.user_id,
+        "feature": feature,
+        "model_id": model,
+        "requested_model_id": call.requested_model_id,
+        "status": status,
+        "input_tokens": call.input_tokens,
+        "output_tokens": call.output_tokens,
+        "cache_read_tokens": call.cache_read_tokens,
+        "cache_write_tokens": call.cache_write_tokens,
+        "latency_ms": int(latency_ms),
+        "cost_usd": estimate_cost_usd(
+            model, call.input_tokens, call.output_tokens, call.cache_read_tokens, call.cache_write_tokens,
+        ),
+    }
+    try:
+        _writer.submit(_write, row)
+    except RuntimeError:  # interpreter shutting down
+        pass
+
+
+@contextmanager
+def track(
+    feature: str,
+    model_id: str,
+    user_id: Any = None,
+    *,
+    check_budget: bool = True,
+) -> Iterator[LlmCall]:
+    """
+    Account one Bedrock call (or one stream, consumed inside the block).
+
+    Call Bedrock with ``call.model_id`` — it differs from *model_id* when the
+    budget check downgraded the call.  Exceptions propagate unchanged; the
+    call is recorded as ``error``, or ``aborted`` on cancellation / client
+    disconnect (``GeneratorExit``).
+    """
+    uid = _as_uuid(user_id)
+    effective = admit(feature, model_id, uid) if check_budget else model_id
+    with _tracked(feature, model_id, effective, uid) as call:
+        yield call
+
+
+@asynccontextmanager
+async def track_async(
+    feature: str,
+    model_id: str,
+    user_id: Any = None,
+    *,
+    check_budget: bool = True,
+) -> AsyncIterator[LlmCall]:
+    """``track()`` for coroutines: the budget check runs off the event loop."""
+    uid = _as_uuid(user_id)
+    effective = await asyncio.to_thread(admit, feature, model_id, uid) if check_budget else model_id
+    with _tracked(feature, model_id, effective, uid) as call:
+        yield call
+
+
+@contextmanager
+def _tracked(
+    feature: str, model_id: str, effective: str, uid: Optional[uuid.UUID],
+) -> Iterator[LlmCall]:
+    call = LlmCall(feature, effective, uid, model_id if effective != model_id else None)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield call
+    except Exception:
+        status = "error"
+        raise
+    except BaseException:
+        status = "aborted"
+        raise
+    finally:
+        _record(call, status, (time.perf_counter() - start) * 1000)
+
+
+# ── Queries / maintenance ─────────────────────────────────────────────────────
+
+def daily_usage_for_user(db: Session, user_id: Any, days: int = 7) -> dict[str, Any]:
+    """The user's roll-ups for the last *days* IST days plus today's budget state."""
+    uid = _as_uuid(user_id)
+    today = _today()
+    rows = (
+        db.query(LlmUsageDaily)
+        .filter(LlmUsageDaily.user_id == uid, LlmUsageDaily.day > today - timedelta(days=max(1, days)))
+        .order_by(LlmUsageDaily.day.desc(), LlmUsageDaily.feature)
+        .all()
+    )
+    used_today = sum(
+        _budget_tokens(r.input_tokens, r.output_tokens, r.cache_write_tokens) for r in rows if r.day == today
+    )
+    budget = settings.LLM_USER_DAILY_TOKEN_BUDGET
+    return {
+        "day": today.isoformat(),
+        "tokens_used_today": used_today,
+        "daily_token_budget": budget or None,
+        "budget_remaining": max(0, budget - used_today) if budget > 0 else None,
+        "items": [
+            {
+                "day": r.day.isoformat(),
+                "feature": r.feature,
+                "model_id": r.model_id,
+                "calls": r.calls,
+                "rejected": r.rejected,
+                "input_tokens": r.input_tokens,
+                "output_tokens": r.output_tokens,
+                "cache_read_tokens": r.cache_read_tokens,
+                "cache_write_tokens": r.cache_write_tokens,
+            }
+            for r in rows
+        ],
+    }
+
+
+def purge_old_events(db: Session, retention_days: int) -> int:
+    """Delete per-call rows older than *retention_days*; daily roll-ups are kept."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = (
+        db.query(LlmUsageEvent)
+        .filter(LlmUsageEvent.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return int(deleted or 0)
@@ -0,0 +1,195 @@
+"""
+app/services/partition_maintenance.py
+
+Monthly range partitions for the date-keyed cause-list tables (set up by
+``database/cause_list_partitioning_migration.sql``).
+
+- ``ensure_partitions`` creates ``<table>_pYYYYMM`` for the current month
+  and ``CAUSELIST_PARTITION_MONTHS_AHEAD`` months after it, so the daily
+  writes never land in ``<table>_default``.
+- ``drop_expired_partitions`` detaches and drops every partition whose
+  whole month is older than the table's retention, then deletes the few
+  expired rows that may sit in ``<table>_default``.  Dropping a partition
+  leaves nothing for vacuum, unlike the row-by-row purge it replaces
+  (still used for tables that have not been migrated yet).
+
+A new partition is created as a plain table and then attached: ATTACH
+only takes SHARE UPDATE EXCLUSIVE on the parent, so reads and upserts
+carry on meanwhile.  DETACH/DROP need an exclusive lock, so every DDL
+statement runs with ``PARTITION_LOCK_TIMEOUT_MS`` and gives up rather than
+queueing behind the cause-list jobs; the next run retries.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+
+# table -> (partition key column, retention setting; 0 days keeps everything)
+PARTITIONED_TABLES: dict[str, tuple[str, str]] = {
+    "daily_cause_lists": ("date", "CAUSELIST_RETENTION_DAYS"),
+    "advocate_cause_lists": ("date", "ADVOCATE_CAUSELIST_RETENTION_DAYS"),
+    "case_live_status_snapshots": ("fetched_at", "LIVE_STATUS_SNAPSHOT_RETENTION_DAYS"),
+}
+
+_PARTITION_RE = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def _add_months(month: date, n: int) -> date:
+    years, index = divmod(month.month - 1 + n, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _partition_month(table: str, name: str) -> Optional[date]:
+    if not name.startswith(table):
+        return None
+    match = _PARTITION_RE.search(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def _is_partitioned(db: Session, table: str) -> bool:
+    relkind = db.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table}
+    ).scalar()
+    return relkind == "p"
+
+
+def _partitions(db: Session, table: str) -> list[str]:
+    return list(
+        db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:t)"
+            ),
+            {"t": table},
+        ).scalars()
+    )
+
+
+def _columns(db: Session, table: str) -> str:
+    names = db.execute(
+        text(
+            "SELECT attname FROM pg_attribute "
+            "WHERE attrelid = to_regclass(:t) AND attnum > 0 AND NOT attisdropped "
+            "ORDER BY attnum"
+        ),
+        {"t": table},
+    ).scalars()
+    return ", ".join(f'"{n}"' for n in names)
+
+
+def _set_lock_timeout(db: Session) -> None:
+    db.execute(text(f"SET LOCAL lock_timeout = {max(1, int(settings.PARTITION_LOCK_TIMEOUT_MS))}"))
+
+
+def _create_partition(db: Session, table: str, key: str, month: date, has_default: bool) -> str:
+    name = partition_name(table, month)
+    lo, hi = month.isoformat(), _add_months(month, 1).isoformat()
+    _set_lock_timeout(db)
+    db.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{name}" '
+        f'(LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)'
+    ))
+    if has_default:
+        # ATTACH fails while the default partition still holds rows for this month
+        cols = _columns(db, table)
+        db.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{table}_default" '
+                f'WHERE "{key}" >= :lo AND "{key}" < :hi RETURNING {cols}) '
+                f'INSERT INTO "{name}" ({cols}) SELECT {cols} FROM moved'
+            ),
+            {"lo": lo, "hi": hi},
+        )
+    db.execute(text(
+        f"ALTER TABLE \"{table}\" ATTACH PARTITION \"{name}\" FOR VALUES FROM ('{lo}') TO ('{hi}')"
+    ))
+    return name
+
+
+def _delete_older_than(db: Session, table: str, key: str, cutoff: date) -> None:
+    try:
+        _set_lock_timeout(db)
+        result = db.execute(
+            text(f'DELETE FROM "{table}" WHERE "{key}" < :cutoff'), {"cutoff": cutoff.isoformat()}
+        )
+        db.commit()
+        if result.rowcount:
+            logger.info("Deleted %d rows older than %s from %s", result.rowcount, cutoff, table)
+    except DBAPIError as exc:
+        db.rollback()
+        logger.warning("Expired rows in %s not deleted: %s", table, getattr(exc, "orig", exc))
+
+
+def ensure_partitions(db: Session, today: Optional[date] = None) -> list[str]:
+    """Create missing monthly partitions from this month to N months ahead."""
+    this_month = (today or date.today()).replace(day=1)
+    months_ahead = max(1, int(settings.CAUSELIST_PARTITION_MONTHS_AHEAD))
+    created: list[str] = []
+    for table, (key, _) in PARTITIONED_TABLES.items():
+        if not _is_partitioned(db, table):
+            continue
+        existing = set(_partitions(db, table))
+        has_default = f"{table}_default" in existing
+        for n in range(months_ahead + 1):
+            month = _add_months(this_month, n)
+            if partition_name(table, month) in existing:
+                continue
+            try:
+                created.append(_create_partition(db, table, key, month, has_default))
+                db.commit()
+            except DBAPIError as exc:
+                db.rollback()
+                logger.warning(
+                    "Partition %s not created: %s",
+                    partition_name(table, month), getattr(exc, "orig", exc),
+                )
+    db.rollback()  # end the catalogue-read transaction
+    return created
+
+
+def drop_expired_partitions(db: Session, today: Optional[date] = None) -> list[str]:
+    """Detach and drop partitions wholly older than each table's retention."""
+    today = today or date.today()
+    dropped: list[str] = []
+    for table, (key, retention_setting) in PARTITIONED_TABLES.items():
+        if table == "daily_cause_lists" and not settings.CAUSELIST_RETENTION_ENABLED:
+            continue
+        keep_days = int(getattr(settings, retention_setting) or 0)
+        if keep_days <= 0:
+            continue
+        cutoff = today - timedelta(days=keep_days)
+        if not _is_partitioned(db, table):
+            # Not migrated yet: fall back to the row delete
+            _delete_older_than(db, table, key, cutoff)
+            continue
+        partitions = _partitions(db, table)
+        for name in sorted(partitions):
+            month = _partition_month(table, name)
+            if month is None or _add_months(month, 1) > cutoff:
+                continue
+            try:
+                _set_lock_timeout(db)
+                db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+                db.execute(text(f'DROP TABLE "{name}"'))
+                db.commit()
+                dropped.append(name)
+            except DBAPIError as exc:
+                db.rollback()
+                logger.warning("Partition %s not dropped: %s", name, getattr(exc, "orig", exc))
+        if f"{table}_default" in partitions:
+            _delete_older_than(db, f"{table}_default", key, cutoff)
+    db.rollback()
+    return dropped
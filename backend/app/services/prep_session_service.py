@@ -25,10 +25,11 @@ from typing import AsyncGenerator, Optional
 import boto3
 from botocore.config import Config
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.db.compression import HEAVY
 from app.db.models import (
     Case,
     Document,
@@ -41,6 +42,7 @@ from app.agent.prep_prompts import (
     get_prep_system_prompt,
     PREP_MODES,
 )
+from app.services import llm_usage_service
 from app.services.bda_service import bda_service
 
 
@@ -390,6 +392,7 @@ class PrepSessionService:
 
         docs = (
             db.query(Document)
+            .options(undefer_group(HEAVY))
             .filter(Document.id.in_(session.document_ids))
             .all()
         )
@@ -553,25 +556,29 @@ class PrepSessionService:
         full_text = ""
 
         try:
-            response = bedrock.invoke_model_with_response_stream(
-                modelId=_prep_model_id(),
-                body=json.dumps(request_body),
-                contentType="application/json",
-                accept="application/json",
-            )
+            async with llm_usage_service.track_async("prep.chat", _prep_model_id(), user_id=user_id) as call:
+                response = bedrock.invoke_model_with_response_stream(
+                    modelId=call.model_id,
+                    body=json.dumps(request_body),
+                    contentType="application/json",
+                    accept="application/json",
+                )
 
-            for event in response["body"]:
-                chunk_bytes = event.get("chunk", {}).get("bytes", b"")
-                if not chunk_bytes:
-                    continue
-                chunk_data = json.loads(chunk_bytes)
+                for event in response["body"]:
+                    chunk_bytes = event.get("chunk", {}).get("bytes", b"")
+                    if not chunk_bytes:
+                        continue
+                    chunk_data = json.loads(chunk_bytes)
 
-                if chunk_data.get("type") == "content_block_delta":
-                    delta = chunk_data.get("delta", {})
-                    if delta.get("type") == "text_delta":
-                        text_piece = delta.get("text", "")
-                        full_text += text_piece
-                        yield _sse({"type": "text_delta", "text": text_piece})
+                    if chunk_data.get("type") == "content_block_delta":
+                        delta = chunk_data.get("delta", {})
+                        if delta.get("type") == "text_delta":
+                            text_piece = delta.get("text", "")
+                            full_text += text_piece
+                            yield _sse({"type": "text_delta", "text": text_piece})
+
+                    # Totals for the whole stream arrive with message_stop
+                    call.add_usage(chunk_data.get("amazon-bedrock-invocationMetrics"))
 
         except Exception as exc:
             logger.exception(
@@ -648,125 +655,130 @@ class PrepSessionService:
         try:
             for _iteration in range(MAX_ITERATIONS):
 
-                response = bedrock.converse_stream(
-                    modelId=model_id,
-                    system=[{"text": system_prompt}],
-                    messages=messages,
-                    toolConfig={
-                        "tools": [{"toolSpec": t} for t in PREP_TOOL_SPECS]
-                    },
-                    inferenceConfig={
-                        "maxTokens":   4096,
-                        "temperature": 0.3,
-                    },
-                )
-
-                current_tool:            dict | None = None
-                current_tool_input_json: str         = ""
-                stop_reason:             str | None  = None
-                assistant_content:       list[dict]  = []
-                current_text_block:      str         = ""
-
-                for chunk in response["stream"]:
-                    event_type = next(iter(chunk), None)
-
-                    # ── text / tool input delta ──────────────────────────
-                    if event_type == "contentBlockDelta":
-                        delta = chunk["contentBlockDelta"].get("delta", {})
-
-                        if "text" in delta:
-                            text       = delta["text"]
-                            full_text += text
-                            current_text_block += text
-                            yield _sse({"type": "text_delta", "text": text})
-
-                        elif "toolUse" in delta:
-                            current_tool_input_json += delta["toolUse"].get("input", "")
-
-                    # ── block start ──────────────────────────────────────
-                    elif event_type == "contentBlockStart":
-                        start = chunk["contentBlockStart"].get("start", {})
-                        if "toolUse" in start:
-                            # Flush any accumulated text block first
-                            if current_text_block:
-                                assistant_content.append({"text": current_text_block})
-                                current_text_block = ""
+                async with llm_usage_service.track_async("prep.precedent_finder", model_id, user_id=user_id) as call:
+                    response = bedrock.converse_stream(
+                        modelId=call.model_id,
+                        system=[{"text": system_prompt}],
+                        messages=messages,
+                        toolConfig={
+                            "tools": [{"toolSpec": t} for t in PREP_TOOL_SPECS]
+                        },
+                        inferenceConfig={
+                            "maxTokens":   4096,
+                            "temperature": 0.3,
+                        },
+                    )
 
-                            current_tool = {
-                                "id":   start["toolUse"]["toolUseId"],
-                                "name": start["toolUse"]["name"],
-                            }
-                            current_tool_input_json = ""
-                            yield _sse({
-                                "type":  "tool_start",
-                                "tool":  current_tool["name"],
-                                "input": {},
-                            })
-
-                    # ── block end → dispatch tool ────────────────────────
-                    elif event_type == "contentBlockStop":
-                        if current_tool:
-                            tool_name = current_tool["name"]
-                            tool_id   = current_tool["id"]
-
-                            try:
-                                tool_inputs = (
-                                    json.loads(current_tool_input_json)
-                                    if current_tool_input_json
-                                    else {}
-                                )
-                            except json.JSONDecodeError:
-                                tool_inputs = {}
-
-                            # Dispatch tool (await is safe inside sync for-loop
-                            # of an async generator)
-                            tool_result = await dispatch_prep_tool(
-                                tool_name=tool_name,
-                                tool_inputs=tool_inputs,
-                            )
-
-                            yield _sse({
-                                "type":    "tool_end",
-                                "tool":    tool_name,
-                                "success": tool_result.get("success", False),
-                                "summary": summarise_prep_tool_result(tool_name, tool_result),
-                            })
-
-                            # Append tool use + result to message history
-                            assistant_content.append({
-                                "toolUse": {
-                                    "toolUseId": tool_id,
-                                    "name":      tool_name,
-                                    "input":     tool_inputs,
+                    current_tool:            dict | None = None
+                    current_tool_input_json: str         = ""
+                    stop_reason:             str | None  = None
+                    assistant_content:       list[dict]  = []
+                    current_text_block:      str         = ""
+
+                    for chunk in response["stream"]:
+                        event_type = next(iter(chunk), None)
+
+                        # ── text / tool input delta ──────────────────────
+                        if event_type == "contentBlockDelta":
+                            delta = chunk["contentBlockDelta"].get("delta", {})
+
+                            if "text" in delta:
+                                text       = delta["text"]
+                                full_text += text
+                                current_text_block += text
+                                yield _sse({"type": "text_delta", "text": text})
+
+                            elif "toolUse" in delta:
+                                current_tool_input_json += delta["toolUse"].get("input", "")
+
+                        # ── block start ──────────────────────────────────
+                        elif event_type == "contentBlockStart":
+                            start = chunk["contentBlockStart"].get("start", {})
+                            if "toolUse" in start:
+                                # Flush any accumulated text block first
+                                if current_text_block:
+                                    assistant_content.append({"text": current_text_block})
+                                    current_text_block = ""
+
+                                current_tool = {
+                                    "id":   start["toolUse"]["toolUseId"],
+                                    "name": start["toolUse"]["name"],
                                 }
-                            })
-                            messages.append({
-                                "role":    "assistant",
-                                "content": assistant_content,
-                            })
-                            messages.append({
-                                "role": "user",
-                                "content": [{
-                                    "toolResult": {
+                                current_tool_input_json = ""
+                                yield _sse({
+                                    "type":  "tool_start",
+                                    "tool":  current_tool["name"],
+                                    "input": {},
+                                })
+
+                        # ── block end → dispatch tool ────────────────────
+                        elif event_type == "contentBlockStop":
+                            if current_tool:
+                                tool_name = current_tool["name"]
+                                tool_id   = current_tool["id"]
+
+                                try:
+                                    tool_inputs = (
+                                        json.loads(current_tool_input_json)
+                                        if current_tool_input_json
+                                        else {}
+                                    )
+                                except json.JSONDecodeError:
+                                    tool_inputs = {}
+
+                                # Dispatch tool (await is safe inside sync for-loop
+                                # of an async generator)
+                                tool_result = await dispatch_prep_tool(
+                                    tool_name=tool_name,
+                                    tool_inputs=tool_inputs,
+                                )
+
+                                yield _sse({
+                                    "type":    "tool_end",
+                                    "tool":    tool_name,
+                                    "success": tool_result.get("success", False),
+                                    "summary": summarise_prep_tool_result(tool_name, tool_result),
+                                })
+
+                                # Append tool use + result to message history
+                                assistant_content.append({
+                                    "toolUse": {
                                         "toolUseId": tool_id,
-                                        "content":   [{"text": json.dumps(tool_result)}],
-                                        "status":    "success" if tool_result.get("success") else "error",
+                                        "name":      tool_name,
+                                        "input":     tool_inputs,
                                     }
-                                }],
-                            })
-
-                            # Reset for next block
-                            current_tool            = None
-                            current_tool_input_json = ""
-                            assistant_content       = []
+                                })
+                                messages.append({
+                                    "role":    "assistant",
+                                    "content": assistant_content,
+                                })
+                                messages.append({
+                                    "role": "user",
+                                    "content": [{
+                                        "toolResult": {
+                                            "toolUseId": tool_id,
+                                            "content":   [{"text": json.dumps(tool_result)}],
+                                            "status":    "success" if tool_result.get("success") else "error",
+                                        }
+                                    }],
+                                })
+
+                                # Reset for next block
+                                current_tool            = None
+                                current_tool_input_json = ""
+                                assistant_content       = []
+
+                            elif current_text_block:
+                                assistant_content.append({"text": current_text_block})
+                                current_text_block = ""
 
-                        elif current_text_block:
-                            assistant_content.append({"text": current_text_block})
-                            current_text_block = ""
+                        # ── stop reason ──────────────────────────────────
+                        elif event_type == "messageStop":
+                            stop_reason = chunk["messageStop"].get("stopReason")
 
-                    # ── stop reason ──────────────────────────────────────
-                    elif event_type == "messageStop":
-                        stop_reason = chunk["messageStop"].get("stopReason")
+                        # ── token usage ──────────────────────────────────
+                        elif event_type == "metadata":
+                            call.add_usage(chunk["metadata"].get("usage"))
 
                 # ── After stream: handle stop reason ─────────────────────
                 if stop_reason == "end_turn":
@@ -4,9 +4,18 @@ splits into safe chunks, translates each chunk, and returns the assembled result
 """
 from __future__ import annotations
 
+import functools
+import importlib.util
 import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
-from typing import List, Literal
+from typing import Callable, Deque, Dict, Iterator, List, Literal, Optional, Tuple
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -20,69 +29,212 @@ _OVERLAP_CHARS = 100  # slight overlap to keep sentence context at boundaries
 
 # ── Text extraction helpers ────────────────────────────────────────────────
 
+# A page whose text layer has fewer letters/digits than this is treated as
+# "no usable text" — it is OCR'd if it carries an image, otherwise kept as-is
+# (blank separator pages, signature-only last pages).
+_MIN_NATIVE_CHARS = 80
+
+# A page mostly covered by images whose text layer is thin for its size is a
+# scan carrying a few native words (court stamp, header line, Bates number):
+# OCR it even though it clears _MIN_NATIVE_CHARS.  Density is letters/digits
+# per 1000 pt² — a full A4 page of text is around 5, a stamp line under 0.5.
+_SCANNED_IMAGE_COVERAGE = 0.5
+_MIN_NATIVE_DENSITY = 1.0
+
+# Text layers where more than this fraction of characters are replacement /
+# private-use / control glyphs come from fonts without a usable ToUnicode map.
+_MAX_JUNK_RATIO = 0.05
+
+# Malayalam text where more than this fraction of words start with a dependent
+# vowel sign or virama was extracted from a broken (visual-order) font mapping.
+_MAX_ORPHAN_SIGN_RATIO = 0.10
+
+# Legacy ASCII-encoded Malayalam fonts: the text layer is Latin gibberish.
+_LEGACY_ML_FONT_MARKERS = ("ML-TT", "ML_TT", "MLTT", "FML-", "MANORAMA", "MATHRUBHUMI", "PANCHARI")
+
+_ocr_executor: Optional[ThreadPoolExecutor] = None
+_ocr_executor_lock = threading.Lock()
+
+
+def _get_ocr_executor() -> ThreadPoolExecutor:
+    """
+    Shared pool for page OCR.  pytesseract shells out to the tesseract binary,
+    so threads give real parallelism without pickling page images.
+    """
+    global _ocr_executor
+    if _ocr_executor is None:
+        with _ocr_executor_lock:
+            if _ocr_executor is None:
+                _ocr_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.LEGAL_TRANSLATE_OCR_WORKERS),
+                    thread_name_prefix="translate-ocr",
+                )
+    return _ocr_executor
+
+
+def _is_malayalam(ch: str) -> bool:
+    return "\u0d00" <= ch <= "\u0d7f"
+
+
+def _is_ml_dependent_sign(ch: str) -> bool:
+    # Vowel signs U+0D3E–U+0D4C, virama U+0D4D, au length mark U+0D57
+    return "\u0d3e" <= ch <= "\u0d4d" or ch == "\u0d57"
+
+
+def _native_text_problem(text: str, font_names: List[str]) -> Optional[str]:
+    """
+    Return a short reason if a page's native text layer cannot be trusted,
+    or None if it is good enough to translate without OCR.
+    """
+    letters = sum(1 for c in text if c.isalnum())
+    if letters < _MIN_NATIVE_CHARS:
+        return "sparse"
+
+    junk = sum(
+        1 for c in text
+        if c == "\ufffd"
+        or "\ue000" <= c <= "\uf8ff"
+        or (ord(c) < 32 and c not in "\n\r\t")
+    )
+    if junk / max(len(text), 1) > _MAX_JUNK_RATIO:
+        return "unmapped-glyphs"
+
+    has_malayalam = any(_is_malayalam(c) for c in text)
+    if not has_malayalam and any(
+        marker in name.upper() for name in font_names for marker in _LEGACY_ML_FONT_MARKERS
+    ):
+        return "legacy-malayalam-font"
+
+    if has_malayalam:
+        words = [w for w in text.split() if _is_malayalam(w[0])]
+        orphans = sum(1 for w in words if _is_ml_dependent_sign(w[0]))
+        if words and orphans / len(words) > _MAX_ORPHAN_SIGN_RATIO:
+            return "broken-malayalam-shaping"
+
+    return None
+
+
+def _looks_scanned(page, text: str) -> bool:
+    """True if *page* is mostly image with only a sparse native text layer."""
+    page_area = abs(page.rect)
+    if not page_area:
+        return False
+    image_area = 0.0
+    for info in page.get_image_info():
+        bbox = page.rect & info["bbox"]   # clip to the visible page
+        if not bbox.is_empty:
+            image_area += abs(bbox)
+    if min(image_area / page_area, 1.0) < _SCANNED_IMAGE_COVERAGE:
+        return False
+    letters = sum(1 for c in text if c.isalnum())
+    return letters * 1000 / page_area < _MIN_NATIVE_DENSITY
+
+
+def _ocr_image(image, lang: str) -> str:
+    import pytesseract  # type: ignore
+
+    try:
+        return pytesseract.image_to_string(image, lang=lang).strip()
+    except Exception as ocr_exc:
+        logger.debug("_extract_pdf_pages: page OCR failed: %s", ocr_exc)
+        return ""
+
 
-def _extract_pdf_force_ocr(data: bytes, lang: str = "mal+eng") -> str:
+def _extract_pdf_pages(data: bytes, lang: str = "mal+eng", force_ocr: bool = False) -> str:
     """
-    Extract text from a PDF using the same Force-OCR path as the OCR page:
-      1. Render each page with PyMuPDF (fitz) at 2× scale → PIL image.
-      2. Run Tesseract with *lang* (default "mal+eng") on every page.
-      3. If Tesseract yields nothing for a page, fall back to pypdf native
-         text for that page only (same merge logic as the OCR page).
-
-    This is the canonical path for scanned / image-based PDFs such as
-    court orders and Malayalam legal documents.
+    Extract text from a PDF page by page, OCR-ing only pages that need it:
+      1. Read each page's native text layer with PyMuPDF (fitz).
+      2. Keep it when it is dense enough, the page is not mostly a scanned
+         image, and the text passes the encoding checks (no unmapped glyphs,
+         no legacy ASCII Malayalam font, sane Malayalam vowel-sign order).
+      3. Otherwise — or for every page when *force_ocr* is set — render the
+         page at 2× and run Tesseract *lang* in the shared OCR pool.  Pages
+         render sequentially (PyMuPDF is not thread-safe) while earlier
+         pages are already being OCR'd; at most 2× the pool size of rendered
+         pages are in flight, so a long scan never holds every page image.
+      4. If OCR yields nothing for a page, the native text is kept.
+
+    Native-text court orders therefore translate with no OCR latency, and
+    mixed documents pay OCR cost only on their scanned pages.
     """
     try:
         import fitz  # type: ignore  (PyMuPDF)
-        import pytesseract  # type: ignore
-        from PIL import Image  # type: ignore
 
-        # ── render pages via fitz ──────────────────────────────────────────
+        try:
+            from PIL import Image  # type: ignore
+            ocr_available = importlib.util.find_spec("pytesseract") is not None
+        except ImportError:
+            ocr_available = False
+
+        started = time.monotonic()
+        window = max(1, settings.LEGAL_TRANSLATE_OCR_WORKERS) * 2
         doc = fitz.open(stream=data, filetype="pdf")
-        ocr_pages: List[str] = []
-        for page in doc:
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
-            mode = "RGBA" if pix.alpha else "RGB"
-            image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
-            try:
-                text = pytesseract.image_to_string(image, lang=lang).strip()
-            except Exception as ocr_exc:
-                logger.debug("_extract_pdf_force_ocr: page OCR failed: %s", ocr_exc)
-                text = ""
-            ocr_pages.append(text)
-        doc.close()
-
-        # ── fallback: for any page where OCR produced nothing, try pypdf ──
-        has_blank = any(not t for t in ocr_pages)
-        if has_blank:
-            try:
-                import io as _io
-                import pypdf  # type: ignore
-
-                reader = pypdf.PdfReader(_io.BytesIO(data))
-                native_pages = [
-                    (reader.pages[i].extract_text() or "").strip()
-                    for i in range(len(reader.pages))
-                ]
-                merged = [
-                    ocr_pages[i] if ocr_pages[i] else native_pages[i]
-                    for i in range(min(len(ocr_pages), len(native_pages)))
-                ]
-                ocr_pages = merged
-            except Exception as native_exc:
-                logger.debug(
-                    "_extract_pdf_force_ocr: native fallback failed: %s", native_exc
-                )
+        native_pages: List[str] = []
+        ocr_pages: Dict[int, str] = {}
+        in_flight: Deque[Tuple[int, Future]] = deque()
+        reasons: Dict[str, int] = {}
+
+        def collect_oldest() -> None:
+            idx, future = in_flight.popleft()
+            ocr_pages[idx] = future.result()
+
+        try:
+
+            for idx, page in enumerate(doc):
+                native = (page.get_text("text") or "").strip()
+                native_pages.append(native)
+
+                if force_ocr:
+                    reason: Optional[str] = "forced"
+                else:
+                    fonts = [f[3] for f in page.get_fonts()]
+                    reason = _native_text_problem(native, fonts)
+                    if reason == "sparse" and not page.get_images():
+                        reason = None   # genuinely (near-)empty page
+                    elif reason is None and _looks_scanned(page, native):
+                        reason = "scanned"
+                if reason is None:
+                    continue
+
+                reasons[reason] = reasons.get(reason, 0) + 1
+                if not ocr_available:
+                    continue
+                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
+                mode = "RGBA" if pix.alpha else "RGB"
+                image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+                in_flight.append((idx, _get_ocr_executor().submit(_ocr_image, image, lang)))
+                del pix, image
+                while len(in_flight) > window:
+                    collect_oldest()
+            while in_flight:
+                collect_oldest()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+            doc.close()
+
+        if reasons and not ocr_available:
+            logger.warning(
+                "_extract_pdf_pages: %d pages need OCR but pytesseract/Pillow "
+                "are not installed — using native text", sum(reasons.values()),
+            )
 
-        result = "\n\n".join(ocr_pages).strip()
+        pages = list(native_pages)
+        for idx, ocr_text in ocr_pages.items():
+            if ocr_text:
+                pages[idx] = ocr_text
+
+        result = "\n\n".join(p for p in pages if p).strip()
         logger.info(
-            "_extract_pdf_force_ocr: %d pages, lang=%s, %d chars extracted",
-            len(ocr_pages), lang, len(result),
+            "_extract_pdf_pages: %d pages (%d native, %d OCR %s), lang=%s, "
+            "%d chars in %.2fs",
+            len(pages), len(pages) - len(ocr_pages), len(ocr_pages),
+            reasons, lang, len(result), time.monotonic() - started,
         )
         return result
 
     except Exception as exc:
-        logger.error("_extract_pdf_force_ocr failed: %s", exc)
+        logger.error("_extract_pdf_pages failed: %s", exc)
         # Last resort — old threshold-based path
         return _extract_pdf_threshold_fallback(data, ocr_lang=lang)
 
@@ -162,20 +314,26 @@ def _extract_txt(data: bytes) -> str:
         return data.decode("latin-1", errors="replace")
 
 
-def extract_text(data: bytes, mime_type: str, ocr_lang: str = "mal+eng") -> str:
+def extract_text(
+    data: bytes,
+    mime_type: str,
+    ocr_lang: str = "mal+eng",
+    force_ocr: bool = False,
+) -> str:
     """
     Dispatch to the right extractor based on MIME type.
 
-    For PDFs: always uses the Force-OCR path (fitz + Tesseract mal+eng),
-    same as ticking "Force OCR" on the OCR page.  This correctly handles
-    scanned Malayalam court documents that fool pypdf into returning
-    garbled or empty text.
+    For PDFs: each page's native text layer is used when it is dense and
+    correctly encoded; pages that are scanned, sparse or carry garbled
+    Malayalam (legacy fonts, broken glyph maps) are OCR'd with Tesseract
+    *ocr_lang* in parallel.  Pass *force_ocr* to OCR every page, same as
+    ticking "Force OCR" on the OCR page.
 
     Supported: application/pdf, application/vnd.openxmlformats-officedocument.wordprocessingml.document,
                text/plain.
     """
     if mime_type == "application/pdf":
-        return _extract_pdf_force_ocr(data, lang=ocr_lang)
+        return _extract_pdf_pages(data, lang=ocr_lang, force_ocr=force_ocr)
     if mime_type in (
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "application/msword",
@@ -233,6 +391,137 @@ def chunk_text(text: str, max_chars: int = _MAX_CHUNK_CHARS) -> List[str]:
     return final_chunks
 
 
+# ── Concurrent chunk translation ──────────────────────────────────────────
+
+# One semaphore per Bedrock model, shared by every document being translated
+# in this process, so parallel uploads cannot exceed the model's limit.
+_model_slots: Dict[str, threading.BoundedSemaphore] = {}
+_model_slots_lock = threading.Lock()
+
+
+def _model_slot(model_id: str) -> threading.BoundedSemaphore:
+    with _model_slots_lock:
+        slot = _model_slots.get(model_id)
+        if slot is None:
+            slot = threading.BoundedSemaphore(max(1, settings.LEGAL_TRANSLATE_CONCURRENCY))
+            _model_slots[model_id] = slot
+        return slot
+
+
+def _failed_chunk(idx: int, chunk: str, exc: Optional[BaseException]) -> dict:
+    return {
+        "index": idx,
+        "text": chunk,
+        "failed": True,
+        "error": str(exc),
+        "warnings": [],
+        "glossary_hits": 0,
+        "tm_segments": 0,
+        "tm_hits": 0,
+    }
+
+
+def _translate_one_chunk(
+    idx: int,
+    chunk: str,
+    direction: Direction,
+    translate_fn: Callable[..., str],
+    model_id: str,
+) -> dict:
+    """
+    Protect → translate → restore → validate a single chunk, retrying
+    transient failures (RuntimeError) with backoff.  Never raises: a chunk
+    that still fails after the retries, or fails in any other way (budget
+    exhausted, malformed response, ...), comes back with ``failed=True`` and
+    the source text.
+    """
+    from .protect_service import protect_service
+    from .glossary_service import glossary_service
+    from .translation_memory import TMStats
+
+    try:
+        protected, pmap = protect_service.protect_text(chunk)
+        attempts = 1 + max(0, settings.LEGAL_TRANSLATE_CHUNK_RETRIES)
+        last_exc: Optional[Exception] = None
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(min(8.0, 0.5 * 2 ** (attempt - 1)) * (1 + random.random()))
+            tm_stats = TMStats()
+            try:
+                with _model_slot(model_id):
+                    translated_protected = translate_fn(protected, direction, tm_stats=tm_stats)
+                break
+            except RuntimeError as exc:
+                last_exc = exc
+                logger.warning(
+                    "Chunk %d translation attempt %d/%d failed: %s",
+                    idx + 1, attempt + 1, attempts, exc,
+                )
+        else:
+            return _failed_chunk(idx, chunk, last_exc)
+
+        restored = protect_service.restore_text(translated_protected, pmap)
+        return {
+            "index": idx,
+            "text": restored,
+            "failed": False,
+            "error": None,
+            "warnings": protect_service.validate_protection(chunk, restored, pmap),
+            "glossary_hits": len(glossary_service.find_matches(chunk, direction)),
+            "tm_segments": tm_stats.segments,
+            "tm_hits": tm_stats.hits,
+        }
+    except Exception as exc:
+        # Not worth retrying; one chunk must not sink the whole document
+        logger.warning("Chunk %d translation failed: %s", idx + 1, exc)
+        return _failed_chunk(idx, chunk, exc)
+
+
+def translate_chunks_ordered(
+    chunks: List[str],
+    direction: Direction,
+    translate_fn: Optional[Callable[..., str]] = None,
+    model_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Translate *chunks* concurrently and yield one result dict per chunk in
+    document order, each as soon as it and every chunk before it is done.
+
+    At most LEGAL_TRANSLATE_CONCURRENCY calls per model are in flight across
+    the whole process.  Each chunk is retried independently; see
+    ``_translate_one_chunk`` for the result shape.  Closing the generator
+    early (e.g. SSE client disconnect) cancels chunks not yet started.
+
+    *translate_fn* defaults to ``llm_translate_service.translate_chunk`` (on
+    *model_id*, usage accounted to *user_id*) and is called as
+    ``translate_fn(text, direction, tm_stats=TMStats)``.
+    """
+    model = model_id or settings.LEGAL_TRANSLATE_MODEL_ID
+    if translate_fn is None:
+        from .llm_translate_service import llm_translate_service
+
+        translate_fn = functools.partial(
+            llm_translate_service.translate_chunk, model_id=model, user_id=user_id
+        )
+
+    if not chunks:
+        return
+    executor = ThreadPoolExecutor(
+        max_workers=min(len(chunks), max(1, settings.LEGAL_TRANSLATE_CONCURRENCY)),
+        thread_name_prefix="translate-chunk",
+    )
+    try:
+        futures = [
+            executor.submit(_translate_one_chunk, idx, chunk, direction, translate_fn, model)
+            for idx, chunk in enumerate(chunks)
+        ]
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 # ── Orchestrator ───────────────────────────────────────────────────────────
 
 
@@ -245,14 +534,20 @@ class DocumentTranslateService:
         self,
         text: str,
         direction: Direction,
+        user_id: Optional[str] = None,
     ) -> dict:
         """
         Translate a (potentially long) document text.
 
+        Chunks are translated concurrently (see ``translate_chunks_ordered``)
+        and reassembled in document order.
+
         Parameters
         ----------
         text      : extracted plain text from document
         direction : "en_to_ml" | "ml_to_en"
+        user_id   : owner of the Bedrock usage; raises ``BudgetExceeded`` up
+                    front when over the daily token budget
 
         Returns
         -------
@@ -261,13 +556,16 @@ class DocumentTranslateService:
           "chunks": int,
           "glossary_hits": int,
           "warnings": list[str],
+          "tm_segments": int,    # paragraphs eligible for translation memory
+          "tm_hits": int,        # of which served from memory
+          "tm_hit_rate": float,
         }
         """
-        # Import here to avoid circular imports at module load time
-        from .llm_translate_service import llm_translate_service
-        from .protect_service import protect_service
-        from .glossary_service import glossary_service
+        from app.services import llm_usage_service
+
+        from .translation_memory import TMStats
 
+        model = llm_usage_service.admit("translate", settings.LEGAL_TRANSLATE_MODEL_ID, user_id)
         chunks = chunk_text(text)
         logger.info(
             "document_translate: %d chars → %d chunks (direction=%s)",
@@ -277,31 +575,23 @@ class DocumentTranslateService:
         translated_parts: List[str] = []
         all_warnings: List[str] = []
         total_glossary_hits = 0
+        tm_stats = TMStats()
 
-        for idx, chunk in enumerate(chunks):
-            protected, pmap = protect_service.protect_text(chunk)
-            try:
-                translated_protected = llm_translate_service.translate_chunk(
-                    protected, direction
+        for result in translate_chunks_ordered(chunks, direction, model_id=model, user_id=user_id):
+            idx = result["index"]
+            if result["failed"]:
+                logger.error(
+                    "Chunk %d/%d translation failed: %s", idx + 1, len(chunks), result["error"]
                 )
-            except RuntimeError as exc:
-                logger.error("Chunk %d/%d translation failed: %s", idx + 1, len(chunks), exc)
                 # Keep original chunk on failure so document is still usable
-                translated_parts.append(chunk)
-                all_warnings.append(f"Chunk {idx + 1} failed: {exc}")
-                continue
-
-            restored = protect_service.restore_text(translated_protected, pmap)
-            warnings = protect_service.validate_protection(chunk, restored)
-            all_warnings.extend(warnings)
-
-            hits = len(glossary_service.find_matches(chunk, direction))
-            total_glossary_hits += hits
-
-            translated_parts.append(restored)
+                all_warnings.append(f"Chunk {idx + 1} failed: {result['error']}")
+            all_warnings.extend(result["warnings"])
+            total_glossary_hits += result["glossary_hits"]
+            tm_stats.add(TMStats(result["tm_segments"], result["tm_hits"]))
+            translated_parts.append(result["text"])
             logger.debug(
                 "Chunk %d/%d done — glossary_hits=%d warnings=%d",
-                idx + 1, len(chunks), hits, len(warnings),
+                idx + 1, len(chunks), result["glossary_hits"], len(result["warnings"]),
             )
 
         return {
@@ -309,6 +599,9 @@ class DocumentTranslateService:
             "chunks": len(chunks),
             "glossary_hits": total_glossary_hits,
             "warnings": all_warnings,
+            "tm_segments": tm_stats.segments,
+            "tm_hits": tm_stats.hits,
+            "tm_hit_rate": tm_stats.hit_rate,
         }
 
     def translate_bytes(
@@ -316,14 +609,14 @@ class DocumentTranslateService:
         data: bytes,
         mime_type: str,
         direction: Direction,
+        user_id: Optional[str] = None,
     ) -> dict:
         """
         Extract text from raw file bytes, then translate.
 
-        PDFs always go through the Force-OCR path (fitz + Tesseract mal+eng)
-        — the same workflow as ticking "Force OCR" on the OCR page.  This
-        avoids the garbled-text problem that occurs when pypdf tries to read
-        a scanned Malayalam PDF.
+        PDFs are classified page by page: pages with a usable text layer are
+        read natively and only scanned or garbled pages are OCR'd (Tesseract
+        mal+eng), so native-text court orders skip OCR entirely.
 
         Returns the same dict as translate_document_text, plus "char_count".
         """
@@ -332,7 +625,7 @@ class DocumentTranslateService:
             logger.warning(
                 "translate_bytes: extraction produced empty text for mime=%s", mime_type
             )
-        result = self.translate_document_text(text, direction)
+        result = self.translate_document_text(text, direction, user_id)
         result["char_count"] = len(text)
         return result
 
@@ -1,20 +1,131 @@
 """
 Glossary service — loads legal_glossary.json once at startup, builds
-bidirectional indexes sorted longest-match-first, and provides fast
-term lookup and placeholder replacement helpers for the translation pipeline.
+bidirectional indexes sorted longest-match-first plus an Aho–Corasick
+automaton per direction, and provides fast term lookup and placeholder
+replacement helpers for the translation pipeline.
+
+Every lookup is a single pass over the text (O(text + matches)) regardless
+of glossary size, instead of one scan or regex substitution per term.
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
-import re
+from collections import deque
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as ``\\w`` in Python's ``re``."""
+    return ch.isalnum() or ch == "_"
+
+
+def _casefold_same_length(text: str) -> str:
+    """
+    Lowercase *text* without changing its length, so match offsets in the
+    folded text are valid in the original (a few characters such as 'İ'
+    lowercase to two code points; those are left as-is).
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class _TermAutomaton:
+    """
+    Aho–Corasick automaton over a fixed term list.
+
+    ``scan`` reports leftmost-longest, non-overlapping matches in a single
+    pass.  With ``whole_words=True`` a match must satisfy the same boundary
+    rule as ``\\b<term>\\b`` in ``re``: the character on each side of the
+    match must differ in "wordiness" from the term's own edge character.
+    """
+
+    def __init__(self, terms: List[str], case_insensitive: bool) -> None:
+        self.case_insensitive = case_insensitive
+        self._goto: List[Dict[str, int]] = [{}]
+        self._term: List[Optional[str]] = [None]   # term ending at node
+        self._fail: List[int] = [0]
+        self._dict_link: List[int] = [0]           # nearest fail-ancestor with a term
+
+        for term in terms:
+            key = term.lower() if case_insensitive else term
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._term.append(None)
+                    self._fail.append(0)
+                    self._dict_link.append(0)
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._term[node] = key
+
+        # Breadth-first construction of failure and dictionary-suffix links
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                fail = self._goto[f].get(ch, 0)
+                self._fail[child] = fail if fail != child else 0
+                self._dict_link[child] = (
+                    fail if self._term[fail] is not None else self._dict_link[fail]
+                )
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def scan(self, text: str, whole_words: bool) -> List[Tuple[int, int, str]]:
+        """Return ``(start, end, term_key)`` matches, ordered by start."""
+        if not text or len(self._goto) == 1:
+            return []
+        hay = _casefold_same_length(text) if self.case_insensitive else text
+        goto, fail, terms, dict_link = self._goto, self._fail, self._term, self._dict_link
+        n = len(text)
+
+        candidates: List[Tuple[int, int, str]] = []
+        node = 0
+        for i, ch in enumerate(hay):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            m = node if terms[node] is not None else dict_link[node]
+            while m:
+                key = terms[m]
+                end = i + 1
+                start = end - len(key)
+                if not whole_words or (
+                    (start == 0 or _is_word_char(text[start - 1]) != _is_word_char(key[0]))
+                    and (end == n or _is_word_char(text[end]) != _is_word_char(key[-1]))
+                ):
+                    candidates.append((start, end, key))
+                m = dict_link[m]
+
+        if not candidates:
+            return []
+        # Leftmost-longest, non-overlapping selection
+        candidates.sort(key=lambda c: (c[0], c[0] - c[1]))
+        selected: List[Tuple[int, int, str]] = []
+        last_end = 0
+        for start, end, key in candidates:
+            if start >= last_end:
+                selected.append((start, end, key))
+                last_end = end
+        return selected
+
+
 class GlossaryService:
     """
     Singleton that owns the in-memory legal glossary.
@@ -34,6 +145,8 @@ class GlossaryService:
         self._en_terms: List[str] = []   # already-lowercase keys
         self._ml_terms: List[str] = []
         self._categories: Dict[str, str] = {}  # lowercase EN → category label
+        self._automata: Dict[str, _TermAutomaton] = {}
+        self._version = "none"   # content hash of the loaded glossary file
         self._loaded = False
 
     # ── Loading ──────────────────────────────────────────────────────────────
@@ -58,14 +171,16 @@ class GlossaryService:
             return
 
         try:
-            with open(path, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
+            with open(path, "rb") as fh:
+                raw = fh.read()
+            data = json.loads(raw.decode("utf-8"))
         except Exception as exc:
             logger.error("Failed to load legal_glossary.json: %s", exc)
             self._loaded = True
             return
 
         terms: List[dict] = data.get("terms", [])
+        self._version = hashlib.sha1(raw).hexdigest()[:12]
 
         # ── Validation pass ────────────────────────────────────────────────
         seen_en: Dict[str, int] = {}   # lowercase EN → first occurrence index
@@ -122,6 +237,11 @@ class GlossaryService:
         # Sort longest-first so multi-word phrases are matched before substrings
         self._en_terms = sorted(self._en_to_ml.keys(), key=len, reverse=True)
         self._ml_terms = sorted(self._ml_to_en.keys(), key=len, reverse=True)
+        # Compile once; English is matched case-insensitively, Malayalam exactly
+        self._automata = {
+            "en_to_ml": _TermAutomaton(self._en_terms, case_insensitive=True),
+            "ml_to_en": _TermAutomaton(self._ml_terms, case_insensitive=False),
+        }
         self._loaded = True
         logger.info(
             "Legal glossary loaded: %d EN→ML entries, %d ML→EN entries "
@@ -136,54 +256,55 @@ class GlossaryService:
 
     # ── Public API ────────────────────────────────────────────────────────────
 
+    @property
+    def version(self) -> str:
+        """Short content hash of the loaded glossary ("none" when disabled)."""
+        self._ensure_loaded()
+        return self._version
+
+    def _scan(
+        self, text: str, direction: str, whole_words: bool
+    ) -> Tuple[List[Tuple[int, int, str]], Dict[str, str]]:
+        self._ensure_loaded()
+        mapping = self._en_to_ml if direction == "en_to_ml" else self._ml_to_en
+        automaton = self._automata.get(direction)
+        if automaton is None:
+            return [], mapping
+        return automaton.scan(text, whole_words), mapping
+
     def find_matches(self, text: str, direction: str) -> List[Tuple[str, str]]:
         """
         Return a list of (source_term, target_term) pairs found in *text*.
-        Only the first occurrence of each term is returned; longer matches
-        take priority (thanks to the longest-first ordering).
+        Each term is returned once; longer matches take priority over terms
+        they overlap, and the result is ordered longest term first.
+
+        Matching is substring-based (no word boundaries), so terms that
+        appear inside inflected forms are still reported as prompt hints.
 
         Parameters
         ----------
         text      : input text to scan
         direction : "en_to_ml" | "ml_to_en"
         """
-        self._ensure_loaded()
-
-        if direction == "en_to_ml":
-            source_terms = self._en_terms
-            mapping = self._en_to_ml
-            text_lower = text.lower()
-        else:
-            source_terms = self._ml_terms
-            mapping = self._ml_to_en
-            text_lower = text
-
-        matches: List[Tuple[str, str]] = []
-        seen_spans: List[Tuple[int, int]] = []
-
-        for term in source_terms:
-            search_in = text_lower if direction == "en_to_ml" else text
-            pos = search_in.find(term)
-            if pos == -1:
-                continue
-            end = pos + len(term)
-            if any(s <= pos < e or s < end <= e for s, e in seen_spans):
-                continue
-            seen_spans.append((pos, end))
-            matches.append((term, mapping[term]))
-
-        return matches
+        spans, mapping = self._scan(text, direction, whole_words=False)
+        seen: Dict[str, None] = {}
+        for _, _, term in spans:
+            seen.setdefault(term, None)
+        ordered = sorted(seen, key=len, reverse=True)   # stable: ties by first occurrence
+        return [(term, mapping[term]) for term in ordered]
 
     def replace_with_placeholders(
         self, text: str, direction: str
     ) -> Tuple[str, Dict[str, str]]:
         """
         Scan *text* for glossary matches and replace them with deterministic
-        ``<<GLOSS_N>>`` tokens (N starts at 1, increments per unique matched term).
+        ``<<GLOSS_N>>`` tokens (N starts at 1, increments per unique matched
+        term in order of first occurrence).
 
         Each unique matched term gets one placeholder; ALL occurrences of that
-        term in the text are replaced with the same placeholder.  Longest terms
-        are matched first to prevent sub-term clobbering.
+        term in the text are replaced with the same placeholder.  Matches are
+        leftmost-longest and non-overlapping, so sub-terms are never clobbered.
+        English terms must sit on word boundaries and match case-insensitively.
 
         Parameters
         ----------
@@ -196,42 +317,28 @@ class GlossaryService:
             tokenized_text — text with glossary terms replaced by ``<<GLOSS_N>>``
             term_map       — ``{placeholder: target_language_translation}``
         """
-        self._ensure_loaded()
-
-        if direction == "en_to_ml":
-            source_terms = self._en_terms   # sorted longest-first, lowercase
-            mapping = self._en_to_ml
-        else:
-            source_terms = self._ml_terms
-            mapping = self._ml_to_en
+        spans, mapping = self._scan(
+            text, direction, whole_words=(direction == "en_to_ml")
+        )
+        if not spans:
+            return text, {}
 
         term_map: Dict[str, str] = {}
-        result = text
-        counter = 1
-
-        for term in source_terms:
-            if direction == "en_to_ml":
-                # Quick pre-check before expensive regex
-                if term not in result.lower():
-                    continue
-                placeholder = f"<<GLOSS_{counter}>>"
-                # Word-boundary replacement, case-insensitive for English
-                result = re.sub(
-                    r"\b" + re.escape(term) + r"\b",
-                    placeholder,
-                    result,
-                    flags=re.IGNORECASE,
-                )
-            else:
-                if term not in result:
-                    continue
-                placeholder = f"<<GLOSS_{counter}>>"
-                result = result.replace(term, placeholder)
-
-            term_map[placeholder] = mapping[term]
-            counter += 1
-
-        return result, term_map
+        placeholders: Dict[str, str] = {}
+        parts: List[str] = []
+        cursor = 0
+        for start, end, term in spans:
+            placeholder = placeholders.get(term)
+            if placeholder is None:
+                placeholder = f"<<GLOSS_{len(placeholders) + 1}>>"
+                placeholders[term] = placeholder
+                term_map[placeholder] = mapping[term]
+            parts.append(text[cursor:start])
+            parts.append(placeholder)
+            cursor = end
+        parts.append(text[cursor:])
+
+        return "".join(parts), term_map
 
     def restore_placeholders(self, translated: str, term_map: Dict[str, str]) -> str:
         """
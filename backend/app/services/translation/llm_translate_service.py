@@ -8,14 +8,16 @@ from __future__ import annotations
 import json
 import logging
 import re
-from typing import Dict, Generator, List, Literal, Union
+from typing import Dict, Generator, List, Literal, Tuple, Union
 
 import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from app.core.config import settings
+from app.services import llm_usage_service
 from .glossary_service import glossary_service
 from .protect_service import protect_service
+from .translation_memory import Segment, TMStats, make_segment, translation_memory
 
 logger = logging.getLogger(__name__)
 
@@ -166,6 +168,10 @@ def _validate_glossary_placeholders(
     return [ph for ph in term_map if ph not in translated]
 
 
+# Blank-line paragraph separator; the capture group keeps it in re.split output
+_PARAGRAPH_SPLIT_RE = re.compile(r"(\n[ \t]*\n\s*)")
+_PROT_RE = re.compile(r"__PROT_\d{4}__")
+
 # Matches any LLM preamble the model adds before the actual translation,
 # e.g. "Here is the formal English translation of the Malayalam legal text:"
 # or "Translation:" or "Here is the Malayalam translation:\n\n"
@@ -187,6 +193,32 @@ def _strip_preamble(text: str) -> str:
     return stripped
 
 
+def _aligned_pairs(
+    run: List[int], pieces: List[str], parts: List[str], segments: Dict[int, Segment]
+) -> List[Tuple[Segment, str]]:
+    """
+    The (segment, translated paragraph) pairs of one translated run that are
+    safe to remember.  Equal paragraph counts do not prove alignment — the
+    model may merge one paragraph and split another — so a paragraph is only
+    trusted when the run has no other, or when its translation carries
+    exactly its source's entity tokens and no other paragraph of the run has
+    that same token set.
+    """
+    if len(run) == 1:
+        return [(segments[run[0]], pieces[0])] if run[0] in segments else []
+    sources = [frozenset(_PROT_RE.findall(parts[idx])) for idx in run]
+    pairs: List[Tuple[Segment, str]] = []
+    for idx, source, piece in zip(run, sources, pieces):
+        if (
+            idx in segments
+            and source
+            and sources.count(source) == 1
+            and frozenset(_PROT_RE.findall(piece)) == source
+        ):
+            pairs.append((segments[idx], piece))
+    return pairs
+
+
 # ── Service ───────────────────────────────────────────────────────────────
 
 class LLMTranslateService:
@@ -208,19 +240,27 @@ class LLMTranslateService:
         system_prompt: str,
         direction: Direction,
         model_id: str | None = None,
+        user_id: str | None = None,
     ) -> str:
-        """Single synchronous Bedrock Converse call; returns translated text."""
+        """
+        Single synchronous Bedrock Converse call; returns translated text.
+
+        Usage is accounted to *user_id*; the budget is checked by the public
+        entry points, once per request, not per chunk.
+        """
         model = model_id or settings.LEGAL_TRANSLATE_MODEL_ID
         max_tokens = _adaptive_max_tokens(text, settings.LEGAL_TRANSLATE_MAX_TOKENS)
-        response = self._client.converse(
-            modelId=model,
-            system=[{"text": system_prompt}],
-            messages=[{"role": "user", "content": [{"text": text}]}],
-            inferenceConfig={
-                "temperature": settings.LEGAL_TRANSLATE_TEMPERATURE,
-                "maxTokens": max_tokens,
-            },
-        )
+        with llm_usage_service.track("translate", model, user_id=user_id, check_budget=False) as call:
+            response = self._client.converse(
+                modelId=model,
+                system=[{"text": system_prompt}],
+                messages=[{"role": "user", "content": [{"text": text}]}],
+                inferenceConfig={
+                    "temperature": settings.LEGAL_TRANSLATE_TEMPERATURE,
+                    "maxTokens": max_tokens,
+                },
+            )
+            call.add_usage(response.get("usage"))
         raw = response["output"]["message"]["content"][0]["text"].strip()
         return _strip_preamble(raw)
 
@@ -232,13 +272,16 @@ class LLMTranslateService:
         term_map: Dict[str, str],
         hint_block: str,
         model_id: str | None = None,
-    ) -> str:
+        user_id: str | None = None,
+    ) -> Tuple[str, bool]:
         """
         Call Bedrock, then validate <<GLOSS_N>> placeholders.
         If any are missing, retry once with an emphatic prompt.
-        Returns the translated tokenized string (still contains <<GLOSS_N>>).
+        Returns the translated tokenized string (still contains <<GLOSS_N>>)
+        and whether every placeholder survived.
         """
-        translated = self._call_bedrock(tokenized, system_prompt, direction, model_id)
+        complete = True
+        translated = self._call_bedrock(tokenized, system_prompt, direction, model_id, user_id)
 
         if term_map:
             missing = _validate_glossary_placeholders(translated, term_map)
@@ -251,43 +294,31 @@ class LLMTranslateService:
                     direction, hint_block, missing, term_map
                 )
                 translated = self._call_bedrock(
-                    tokenized, retry_prompt, direction, model_id
+                    tokenized, retry_prompt, direction, model_id, user_id
                 )
                 still_missing = _validate_glossary_placeholders(translated, term_map)
                 if still_missing:
+                    complete = False
                     logger.error(
                         "llm_translate: placeholders still missing after retry: %s",
                         still_missing,
                     )
 
-        return translated
+        return translated, complete
 
     # ── Public API ────────────────────────────────────────────────────────
 
-    def translate_chunk(
+    def _translate_uncached(
         self,
         text: str,
         direction: Direction,
         model_id: str | None = None,
-    ) -> str:
+        user_id: str | None = None,
+    ) -> Tuple[str, bool]:
         """
-        Translate a single text chunk using the full placeholder pipeline.
-
-        The caller may pass already-entity-protected text (containing
-        __PROT_NNNN__ tokens).  This method additionally:
-          1. Replaces glossary terms with <<GLOSS_N>> placeholders.
-          2. Translates via Bedrock (with retry on placeholder loss).
-          3. Restores glossary placeholders.
-
-        The caller is responsible for restoring __PROT_NNNN__ tokens afterwards.
-
-        Returns
-        -------
-        Translated text with __PROT_NNNN__ tokens intact.
+        Glossary placeholders → Bedrock (with retry) → glossary restore.
+        Also returns whether every glossary placeholder survived.
         """
-        if not text.strip():
-            return text
-
         # 1. Glossary placeholder replacement
         tokenized, term_map = glossary_service.replace_with_placeholders(text, direction)
 
@@ -301,8 +332,8 @@ class LLMTranslateService:
 
         try:
             # 4. Translate with placeholder validation + retry
-            translated = self._translate_with_retry(
-                tokenized, system_prompt, direction, term_map, hint_block, model_id
+            translated, complete = self._translate_with_retry(
+                tokenized, system_prompt, direction, term_map, hint_block, model_id, user_id
             )
         except (BotoCoreError, ClientError) as exc:
             logger.error("Bedrock translation failed: %s", exc)
@@ -312,9 +343,91 @@ class LLMTranslateService:
         if term_map:
             translated = glossary_service.restore_placeholders(translated, term_map)
 
-        return translated
+        return translated, complete
+
+    def translate_chunk(
+        self,
+        text: str,
+        direction: Direction,
+        model_id: str | None = None,
+        tm_stats: TMStats | None = None,
+        user_id: str | None = None,
+    ) -> str:
+        """
+        Translate a single text chunk using the full placeholder pipeline.
+
+        The caller may pass already-entity-protected text (containing
+        __PROT_NNNN__ tokens).  This method additionally:
+          1. Looks each paragraph up in the translation memory.
+          2. For runs of paragraphs not found, replaces glossary terms with
+             <<GLOSS_N>> placeholders, translates via Bedrock (with retry on
+             placeholder loss) and restores the glossary placeholders.
+          3. Stores newly translated paragraphs back into the memory.
+
+        The caller is responsible for restoring __PROT_NNNN__ tokens afterwards.
+        Segment / hit counts are added to *tm_stats* when given.  Bedrock usage
+        is accounted to *user_id*.
+
+        Returns
+        -------
+        Translated text with __PROT_NNNN__ tokens intact.
+        """
+        if not text.strip():
+            return text
 
-    def translate_text(self, text: str, direction: Direction) -> dict:
+        model = model_id or settings.LEGAL_TRANSLATE_MODEL_ID
+        if not translation_memory.enabled:
+            return self._translate_uncached(text, direction, model, user_id)[0]
+
+        # Even indexes are paragraphs, odd indexes the blank-line separators
+        parts = _PARAGRAPH_SPLIT_RE.split(text)
+        version = glossary_service.version
+        segments = {
+            i: make_segment(parts[i], direction, model, version)
+            for i in range(0, len(parts), 2)
+            if translation_memory.eligible(parts[i])
+        }
+        hits = translation_memory.lookup(segments) if segments else {}
+        if tm_stats is not None:
+            tm_stats.segments += len(segments)
+            tm_stats.hits += len(hits)
+
+        out = list(parts)
+        for i, translated in hits.items():
+            out[i] = translated
+
+        # Translate each maximal run of paragraphs the memory did not cover
+        to_store: List[Tuple[Segment, str]] = []
+        run: List[int] = []
+        for i in [*range(0, len(parts), 2), None]:
+            if i is not None and i not in hits:
+                if parts[i].strip():
+                    run.append(i)
+                continue
+            if not run:
+                continue
+            first, last = run[0], run[-1]
+            translated, complete = self._translate_uncached(
+                "".join(parts[first:last + 1]), direction, model, user_id
+            )
+            pieces = [p for p in _PARAGRAPH_SPLIT_RE.split(translated)[::2] if p.strip()]
+            if len(pieces) == len(run):
+                for idx, piece in zip(run, pieces):
+                    out[idx] = piece
+                if complete:
+                    to_store.extend(_aligned_pairs(run, pieces, parts, segments))
+            else:
+                # Paragraph structure changed — keep the run as one block
+                out[first] = translated
+                for idx in range(first + 1, last + 1):
+                    out[idx] = ""
+            run = []
+
+        if to_store:
+            translation_memory.store(to_store)
+        return "".join(out)
+
+    def translate_text(self, text: str, direction: Direction, user_id: str | None = None) -> dict:
         """
         Full pipeline for a plain-text input:
           1. Protect entities (__PROT_NNNN__)
@@ -325,6 +438,9 @@ class LLMTranslateService:
           6. Restore entity placeholders
           7. Validate protection
 
+        Raises ``BudgetExceeded`` before calling Bedrock when *user_id* is
+        over its daily token budget.
+
         Returns
         -------
         {
@@ -348,10 +464,11 @@ class LLMTranslateService:
         )
 
         # 4. Translate
+        model = llm_usage_service.admit("translate", settings.LEGAL_TRANSLATE_MODEL_ID, user_id)
         system_prompt = _build_system_prompt(direction, hint_block)
         try:
-            translated = self._translate_with_retry(
-                tokenized, system_prompt, direction, term_map, hint_block
+            translated, _ = self._translate_with_retry(
+                tokenized, system_prompt, direction, term_map, hint_block, model, user_id
             )
         except (BotoCoreError, ClientError) as exc:
             logger.error("Bedrock translation failed: %s", exc)
@@ -365,7 +482,7 @@ class LLMTranslateService:
         restored = protect_service.restore_text(translated, pmap)
 
         # 7. Validate entity protection
-        warnings = protect_service.validate_protection(text, restored)
+        warnings = protect_service.validate_protection(text, restored, pmap)
         if warnings:
             logger.warning("Protection validation issues: %s", warnings)
 
@@ -384,7 +501,11 @@ class LLMTranslateService:
         }
 
     def stream_translate_text(
-        self, text: str, direction: Direction
+        self,
+        text: str,
+        direction: Direction,
+        model_id: str | None = None,
+        user_id: str | None = None,
     ) -> Generator[Union[str, dict], None, None]:
         """
         Generator that streams the translation using Bedrock converse_stream.
@@ -398,7 +519,9 @@ class LLMTranslateService:
                "glossary_terms": list[{"source", "target"}],
                "direction": str}
 
-        The caller must handle both types and send them as SSE events.
+        The caller must handle both types and send them as SSE events.  A
+        generator cannot reject before the response starts, so the caller
+        checks the budget (``llm_usage_service.admit``) and passes *model_id*.
         """
         # 1. Protect entities
         protected, pmap = protect_service.protect_text(text)
@@ -413,37 +536,40 @@ class LLMTranslateService:
             tokenized, direction, max_terms=10
         )
         system_prompt = _build_system_prompt(direction, hint_block)
-        model = settings.LEGAL_TRANSLATE_MODEL_ID
+        model = model_id or settings.LEGAL_TRANSLATE_MODEL_ID
         max_tokens = _adaptive_max_tokens(text, settings.LEGAL_TRANSLATE_MAX_TOKENS)
 
         # 4. Stream from Bedrock
-        try:
-            response = self._client.converse_stream(
-                modelId=model,
-                system=[{"text": system_prompt}],
-                messages=[{"role": "user", "content": [{"text": tokenized}]}],
-                inferenceConfig={
-                    "temperature": settings.LEGAL_TRANSLATE_TEMPERATURE,
-                    "maxTokens": max_tokens,
-                },
-            )
-        except (BotoCoreError, ClientError) as exc:
-            logger.error("Bedrock stream translation failed: %s", exc)
-            raise RuntimeError(f"LLM stream translation error: {exc}") from exc
-
         full_translated = ""
-        stream = response.get("stream")
-        if stream:
-            for event in stream:
-                if "contentBlockDelta" in event:
-                    chunk_text = (
-                        event["contentBlockDelta"]
-                        .get("delta", {})
-                        .get("text", "")
-                    )
-                    if chunk_text:
-                        full_translated += chunk_text
-                        yield chunk_text   # raw chunk — client shows as live preview
+        with llm_usage_service.track("translate", model, user_id=user_id, check_budget=False) as call:
+            try:
+                response = self._client.converse_stream(
+                    modelId=model,
+                    system=[{"text": system_prompt}],
+                    messages=[{"role": "user", "content": [{"text": tokenized}]}],
+                    inferenceConfig={
+                        "temperature": settings.LEGAL_TRANSLATE_TEMPERATURE,
+                        "maxTokens": max_tokens,
+                    },
+                )
+            except (BotoCoreError, ClientError) as exc:
+                logger.error("Bedrock stream translation failed: %s", exc)
+                raise RuntimeError(f"LLM stream translation error: {exc}") from exc
+
+            stream = response.get("stream")
+            if stream:
+                for event in stream:
+                    if "contentBlockDelta" in event:
+                        chunk_text = (
+                            event["contentBlockDelta"]
+                            .get("delta", {})
+                            .get("text", "")
+                        )
+                        if chunk_text:
+                            full_translated += chunk_text
+                            yield chunk_text   # raw chunk — client shows as live preview
+                    elif "metadata" in event:
+                        call.add_usage(event["metadata"].get("usage"))
 
         # Strip any preamble the model emitted at the start of the stream
         full_translated = _strip_preamble(full_translated)
@@ -461,7 +587,7 @@ class LLMTranslateService:
                         direction, hint_block, missing, term_map
                     )
                     full_translated = self._call_bedrock(
-                        tokenized, retry_prompt, direction
+                        tokenized, retry_prompt, direction, model, user_id
                     )
                 except (BotoCoreError, ClientError) as exc:
                     logger.error("Bedrock retry failed: %s", exc)
@@ -476,7 +602,7 @@ class LLMTranslateService:
         full_restored = protect_service.restore_text(full_translated, pmap)
 
         # 8. Validate
-        warnings = protect_service.validate_protection(text, full_restored)
+        warnings = protect_service.validate_protection(text, full_restored, pmap)
 
         source_matches = glossary_service.find_matches(text, direction)
         glossary_terms = [
@@ -9,7 +9,7 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +23,11 @@ _CASE_NUMBER = re.compile(
 )
 
 # Section/article refs  e.g. "Section 302", "Sec. 420 IPC", "Art. 226", "Article 21"
+# The statute name must be Title Case words ending in "Act" (matched
+# case-sensitively) so the suffix cannot run across ordinary prose.
 _SECTION_REF = re.compile(
     r"\b(?:Section|Sec\.|Article|Art\.|Clause|S\.)\s*\d+(?:[A-Z])?(?:\s*\(\d+\))*"
-    r"(?:\s+(?:of\s+the\s+)?(?:[A-Z][A-Za-z\s]+?Act|IPC|CrPC|CPC|IEA|POCSO|NDPS|IT Act))?",
+    r"(?:\s+(?:of\s+the\s+)?(?:(?-i:(?:[A-Z][A-Za-z]*\s+)+Act)|IPC|CrPC|CPC|IEA|POCSO|NDPS|IT Act))?",
     re.IGNORECASE,
 )
 
@@ -82,6 +84,14 @@ _PATTERNS: List[Tuple[re.Pattern, str]] = [
     (_LATIN,        "LAT"),
 ]
 
+# All patterns fused into one alternation so a chunk is scanned once.  The
+# scanner takes the leftmost match; when several patterns match at the same
+# position the earliest in _PATTERNS wins (regex alternation order).
+_COMBINED = re.compile(
+    "|".join(f"(?P<{label}>{pattern.pattern})" for pattern, label in _PATTERNS),
+    re.IGNORECASE,
+)
+
 _PLACEHOLDER_RE = re.compile(r"__PROT_(\d{4})__")
 
 
@@ -90,14 +100,22 @@ class ProtectionMap:
     """Holds the mapping from placeholder → original text for one segment."""
     store: Dict[str, str] = field(default_factory=dict)
     counter: int = 0
+    labels: Dict[str, str] = field(default_factory=dict)   # placeholder → pattern label
+    restored: Optional[Set[str]] = None                    # placeholders seen by restore_text
 
-    def add(self, original: str) -> str:
+    def add(self, original: str, label: str = "") -> str:
         key = f"__PROT_{self.counter:04d}__"
         self.store[key] = original
+        self.labels[key] = label
         self.counter += 1
         return key
 
 
+def _scan(text: str) -> List[Tuple[int, int, str]]:
+    """Return non-overlapping ``(start, end, label)`` entity spans, left to right."""
+    return [(m.start(), m.end(), m.lastgroup or "") for m in _COMBINED.finditer(text)]
+
+
 class ProtectService:
     """
     Deterministic pre/post processor that shields legal entities from
@@ -108,64 +126,80 @@ class ProtectService:
     protected_text, pmap = protect_service.protect_text(raw_text)
     # … send protected_text to LLM …
     restored_text = protect_service.restore_text(translated_text, pmap)
+    warnings = protect_service.validate_protection(raw_text, restored_text, pmap)
     """
 
     # ── Public API ─────────────────────────────────────────────────────────
 
     def protect_text(self, text: str) -> Tuple[str, ProtectionMap]:
         """
-        Replace protected entities with placeholders.
+        Replace protected entities with placeholders in a single scan.
 
-        Returns (modified_text, ProtectionMap).
+        Placeholders are numbered left to right.  Returns
+        (modified_text, ProtectionMap).
         """
         pmap = ProtectionMap()
-        result = text
-
-        # Collect all non-overlapping matches from all patterns, then replace
-        # them from rightmost to leftmost so offsets stay valid.
-        all_matches: List[Tuple[int, int, str]] = []  # (start, end, original)
-
-        occupied: List[Tuple[int, int]] = []
-
-        for pattern, _label in _PATTERNS:
-            for m in pattern.finditer(result):
-                s, e = m.start(), m.end()
-                # Skip if already claimed by a higher-priority pattern
-                if any(os_ <= s < oe or os_ < e <= oe for os_, oe in occupied):
-                    continue
-                all_matches.append((s, e, m.group()))
-                occupied.append((s, e))
-
-        # Sort rightmost first so we can do in-place substitution
-        all_matches.sort(key=lambda x: x[0], reverse=True)
-
-        for start, end, original in all_matches:
-            placeholder = pmap.add(original)
-            result = result[:start] + placeholder + result[end:]
-
-        return result, pmap
+        parts: List[str] = []
+        cursor = 0
+        for start, end, label in _scan(text):
+            parts.append(text[cursor:start])
+            parts.append(pmap.add(text[start:end], label))
+            cursor = end
+        if not parts:
+            return text, pmap
+        parts.append(text[cursor:])
+        return "".join(parts), pmap
 
     def restore_text(self, text: str, pmap: ProtectionMap) -> str:
-        """Replace all __PROT_NNNN__ placeholders with their originals."""
+        """
+        Replace all __PROT_NNNN__ placeholders with their originals.
+
+        The placeholders actually found are recorded on *pmap* so
+        ``validate_protection`` can check them without rescanning.
+        """
+        seen: Set[str] = set()
 
         def _replacer(m: re.Match) -> str:
             key = m.group(0)
-            return pmap.store.get(key, key)
-
-        return _PLACEHOLDER_RE.sub(_replacer, text)
-
-    def validate_protection(self, original: str, restored: str) -> List[str]:
+            original = pmap.store.get(key)
+            if original is None:
+                return key
+            seen.add(key)
+            return original
+
+        restored = _PLACEHOLDER_RE.sub(_replacer, text)
+        pmap.restored = seen
+        return restored
+
+    def validate_protection(
+        self,
+        original: str,
+        restored: str,
+        pmap: Optional[ProtectionMap] = None,
+    ) -> List[str]:
         """
         Return a list of any entities that appear in *original* but are
         missing from *restored* (useful for logging / alerting).
+
+        With the *pmap* that ``restore_text`` used, only entities whose
+        placeholder the LLM dropped are checked (by substring, in case the
+        model copied the entity verbatim); otherwise *original* is scanned
+        once to find the entities.
         """
-        issues: List[str] = []
-        for pattern, label in _PATTERNS:
-            for m in pattern.finditer(original):
-                entity = m.group()
-                if entity not in restored:
-                    issues.append(f"[{label}] '{entity}' lost after restoration")
-        return issues
+        if pmap is not None and pmap.restored is not None:
+            entities = [
+                (pmap.labels.get(key, ""), value)
+                for key, value in pmap.store.items()
+                if key not in pmap.restored
+            ]
+        else:
+            entities = [(label, original[s:e]) for s, e, label in _scan(original)]
+
+        return [
+            f"[{label}] '{entity}' lost after restoration"
+            for label, entity in entities
+            if entity not in restored
+        ]
 
 
 # Module-level singleton
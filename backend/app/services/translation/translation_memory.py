@@ -0,0 +1,311 @@
+"""
+Translation memory — reuses previously translated segments so repeated
+boilerplate (cause titles, prayers, standard order language) is not sent to
+Bedrock again.
+
+Segments are paragraphs of the entity-protected chunk text.  Before hashing,
+a segment's ``__PROT_NNNN__`` tokens are renumbered in order of appearance,
+so the same paragraph matches regardless of where it sat in its chunk; the
+stored translation uses the same segment-local numbering and is mapped back
+to the caller's tokens on reuse.
+
+Keys are sha256(direction, model, glossary version, normalised segment), so a
+model switch or glossary edit never serves stale output.  Lookups go through
+an in-process LRU first, then the ``translation_memory`` table.  Any database
+error degrades to a cache miss — the memory never blocks a translation.
+Hit counts are tallied in process and written in batches, so a lookup is a
+read-only query.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_PROT_RE = re.compile(r"__PROT_\d{4}__")
+_LOOSE_RE = re.compile(r"[^\w]+")
+
+# In-process entries live for a day; the table is the durable store.
+_CACHE_TTL_SECONDS = 24 * 3600
+
+# Pending hit counts are written once this old, or once this many keys pile up
+_HIT_FLUSH_SECONDS = 60
+_HIT_FLUSH_KEYS = 500
+
+
+@dataclass
+class TMStats:
+    """Per-request segment counters (reported as the TM hit rate)."""
+    segments: int = 0
+    hits: int = 0
+
+    def add(self, other: "TMStats") -> None:
+        self.segments += other.segments
+        self.hits += other.hits
+
+    @property
+    def hit_rate(self) -> float:
+        return round(self.hits / self.segments, 4) if self.segments else 0.0
+
+
+@dataclass
+class Segment:
+    """A source paragraph prepared for lookup/storage."""
+    key: str
+    loose_key: str
+    normalized: str
+    direction: str
+    model_id: str
+    glossary_version: str
+    tokens: List[str] = field(default_factory=list)  # local index → caller's token
+
+    def to_local(self, translated: str) -> Optional[str]:
+        """Caller-numbered translation → segment-local numbering (None if it has foreign tokens)."""
+        local = {tok: f"__PROT_{i:04d}__" for i, tok in enumerate(self.tokens)}
+        foreign = False
+
+        def _sub(m: re.Match) -> str:
+            nonlocal foreign
+            tok = local.get(m.group(0))
+            if tok is None:
+                foreign = True
+                return m.group(0)
+            return tok
+
+        out = _PROT_RE.sub(_sub, translated)
+        return None if foreign else out
+
+    def local_tokens(self) -> set:
+        """The segment-local placeholders a translation of this segment must carry."""
+        return {f"__PROT_{i:04d}__" for i in range(len(self.tokens))}
+
+    def from_local(self, translated: str) -> str:
+        """Segment-local translation → the caller's token numbering."""
+
+        def _sub(m: re.Match) -> str:
+            idx = int(m.group(0)[7:11])
+            return self.tokens[idx] if idx < len(self.tokens) else m.group(0)
+
+        return _PROT_RE.sub(_sub, translated)
+
+
+def make_segment(text: str, direction: str, model_id: str, glossary_version: str) -> Segment:
+    tokens: List[str] = []
+    positions: Dict[str, int] = {}
+
+    def _renumber(m: re.Match) -> str:
+        tok = m.group(0)
+        if tok not in positions:
+            positions[tok] = len(tokens)
+            tokens.append(tok)
+        return f"__PROT_{positions[tok]:04d}__"
+
+    normalized = " ".join(_PROT_RE.sub(_renumber, text).split())
+    scope = f"{direction}\0{model_id}\0{glossary_version}\0"
+    loose = " ".join(_LOOSE_RE.sub(" ", normalized.casefold()).split())
+    return Segment(
+        key=hashlib.sha256((scope + normalized).encode("utf-8")).hexdigest(),
+        loose_key=hashlib.sha256((scope + loose).encode("utf-8")).hexdigest(),
+        normalized=normalized,
+        direction=direction,
+        model_id=model_id,
+        glossary_version=glossary_version,
+        tokens=tokens,
+    )
+
+
+class TranslationMemory:
+    """LRU front + Postgres back store for translated segments."""
+
+    def __init__(self) -> None:
+        self._cache: TTLCache[str] = TTLCache(
+            max_entries=settings.LEGAL_TRANSLATE_TM_CACHE_SIZE,
+            ttl_seconds=_CACHE_TTL_SECONDS,
+        )
+        self._hits: Dict[str, int] = {}
+        self._hits_lock = threading.Lock()
+        self._hits_flushed_at = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LEGAL_TRANSLATE_TM_ENABLED
+
+    def eligible(self, text: str) -> bool:
+        return len(text.strip()) >= settings.LEGAL_TRANSLATE_TM_MIN_CHARS
+
+    def lookup(self, segments: Dict[int, Segment]) -> Dict[int, str]:
+        """
+        Return ``{position: translation}`` for the segments found, with tokens
+        already mapped back to each segment's caller numbering.
+        """
+        found: Dict[int, str] = {}
+        pending: Dict[str, List[int]] = {}
+        for pos, seg in segments.items():
+            cached = self._cache.get(seg.key)
+            if cached is not None:
+                found[pos] = seg.from_local(cached)
+            else:
+                pending.setdefault(seg.key, []).append(pos)
+
+        if pending:
+            for key, translated in self._db_lookup(segments, pending).items():
+                self._cache.set(key, translated)
+                for pos in pending[key]:
+                    found[pos] = segments[pos].from_local(translated)
+        return found
+
+    def store(self, pairs: List[Tuple[Segment, str]]) -> None:
+        """
+        Persist caller-numbered translations for *pairs* (best effort).
+        A translation that does not carry exactly its segment's placeholders
+        (one dropped or foreign) is not stored: every later hit would reuse it.
+        """
+        rows: Dict[str, dict] = {}
+        for seg, translated in pairs:
+            local = seg.to_local(translated)
+            if local is None or not local.strip():
+                continue
+            if set(_PROT_RE.findall(local)) != seg.local_tokens():
+                continue
+            self._cache.set(seg.key, local)
+            rows[seg.key] = {
+                "key_hash": seg.key,
+                "loose_hash": seg.loose_key,
+                "direction": seg.direction,
+                "model_id": seg.model_id,
+                "glossary_version": seg.glossary_version,
+                "source_text": seg.normalized,
+                "translated_text": local,
+            }
+        if rows:
+            self._db_store(list(rows.values()))
+
+    # ── Persistence ───────────────────────────────────────────────────────
+
+    def _db_lookup(
+        self, segments: Dict[int, Segment], pending: Dict[str, List[int]]
+    ) -> Dict[str, str]:
+        from app.db.database import SessionLocal
+        from app.db.models import TranslationMemoryEntry as TM
+
+        result: Dict[str, str] = {}
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(TM.key_hash, TM.translated_text)
+                .filter(TM.key_hash.in_(list(pending)))
+                .all()
+            )
+            result = {r.key_hash: r.translated_text for r in rows}
+
+            if settings.LEGAL_TRANSLATE_TM_NEAR_MATCH:
+                loose_to_key = {
+                    segments[positions[0]].loose_key: key
+                    for key, positions in pending.items() if key not in result
+                }
+                if loose_to_key:
+                    near = (
+                        db.query(TM.loose_hash, TM.key_hash, TM.translated_text)
+                        .filter(TM.loose_hash.in_(list(loose_to_key)))
+                        .order_by(TM.hit_count.desc())
+                        .all()
+                    )
+                    for r in near:
+                        key = loose_to_key.get(r.loose_hash)
+                        if not key or key in result:
+                            continue
+                        # The variant must carry exactly this segment's
+                        # placeholders, or entities would be dropped or invented
+                        seg = segments[pending[key][0]]
+                        if set(_PROT_RE.findall(r.translated_text)) != seg.local_tokens():
+                            continue
+                        result[key] = r.translated_text
+                        self._count_hit(r.key_hash)
+
+            for r in rows:
+                self._count_hit(r.key_hash)
+            if self._hits_due():
+                self._flush_hits(db)
+        except Exception as exc:
+            db.rollback()
+            logger.warning("translation_memory: lookup failed (%s) — treating as miss", exc)
+        finally:
+            db.close()
+        return result
+
+    def _db_store(self, rows: List[dict]) -> None:
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        from app.db.database import SessionLocal
+        from app.db.models import TranslationMemoryEntry as TM
+
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            for row in rows:
+                row.update(hit_count=0, created_at=now, last_used_at=now)
+            db.execute(pg_insert(TM).values(rows).on_conflict_do_nothing(index_elements=["key_hash"]))
+            db.commit()
+            # Writing anyway: take the pending hit counts along
+            self._flush_hits(db)
+        except Exception as exc:
+            db.rollback()
+            logger.warning("translation_memory: store of %d segments failed: %s", len(rows), exc)
+        finally:
+            db.close()
+
+    def _count_hit(self, key: str) -> None:
+        with self._hits_lock:
+            self._hits[key] = self._hits.get(key, 0) + 1
+
+    def _hits_due(self) -> bool:
+        with self._hits_lock:
+            return bool(self._hits) and (
+                len(self._hits) >= _HIT_FLUSH_KEYS
+                or time.monotonic() - self._hits_flushed_at >= _HIT_FLUSH_SECONDS
+            )
+
+    def _flush_hits(self, db) -> None:
+        """Add the pending hit counts with one UPDATE and commit."""
+        from sqlalchemy import case
+
+        from app.db.models import TranslationMemoryEntry as TM
+
+        with self._hits_lock:
+            hits, self._hits = self._hits, {}
+            self._hits_flushed_at = time.monotonic()
+        if not hits:
+            return
+        try:
+            db.query(TM).filter(TM.key_hash.in_(list(hits))).update(
+                {
+                    TM.hit_count: TM.hit_count + case(hits, value=TM.key_hash, else_=0),
+                    TM.last_used_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            # Keep them for the next flush
+            with self._hits_lock:
+                for key, n in hits.items():
+                    self._hits[key] = self._hits.get(key, 0) + n
+            logger.warning("translation_memory: hit count update failed: %s", exc)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+# Module-level singleton
+translation_memory = TranslationMemory()
@@ -7,7 +7,10 @@ filtering, used by the Drafting AI feature.
 Functions
 ---------
 embed_text(text)
-    Call Bedrock Titan Embed v2 and return the embedding vector.
+    Embed a single string and return the vector as a list (legacy shape).
+
+embed_texts(texts)
+    Embed many strings and return one float32 NumPy array per input.
 
 retrieve_from_kb(query, workspace_id, top_k)
     Retrieve the most relevant chunks from the Bedrock KB that belong to the
@@ -16,18 +19,42 @@ retrieve_from_kb(query, workspace_id, top_k)
 ingest_chunk_to_kb(chunk, workspace_id, doc_id, filename)
     [Best-effort] Ingest a single text chunk into the Bedrock KB with metadata.
     Not a blocking operation — failures are logged and swallowed.
+
+Embedding pipeline
+------------------
+All embedding goes through one process-wide ``EmbeddingService``:
+  - concurrent requests are coalesced into micro-batches
+    (EMBEDDING_BATCH_SIZE / EMBEDDING_BATCH_WAIT_MS);
+  - identical texts are deduplicated and vectors are cached in a bounded LRU
+    keyed by hash(model, normalised text);
+  - Titan calls share one boto3 client and run on a small thread pool, so a
+    batch costs roughly one round-trip instead of one per chunk.
+Set EMBEDDING_BACKEND=local to use the deterministic ``LocalHashEmbedder``.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Any
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 _TITAN_EMBED_MODEL = "amazon.titan-embed-text-v2:0"
+_TITAN_MAX_CHARS   = 8000     # Titan v2 input limit (characters, conservative)
+_EMBED_DIM         = 1024
 _BEDROCK_KB_ID     = ""   # resolved at call time from env
 
+_WS_RE    = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\w+")
+
 
 def _kb_id() -> str:
     return os.getenv("BEDROCK_KNOWLEDGE_BASE_ID", "")
@@ -37,41 +64,301 @@ def _region() -> str:
     return os.getenv("AWS_REGION", "ap-south-1")
 
 
+def _normalize(text: str) -> str:
+    return _WS_RE.sub(" ", text or "").strip()[:_TITAN_MAX_CHARS]
+
+
+# ── Embedding backends ────────────────────────────────────────────────────────
+
+class TitanEmbedder:
+    """Titan Embed Text v2 via one shared bedrock-runtime client."""
+
+    model_id = _TITAN_EMBED_MODEL
+
+    def __init__(self, concurrency: int = 8) -> None:
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, concurrency), thread_name_prefix="titan-embed"
+        )
+
+    def _get_client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import boto3
+                    from app.core.config import settings
+
+                    self._client = boto3.client(
+                        "bedrock-runtime",
+                        region_name=_region(),
+                        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    )
+        return self._client
+
+    def _embed_one(self, text: str) -> Optional[np.ndarray]:
+        import json
+
+        try:
+            response = self._get_client().invoke_model(
+                modelId=_TITAN_EMBED_MODEL,
+                body=json.dumps({"inputText": text}),
+                contentType="application/json",
+                accept="application/json",
+            )
+            result = json.loads(response["body"].read())
+            vector = result.get("embedding") or []
+            return np.asarray(vector, dtype=np.float32) if vector else None
+        except Exception as exc:
+            logger.warning("embed_text failed: %s", exc)
+            return None
+
+    def embed_batch(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        """Blocking: embed *texts* in parallel on the backend's thread pool."""
+        return list(self._pool.map(self._embed_one, texts))
+
+
+class LocalHashEmbedder:
+    """
+    Deterministic, network-free stand-in for Titan (feature hashing of word
+    unigrams and bigrams, L2-normalised).  Texts that share words get similar
+    vectors, which is enough to exercise retrieval end-to-end in tests.
+    """
+
+    model_id = "local-hash-v1"
+
+    def __init__(self, dim: int = _EMBED_DIM) -> None:
+        self.dim = dim
+
+    def _embed_one(self, text: str) -> Optional[np.ndarray]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        if not tokens:
+            return None
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            h = int.from_bytes(digest, "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) == 0 else -1.0
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    def embed_batch(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        return [self._embed_one(t) for t in texts]
+
+
+# ── Batching service ──────────────────────────────────────────────────────────
+
+_EMPTY = np.empty(0, dtype=np.float32)
+
+
+class EmbeddingService:
+    """
+    Coalesces concurrent embed requests into micro-batches and caches vectors.
+
+    Safe to share across coroutines of one event loop; the cache itself is
+    lock-protected so sync callers on other threads can read it too.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        max_batch: int = 16,
+        max_wait_ms: int = 5,
+        cache_size: int = 20000,
+    ) -> None:
+        self.backend     = backend
+        self.max_batch   = max(1, max_batch)
+        self.max_wait    = max(0, max_wait_ms) / 1000.0
+        self.cache_size  = max(0, cache_size)
+
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pending: "OrderedDict[str, tuple[str, asyncio.Future]]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self, normalized: str) -> str:
+        raw = f"{self.backend.model_id}\x00{normalized}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    # ── cache ────────────────────────────────────────────────────────────────
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            vec = self._cache.get(key)
+            if vec is not None:
+                self._cache.move_to_end(key)
+            return vec
+
+    def _cache_put(self, key: str, vec: np.ndarray) -> None:
+        if not self.cache_size:
+            return
+        vec.setflags(write=False)
+        with self._cache_lock:
+            self._cache[key] = vec
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ── batching ─────────────────────────────────────────────────────────────
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # New event loop (e.g. a fresh asyncio.run in a script or test):
+            # futures from the old loop can never resolve here, so drop them.
+            self._loop = loop
+            self._pending.clear()
+            self._inflight.clear()
+            self._flush_handle = None
+        return loop
+
+    def _submit(self, text: str) -> "asyncio.Future[np.ndarray]":
+        """
+        Future for *text*'s vector.  Coalesced callers share one underlying
+        future, so each gets it behind its own ``asyncio.shield``: cancelling
+        one caller must not cancel the others (or the batch slot).
+        """
+        loop = self._bind_loop()
+        normalized = _normalize(text)
+        fut: asyncio.Future = loop.create_future()
+        if not normalized:
+            fut.set_result(_EMPTY)
+            return fut
+
+        key = self.cache_key(normalized)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.hits += 1
+            fut.set_result(cached)
+            return fut
+
+        shared = self._inflight.get(key)
+        if shared is not None:
+            self.hits += 1
+            return asyncio.shield(shared)
+
+        self.misses += 1
+        self._inflight[key] = fut
+        self._pending[key] = (normalized, fut)
+        if len(self._pending) >= self.max_batch:
+            self._schedule_flush(loop, immediate=True)
+        elif self._flush_handle is None:
+            self._schedule_flush(loop, immediate=False)
+        return asyncio.shield(fut)
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop, immediate: bool) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if immediate:
+            batch = self._take_batch()
+            loop.create_task(self._run_batch(batch))
+            if self._pending:
+                self._schedule_flush(loop, immediate=len(self._pending) >= self.max_batch)
+        else:
+            self._flush_handle = loop.call_later(self.max_wait, self._on_timer, loop)
+
+    def _on_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._flush_handle = None
+        if self._pending:
+            self._schedule_flush(loop, immediate=True)
+
+    def _take_batch(self) -> list[tuple[str, str, asyncio.Future]]:
+        batch: list[tuple[str, str, asyncio.Future]] = []
+        while self._pending and len(batch) < self.max_batch:
+            key, (normalized, fut) = self._pending.popitem(last=False)
+            batch.append((key, normalized, fut))
+        return batch
+
+    async def _run_batch(self, batch: list[tuple[str, str, asyncio.Future]]) -> None:
+        texts = [normalized for _, normalized, _ in batch]
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(
+                None, self.backend.embed_batch, texts
+            )
+        except Exception as exc:
+            logger.warning("Embedding batch of %d failed: %s", len(texts), exc)
+            vectors = [None] * len(texts)
+
+        for (key, _, fut), vec in zip(batch, vectors):
+            self._inflight.pop(key, None)
+            if vec is not None and vec.size:
+                self._cache_put(key, vec)
+                result = vec
+            else:
+                result = _EMPTY
+            if not fut.done():
+                fut.set_result(result)
+
+    # ── public ───────────────────────────────────────────────────────────────
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed one string; returns an empty array on failure."""
+        return await self._submit(text)
+
+    async def embed_many(self, texts: list[str]) -> list[np.ndarray]:
+        """Embed many strings, preserving order; failures are empty arrays."""
+        futures = [self._submit(t) for t in texts]
+        return list(await asyncio.gather(*futures))
+
+    def stats(self) -> dict[str, int]:
+        with self._cache_lock:
+            size = len(self._cache)
+        return {"hits": self.hits, "misses": self.misses, "cached": size}
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Return the process-wide EmbeddingService, creating it on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from app.core.config import settings
+
+                if (settings.EMBEDDING_BACKEND or "").strip().lower() == "local":
+                    backend: Any = LocalHashEmbedder()
+                else:
+                    backend = TitanEmbedder(concurrency=settings.EMBEDDING_CONCURRENCY)
+                _service = EmbeddingService(
+                    backend,
+                    max_batch=settings.EMBEDDING_BATCH_SIZE,
+                    max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS,
+                    cache_size=settings.EMBEDDING_CACHE_SIZE,
+                )
+    return _service
+
+
 # ── Embedding ─────────────────────────────────────────────────────────────────
 
 async def embed_text(text: str) -> list[float]:
     """
-    Embed *text* using Bedrock Titan Embed Text v2.
+    Embed *text* using the shared embedding pipeline (Titan Embed Text v2).
 
     Returns the embedding vector (1024-dim).  Returns [] on failure.
     """
-    import json
-    import boto3
-    from app.core.config import settings
-
     if not text or not text.strip():
         return []
+    vec = await get_embedding_service().embed(text)
+    return vec.tolist()
 
-    try:
-        client = boto3.client(
-            "bedrock-runtime",
-            region_name=_region(),
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-        body = json.dumps({"inputText": text[:8000]})   # Titan v2 limit
-        response = client.invoke_model(
-            modelId=_TITAN_EMBED_MODEL,
-            body=body,
-            contentType="application/json",
-            accept="application/json",
-        )
-        result = json.loads(response["body"].read())
-        return result.get("embedding", [])
 
-    except Exception as exc:
-        logger.warning("embed_text failed: %s", exc)
+async def embed_texts(texts: list[str]) -> list[np.ndarray]:
+    """
+    Embed *texts* in micro-batches with caching.
+
+    Returns one float32 array per input, in order; failed or blank inputs
+    yield an empty array.
+    """
+    if not texts:
         return []
+    return await get_embedding_service().embed_many(texts)
 
 
 # ── KB Retrieval ──────────────────────────────────────────────────────────────
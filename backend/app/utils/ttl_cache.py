@@ -0,0 +1,78 @@
+"""
+app/utils/ttl_cache.py
+
+Small bounded, thread-safe in-process cache with per-entry expiry.
+
+Used for short-lived memoisation of expensive remote calls (LLM query
+expansion, KB retrieval, rerank scores) where a stale answer for a few
+minutes is acceptable and the working set is small.  Eviction is LRU once
+``max_entries`` is reached; expired entries are dropped lazily on access.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_key(text: str) -> str:
+    """Case- and whitespace-insensitive cache key for free-text queries."""
+    return _WS_RE.sub(" ", (text or "").lower()).strip().rstrip("?.!")
+
+
+class TTLCache(Generic[V]):
+    """LRU cache whose entries expire ``ttl_seconds`` after being set."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 900.0) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,354 @@
+"""
+app/utils/workspace_index.py
+
+Local hybrid retrieval index for Drafting AI workspaces.
+
+Documents are chunked once at upload time and persisted to
+``workspace_chunks`` (optionally with a float32 Titan embedding per chunk).
+At chat time the chunks of a workspace are loaded into an in-memory index —
+BM25 postings plus a dense embedding matrix — and queried in-process with
+NumPy top-k.  Hot workspaces are kept in a small per-process LRU, so a RAG
+turn costs no network hop unless embeddings are enabled (one query embed).
+
+Functions
+---------
+index_document(db, workspace_id, doc_id, text)
+    Chunk *text*, optionally embed the chunks, and persist them.
+
+search(db, workspace_id, query, docs, top_k)
+    Return the *top_k* most relevant chunks of the workspace, in the same
+    {"text", "score", "metadata"} shape as embedder.retrieve_from_kb.
+
+invalidate(workspace_id)
+    Drop the cached in-memory index for a workspace.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+import threading
+import uuid as _uuid
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import WorkspaceChunk, WorkspaceDocument
+from app.utils.chunker import chunk_text
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Standard Okapi BM25 parameters
+_BM25_K1 = 1.5
+_BM25_B  = 0.75
+
+# Reciprocal-rank-fusion constant used to merge BM25 and dense rankings
+_RRF_K = 60
+
+_cache: "OrderedDict[str, _WorkspaceIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _to_unit_vector(vector: "list[float] | np.ndarray") -> Optional[np.ndarray]:
+    if vector is None or len(vector) == 0:
+        return None
+    arr  = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    if norm == 0.0:
+        return None
+    return arr / norm
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the *k* highest scores, best first."""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+# ============================================================================
+# In-memory index
+# ============================================================================
+
+class _WorkspaceIndex:
+    """BM25 postings + optional dense matrix for one workspace's chunks."""
+
+    def __init__(
+        self,
+        signature: frozenset[str],
+        texts: list[str],
+        metadata: list[dict[str, Any]],
+        embeddings: Optional[np.ndarray],
+    ) -> None:
+        self.signature  = signature
+        self.texts      = texts
+        self.metadata   = metadata
+        self.embeddings = embeddings     # (n, dim) float32, rows L2-normalised
+
+        n = len(texts)
+        self.doc_len = np.zeros(n, dtype=np.float32)
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        for i, text in enumerate(texts):
+            counts = Counter(_tokenize(text))
+            self.doc_len[i] = sum(counts.values())
+            for term, tf in counts.items():
+                ids, tfs = postings.setdefault(term, ([], []))
+                ids.append(i)
+                tfs.append(tf)
+
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {
+            term: (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (ids, tfs) in postings.items()
+        }
+        self.avg_len = float(self.doc_len.mean()) if n else 0.0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def bm25(self, query: str) -> np.ndarray:
+        n      = len(self)
+        scores = np.zeros(n, dtype=np.float32)
+        if not n or self.avg_len == 0.0:
+            return scores
+        for term in set(_tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            ids, tfs = posting
+            df   = ids.size
+            idf  = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            norm = tfs + _BM25_K1 * (1.0 - _BM25_B + _BM25_B * self.doc_len[ids] / self.avg_len)
+            scores[ids] += idf * tfs * (_BM25_K1 + 1.0) / norm
+        return scores
+
+    def query(self, query: str, query_vector: Optional[np.ndarray], top_k: int) -> list[dict[str, Any]]:
+        lexical = self.bm25(query)
+        lexical_top = [int(i) for i in _top_k(lexical, top_k) if lexical[i] > 0]
+
+        if query_vector is None or self.embeddings is None \
+                or self.embeddings.shape[1] != query_vector.shape[0]:
+            return [self._hit(i, float(lexical[i])) for i in lexical_top]
+
+        dense     = self.embeddings @ query_vector
+        dense_top = [int(i) for i in _top_k(dense, top_k)]
+
+        fused: dict[int, float] = {}
+        for ranking in (lexical_top, dense_top):
+            for rank, idx in enumerate(ranking):
+                fused[idx] = fused.get(idx, 0.0) + 1.0 / (_RRF_K + rank + 1)
+        best = sorted(fused.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+        return [self._hit(idx, score) for idx, score in best]
+
+    def _hit(self, idx: int, score: float) -> dict[str, Any]:
+        return {
+            "text":     self.texts[idx],
+            "score":    round(score, 4),
+            "metadata": dict(self.metadata[idx]),
+        }
+
+
+# ============================================================================
+# Persistence
+# ============================================================================
+
+async def _embed_chunks(chunks: list[str]) -> list[Optional[bytes]]:
+    if not settings.DRAFTING_LOCAL_INDEX_EMBEDDINGS:
+        return [None] * len(chunks)
+    from app.utils.embedder import embed_texts
+
+    vectors = await embed_texts(chunks)
+    out: list[Optional[bytes]] = []
+    for vector in vectors:
+        unit = _to_unit_vector(vector)
+        out.append(unit.tobytes() if unit is not None else None)
+    return out
+
+
+async def index_document(
+    db: Session,
+    workspace_id: str,
+    doc_id: str,
+    text: str,
+) -> int:
+    """
+    Chunk *text* and persist it to ``workspace_chunks`` for *doc_id*.
+
+    Existing chunks for the document are replaced.  Returns the number of
+    chunks written.  The caller's session is committed (in a worker thread).
+    """
+    chunks     = await asyncio.to_thread(chunk_text, text or "", chunk_size=512, overlap=50)
+    embeddings = await _embed_chunks(chunks) if chunks else []
+
+    await asyncio.to_thread(_replace_chunks, db, workspace_id, doc_id, chunks, embeddings)
+    invalidate(str(workspace_id))
+    logger.debug("workspace_index: indexed %d chunks for doc %s", len(chunks), doc_id)
+    return len(chunks)
+
+
+def _replace_chunks(
+    db: Session,
+    workspace_id: str,
+    doc_id: str,
+    chunks: list[str],
+    embeddings: list[Optional[bytes]],
+) -> None:
+    db.query(WorkspaceChunk).filter(WorkspaceChunk.document_id == doc_id).delete(
+        synchronize_session=False
+    )
+    ws_uuid  = _uuid.UUID(str(workspace_id))
+    doc_uuid = _uuid.UUID(str(doc_id))
+    db.add_all([
+        WorkspaceChunk(
+            workspace_id=ws_uuid,
+            document_id=doc_uuid,
+            chunk_index=i,
+            text=chunk,
+            embedding=embedding,
+        )
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+    ])
+    db.commit()
+
+
+def _load_rows(db: Session, workspace_id: str) -> list:
+    return (
+        db.query(
+            WorkspaceChunk.document_id,
+            WorkspaceChunk.chunk_index,
+            WorkspaceChunk.text,
+            WorkspaceChunk.embedding,
+        )
+        .filter(WorkspaceChunk.workspace_id == workspace_id)
+        .order_by(WorkspaceChunk.document_id, WorkspaceChunk.chunk_index)
+        .all()
+    )
+
+
+async def _build_index(
+    db: Session,
+    workspace_id: str,
+    docs: list[WorkspaceDocument],
+    signature: frozenset[str],
+) -> _WorkspaceIndex:
+    rows = await asyncio.to_thread(_load_rows, db, workspace_id)
+
+    # Backfill documents uploaded before the local index existed (or whose
+    # upload-time indexing failed) so retrieval never silently misses them.
+    indexed = {str(r.document_id) for r in rows}
+    missing = [d for d in docs if str(d.id) not in indexed and (d.extracted_text or "").strip()]
+    if missing:
+        for doc in missing:
+            await index_document(db, workspace_id, str(doc.id), doc.extracted_text or "")
+        rows = await asyncio.to_thread(_load_rows, db, workspace_id)
+
+    filenames = {str(d.id): d.filename for d in docs}
+    texts: list[str] = []
+    metadata: list[dict[str, Any]] = []
+    vectors: list[Optional[np.ndarray]] = []
+    for row in rows:
+        doc_id = str(row.document_id)
+        if doc_id not in signature:
+            continue
+        texts.append(row.text)
+        metadata.append({
+            "workspaceId": str(workspace_id),
+            "docId":       doc_id,
+            "filename":    filenames.get(doc_id, ""),
+            "chunkIndex":  row.chunk_index,
+        })
+        vectors.append(
+            np.frombuffer(row.embedding, dtype=np.float32) if row.embedding else None
+        )
+
+    embeddings: Optional[np.ndarray] = None
+    if vectors and all(v is not None for v in vectors) \
+            and len({v.shape[0] for v in vectors}) == 1:
+        embeddings = np.vstack(vectors)
+
+    return _WorkspaceIndex(signature, texts, metadata, embeddings)
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+def invalidate(workspace_id: str) -> None:
+    """Drop the cached in-memory index for *workspace_id* (no-op if absent)."""
+    with _cache_lock:
+        _cache.pop(str(workspace_id), None)
+
+
+def _cache_get(workspace_id: str, signature: frozenset[str]) -> Optional[_WorkspaceIndex]:
+    with _cache_lock:
+        index = _cache.get(workspace_id)
+        if index is None:
+            return None
+        if index.signature != signature:
+            # Document set changed (possibly in another worker) — rebuild.
+            _cache.pop(workspace_id, None)
+            return None
+        _cache.move_to_end(workspace_id)
+        return index
+
+
+def _cache_put(workspace_id: str, index: _WorkspaceIndex) -> None:
+    capacity = max(1, int(settings.DRAFTING_LOCAL_INDEX_CACHE_SIZE))
+    with _cache_lock:
+        _cache[workspace_id] = index
+        _cache.move_to_end(workspace_id)
+        while len(_cache) > capacity:
+            _cache.popitem(last=False)
+
+
+async def search(
+    db: Session,
+    workspace_id: str,
+    query: str,
+    docs: list[WorkspaceDocument],
+    top_k: int = 8,
+) -> list[dict[str, Any]]:
+    """
+    Retrieve the *top_k* most relevant chunks for *query* from the workspace.
+
+    *docs* is the workspace's current document list; its id set is the cache
+    key, so uploads and deletions are picked up without explicit invalidation.
+    Returns [] on failure.
+    """
+    if not query.strip() or not docs:
+        return []
+
+    workspace_id = str(workspace_id)
+    signature    = frozenset(str(d.id) for d in docs)
+
+    try:
+        index = _cache_get(workspace_id, signature)
+        if index is None:
+            index = await _build_index(db, workspace_id, docs, signature)
+            _cache_put(workspace_id, index)
+
+        if not len(index):
+            return []
+
+        query_vector: Optional[np.ndarray] = None
+        if index.embeddings is not None and settings.DRAFTING_LOCAL_INDEX_EMBEDDINGS:
+            from app.utils.embedder import get_embedding_service
+            query_vector = _to_unit_vector(await get_embedding_service().embed(query))
+
+        return index.query(query, query_vector, top_k)
+
+    except Exception as exc:
+        logger.warning("workspace_index.search failed for %s: %s", workspace_id, exc)
+        return []
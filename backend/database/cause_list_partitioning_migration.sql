@@ -0,0 +1,123 @@
+-- ============================================================
+-- Monthly range partitions for the date-keyed cause-list tables
+--   daily_cause_lists          PARTITION BY RANGE (date)
+--   advocate_cause_lists       PARTITION BY RANGE (date)
+--   case_live_status_snapshots PARTITION BY RANGE (fetched_at)
+--
+-- Partitions are named <table>_pYYYYMM and cover one calendar month;
+-- <table>_default catches anything outside the created range.  From
+-- here on app/services/partition_maintenance.py creates partitions
+-- ahead of time and drops expired ones (no more row-by-row purges).
+--
+-- Each table is renamed to <table>_legacy, recreated as a partitioned
+-- parent with the same columns, and its rows are copied across.
+-- Primary keys must contain the partition key, so they become
+-- (id, date) / (id, fetched_at); the unique constraints used by the
+-- ON CONFLICT upserts already contain date.  Re-running is a no-op for
+-- tables that are already partitioned.
+--
+-- Run: psql "$DATABASE_URL" -f database/cause_list_partitioning_migration.sql
+-- Once verified: DROP TABLE daily_cause_lists_legacy,
+--   advocate_cause_lists_legacy, case_live_status_snapshots_legacy;
+-- ============================================================
+
+BEGIN;
+
+DO $$
+DECLARE
+    spec RECORD;
+    idx RECORD;
+    fk RECORD;
+    stmt TEXT;
+    legacy TEXT;
+    lo DATE;
+    hi DATE;
+    m DATE;
+BEGIN
+    FOR spec IN
+        SELECT * FROM (VALUES
+            ('daily_cause_lists', 'date', ARRAY[
+                'ALTER TABLE daily_cause_lists ADD CONSTRAINT daily_cause_lists_pkey PRIMARY KEY (id, date)',
+                'ALTER TABLE daily_cause_lists ADD CONSTRAINT uq_daily_cause_lists_adv_date UNIQUE (advocate_id, date)',
+                'CREATE INDEX ix_daily_cause_lists_advocate_id ON daily_cause_lists (advocate_id)',
+                'CREATE INDEX ix_daily_cause_lists_date ON daily_cause_lists (date)'
+            ]),
+            ('advocate_cause_lists', 'date', ARRAY[
+                'ALTER TABLE advocate_cause_lists ADD CONSTRAINT advocate_cause_lists_pkey PRIMARY KEY (id, date)',
+                'ALTER TABLE advocate_cause_lists ADD CONSTRAINT uq_advocate_cause_lists_lawyer_adv_date_case UNIQUE (lawyer_id, advocate_name, date, case_no)',
+                'CREATE INDEX ix_advocate_cause_lists_lawyer_date ON advocate_cause_lists (lawyer_id, date)',
+                'CREATE INDEX ix_advocate_cause_lists_date_court ON advocate_cause_lists (date, court_hall_number)',
+                'CREATE INDEX ix_advocate_cause_lists_date_case ON advocate_cause_lists (date, case_no)'
+            ]),
+            ('case_live_status_snapshots', 'fetched_at', ARRAY[
+                'ALTER TABLE case_live_status_snapshots ADD CONSTRAINT case_live_status_snapshots_pkey PRIMARY KEY (id, fetched_at)',
+                'CREATE INDEX ix_case_live_status_snapshots_case_id ON case_live_status_snapshots (case_id)',
+                'CREATE INDEX ix_case_live_status_snapshots_fetched_at ON case_live_status_snapshots (fetched_at)'
+            ])
+        ) AS t(tbl, key_col, ddl)
+    LOOP
+        IF to_regclass(spec.tbl) IS NULL THEN
+            RAISE NOTICE '% does not exist, skipping', spec.tbl;
+            CONTINUE;
+        END IF;
+        IF (SELECT relkind FROM pg_class WHERE oid = to_regclass(spec.tbl)) = 'p' THEN
+            RAISE NOTICE '% is already partitioned, skipping', spec.tbl;
+            CONTINUE;
+        END IF;
+
+        legacy := spec.tbl || '_legacy';
+        EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', spec.tbl);
+        EXECUTE format('ALTER TABLE %I RENAME TO %I', spec.tbl, legacy);
+
+        -- Free the index names (renaming a PK/unique index renames its constraint too)
+        FOR idx IN
+            SELECT i.relname
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = to_regclass(legacy)
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.relname, left(idx.relname, 56) || '_legacy');
+        END LOOP;
+
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) '
+            'PARTITION BY RANGE (%I)',
+            spec.tbl, legacy, spec.key_col
+        );
+
+        -- One partition per month from the oldest row to three months ahead
+        EXECUTE format('SELECT date_trunc(''month'', min(%I))::date FROM %I', spec.key_col, legacy) INTO lo;
+        lo := LEAST(COALESCE(lo, date_trunc('month', CURRENT_DATE)::date), date_trunc('month', CURRENT_DATE)::date);
+        hi := (date_trunc('month', CURRENT_DATE) + interval '4 months')::date;
+        m := lo;
+        WHILE m < hi LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                spec.tbl || '_p' || to_char(m, 'YYYYMM'), spec.tbl, m, (m + interval '1 month')::date
+            );
+            m := (m + interval '1 month')::date;
+        END LOOP;
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', spec.tbl || '_default', spec.tbl);
+
+        EXECUTE format('INSERT INTO %I SELECT * FROM %I', spec.tbl, legacy);
+
+        -- Keys and indexes after the copy; partitioned indexes cascade to every partition
+        FOREACH stmt IN ARRAY spec.ddl LOOP
+            EXECUTE stmt;
+        END LOOP;
+
+        -- Foreign keys as they were (the referenced table name varies between installs)
+        FOR fk IN
+            SELECT conname, pg_get_constraintdef(oid) AS def
+            FROM pg_constraint
+            WHERE conrelid = to_regclass(legacy) AND contype = 'f'
+        LOOP
+            EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I %s', spec.tbl, fk.conname, fk.def);
+        END LOOP;
+
+        RAISE NOTICE '% partitioned by %', spec.tbl, spec.key_col;
+    END LOOP;
+END
+$$;
+
+COMMIT;
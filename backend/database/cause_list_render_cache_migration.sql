@@ -0,0 +1,19 @@
+-- ============================================================
+-- Pre-rendered cause-list HTML (app/services/cause_list_store.py)
+--
+-- upsert_result renders the HTML once and stores it zstd-compressed
+-- next to the sha256 of result_json; GET /cause-list serves it with an
+-- ETag built from that hash, so repeat polls get 304 without rendering
+-- or even loading result_json.  Existing rows are rendered on first read.
+--
+-- Run: psql -d <db> -f database/cause_list_render_cache_migration.sql
+-- ============================================================
+
+BEGIN;
+
+ALTER TABLE daily_cause_lists ADD COLUMN IF NOT EXISTS result_hash       VARCHAR(64);
+ALTER TABLE daily_cause_lists ADD COLUMN IF NOT EXISTS render_version    INTEGER;
+ALTER TABLE daily_cause_lists ADD COLUMN IF NOT EXISTS rendered_html_zst BYTEA;
+ALTER TABLE daily_cause_lists ALTER COLUMN rendered_html_zst SET STORAGE EXTERNAL;
+
+COMMIT;
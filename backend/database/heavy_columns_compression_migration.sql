@@ -0,0 +1,41 @@
+-- ============================================================
+-- zstd-compressed copies of the heavy text / JSON columns
+-- (app/db/compression.py)
+--
+--   documents.extracted_text            -> extracted_text_zst
+--   workspace_documents.extracted_text  -> extracted_text_zst
+--   cases.raw_court_data                -> raw_court_data_zst
+--   daily_cause_lists.result_json       -> result_json_zst
+--   legal_insight_results.result_json   -> result_json_zst
+--
+-- New writes go to the *_zst column and NULL the original, which is
+-- only read for rows not yet converted.  After this migration, run the
+-- online backfill (batched, resumable, safe alongside live traffic):
+--   python -m jobs.compress_heavy_columns
+--
+-- The payload is already compressed, so *_zst uses STORAGE EXTERNAL:
+-- TOAST stores it out of line without trying pglz on it again.
+--
+-- Run: psql -d <db> -f database/heavy_columns_compression_migration.sql
+-- ============================================================
+
+BEGIN;
+
+ALTER TABLE documents             ADD COLUMN IF NOT EXISTS extracted_text_zst BYTEA;
+ALTER TABLE workspace_documents   ADD COLUMN IF NOT EXISTS extracted_text_zst BYTEA;
+ALTER TABLE cases                 ADD COLUMN IF NOT EXISTS raw_court_data_zst BYTEA;
+ALTER TABLE daily_cause_lists     ADD COLUMN IF NOT EXISTS result_json_zst    BYTEA;
+ALTER TABLE legal_insight_results ADD COLUMN IF NOT EXISTS result_json_zst    BYTEA;
+
+ALTER TABLE documents             ALTER COLUMN extracted_text_zst SET STORAGE EXTERNAL;
+ALTER TABLE workspace_documents   ALTER COLUMN extracted_text_zst SET STORAGE EXTERNAL;
+ALTER TABLE cases                 ALTER COLUMN raw_court_data_zst SET STORAGE EXTERNAL;
+ALTER TABLE daily_cause_lists     ALTER COLUMN result_json_zst    SET STORAGE EXTERNAL;
+ALTER TABLE legal_insight_results ALTER COLUMN result_json_zst    SET STORAGE EXTERNAL;
+
+-- The plain columns are emptied once a row is compressed
+ALTER TABLE daily_cause_lists     ALTER COLUMN result_json DROP NOT NULL;
+ALTER TABLE daily_cause_lists     ALTER COLUMN result_json DROP DEFAULT;
+ALTER TABLE legal_insight_results ALTER COLUMN result_json DROP NOT NULL;
+
+COMMIT;
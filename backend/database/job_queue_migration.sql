@@ -0,0 +1,40 @@
+-- ============================================================
+-- Durable background job queue (worker: python -m jobs.worker)
+-- Run: psql -d <db> -f database/job_queue_migration.sql
+-- ============================================================
+
+BEGIN;
+
+DO $$ BEGIN
+  CREATE TYPE job_queue_status AS ENUM ('queued', 'running', 'succeeded', 'dead');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS job_queue (
+  id            UUID              PRIMARY KEY DEFAULT gen_random_uuid(),
+  job_type      VARCHAR(64)       NOT NULL,
+  payload       JSONB             NOT NULL DEFAULT '{}'::jsonb,
+  priority      INTEGER           NOT NULL DEFAULT 100,      -- lower runs first
+  status        job_queue_status  NOT NULL DEFAULT 'queued',
+  attempts      INTEGER           NOT NULL DEFAULT 0,
+  max_attempts  INTEGER           NOT NULL DEFAULT 5,
+  run_after     TIMESTAMP         NOT NULL DEFAULT NOW(),    -- backoff / delayed start
+  locked_by     VARCHAR(100),
+  locked_until  TIMESTAMP,                                   -- visibility timeout
+  dedupe_key    VARCHAR(200),
+  last_error    TEXT,
+  created_at    TIMESTAMP         NOT NULL DEFAULT NOW(),
+  updated_at    TIMESTAMP         NOT NULL DEFAULT NOW(),
+  finished_at   TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_job_queue_dequeue
+  ON job_queue (job_type, status, priority, run_after);
+
+-- At most one *queued* job per dedupe key; a new one may queue behind a
+-- running one (the earlier index also covered 'running' and dropped it)
+DROP INDEX IF EXISTS uq_job_queue_dedupe_active;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_job_queue_dedupe_queued
+  ON job_queue (dedupe_key) WHERE status = 'queued';
+
+COMMIT;
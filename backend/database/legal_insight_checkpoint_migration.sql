@@ -0,0 +1,15 @@
+-- ============================================================
+-- Legal Insight — resumable map-reduce checkpoints
+-- Run: psql -d <db> -f database/legal_insight_checkpoint_migration.sql
+-- ============================================================
+
+BEGIN;
+
+-- Completed map batches of an in-flight job; cleared when the job completes.
+ALTER TABLE legal_insight_jobs ADD COLUMN IF NOT EXISTS checkpoint JSONB;
+
+-- Stale-job sweep: non-terminal status + oldest heartbeat (updated_at).
+CREATE INDEX IF NOT EXISTS ix_legal_insight_jobs_status_updated
+  ON legal_insight_jobs (status, updated_at);
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- ============================================================
+-- Legal Insight — reuse extracted chunks across jobs by PDF hash
+-- Run: psql -d <db> -f database/legal_insight_extraction_reuse_migration.sql
+-- ============================================================
+
+BEGIN;
+
+-- Extraction settings fingerprint of the job's persisted chunks.
+ALTER TABLE legal_insight_jobs ADD COLUMN IF NOT EXISTS extraction_key VARCHAR(64);
+
+-- Lookup of a prior job with the same PDF + extraction settings.
+CREATE INDEX IF NOT EXISTS ix_legal_insight_jobs_sha_extraction
+  ON legal_insight_jobs (pdf_sha256, extraction_key);
+
+COMMIT;
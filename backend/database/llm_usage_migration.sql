@@ -0,0 +1,52 @@
+-- ============================================================
+-- Bedrock token accounting (app/services/llm_usage_service.py)
+-- Run: psql -d <db> -f database/llm_usage_migration.sql
+-- ============================================================
+
+BEGIN;
+
+-- One row per Bedrock call; purged after LLM_USAGE_RETENTION_DAYS
+CREATE TABLE IF NOT EXISTS llm_usage_events (
+  id                  BIGSERIAL     PRIMARY KEY,
+  created_at          TIMESTAMP     NOT NULL DEFAULT NOW(),
+  day                 DATE          NOT NULL,                -- IST date
+  user_id             UUID,                                  -- NULL for system calls
+  feature             VARCHAR(64)   NOT NULL,
+  model_id            VARCHAR(255)  NOT NULL,
+  requested_model_id  VARCHAR(255),                          -- set when downgraded
+  status              VARCHAR(16)   NOT NULL,                -- ok / error / aborted / rejected
+  input_tokens        INTEGER       NOT NULL DEFAULT 0,
+  output_tokens       INTEGER       NOT NULL DEFAULT 0,
+  cache_read_tokens   INTEGER       NOT NULL DEFAULT 0,
+  cache_write_tokens  INTEGER       NOT NULL DEFAULT 0,
+  latency_ms          INTEGER       NOT NULL DEFAULT 0,
+  cost_usd            DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_usage_events_created_at
+  ON llm_usage_events (created_at);
+CREATE INDEX IF NOT EXISTS ix_llm_usage_events_user_day
+  ON llm_usage_events (user_id, day);
+
+-- Daily roll-up, upserted per call; read by the budget checks
+CREATE TABLE IF NOT EXISTS llm_usage_daily (
+  day                 DATE          NOT NULL,
+  user_id             UUID          NOT NULL,                -- nil UUID for system calls
+  feature             VARCHAR(64)   NOT NULL,
+  model_id            VARCHAR(255)  NOT NULL,
+  calls               INTEGER       NOT NULL DEFAULT 0,
+  errors              INTEGER       NOT NULL DEFAULT 0,
+  rejected            INTEGER       NOT NULL DEFAULT 0,
+  input_tokens        BIGINT        NOT NULL DEFAULT 0,
+  output_tokens       BIGINT        NOT NULL DEFAULT 0,
+  cache_read_tokens   BIGINT        NOT NULL DEFAULT 0,
+  cache_write_tokens  BIGINT        NOT NULL DEFAULT 0,
+  latency_ms          BIGINT        NOT NULL DEFAULT 0,
+  cost_usd            DOUBLE PRECISION NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, user_id, feature, model_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_usage_daily_day_feature
+  ON llm_usage_daily (day, feature);
+
+COMMIT;
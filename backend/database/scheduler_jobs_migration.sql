@@ -0,0 +1,26 @@
+-- ============================================================
+-- Scheduled job state (app/core/scheduler.py)
+-- Run: psql -d <db> -f database/scheduler_jobs_migration.sql
+-- ============================================================
+
+BEGIN;
+
+-- One row per job, upserted by the leader; last run, outcome and counters
+CREATE TABLE IF NOT EXISTS scheduler_jobs (
+  name                VARCHAR(100)  PRIMARY KEY,
+  scheduler_group     VARCHAR(50)   NOT NULL,                -- api / scraper
+  last_scheduled_for  TIMESTAMP,                               -- slot of the last run or skip (UTC)
+  last_started_at     TIMESTAMP,
+  last_finished_at    TIMESTAMP,
+  last_duration_ms    INTEGER,
+  last_status         VARCHAR(16),                             -- ok / error / cancelled / abandoned
+  last_error          TEXT,
+  running_since       TIMESTAMP,
+  running_owner       VARCHAR(255),                            -- host:pid
+  run_count           INTEGER       NOT NULL DEFAULT 0,
+  error_count         INTEGER       NOT NULL DEFAULT 0,
+  skipped_count       INTEGER       NOT NULL DEFAULT 0,
+  updated_at          TIMESTAMP     NOT NULL DEFAULT NOW()
+);
+
+COMMIT;
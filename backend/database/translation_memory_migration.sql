@@ -0,0 +1,26 @@
+-- ============================================================
+-- Legal translation — translation memory (segment reuse)
+-- Run: psql -d <db> -f database/translation_memory_migration.sql
+-- ============================================================
+
+BEGIN;
+
+-- One row per translated paragraph.  Keys are scoped by direction, model and
+-- glossary version, so changing any of them naturally misses the old rows.
+CREATE TABLE IF NOT EXISTS translation_memory (
+  key_hash          VARCHAR(64)   PRIMARY KEY,
+  loose_hash        VARCHAR(64)   NOT NULL,
+  direction         VARCHAR(10)   NOT NULL,
+  model_id          VARCHAR(255)  NOT NULL,
+  glossary_version  VARCHAR(20)   NOT NULL,
+  source_text       TEXT          NOT NULL,
+  translated_text   TEXT          NOT NULL,
+  hit_count         INTEGER       NOT NULL DEFAULT 0,
+  created_at        TIMESTAMP     NOT NULL DEFAULT NOW(),
+  last_used_at      TIMESTAMP     NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_translation_memory_loose_hash   ON translation_memory (loose_hash);
+CREATE INDEX IF NOT EXISTS ix_translation_memory_last_used_at ON translation_memory (last_used_at);
+
+COMMIT;
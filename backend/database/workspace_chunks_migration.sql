@@ -0,0 +1,25 @@
+-- ============================================================
+-- Drafting AI — local per-workspace retrieval index
+-- Run: psql -d <db> -f database/workspace_chunks_migration.sql
+-- ============================================================
+
+BEGIN;
+
+-- One row per 512-word chunk of a workspace document.
+-- embedding = L2-normalised float32 vector as raw bytes (NULL when disabled).
+CREATE TABLE IF NOT EXISTS workspace_chunks (
+  id            UUID        PRIMARY KEY DEFAULT gen_random_uuid(),
+  workspace_id  UUID        NOT NULL REFERENCES workspaces(id) ON DELETE CASCADE,
+  document_id   UUID        NOT NULL REFERENCES workspace_documents(id) ON DELETE CASCADE,
+  chunk_index   INTEGER     NOT NULL,
+  text          TEXT        NOT NULL,
+  embedding     BYTEA,
+  created_at    TIMESTAMP   NOT NULL DEFAULT NOW(),
+
+  CONSTRAINT uq_workspace_chunks_doc_idx UNIQUE (document_id, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS ix_workspace_chunks_workspace_id ON workspace_chunks (workspace_id);
+CREATE INDEX IF NOT EXISTS ix_workspace_chunks_document_id  ON workspace_chunks (document_id);
+
+COMMIT;
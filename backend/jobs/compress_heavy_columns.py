@@ -0,0 +1,81 @@
+"""
+One-off online backfill for database/heavy_columns_compression_migration.sql.
+
+Moves every remaining plain value of the heavy columns into its zstd
+``*_zst`` column (app/db/compression.py) and clears the original, in small
+batches.  Each batch locks its rows with FOR UPDATE SKIP LOCKED and commits
+straight away, so the app keeps reading and writing the tables meanwhile and
+the job can be stopped and re-run at any point.  Rows written by the app
+after the migration are already compressed and are never touched.
+
+Run: python -m jobs.compress_heavy_columns [--table cases] [--batch-size 200]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.core.logger import logger
+from app.db.compression import compress_json, compress_text
+from app.db.database import SessionLocal
+
+# table -> (column, is_json)
+HEAVY_COLUMNS: dict[str, tuple[str, bool]] = {
+    "documents": ("extracted_text", False),
+    "workspace_documents": ("extracted_text", False),
+    "cases": ("raw_court_data", True),
+    "daily_cause_lists": ("result_json", True),
+    "legal_insight_results": ("result_json", True),
+}
+
+
+def compress_table(table: str, batch_size: int, sleep_sec: float) -> int:
+    column, is_json = HEAVY_COLUMNS[table]
+    compress = compress_json if is_json else compress_text
+    select = text(
+        f'SELECT id, "{column}" FROM "{table}" '
+        f'WHERE "{column}_zst" IS NULL AND "{column}" IS NOT NULL '
+        f"LIMIT :n FOR UPDATE SKIP LOCKED"
+    )
+    update = text(f'UPDATE "{table}" SET "{column}_zst" = :blob, "{column}" = NULL WHERE id = :id')
+
+    done = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(select, {"n": batch_size}).all()
+            if not rows:
+                db.rollback()
+                break
+            db.execute(update, [{"id": row_id, "blob": compress(value)} for row_id, value in rows])
+            db.commit()
+            done += len(rows)
+            logger.info("compress_heavy_columns: %s.%s %d rows", table, column, done)
+            if sleep_sec > 0:
+                time.sleep(sleep_sec)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compress heavy text/JSON columns into their *_zst columns")
+    parser.add_argument("--table", choices=sorted(HEAVY_COLUMNS), action="append",
+                        help="limit to this table (repeatable; default: all)")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--sleep", type=float, default=0.2, help="seconds to pause between batches")
+    args = parser.parse_args()
+
+    summary = {}
+    for table in args.table or list(HEAVY_COLUMNS):
+        summary[table] = compress_table(table, max(1, args.batch_size), args.sleep)
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
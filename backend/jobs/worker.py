@@ -0,0 +1,195 @@
+"""
+Durable job-queue worker.
+
+    python -m jobs.worker                       # all types, JOB_WORKER_CONCURRENCY
+    python -m jobs.worker --types legal_insight.run --concurrency legal_insight.run=4
+
+Each unit of concurrency is one polling slot: it leases a job, runs the
+handler (async handlers on this loop, sync ones in a thread), extends the
+lease while the handler runs, then marks the job complete or failed.  If a
+heartbeat finds the lease taken over, the handler is cancelled (sync ones
+are told through ``JobContext.lease_lost``) and the job is left to its new
+owner.
+SIGTERM/SIGINT stop new dequeues and let in-flight jobs finish; anything
+cut short is picked up again after its visibility timeout.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import traceback
+from typing import Any
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.database import SessionLocal
+from app.services import job_queue
+from app.services.job_handlers import HANDLERS, JobContext, current_job, is_async
+
+_MAINTENANCE_INTERVAL_SEC = 600
+
+
+def _parse_concurrency(spec: str) -> dict[str, int]:
+    out: dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, count = part.strip().partition("=")
+        if name:
+            out[name.strip()] = max(0, int(count or 1))
+    return out
+
+
+def _with_session(fn, *args: Any) -> Any:
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+async def _heartbeat(job_id: str, worker_id: str) -> None:
+    """Extend the lease until cancelled; returns only if the lease was lost."""
+    visibility = settings.JOB_QUEUE_VISIBILITY_SEC
+    while True:
+        await asyncio.sleep(max(5, visibility // 3))
+        try:
+            owned = await asyncio.to_thread(
+                _with_session, job_queue.heartbeat, job_id, worker_id, visibility
+            )
+            if not owned:
+                logger.warning("worker: lost lease on job %s", job_id)
+                return
+        except Exception as exc:
+            logger.warning("worker: heartbeat for %s failed: %s", job_id, exc)
+
+
+async def _run(job: dict[str, Any], worker_id: str) -> None:
+    job_id, job_type = job["id"], job["job_type"]
+    handler = HANDLERS.get(job_type)
+    ctx = JobContext(job["attempts"], job["max_attempts"])
+    beat = asyncio.create_task(_heartbeat(job_id, worker_id))
+    try:
+        if handler is None:
+            raise LookupError(f"no handler for job type {job_type!r}")
+        logger.info("worker: running %s %s (attempt %d)", job_type, job_id, job["attempts"])
+        # The task (and to_thread) copy the context, so the handler sees ctx
+        token = current_job.set(ctx)
+        try:
+            if is_async(job_type):
+                work = asyncio.create_task(handler(job["payload"]))
+            else:
+                work = asyncio.create_task(asyncio.to_thread(handler, job["payload"]))
+        finally:
+            current_job.reset(token)
+
+        await asyncio.wait({work, beat}, return_when=asyncio.FIRST_COMPLETED)
+        if not work.done():
+            # Another worker owns the job now: stop, and record nothing
+            ctx.lease_lost.set()
+            work.cancel()
+            work.add_done_callback(lambda t: t.cancelled() or t.exception())
+            logger.warning("worker: abandoned %s %s after losing its lease", job_type, job_id)
+            return
+        work.result()
+    except Exception as exc:
+        logger.debug("worker: %s %s failed:\n%s", job_type, job_id, traceback.format_exc())
+        await asyncio.to_thread(
+            _with_session, job_queue.fail, job_id, worker_id,
+            f"{type(exc).__name__}: {exc}", job["attempts"], job["max_attempts"],
+        )
+    else:
+        await asyncio.to_thread(_with_session, job_queue.complete, job_id, worker_id)
+        logger.info("worker: completed %s %s", job_type, job_id)
+    finally:
+        beat.cancel()
+
+
+async def _slot(job_type: str, worker_id: str, stop: asyncio.Event) -> None:
+    idle = settings.JOB_QUEUE_POLL_INTERVAL_SEC
+    delay = idle
+    while not stop.is_set():
+        try:
+            jobs = await asyncio.to_thread(
+                _with_session, job_queue.dequeue, [job_type], worker_id,
+                settings.JOB_QUEUE_VISIBILITY_SEC,
+            )
+        except Exception as exc:
+            logger.warning("worker: dequeue %s failed: %s", job_type, exc)
+            jobs = []
+
+        if jobs:
+            delay = idle
+            for job in jobs:
+                await _run(job, worker_id)
+            continue
+
+        # Nothing due: back off up to 15x the base interval
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        delay = min(delay * 2, idle * 15)
+
+
+async def _maintenance(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            dead = await asyncio.to_thread(_with_session, job_queue.reap_abandoned)
+            purged = await asyncio.to_thread(
+                _with_session, job_queue.purge_finished, settings.JOB_QUEUE_RETENTION_DAYS
+            )
+            if dead or purged:
+                logger.info("worker: maintenance reaped=%d purged=%d", dead, purged)
+        except Exception as exc:
+            logger.warning("worker: maintenance failed: %s", exc)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=_MAINTENANCE_INTERVAL_SEC)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_worker(concurrency: dict[str, int]) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover — non-POSIX
+            pass
+
+    slots = [
+        _slot(job_type, worker_id, stop)
+        for job_type, count in concurrency.items()
+        for _ in range(count)
+    ]
+    logger.info("worker %s started: %s", worker_id, concurrency)
+    await asyncio.gather(_maintenance(stop), *slots)
+    logger.info("worker %s stopped", worker_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the durable job-queue worker")
+    parser.add_argument("--types", help="comma-separated job types (default: all configured)")
+    parser.add_argument(
+        "--concurrency",
+        default=settings.JOB_WORKER_CONCURRENCY,
+        help='per-type slots, e.g. "legal_insight.run=2,drafting.kb_ingest=4"',
+    )
+    args = parser.parse_args()
+
+    concurrency = _parse_concurrency(args.concurrency)
+    if args.types:
+        wanted = {t.strip() for t in args.types.split(",") if t.strip()}
+        concurrency = {t: concurrency.get(t, 1) for t in wanted}
+    unknown = set(concurrency) - set(HANDLERS)
+    if unknown:
+        parser.error(f"unknown job types: {', '.join(sorted(unknown))}")
+
+    asyncio.run(run_worker(concurrency))
+
+
+if __name__ == "__main__":
+    main()
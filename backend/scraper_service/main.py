@@ -17,6 +17,7 @@ HTTP endpoints (secured with x-scraper-secret header):
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import re
@@ -26,8 +27,6 @@ from datetime import date, datetime, timedelta
 from typing import Any, Dict, Optional
 from zoneinfo import ZoneInfo
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from fastapi import FastAPI, Header, HTTPException
 from sqlalchemy.orm import Session
 
@@ -182,61 +181,45 @@ async def run_advocate_causelist_sync() -> None:
     logger.info("JOB advocate_causelist_sync — starting")
 
     from app.db.models import User
-    from app.services.advocate_causelist_service import fetch_and_store_advocate_causelist
+    from app.services.advocate_causelist_service import AdvocateTarget, sync_advocate_causelists
 
     tomorrow = (datetime.now(IST) + timedelta(days=1)).date()
-    db = _get_db()
 
     try:
-        users = (
-            db.query(User)
-            .filter(
-                User.khc_advocate_code != None,
-                User.khc_advocate_code != "",
-                User.is_active == True,
+        db = _get_db()
+        try:
+            users = (
+                db.query(User)
+                .filter(
+                    User.khc_advocate_code != None,
+                    User.khc_advocate_code != "",
+                    User.is_active == True,
+                )
+                .all()
             )
-            .all()
-        )
-
-        logger.info(
-            "JOB advocate_causelist_sync — %d users with KHC code, date=%s",
-            len(users), tomorrow,
-        )
-
-        success = failed = 0
-        for user in users:
-            try:
-                rows = await fetch_and_store_advocate_causelist(
-                    advocate_name=user.khc_advocate_name or "",
-                    target_date=tomorrow,
+            targets = [
+                AdvocateTarget(
                     lawyer_id=str(user.id),
-                    db=db,
+                    advocate_name=user.khc_advocate_name or "",
                     enrollment_number=user.khc_enrollment_number or "",
                     advocate_code=user.khc_advocate_code or "",
                 )
-                success += 1
-                logger.info(
-                    "advocate_causelist_sync: %s — %d rows",
-                    user.khc_advocate_name, len(rows),
-                )
-            except Exception as exc:
-                failed += 1
-                logger.exception(
-                    "advocate_causelist_sync: error for user %s — %s",
-                    user.id, exc,
-                )
-
-            time.sleep(1)   # brief pause between users
+                for user in users
+            ]
+        finally:
+            db.close()
 
         logger.info(
-            "JOB advocate_causelist_sync — done. success=%d failed=%d",
-            success, failed,
+            "JOB advocate_causelist_sync — %d users with KHC code, date=%s",
+            len(targets), tomorrow,
         )
+        # Bounded concurrency + a shared politeness limit replace the
+        # sequential loop and its blocking sleep between users
+        summary = await sync_advocate_causelists(targets, tomorrow)
+        logger.info("JOB advocate_causelist_sync — done. %s", summary)
 
     except Exception as exc:
         logger.exception("JOB advocate_causelist_sync — fatal: %s", exc)
-    finally:
-        db.close()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -268,69 +251,30 @@ def run_daily_pdf_sync() -> None:
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-# APScheduler setup
+# Scheduler — leader-elected through Postgres, so with several replicas each
+# slot still runs once; runs are recorded in scheduler_jobs (app/core/scheduler.py)
 # ══════════════════════════════════════════════════════════════════════════════
 
-_scheduler: AsyncIOScheduler | None = None
-
-
-def _start_scheduler() -> None:
-    global _scheduler
-    _scheduler = AsyncIOScheduler(timezone=IST)
-
-    # Case status — 5:00 AM IST
-    _scheduler.add_job(
-        run_case_status_sync,
-        CronTrigger(hour=5, minute=0, timezone=IST),
-        id="case_status_0500",
-        max_instances=1,
-        misfire_grace_time=600,
-    )
-    # Case status — 2:00 PM IST
-    _scheduler.add_job(
-        run_case_status_sync,
-        CronTrigger(hour=14, minute=0, timezone=IST),
-        id="case_status_1400",
-        max_instances=1,
-        misfire_grace_time=600,
-    )
-    # Case status — 6:30 PM IST
-    _scheduler.add_job(
-        run_case_status_sync,
-        CronTrigger(hour=18, minute=30, timezone=IST),
-        id="case_status_1830",
-        max_instances=1,
-        misfire_grace_time=600,
-    )
+def _build_scheduler():
+    from app.core.scheduler import Job, Scheduler
 
+    scheduler = Scheduler("scraper")
+    # Case status — 5:00 AM | 2:00 PM | 6:30 PM IST
+    scheduler.add(Job(
+        "scraper.case_status_sync", run_case_status_sync,
+        at_ist=((5, 0), (14, 0), (18, 30)),
+    ))
     # Advocate cause list — 7:15 PM IST
-    _scheduler.add_job(
-        run_advocate_causelist_sync,
-        CronTrigger(hour=19, minute=15, timezone=IST),
-        id="causelist_1915",
-        max_instances=1,
-        misfire_grace_time=300,
-    )
-
-    # Daily cause list PDF — 6:45 PM IST (first wave)
-    _scheduler.add_job(
-        run_daily_pdf_sync,
-        CronTrigger(hour=18, minute=45, timezone=IST),
-        id="daily_pdf_1845",
-        max_instances=1,
-        misfire_grace_time=300,
-    )
-    # Daily cause list PDF — 7:15 PM IST (catch stragglers)
-    _scheduler.add_job(
-        run_daily_pdf_sync,
-        CronTrigger(hour=19, minute=15, timezone=IST),
-        id="daily_pdf_1915",
-        max_instances=1,
-        misfire_grace_time=300,
-    )
-
-    _scheduler.start()
-    logger.info("Scheduler started — 6 jobs registered")
+    scheduler.add(Job(
+        "scraper.advocate_causelist_sync", run_advocate_causelist_sync,
+        at_ist=((19, 15),),
+    ))
+    # Daily cause list PDF — 6:45 PM IST (first wave), 7:15 PM IST (stragglers)
+    scheduler.add(Job(
+        "scraper.daily_pdf_sync", run_daily_pdf_sync,
+        at_ist=((18, 45), (19, 15)),
+    ))
+    return scheduler
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -339,10 +283,16 @@ def _start_scheduler() -> None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    _start_scheduler()
+    from app.core.config import settings
+
+    task = asyncio.create_task(_build_scheduler().run()) if settings.SCHEDULER_ENABLED else None
     yield
-    if _scheduler and _scheduler.running:
-        _scheduler.shutdown(wait=False)
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 
 app = FastAPI(title="Lawmate Scraper Service", lifespan=lifespan)